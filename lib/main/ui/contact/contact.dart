@@ -70,7 +70,7 @@ class _ContactState extends State<Contact> {
           if (kIsWeb) ...[
             const SizedBox(height: 48.0),
             AppDownloadButtons(
-              // APK download URL from CI/CD (GitHub Releases direct link)
+              // APK download URL from CI/CD (same-origin Firebase Hosting link)
               // Set via --dart-define=APK_DOWNLOAD_URL=... at build time
               googlePlayUrl: EnvConfig.apkDownloadUrl,
             ),
@@ -65,7 +65,7 @@ class EnvConfig {
     );
   }
 
-  /// APK download URL (GoFile direct link).
+  /// APK download URL (served from Firebase Hosting under /downloads/).
   /// Provided via --dart-define=APK_DOWNLOAD_URL=... at build time from CI/CD.
   /// Returns null if not configured (optional for debug builds).
   static String? get apkDownloadUrl {
@@ -0,0 +1,673 @@
+#!/usr/bin/env python3
+"""
+APK Composition Analyzer
+
+This module reports what an APK (or AAB) is made of without extracting it:
+the file is memory-mapped and only the ZIP central directory is parsed, so
+the cost is proportional to the number of entries, not the archive size.
+
+Features:
+- Central directory parsing straight from mmap (ZIP and ZIP64)
+- Compressed/uncompressed size breakdown per group:
+  lib/<abi>, classes*.dex, assets/flutter_assets, images, fonts, res, ...
+- Largest-entry listing
+- Entry-by-entry diff of two archives (CRC + size from the central directory)
+- Size budgets (total, growth, per group) for CI gating
+
+Requirements:
+- Python 3.7+ (standard library only)
+
+Usage:
+    from apk_analyzer import analyze_apk
+
+    report = analyze_apk("app-release.apk")
+    for group in report['groups']:
+        print(group['group'], group['compressed_size'])
+"""
+
+import json
+import mmap
+import re
+import struct
+from pathlib import Path
+from typing import Any, Collection, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+
+# End of central directory record
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD_STRUCT = struct.Struct("<4sHHHHIIH")
+
+# ZIP64 end of central directory locator and record
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sIQI")
+ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQHHIIQQQQ")
+
+# Central directory file header
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+CENTRAL_STRUCT = struct.Struct("<4sHHHHHHIIIHHHHHII")
+
+ZIP64_EXTRA_ID = 0x0001
+MAX_COMMENT_SIZE = 0xFFFF
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp', '.svg')
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.woff', '.woff2')
+
+SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2, 'MB': 1024 ** 2, 'G': 1024 ** 3, 'GB': 1024 ** 3}
+
+# AAB modules prefix every path with the module name (e.g. base/lib/...)
+BUNDLE_TOP_LEVEL = ('manifest', 'dex', 'lib', 'assets', 'res', 'root')
+BUNDLE_BASE_MODULE = 'base'
+
+
+class APKAnalysisError(Exception):
+    """Custom exception for APK analysis errors."""
+    pass
+
+
+class ZipEntry(NamedTuple):
+    """One central directory record."""
+    name: str
+    crc32: int
+    compressed_size: int
+    uncompressed_size: int
+    compression: int
+    local_header_offset: int
+
+
+def _find_eocd(data: mmap.mmap) -> int:
+    """Locate the end of central directory record, scanning back over the comment."""
+    size = len(data)
+    floor = max(0, size - EOCD_STRUCT.size - MAX_COMMENT_SIZE)
+    offset = data.rfind(EOCD_SIGNATURE, floor)
+    while offset >= 0:
+        # The signature may also appear inside the comment; the real record's
+        # comment length must reach exactly to the end of the file
+        if offset + EOCD_STRUCT.size <= size:
+            (comment_length,) = struct.unpack_from("<H", data, offset + EOCD_STRUCT.size - 2)
+            if offset + EOCD_STRUCT.size + comment_length == size:
+                return offset
+        offset = data.rfind(EOCD_SIGNATURE, floor, offset)
+    raise APKAnalysisError("End of central directory not found (not a ZIP archive?)")
+
+
+def _apply_zip64_extra(
+    extra: bytes,
+    uncompressed_size: int,
+    compressed_size: int,
+    local_header_offset: int
+):
+    """Replace 0xFFFFFFFF placeholders with values from the ZIP64 extra field."""
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, position)
+        position += 4
+        if header_id == ZIP64_EXTRA_ID:
+            values = extra[position:position + length]
+            cursor = 0
+            if uncompressed_size == 0xFFFFFFFF:
+                (uncompressed_size,) = struct.unpack_from("<Q", values, cursor)
+                cursor += 8
+            if compressed_size == 0xFFFFFFFF:
+                (compressed_size,) = struct.unpack_from("<Q", values, cursor)
+                cursor += 8
+            if local_header_offset == 0xFFFFFFFF:
+                (local_header_offset,) = struct.unpack_from("<Q", values, cursor)
+            break
+        position += length
+    return uncompressed_size, compressed_size, local_header_offset
+
+
+def locate_central_directory(data: Union[bytes, mmap.mmap]) -> Tuple[int, int, int]:
+    """
+    Find the central directory of an in-memory or mapped archive.
+
+    Args:
+        data: Archive bytes or a read-only mmap of the archive
+
+    Returns:
+        Tuple of (entry count, central directory size, central directory offset)
+
+    Raises:
+        APKAnalysisError: If the archive structure is invalid
+    """
+    eocd_offset = _find_eocd(data)
+    (_, _, _, _, total_entries, cd_size, cd_offset, _) = EOCD_STRUCT.unpack_from(data, eocd_offset)
+
+    if total_entries == 0xFFFF or cd_offset == 0xFFFFFFFF or cd_size == 0xFFFFFFFF:
+        locator_offset = eocd_offset - ZIP64_LOCATOR_STRUCT.size
+        if locator_offset < 0 or data[locator_offset:locator_offset + 4] != ZIP64_LOCATOR_SIGNATURE:
+            raise APKAnalysisError("ZIP64 end of central directory locator not found")
+        (_, _, zip64_offset, _) = ZIP64_LOCATOR_STRUCT.unpack_from(data, locator_offset)
+        if data[zip64_offset:zip64_offset + 4] != ZIP64_EOCD_SIGNATURE:
+            raise APKAnalysisError("ZIP64 end of central directory record not found")
+        record = ZIP64_EOCD_STRUCT.unpack_from(data, zip64_offset)
+        total_entries, cd_size, cd_offset = record[7], record[8], record[9]
+
+    if cd_offset + cd_size > len(data):
+        raise APKAnalysisError("Central directory extends past end of file")
+
+    return total_entries, cd_size, cd_offset
+
+
+def parse_central_directory(data: Union[bytes, mmap.mmap]) -> List[ZipEntry]:
+    """
+    Parse the ZIP central directory from an in-memory or mapped archive.
+
+    Args:
+        data: Archive bytes or a read-only mmap of the archive
+
+    Returns:
+        Entries in central directory order
+
+    Raises:
+        APKAnalysisError: If the archive structure is invalid
+    """
+    total_entries, _, cd_offset = locate_central_directory(data)
+
+    entries = []
+    position = cd_offset
+    for _ in range(total_entries):
+        if data[position:position + 4] != CENTRAL_SIGNATURE:
+            raise APKAnalysisError(f"Corrupt central directory entry at offset {position}")
+        (
+            _, _, _, flags, compression, _, _, crc32,
+            compressed_size, uncompressed_size,
+            name_length, extra_length, comment_length,
+            _, _, _, local_header_offset,
+        ) = CENTRAL_STRUCT.unpack_from(data, position)
+
+        name_start = position + CENTRAL_STRUCT.size
+        raw_name = bytes(data[name_start:name_start + name_length])
+        # Bit 11: filename is UTF-8; otherwise CP437 per the ZIP spec
+        name = raw_name.decode('utf-8' if flags & 0x800 else 'cp437')
+
+        if 0xFFFFFFFF in (compressed_size, uncompressed_size, local_header_offset):
+            extra_start = name_start + name_length
+            extra = bytes(data[extra_start:extra_start + extra_length])
+            uncompressed_size, compressed_size, local_header_offset = _apply_zip64_extra(
+                extra, uncompressed_size, compressed_size, local_header_offset
+            )
+
+        entries.append(ZipEntry(
+            name=name,
+            crc32=crc32,
+            compressed_size=compressed_size,
+            uncompressed_size=uncompressed_size,
+            compression=compression,
+            local_header_offset=local_header_offset,
+        ))
+        position = name_start + name_length + extra_length + comment_length
+
+    return entries
+
+
+def read_central_directory(apk_path: Union[str, Path]) -> List[ZipEntry]:
+    """
+    Memory-map an archive and parse its central directory.
+
+    Only the pages holding the central directory are touched, so even large
+    APKs are analyzed without reading their payload.
+
+    Args:
+        apk_path: Path to the APK or AAB
+
+    Returns:
+        Entries in central directory order
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        APKAnalysisError: If the file is not a valid ZIP archive
+    """
+    apk_path = Path(apk_path)
+    if not apk_path.exists():
+        raise FileNotFoundError(f"APK not found: {apk_path}")
+
+    with open(apk_path, 'rb') as f:
+        if apk_path.stat().st_size == 0:
+            raise APKAnalysisError(f"Empty file: {apk_path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                return parse_central_directory(data)
+            except struct.error as e:
+                raise APKAnalysisError(f"Truncated ZIP structure in {apk_path}: {e}")
+
+
+def bundle_modules(names: Iterable[str]) -> FrozenSet[str]:
+    """
+    Find the App Bundle modules in an archive.
+
+    A module is a top-level directory holding manifest/AndroidManifest.xml;
+    an APK has none.
+
+    Args:
+        names: Entry paths inside the archive
+
+    Returns:
+        Module names (e.g. {"base", "feature_maps"})
+    """
+    modules = set()
+    for name in names:
+        parts = name.split('/')
+        if len(parts) == 3 and parts[1:] == ['manifest', 'AndroidManifest.xml']:
+            modules.add(parts[0])
+    return frozenset(modules)
+
+
+def classify_entry(name: str, modules: Collection[str] = (BUNDLE_BASE_MODULE,)) -> str:
+    """
+    Map an archive entry to its size-breakdown group.
+
+    Args:
+        name: Entry path inside the archive
+        modules: App Bundle modules whose prefix is stripped (see
+            bundle_modules); empty for an APK
+
+    Returns:
+        Group label (e.g. "lib/arm64-v8a", "classes*.dex", "fonts")
+    """
+    parts = name.split('/')
+
+    # App Bundle module prefix: base/lib/..., feature/dex/...
+    if len(parts) > 2 and parts[0] in modules and parts[1] in BUNDLE_TOP_LEVEL:
+        parts = parts[1:]
+        if parts[0] == 'root':
+            parts = parts[1:]
+
+    lower = name.lower()
+    top = parts[0]
+
+    if top == 'lib' and len(parts) > 2:
+        return f"lib/{parts[1]}"
+    if (len(parts) == 1 or top == 'dex') and parts[-1].startswith('classes') and lower.endswith('.dex'):
+        return "classes*.dex"
+    if lower.endswith(FONT_EXTENSIONS):
+        return "fonts"
+    if top == 'assets' and len(parts) > 1 and parts[1] == 'flutter_assets':
+        if lower.endswith(IMAGE_EXTENSIONS):
+            return "assets/flutter_assets (images)"
+        return "assets/flutter_assets"
+    if top == 'assets':
+        return "assets"
+    if top == 'res':
+        return "res"
+    if top == 'META-INF':
+        return "META-INF"
+    if len(parts) == 1 and parts[0] == 'resources.arsc':
+        return "resources.arsc"
+    return "other"
+
+
+def summarize_entries(entries: List[ZipEntry]) -> List[Dict[str, Any]]:
+    """
+    Aggregate entries into groups, largest compressed size first.
+
+    Args:
+        entries: Central directory entries
+
+    Returns:
+        One dictionary per group with group, files, compressed_size and
+        uncompressed_size keys
+    """
+    modules = bundle_modules(entry.name for entry in entries)
+    groups: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        if entry.name.endswith('/'):
+            continue
+        label = classify_entry(entry.name, modules)
+        group = groups.setdefault(label, {
+            'group': label,
+            'files': 0,
+            'compressed_size': 0,
+            'uncompressed_size': 0,
+        })
+        group['files'] += 1
+        group['compressed_size'] += entry.compressed_size
+        group['uncompressed_size'] += entry.uncompressed_size
+
+    return sorted(groups.values(), key=lambda g: (-g['compressed_size'], g['group']))
+
+
+def analyze_apk(apk_path: Union[str, Path], top: int = 10) -> Dict[str, Any]:
+    """
+    Produce a size breakdown of an APK or AAB.
+
+    Args:
+        apk_path: Path to the archive
+        top: Number of largest entries to include
+
+    Returns:
+        Dictionary containing:
+            - path: Archive path
+            - file_size: Size on disk
+            - entries: Number of file entries
+            - compressed_size, uncompressed_size: Totals over all entries
+            - groups: Per-group breakdown (see summarize_entries)
+            - largest: The top entries by compressed size
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        APKAnalysisError: If the file is not a valid ZIP archive
+    """
+    apk_path = Path(apk_path)
+    entries = [entry for entry in read_central_directory(apk_path) if not entry.name.endswith('/')]
+    largest = sorted(entries, key=lambda e: e.compressed_size, reverse=True)[:top]
+    modules = bundle_modules(entry.name for entry in entries)
+
+    return {
+        'path': str(apk_path),
+        'file_size': apk_path.stat().st_size,
+        'entries': len(entries),
+        'compressed_size': sum(entry.compressed_size for entry in entries),
+        'uncompressed_size': sum(entry.uncompressed_size for entry in entries),
+        'groups': summarize_entries(entries),
+        'largest': [
+            {
+                'name': entry.name,
+                'group': classify_entry(entry.name, modules),
+                'compressed_size': entry.compressed_size,
+                'uncompressed_size': entry.uncompressed_size,
+            }
+            for entry in largest
+        ],
+    }
+
+
+def format_size(size: int) -> str:
+    """Human-readable byte count (binary units)."""
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.2f} GB"
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Render an analyze_apk() report as a text table.
+
+    Args:
+        report: Result of analyze_apk()
+
+    Returns:
+        Multi-line table
+    """
+    total = report['compressed_size'] or 1
+    lines = [
+        f"{'Group':<34} {'Files':>6} {'Compressed':>12} {'Uncompressed':>13} {'Share':>6}",
+        "-" * 75,
+    ]
+    for group in report['groups']:
+        lines.append(
+            f"{group['group']:<34} {group['files']:>6} "
+            f"{format_size(group['compressed_size']):>12} "
+            f"{format_size(group['uncompressed_size']):>13} "
+            f"{group['compressed_size'] * 100 / total:>5.1f}%"
+        )
+    lines.append("-" * 75)
+    lines.append(
+        f"{'Total':<34} {report['entries']:>6} "
+        f"{format_size(report['compressed_size']):>12} "
+        f"{format_size(report['uncompressed_size']):>13} {'100.0%':>6}"
+    )
+
+    if report['largest']:
+        lines.append("")
+        lines.append("Largest entries:")
+        for entry in report['largest']:
+            lines.append(f"  {format_size(entry['compressed_size']):>10}  {entry['name']}")
+
+    return "\n".join(lines)
+
+
+def diff_entries(old_entries: List[ZipEntry], new_entries: List[ZipEntry]) -> List[Dict[str, Any]]:
+    """
+    Compare two archives entry by entry.
+
+    An entry is unchanged when its CRC-32 and uncompressed size match, so no
+    payload has to be read or decompressed.
+
+    Args:
+        old_entries: Central directory of the previous archive
+        new_entries: Central directory of the new archive
+
+    Returns:
+        One dictionary per changed entry (status added/removed/changed) with
+        name, group, old/new compressed sizes and the compressed delta,
+        largest growth first
+    """
+    old_by_name = {entry.name: entry for entry in old_entries if not entry.name.endswith('/')}
+    new_by_name = {entry.name: entry for entry in new_entries if not entry.name.endswith('/')}
+
+    modules = bundle_modules(old_by_name.keys() | new_by_name.keys())
+
+    changes = []
+    for name in old_by_name.keys() | new_by_name.keys():
+        old = old_by_name.get(name)
+        new = new_by_name.get(name)
+        if old and new:
+            if old.crc32 == new.crc32 and old.uncompressed_size == new.uncompressed_size:
+                continue
+            status = 'changed'
+        else:
+            status = 'added' if new else 'removed'
+
+        old_size = old.compressed_size if old else 0
+        new_size = new.compressed_size if new else 0
+        changes.append({
+            'name': name,
+            'group': classify_entry(name, modules),
+            'status': status,
+            'old_size': old_size,
+            'new_size': new_size,
+            'delta': new_size - old_size,
+        })
+
+    return sorted(changes, key=lambda c: (-c['delta'], c['name']))
+
+
+def diff_apks(
+    old_path: Optional[Union[str, Path]],
+    new_path: Union[str, Path],
+    top: int = 10
+) -> Dict[str, Any]:
+    """
+    Size diff of a new archive against the previous one.
+
+    Args:
+        old_path: Previous archive (None when there is no baseline)
+        new_path: New archive
+        top: Number of top growers to include
+
+    Returns:
+        Dictionary containing:
+            - old_path, new_path: Compared files
+            - old_size, new_size, delta: File sizes on disk (download size)
+            - groups: Per-group old/new compressed size and delta
+            - changes: Counts of added, removed and changed entries
+            - top_growers: Largest positive deltas
+
+    Raises:
+        FileNotFoundError: If an archive doesn't exist
+        APKAnalysisError: If an archive is not a valid ZIP
+    """
+    new_path = Path(new_path)
+    new_entries = read_central_directory(new_path)
+    if old_path is not None:
+        old_path = Path(old_path)
+        old_entries = read_central_directory(old_path)
+        old_size = old_path.stat().st_size
+    else:
+        old_entries = []
+        old_size = 0
+    new_size = new_path.stat().st_size
+
+    old_groups = {g['group']: g['compressed_size'] for g in summarize_entries(old_entries)}
+    new_groups = {g['group']: g['compressed_size'] for g in summarize_entries(new_entries)}
+    groups = [
+        {
+            'group': label,
+            'old_size': old_groups.get(label, 0),
+            'new_size': new_groups.get(label, 0),
+            'delta': new_groups.get(label, 0) - old_groups.get(label, 0),
+        }
+        for label in old_groups.keys() | new_groups.keys()
+    ]
+    groups.sort(key=lambda g: (-g['delta'], g['group']))
+
+    changes = diff_entries(old_entries, new_entries)
+    counts = {'added': 0, 'removed': 0, 'changed': 0}
+    for change in changes:
+        counts[change['status']] += 1
+
+    return {
+        'old_path': str(old_path) if old_path is not None else None,
+        'new_path': str(new_path),
+        'old_size': old_size,
+        'new_size': new_size,
+        'delta': new_size - old_size,
+        'groups': groups,
+        'changes': counts,
+        'top_growers': [change for change in changes if change['delta'] > 0][:top],
+    }
+
+
+def parse_size(value: Union[str, int]) -> int:
+    """
+    Parse a size such as 512KB, 1.5MB or 30000000 into bytes (binary units).
+
+    Args:
+        value: Size string or integer byte count
+
+    Returns:
+        Size in bytes
+
+    Raises:
+        APKAnalysisError: If the value cannot be parsed
+    """
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([A-Za-z]*)\s*", str(value))
+    if not match or match.group(2).upper() not in SIZE_UNITS:
+        raise APKAnalysisError(f"Invalid size: {value!r} (expected e.g. 512KB, 1.5MB)")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def load_budgets(budget_file: Optional[Union[str, Path]] = None, **overrides) -> Dict[str, Any]:
+    """
+    Load size budgets from a JSON file and apply command-line overrides.
+
+    The file format is:
+        {"total": "30MB", "total_growth": "500KB",
+         "groups": {"fonts": "1MB"}, "group_growth": {"lib/arm64-v8a": "200KB"}}
+
+    Args:
+        budget_file: Optional path to the JSON budget file
+        **overrides: total, total_growth, groups, group_growth values
+
+    Returns:
+        Budgets with every size converted to bytes
+
+    Raises:
+        APKAnalysisError: If the file or a size is invalid
+    """
+    raw: Dict[str, Any] = {}
+    if budget_file:
+        try:
+            raw = json.loads(Path(budget_file).read_text(encoding='utf-8'))
+        except (IOError, ValueError) as e:
+            raise APKAnalysisError(f"Failed to read budget file {budget_file}: {e}")
+
+    for key in ('groups', 'group_growth'):
+        merged = dict(raw.get(key) or {})
+        merged.update(overrides.get(key) or {})
+        raw[key] = merged
+    for key in ('total', 'total_growth'):
+        if overrides.get(key) is not None:
+            raw[key] = overrides[key]
+
+    budgets: Dict[str, Any] = {
+        'total': parse_size(raw['total']) if raw.get('total') is not None else None,
+        'total_growth': parse_size(raw['total_growth']) if raw.get('total_growth') is not None else None,
+        'groups': {group: parse_size(size) for group, size in raw['groups'].items()},
+        'group_growth': {group: parse_size(size) for group, size in raw['group_growth'].items()},
+    }
+    return budgets
+
+
+def check_budgets(diff: Dict[str, Any], budgets: Dict[str, Any]) -> List[str]:
+    """
+    Compare a diff_apks() report with size budgets.
+
+    Growth budgets only apply when the diff has a baseline. Without a previous
+    archive every entry counts as added, so total_growth and group_growth are
+    skipped rather than charged with the whole archive.
+
+    Args:
+        diff: Result of diff_apks()
+        budgets: Result of load_budgets()
+
+    Returns:
+        Human-readable violations (empty when every budget holds)
+    """
+    violations = []
+    if budgets.get('total') is not None and diff['new_size'] > budgets['total']:
+        violations.append(
+            f"Total size {format_size(diff['new_size'])} exceeds budget {format_size(budgets['total'])}"
+        )
+    has_baseline = diff.get('old_path') is not None
+    if (has_baseline and budgets.get('total_growth') is not None
+            and diff['delta'] > budgets['total_growth']):
+        violations.append(
+            f"Total growth {format_size(diff['delta'])} exceeds budget {format_size(budgets['total_growth'])}"
+        )
+
+    groups = {g['group']: g for g in diff['groups']}
+    for label, limit in sorted(budgets.get('groups', {}).items()):
+        size = groups.get(label, {}).get('new_size', 0)
+        if size > limit:
+            violations.append(f"Group {label} size {format_size(size)} exceeds budget {format_size(limit)}")
+    for label, limit in sorted(budgets.get('group_growth', {}).items() if has_baseline else ()):
+        delta = groups.get(label, {}).get('delta', 0)
+        if delta > limit:
+            violations.append(f"Group {label} growth {format_size(delta)} exceeds budget {format_size(limit)}")
+
+    return violations
+
+
+def format_diff(diff: Dict[str, Any]) -> str:
+    """
+    Render a diff_apks() report as text.
+
+    Args:
+        diff: Result of diff_apks()
+
+    Returns:
+        Multi-line summary with group deltas and top growers
+    """
+    lines = [
+        f"Previous: {diff['old_path'] or '(none; growth budgets n/a)'}",
+        f"New:      {diff['new_path']}",
+        f"Size:     {format_size(diff['old_size'])} -> {format_size(diff['new_size'])} "
+        f"({'+' if diff['delta'] >= 0 else '-'}{format_size(abs(diff['delta']))})",
+        f"Entries:  {diff['changes']['added']} added, {diff['changes']['removed']} removed, "
+        f"{diff['changes']['changed']} changed",
+        "",
+        f"{'Group':<34} {'Previous':>12} {'New':>12} {'Delta':>12}",
+        "-" * 73,
+    ]
+    for group in diff['groups']:
+        sign = '+' if group['delta'] >= 0 else '-'
+        lines.append(
+            f"{group['group']:<34} {format_size(group['old_size']):>12} "
+            f"{format_size(group['new_size']):>12} {sign + format_size(abs(group['delta'])):>12}"
+        )
+
+    if diff['top_growers']:
+        lines.append("")
+        lines.append("Top growers:")
+        for change in diff['top_growers']:
+            lines.append(f"  +{format_size(change['delta']):>10}  {change['name']} ({change['status']})")
+
+    return "\n".join(lines)
@@ -0,0 +1,752 @@
+#!/usr/bin/env python3
+"""
+APK Delta Patch Tool
+
+This script produces and applies ZIP-entry-aware binary patches between two
+APKs, so returning users can download a small patch instead of the full APK.
+
+How it works:
+1. Both archives are memory-mapped and their central directories parsed
+2. Every entry of the new APK whose name, CRC and bytes match the previous
+   APK becomes a single COPY instruction (no diffing at all)
+3. Only entries whose CRC changed (plus the signing block and central
+   directory) are block-matched against the previous entry of the same name;
+   that work runs on a process pool
+4. A changed deflated entry is diffed on its inflated content: a small
+   source change rewrites most of the compressed stream but little of the
+   plain bytes. This needs the zlib level that reproduces the entry's
+   compressed bytes exactly; when no level does (another deflater), the
+   compressed bytes are diffed as they are
+5. Applying the patch rebuilds the new APK byte-for-byte (re-deflating
+   inflated entries at the recorded level) and verifies its SHA-256, so
+   the APK signature stays valid
+
+Patch format:
+    MAGIC | u32 header length | header JSON | segments
+    segment = u32 length | LZMA-compressed instruction stream
+    instruction = b'C' u64 old_offset u64 length
+                | b'D' u64 length bytes
+                | b'Z' u64 old_offset u64 old_length u8 level u64 length ops
+    Z inflates old bytes [old_offset, +old_length), runs the nested C/D ops
+    against them and emits the result deflated at level
+
+Requirements:
+- Python 3.7+ (standard library only)
+
+Usage:
+    python apk_delta.py create <old_apk> <new_apk> -o <patch> [options]
+    python apk_delta.py apply <old_apk> <patch> -o <new_apk>
+    python apk_delta.py verify <old_apk> <patch> [--expected <new_apk>]
+"""
+
+import argparse
+import hashlib
+import json
+import lzma
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from apk_analyzer import (
+    APKAnalysisError,
+    locate_central_directory,
+    parse_central_directory
+)
+from artifact_staging import compute_digests
+
+
+MAGIC = b"APKDELTA1\n"
+LENGTH_STRUCT = struct.Struct("<I")
+COPY_STRUCT = struct.Struct("<QQ")
+DATA_STRUCT = struct.Struct("<Q")
+DEFLATE_STRUCT = struct.Struct("<QQBQ")
+
+# Header format; 2 added the inflate-and-diff (Z) instruction
+PATCH_FORMAT = 2
+
+# ZIP local file header: fixed size, and where the name/extra lengths sit
+LOCAL_HEADER_SIZE = 30
+LOCAL_LENGTHS = struct.Struct("<HH")
+LOCAL_LENGTHS_OFFSET = 26
+ZIP_DEFLATED = 8
+
+# zlib levels tried when looking for the one that produced an entry, most
+# likely first (6 is the zlib and java.util.zip default)
+DEFLATE_LEVELS = (6, 9, 1, 2, 3, 4, 5, 7, 8)
+
+# Plain bytes compressed before comparing, to reject a wrong level early
+DEFLATE_PROBE_SIZE = 64 * 1024
+
+PATCH_SUFFIX = ".apkpatch"
+
+# Block size used to index the previous entry; matches shorter than this are
+# emitted as literal data
+BLOCK_SIZE = 32
+
+# Segments smaller than this are diffed inline instead of on the process pool
+POOL_THRESHOLD = 64 * 1024
+
+LZMA_PRESET = 6
+
+
+class APKDeltaError(Exception):
+    """Custom exception for APK delta errors."""
+    pass
+
+
+def _encode_ops(ops: List[Tuple]) -> bytes:
+    """Serialize COPY/DATA instructions, merging adjacent copies."""
+    merged: List[Tuple] = []
+    for op in ops:
+        if (
+            merged and op[0] == 'C' and merged[-1][0] == 'C'
+            and merged[-1][1] + merged[-1][2] == op[1]
+        ):
+            merged[-1] = ('C', merged[-1][1], merged[-1][2] + op[2])
+        elif op[0] == 'D' and not op[1]:
+            continue
+        else:
+            merged.append(op)
+
+    stream = bytearray()
+    for op in merged:
+        if op[0] == 'C':
+            stream += b'C' + COPY_STRUCT.pack(op[1], op[2])
+        elif op[0] == 'Z':
+            nested = _encode_ops(op[4])
+            stream += b'Z' + DEFLATE_STRUCT.pack(op[1], op[2], op[3], len(nested)) + nested
+        else:
+            stream += b'D' + DATA_STRUCT.pack(len(op[1])) + op[1]
+    return bytes(stream)
+
+
+def _inflate(data: bytes) -> bytes:
+    """Inflate a raw deflate stream (a ZIP entry's data)."""
+    inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+    return inflater.decompress(data) + inflater.flush()
+
+
+def _deflate(data: bytes, level: int) -> bytes:
+    """Raw deflate stream of data at a zlib level."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def deflate_level(compressed: bytes, plain: bytes) -> Optional[int]:
+    """
+    zlib level that turns plain into exactly compressed, if any.
+
+    Args:
+        compressed: Raw deflate stream of a ZIP entry
+        plain: Its inflated content
+
+    Returns:
+        The level, or None if no level in DEFLATE_LEVELS reproduces it
+    """
+    for level in DEFLATE_LEVELS:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        probe = compressor.compress(plain[:DEFLATE_PROBE_SIZE])
+        if not compressed.startswith(probe):
+            continue
+        if probe + compressor.compress(plain[DEFLATE_PROBE_SIZE:]) + compressor.flush() == compressed:
+            return level
+    return None
+
+
+def diff_bytes(old: bytes, new: bytes, old_base: int = 0) -> List[Tuple]:
+    """
+    Express new as COPY ranges of old plus literal DATA.
+
+    Old is indexed in fixed blocks; new is scanned byte by byte for a block
+    hit, and each hit is extended forwards and backwards.
+
+    Args:
+        old: Previous bytes
+        new: New bytes
+        old_base: Offset added to COPY positions (position of old in its file)
+
+    Returns:
+        List of ('C', old_offset, length) and ('D', bytes) instructions
+    """
+    if len(old) < BLOCK_SIZE or len(new) < BLOCK_SIZE:
+        return [('D', bytes(new))]
+
+    index: Dict[bytes, int] = {}
+    for offset in range(0, len(old) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        index.setdefault(old[offset:offset + BLOCK_SIZE], offset)
+
+    ops: List[Tuple] = []
+    literal_start = 0
+    position = 0
+    limit = len(new) - BLOCK_SIZE
+    step = 4096
+
+    while position <= limit:
+        match = index.get(new[position:position + BLOCK_SIZE])
+        if match is None:
+            position += 1
+            continue
+
+        # Extend backwards into pending literal bytes
+        new_start, old_start = position, match
+        while new_start > literal_start and old_start > 0 and new[new_start - 1] == old[old_start - 1]:
+            new_start -= 1
+            old_start -= 1
+
+        # Extend forwards, a page at a time and then byte by byte
+        new_end, old_end = position + BLOCK_SIZE, match + BLOCK_SIZE
+        while (
+            new_end + step <= len(new) and old_end + step <= len(old)
+            and new[new_end:new_end + step] == old[old_end:old_end + step]
+        ):
+            new_end += step
+            old_end += step
+        while new_end < len(new) and old_end < len(old) and new[new_end] == old[old_end]:
+            new_end += 1
+            old_end += 1
+
+        ops.append(('D', bytes(new[literal_start:new_start])))
+        ops.append(('C', old_base + old_start, new_end - new_start))
+        literal_start = position = new_end
+
+    ops.append(('D', bytes(new[literal_start:])))
+    return ops
+
+
+def _read_range(path: str, start: int, end: int) -> bytes:
+    """Read bytes [start, end) of a file."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def _diff_segment(
+    old_path: Optional[str],
+    old_range: Optional[Tuple[int, int]],
+    new_path: str,
+    new_range: Tuple[int, int]
+) -> bytes:
+    """Process-pool worker: diff one segment and return its compressed stream."""
+    new = _read_range(new_path, *new_range)
+    if old_path is None or old_range is None:
+        ops = [('D', new)]
+    else:
+        ops = diff_bytes(_read_range(old_path, *old_range), new, old_base=old_range[0])
+    return lzma.compress(_encode_ops(ops), preset=LZMA_PRESET)
+
+
+def _diff_deflated_segment(
+    old_path: str,
+    old_range: Tuple[int, int],
+    old_data: Tuple[int, int],
+    new_path: str,
+    new_range: Tuple[int, int],
+    new_data: Tuple[int, int]
+) -> bytes:
+    """
+    Process-pool worker: diff one changed deflated entry on its inflated content.
+
+    The local header and anything after the data (data descriptor, signing
+    block) are diffed as bytes; the data itself becomes a Z instruction.
+    Falls back to _diff_segment() when the new data cannot be re-deflated
+    byte-for-byte or does not inflate.
+
+    Args:
+        old_range, new_range: Entry regions (local header to next entry)
+        old_data, new_data: Compressed data ranges within those regions
+    """
+    new = _read_range(new_path, *new_range)
+    old = _read_range(old_path, *old_range)
+    new_body = new[new_data[0] - new_range[0]:new_data[1] - new_range[0]]
+    old_body = old[old_data[0] - old_range[0]:old_data[1] - old_range[0]]
+    try:
+        new_plain = _inflate(new_body)
+        old_plain = _inflate(old_body)
+    except zlib.error:
+        return _diff_segment(old_path, old_range, new_path, new_range)
+    level = deflate_level(new_body, new_plain)
+    if level is None:
+        return _diff_segment(old_path, old_range, new_path, new_range)
+
+    ops = diff_bytes(old[:old_data[0] - old_range[0]], new[:new_data[0] - new_range[0]], old_base=old_range[0])
+    ops.append(('Z', old_data[0], old_data[1] - old_data[0], level, diff_bytes(old_plain, new_plain)))
+    ops.extend(diff_bytes(old[old_data[1] - old_range[0]:], new[new_data[1] - new_range[0]:],
+                          old_base=old_data[1]))
+    return lzma.compress(_encode_ops(ops), preset=LZMA_PRESET)
+
+
+def _data_range(data: mmap.mmap, entry: Any) -> Tuple[int, int]:
+    """Compressed data range of an entry, located through its local header."""
+    start = entry.local_header_offset + LOCAL_LENGTHS_OFFSET
+    name_length, extra_length = LOCAL_LENGTHS.unpack(data[start:start + LOCAL_LENGTHS.size])
+    data_start = entry.local_header_offset + LOCAL_HEADER_SIZE + name_length + extra_length
+    return data_start, data_start + entry.compressed_size
+
+
+def _entry_regions(data: mmap.mmap) -> Tuple[Dict[str, Dict[str, Any]], List[Tuple[str, int, int]], int]:
+    """
+    Split an archive into per-entry regions.
+
+    Each entry region runs from its local header to the next local header;
+    the last one runs to the central directory (so it also holds the APK
+    signing block).
+
+    Returns:
+        Tuple of (entries by name, ordered (name, start, end) regions,
+        central directory offset)
+    """
+    _, _, cd_offset = locate_central_directory(data)
+    entries = sorted(parse_central_directory(data), key=lambda entry: entry.local_header_offset)
+
+    regions = []
+    by_name = {}
+    for i, entry in enumerate(entries):
+        end = entries[i + 1].local_header_offset if i + 1 < len(entries) else cd_offset
+        regions.append((entry.name, entry.local_header_offset, end))
+        by_name[entry.name] = {'entry': entry, 'start': entry.local_header_offset, 'end': end}
+    return by_name, regions, cd_offset
+
+
+def _sha256(path: Path) -> str:
+    """SHA-256 of a file."""
+    return compute_digests(path, ["sha256"])["sha256"]
+
+
+def create_patch(
+    old_path: Union[str, Path],
+    new_path: Union[str, Path],
+    patch_path: Union[str, Path],
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Create a patch that turns old_path into new_path.
+
+    Args:
+        old_path: Previous APK
+        new_path: New APK
+        patch_path: Output patch file
+        max_workers: Process pool size (defaults to the CPU count)
+
+    Returns:
+        Dictionary containing:
+            - patch_path: Written patch
+            - patch_size, new_size: Sizes in bytes
+            - ratio: patch_size / new_size
+            - entries, entries_copied, entries_diffed: Entry counts
+            - seconds: Generation time
+
+    Raises:
+        FileNotFoundError: If an APK doesn't exist
+        APKDeltaError: If an APK cannot be parsed or the patch cannot be written
+    """
+    started = time.perf_counter()
+    old_path = Path(old_path)
+    new_path = Path(new_path)
+    patch_path = Path(patch_path)
+
+    for path in (old_path, new_path):
+        if not path.is_file():
+            raise FileNotFoundError(f"APK not found: {path}")
+        # mmap rejects empty files, and an empty file is no APK anyway
+        if path.stat().st_size == 0:
+            raise APKDeltaError(f"Cannot parse APK: empty file: {path}")
+
+    with open(old_path, 'rb') as old_file, open(new_path, 'rb') as new_file:
+        with mmap.mmap(old_file.fileno(), 0, access=mmap.ACCESS_READ) as old, \
+                mmap.mmap(new_file.fileno(), 0, access=mmap.ACCESS_READ) as new:
+            try:
+                old_entries, _, old_cd_offset = _entry_regions(old)
+                new_entries, new_regions, new_cd_offset = _entry_regions(new)
+                new_crc = {name: info['entry'].crc32 for name, info in new_entries.items()}
+            except APKAnalysisError as e:
+                raise APKDeltaError(f"Cannot parse APK: {e}")
+
+            # Each segment is a compressed stream, or a (worker, arguments,
+            # new bytes) job for the process pool
+            segments: List[Any] = []
+            copied = 0
+            diffed = 0
+
+            def job(worker, *arguments) -> Tuple[Any, Tuple, int]:
+                new_range = arguments[4] if worker is _diff_deflated_segment else arguments[3]
+                return worker, arguments, new_range[1] - new_range[0]
+
+            if new_regions and new_regions[0][1] > 0:
+                segments.append(job(_diff_segment, str(old_path), (0, old_cd_offset), str(new_path),
+                                    (0, new_regions[0][1])))
+
+            for name, start, end in new_regions:
+                previous = old_entries.get(name)
+                if previous is not None:
+                    # Unchanged entry: same CRC and identical raw bytes
+                    length = end - start
+                    if (
+                        previous['entry'].crc32 == new_crc[name]
+                        and previous['end'] - previous['start'] == length
+                        and old[previous['start']:previous['end']] == new[start:end]
+                    ):
+                        segments.append(lzma.compress(
+                            _encode_ops([('C', previous['start'], length)]), preset=LZMA_PRESET
+                        ))
+                        copied += 1
+                        continue
+                    entry = new_entries[name]['entry']
+                    if previous['entry'].compression == ZIP_DEFLATED and entry.compression == ZIP_DEFLATED:
+                        segments.append(job(
+                            _diff_deflated_segment,
+                            str(old_path), (previous['start'], previous['end']), _data_range(old, previous['entry']),
+                            str(new_path), (start, end), _data_range(new, entry)
+                        ))
+                    else:
+                        segments.append(job(_diff_segment, str(old_path), (previous['start'], previous['end']),
+                                            str(new_path), (start, end)))
+                else:
+                    segments.append(job(_diff_segment, None, None, str(new_path), (start, end)))
+                diffed += 1
+
+            # Central directory and end records, diffed against the old ones
+            segments.append(job(_diff_segment, str(old_path), (old_cd_offset, len(old)),
+                                str(new_path), (new_cd_offset, len(new))))
+            new_size = len(new)
+            entry_count = len(new_regions)
+
+    new_sha256 = _sha256(new_path)
+    old_sha256 = _sha256(old_path)
+
+    streams: List[Optional[bytes]] = [None] * len(segments)
+    pooled = []
+    for i, segment in enumerate(segments):
+        if isinstance(segment, bytes):
+            streams[i] = segment
+        elif segment[2] < POOL_THRESHOLD:
+            streams[i] = segment[0](*segment[1])
+        else:
+            pooled.append(i)
+
+    if pooled:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {i: executor.submit(segments[i][0], *segments[i][1]) for i in pooled}
+            for i, future in futures.items():
+                streams[i] = future.result()
+
+    header = json.dumps({
+        'format': PATCH_FORMAT,
+        'old_name': old_path.name,
+        'old_size': old_path.stat().st_size,
+        'old_sha256': old_sha256,
+        'new_name': new_path.name,
+        'new_size': new_size,
+        'new_sha256': new_sha256,
+        'segments': len(streams),
+    }, separators=(',', ':')).encode('utf-8')
+
+    temporary = patch_path.with_name(f".{patch_path.name}.tmp-{os.getpid()}")
+    try:
+        with open(temporary, 'wb') as f:
+            f.write(MAGIC)
+            f.write(LENGTH_STRUCT.pack(len(header)))
+            f.write(header)
+            for stream in streams:
+                f.write(LENGTH_STRUCT.pack(len(stream)))
+                f.write(stream)
+        os.replace(temporary, patch_path)
+    except IOError as e:
+        try:
+            temporary.unlink()
+        except FileNotFoundError:
+            pass
+        raise APKDeltaError(f"Failed to write patch: {e}")
+
+    patch_size = patch_path.stat().st_size
+    return {
+        'patch_path': str(patch_path),
+        'patch_size': patch_size,
+        'new_size': new_size,
+        'ratio': patch_size / new_size if new_size else 0.0,
+        'entries': entry_count,
+        'entries_copied': copied,
+        'entries_diffed': diffed,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def read_patch_header(patch_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Read the JSON header of a patch file.
+
+    Args:
+        patch_path: Patch file
+
+    Returns:
+        Header dictionary (old/new names, sizes and SHA-256 digests)
+
+    Raises:
+        APKDeltaError: If the file is not a patch
+    """
+    with open(patch_path, 'rb') as f:
+        return _read_header(f)
+
+
+def _read_header(f) -> Dict[str, Any]:
+    """Read and validate the magic and header from an open patch file."""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise APKDeltaError("Not an APK delta patch (bad magic)")
+    raw_length = f.read(LENGTH_STRUCT.size)
+    if len(raw_length) != LENGTH_STRUCT.size:
+        raise APKDeltaError("Truncated patch header")
+    (length,) = LENGTH_STRUCT.unpack(raw_length)
+    try:
+        header = json.loads(f.read(length).decode('utf-8'))
+    except ValueError as e:
+        raise APKDeltaError(f"Corrupt patch header: {e}")
+    if header.get('format', 1) > PATCH_FORMAT:
+        raise APKDeltaError(f"Patch format {header['format']} is newer than this tool supports ({PATCH_FORMAT})")
+    return header
+
+
+def _run_ops(stream: bytes, old: Union[bytes, mmap.mmap], sink, nested: bool = False) -> None:
+    """Execute an instruction stream against old, passing output to sink(bytes)."""
+    position = 0
+    while position < len(stream):
+        op = stream[position:position + 1]
+        position += 1
+        if op == b'C':
+            offset, count = COPY_STRUCT.unpack_from(stream, position)
+            position += COPY_STRUCT.size
+            if offset + count > len(old):
+                raise APKDeltaError("Patch copies past the end of the old APK")
+            sink(old[offset:offset + count])
+        elif op == b'D':
+            (count,) = DATA_STRUCT.unpack_from(stream, position)
+            position += DATA_STRUCT.size
+            sink(stream[position:position + count])
+            position += count
+        elif op == b'Z' and not nested:
+            offset, old_length, level, count = DEFLATE_STRUCT.unpack_from(stream, position)
+            position += DEFLATE_STRUCT.size
+            if offset + old_length > len(old):
+                raise APKDeltaError("Patch inflates past the end of the old APK")
+            try:
+                old_plain = _inflate(old[offset:offset + old_length])
+            except zlib.error as e:
+                raise APKDeltaError(f"Cannot inflate old entry at {offset}: {e}")
+            plain = bytearray()
+            _run_ops(stream[position:position + count], old_plain, plain.extend, nested=True)
+            position += count
+            sink(_deflate(bytes(plain), level))
+        else:
+            raise APKDeltaError(f"Unknown patch instruction: {op!r}")
+
+
+def _replay(old_path: Path, patch_path: Path, sink) -> Dict[str, Any]:
+    """Apply a patch, streaming the rebuilt bytes to sink(bytes)."""
+    if not old_path.is_file():
+        raise FileNotFoundError(f"APK not found: {old_path}")
+
+    with open(patch_path, 'rb') as patch:
+        header = _read_header(patch)
+
+        if old_path.stat().st_size != header['old_size'] or _sha256(old_path) != header['old_sha256']:
+            raise APKDeltaError(f"{old_path.name} is not the APK this patch was made from ({header['old_name']})")
+
+        # mmap rejects an empty file; its contents are simply no bytes
+        with open(old_path, 'rb') as old_file, \
+                (mmap.mmap(old_file.fileno(), 0, access=mmap.ACCESS_READ) if header['old_size']
+                 else nullcontext(b"")) as old:
+            for _ in range(header['segments']):
+                raw_length = patch.read(LENGTH_STRUCT.size)
+                if len(raw_length) != LENGTH_STRUCT.size:
+                    raise APKDeltaError("Truncated patch")
+                (length,) = LENGTH_STRUCT.unpack(raw_length)
+                try:
+                    stream = lzma.decompress(patch.read(length))
+                except lzma.LZMAError as e:
+                    raise APKDeltaError(f"Corrupt patch segment: {e}")
+                _run_ops(stream, old, sink)
+
+    return header
+
+
+def apply_patch(
+    old_path: Union[str, Path],
+    patch_path: Union[str, Path],
+    output_path: Union[str, Path]
+) -> Dict[str, Any]:
+    """
+    Rebuild the new APK from the previous one and a patch.
+
+    The output is written to a temporary file and only moved into place
+    once its size and SHA-256 match the patch header.
+
+    Args:
+        old_path: Previous APK (must match the patch's old_sha256)
+        patch_path: Patch file
+        output_path: Where to write the rebuilt APK
+
+    Returns:
+        Dictionary containing output_path, size and sha256
+
+    Raises:
+        FileNotFoundError: If an input doesn't exist
+        APKDeltaError: If the patch doesn't apply or verification fails
+    """
+    output_path = Path(output_path)
+    temporary = output_path.with_name(f".{output_path.name}.tmp-{os.getpid()}")
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(temporary, 'wb') as out:
+            def sink(chunk):
+                nonlocal size
+                hasher.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+            header = _replay(Path(old_path), Path(patch_path), sink)
+
+        if size != header['new_size'] or hasher.hexdigest() != header['new_sha256']:
+            raise APKDeltaError("Patched APK does not match the expected SHA-256")
+        os.replace(temporary, output_path)
+    finally:
+        if temporary.exists():
+            temporary.unlink()
+
+    return {
+        'output_path': str(output_path),
+        'size': size,
+        'sha256': header['new_sha256'],
+    }
+
+
+def verify_patch(
+    old_path: Union[str, Path],
+    patch_path: Union[str, Path],
+    expected_path: Optional[Union[str, Path]] = None
+) -> Dict[str, Any]:
+    """
+    Dry-run a patch and check the result without writing it.
+
+    Args:
+        old_path: Previous APK
+        patch_path: Patch file
+        expected_path: Optional new APK the result must equal
+
+    Returns:
+        Dictionary containing valid (bool), size, sha256 and reason
+
+    Raises:
+        FileNotFoundError: If an input doesn't exist
+        APKDeltaError: If the patch is malformed
+    """
+    hasher = hashlib.sha256()
+    size = 0
+
+    def sink(chunk):
+        nonlocal size
+        hasher.update(chunk)
+        size += len(chunk)
+
+    header = _replay(Path(old_path), Path(patch_path), sink)
+    digest = hasher.hexdigest()
+
+    reason = ""
+    if size != header['new_size'] or digest != header['new_sha256']:
+        reason = "rebuilt APK does not match the patch header"
+    elif expected_path is not None and _sha256(Path(expected_path)) != digest:
+        reason = f"rebuilt APK differs from {Path(expected_path).name}"
+
+    return {
+        'valid': not reason,
+        'size': size,
+        'sha256': digest,
+        'reason': reason,
+    }
+
+
+def main():
+    """Main entry point for the script"""
+    parser = argparse.ArgumentParser(
+        description="Create, apply and verify ZIP-entry-aware APK delta patches",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Create a patch between two versioned APKs
+  python apk_delta.py create app-portfolio-release-1.0.0+1.apk \\
+      app-portfolio-release-1.1.0+2.apk -o update.apkpatch
+
+  # Rebuild the new APK on the client side
+  python apk_delta.py apply app-portfolio-release-1.0.0+1.apk update.apkpatch -o new.apk
+
+  # Check a patch reproduces the published APK
+  python apk_delta.py verify app-portfolio-release-1.0.0+1.apk update.apkpatch \\
+      --expected app-portfolio-release-1.1.0+2.apk
+        """
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create", help="Create a patch")
+    create_parser.add_argument("old_apk", help="Previous APK")
+    create_parser.add_argument("new_apk", help="New APK")
+    create_parser.add_argument("-o", "--output", required=True, help="Patch file to write")
+    create_parser.add_argument("--jobs", type=int, help="Process pool size (default: CPU count)")
+    create_parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    apply_parser = subparsers.add_parser("apply", help="Apply a patch")
+    apply_parser.add_argument("old_apk", help="Previous APK")
+    apply_parser.add_argument("patch", help="Patch file")
+    apply_parser.add_argument("-o", "--output", required=True, help="Rebuilt APK to write")
+
+    verify_parser = subparsers.add_parser("verify", help="Verify a patch without writing output")
+    verify_parser.add_argument("old_apk", help="Previous APK")
+    verify_parser.add_argument("patch", help="Patch file")
+    verify_parser.add_argument("--expected", help="New APK the patch must reproduce")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "create":
+            result = create_patch(args.old_apk, args.new_apk, args.output, max_workers=args.jobs)
+            if args.json:
+                print(json.dumps(result, indent=2))
+            else:
+                print(f"✓ Patch created: {result['patch_path']}")
+                print(f"  Size: {result['patch_size'] / (1024*1024):.2f} MB "
+                      f"({result['ratio'] * 100:.1f}% of {result['new_size'] / (1024*1024):.2f} MB)")
+                print(f"  Entries: {result['entries_copied']} copied, {result['entries_diffed']} diffed")
+                print(f"  Time: {result['seconds']:.2f}s")
+        elif args.command == "apply":
+            result = apply_patch(args.old_apk, args.patch, args.output)
+            print(f"✓ Patched APK written: {result['output_path']}")
+            print(f"  SHA-256: {result['sha256']}")
+        else:
+            result = verify_patch(args.old_apk, args.patch, args.expected)
+            if not result['valid']:
+                print(f"✗ Patch verification failed: {result['reason']}", file=sys.stderr)
+                return 1
+            print(f"✓ Patch verified (SHA-256 {result['sha256']})")
+
+        return 0
+
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    except APKDeltaError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"UNEXPECTED ERROR: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
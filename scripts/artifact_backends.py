@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Artifact Publishing Backends
+
+One interface for every place release artifacts are published to, so a
+single run can fan out to all of them at once:
+
+- LocalBackend - a directory (e.g. an internal mirror's document root),
+                 staged zero-copy and skipped when unchanged
+- S3Backend    - any S3-compatible endpoint (AWS S3, MinIO, ...), requests
+                 signed with AWS Signature Version 4
+
+The GitHub Releases backends build on this module and live next to their
+engines: GitHubBackend in upload_to_github_releases.py, AsyncGitHubBackend
+in async_release_uploader.py.
+
+publish_all() runs every backend on its own thread and reports each one as
+it finishes, so a slow GitHub upload does not hold back a fast mirror.
+
+Requirements:
+- Python 3.7+
+- requests (S3 backend)
+
+Usage:
+    from artifact_backends import LocalBackend, S3Backend, publish_all
+
+    outcomes = publish_all([LocalBackend("/srv/downloads"), S3Backend(...)],
+                           [("dist/app-latest.apk", None)])
+"""
+
+import abc
+import hashlib
+import hmac
+import mimetypes
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qsl, quote, urlsplit
+
+import requests
+
+from artifact_staging import UP_TO_DATE, DigestCache, StagingError, compute_digests, stage_file
+from http_pool import HTTPPool
+from request_scheduler import backoff_delay
+
+
+SIGV4_ALGORITHM = "AWS4-HMAC-SHA256"
+
+# Body hash of requests without a body (HEAD, GET)
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+# Object metadata holding the artifact's SHA-256 (S3 ETags are MD5 or
+# multipart hashes, so they cannot be compared with our digests)
+S3_DIGEST_HEADER = "x-amz-meta-sha256"
+
+_XML_CODE = re.compile(r"<Code>([^<]*)</Code>")
+
+
+class BackendError(Exception):
+    """Custom exception for artifact backend errors."""
+    pass
+
+
+def sigv4_signature(
+    secret_key: str,
+    method: str,
+    path: str,
+    query: str,
+    headers: Dict[str, str],
+    payload_hash: str,
+    amz_date: str,
+    region: str,
+    service: str = "s3"
+) -> str:
+    """
+    AWS Signature Version 4 of one request.
+
+    Args:
+        secret_key: Secret access key
+        method: HTTP method
+        path: URI path as sent (already percent-encoded)
+        query: Raw query string
+        headers: Signed headers, lower-case names to values
+        payload_hash: Hex SHA-256 of the body (x-amz-content-sha256)
+        amz_date: Request time as YYYYMMDDTHHMMSSZ
+        region: Region of the endpoint, e.g. us-east-1
+        service: Service name
+
+    Returns:
+        Hex signature
+    """
+    names = sorted(headers)
+    canonical_query = "&".join(
+        f"{quote(key, safe='-_.~')}={quote(value, safe='-_.~')}"
+        for key, value in sorted(parse_qsl(query, keep_blank_values=True))
+    )
+    canonical_request = "\n".join([
+        method,
+        path or "/",
+        canonical_query,
+        "".join(f"{name}:{' '.join(str(headers[name]).split())}\n" for name in names),
+        ";".join(names),
+        payload_hash,
+    ])
+    scope = f"{amz_date[:8]}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join([
+        SIGV4_ALGORITHM, amz_date, scope, hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+    ])
+
+    key = ("AWS4" + secret_key).encode("utf-8")
+    for part in (amz_date[:8], region, service, "aws4_request"):
+        key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+    return hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def sign_request(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    payload_hash: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    session_token: Optional[str] = None,
+    now: Optional[datetime] = None
+) -> Dict[str, str]:
+    """
+    Headers for a SigV4-signed S3 request.
+
+    Every given header is signed, plus Host, X-Amz-Date,
+    X-Amz-Content-Sha256 and (with temporary credentials)
+    X-Amz-Security-Token.
+
+    Returns:
+        The given headers with the signing headers and Authorization added
+    """
+    parts = urlsplit(url)
+    amz_date = (now or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    signed = dict(headers)
+    signed["X-Amz-Date"] = amz_date
+    signed["X-Amz-Content-Sha256"] = payload_hash
+    if session_token:
+        signed["X-Amz-Security-Token"] = session_token
+
+    canonical = {name.lower(): value for name, value in signed.items()}
+    canonical["host"] = parts.netloc
+    signature = sigv4_signature(secret_key, method, parts.path, parts.query, canonical,
+                                payload_hash, amz_date, region)
+    signed["Authorization"] = (
+        f"{SIGV4_ALGORITHM} Credential={access_key}/{amz_date[:8]}/{region}/s3/aws4_request, "
+        f"SignedHeaders={';'.join(sorted(canonical))}, Signature={signature}"
+    )
+    return signed
+
+
+class ArtifactBackend(abc.ABC):
+    """
+    A place release artifacts are published to.
+
+    Subclasses implement publish() and describe(); stats() and close() are
+    optional.
+    """
+
+    name = "backend"
+
+    @abc.abstractmethod
+    def describe(self) -> str:
+        """Human-readable target, e.g. 'owner/repo (latest)'."""
+
+    @abc.abstractmethod
+    def publish(self, files: Sequence[Tuple[Path, str]], force: bool = False) -> List[Dict[str, Any]]:
+        """
+        Publish files, replacing earlier versions of the same names.
+
+        Args:
+            files: (path, name) pairs; paths exist and names are unique
+            force: Upload even when the target already holds identical bytes
+
+        Returns:
+            Per-file results, in input order, each containing asset_name,
+            size, uploaded (False if left unchanged) and url
+
+        Raises:
+            BackendError (or the backend's own error type): If publishing fails
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend-specific counters (requests made, ...)."""
+        return {}
+
+    def close(self) -> None:
+        """Release connections and other resources."""
+        pass
+
+
+class LocalBackend(ArtifactBackend):
+    """
+    A local directory, e.g. the document root of an internal mirror.
+
+    Files are staged zero-copy where possible (reflink, ...) and atomically
+    replaced; a file already holding the same bytes is left alone.
+    """
+
+    name = "local"
+
+    # Dotfile, so web servers configured to hide dotfiles do not list it
+    DIGEST_CACHE = ".staging-cache.json"
+
+    def __init__(self, directory: Union[str, Path], base_url: Optional[str] = None):
+        """
+        Args:
+            directory: Target directory (created if missing)
+            base_url: URL the directory is served at (default: file:// URLs)
+        """
+        self.directory = Path(directory)
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+    def describe(self) -> str:
+        return str(self.directory)
+
+    def url(self, name: str) -> str:
+        if self.base_url:
+            return f"{self.base_url}/{quote(name)}"
+        return (self.directory / name).resolve().as_uri()
+
+    def publish(self, files: Sequence[Tuple[Path, str]], force: bool = False) -> List[Dict[str, Any]]:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise BackendError(f"Cannot create {self.directory}: {e}")
+        cache = None if force else DigestCache(self.directory / self.DIGEST_CACHE)
+
+        results = []
+        for path, name in files:
+            try:
+                staged = stage_file(path, self.directory / name, digests=["sha256"], cache=cache)
+            except StagingError as e:
+                raise BackendError(str(e))
+            results.append({
+                'asset_name': name,
+                'size': staged['bytes'],
+                'sha256': staged['digests']['sha256'],
+                'uploaded': staged['strategy'] != UP_TO_DATE,
+                'strategy': staged['strategy'],
+                'url': self.url(name),
+            })
+
+        if cache is not None:
+            try:
+                cache.save()
+            except OSError:
+                # Only costs the next run its up-to-date fast path
+                pass
+        return results
+
+
+class S3Backend(ArtifactBackend):
+    """
+    A bucket on an S3-compatible endpoint (path-style addressing, as MinIO
+    uses by default).
+
+    Each object carries its SHA-256 in x-amz-meta-sha256; a HEAD request
+    finds objects that already hold the same bytes, which are not uploaded
+    again. Bodies are streamed from disk with a signed payload hash, and 5xx
+    responses and dropped connections are retried with backoff.
+    """
+
+    name = "s3"
+
+    DEFAULT_REGION = "us-east-1"
+    DEFAULT_UPLOAD_WORKERS = 4
+    UPLOAD_RETRIES = 4
+    RETRY_BASE_DELAY = 2.0
+    RETRY_MAX_DELAY = 60.0
+
+    def __init__(
+        self,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        endpoint: Optional[str] = None,
+        prefix: str = "",
+        region: Optional[str] = None,
+        session_token: Optional[str] = None,
+        public_url: Optional[str] = None,
+        http_pool: Optional[HTTPPool] = None,
+        max_workers: Optional[int] = None,
+        retries: Optional[int] = None
+    ):
+        """
+        Args:
+            bucket: Bucket name
+            access_key, secret_key, session_token: Credentials
+            endpoint: Endpoint URL (default: https://s3.<region>.amazonaws.com)
+            prefix: Key prefix, e.g. 'android/'
+            region: Signing region (default: DEFAULT_REGION)
+            public_url: URL objects are downloaded from, without the prefix
+                (default: <endpoint>/<bucket>)
+            http_pool: Connection pool (default: a new HTTPPool)
+            max_workers: Concurrent uploads (default: DEFAULT_UPLOAD_WORKERS)
+            retries: Retries per request on 5xx and connection errors
+        """
+        if not bucket or "/" in bucket:
+            raise BackendError(f"Invalid bucket name: {bucket!r}")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.session_token = session_token
+        self.region = region or self.DEFAULT_REGION
+        self.endpoint = (endpoint or f"https://s3.{self.region}.amazonaws.com").rstrip("/")
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.public_url = (public_url or f"{self.endpoint}/{bucket}").rstrip("/")
+        self.http_pool = http_pool or HTTPPool()
+        self.max_workers = max_workers
+        self.retries = self.UPLOAD_RETRIES if retries is None else max(0, retries)
+        self._retry_count = 0
+        self._lock = threading.Lock()
+
+    def describe(self) -> str:
+        return f"s3://{self.bucket}/{self.prefix}"
+
+    def object_url(self, name: str) -> str:
+        return f"{self.endpoint}/{self.bucket}/{quote(self.prefix + name)}"
+
+    def url(self, name: str) -> str:
+        return f"{self.public_url}/{quote(self.prefix + name)}"
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[Path] = None,
+        payload_hash: str = EMPTY_SHA256
+    ) -> requests.Response:
+        """
+        Send a signed request, retrying 5xx responses and connection errors.
+
+        The file body is reopened for every attempt, and every attempt is
+        signed afresh.
+
+        Raises:
+            BackendError: If the last attempt fails to connect
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            signed = sign_request(method, url, headers or {}, payload_hash, self.access_key,
+                                  self.secret_key, self.region, self.session_token)
+            try:
+                if body is None:
+                    response = self.http_pool.request(method, url, headers=signed)
+                else:
+                    with open(body, "rb") as data:
+                        response = self.http_pool.request(method, url, data=data, headers=signed)
+                if response.status_code < 500 or attempt > self.retries:
+                    return response
+                error = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt > self.retries:
+                    raise BackendError(f"{method} {url} failed: {e}")
+                error = type(e).__name__
+            with self._lock:
+                self._retry_count += 1
+            delay = self.retry_delay(attempt)
+            print(f"  ⚠ s3 {method} {url.rsplit('/', 1)[-1]}: {error}, retrying in {delay:.1f} s")
+            time.sleep(delay)
+
+    def retry_delay(self, attempt: int) -> float:
+        """Backoff before retry number attempt (1-based), with jitter."""
+        return backoff_delay(attempt, self.RETRY_BASE_DELAY, self.RETRY_MAX_DELAY)
+
+    @staticmethod
+    def error_message(response: requests.Response) -> str:
+        """'<status> <S3 error code>' from an error response."""
+        match = _XML_CODE.search(response.text or "")
+        return f"{response.status_code} {match.group(1) if match else response.reason}"
+
+    def _put(self, path: Path, name: str, force: bool) -> Dict[str, Any]:
+        size = path.stat().st_size
+        digest = compute_digests(path, ["sha256"])['sha256']
+        url = self.object_url(name)
+        result = {'asset_name': name, 'size': size, 'sha256': digest, 'uploaded': False, 'url': self.url(name)}
+
+        if not force:
+            response = self.request("HEAD", url)
+            if response.status_code == 200:
+                if (response.headers.get(S3_DIGEST_HEADER) == digest
+                        and response.headers.get("Content-Length") == str(size)):
+                    return result
+            elif response.status_code != 404:
+                raise BackendError(f"HEAD s3://{self.bucket}/{self.prefix}{name} failed: "
+                                   f"{self.error_message(response)}")
+
+        headers = {
+            "Content-Type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "Content-Length": str(size),
+            S3_DIGEST_HEADER: digest,
+        }
+        response = self.request("PUT", url, headers=headers, body=path, payload_hash=digest)
+        if response.status_code != 200:
+            raise BackendError(f"PUT s3://{self.bucket}/{self.prefix}{name} failed: "
+                               f"{self.error_message(response)}")
+        result['uploaded'] = True
+        return result
+
+    def publish(self, files: Sequence[Tuple[Path, str]], force: bool = False) -> List[Dict[str, Any]]:
+        workers = min(len(files), self.max_workers or self.DEFAULT_UPLOAD_WORKERS) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda job: self._put(job[0], job[1], force), files))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.http_pool.stats()
+        with self._lock:
+            stats['retries'] = self._retry_count
+        return stats
+
+    def close(self) -> None:
+        self.http_pool.close()
+
+
+def publish_all(
+    backends: Sequence[ArtifactBackend],
+    files: Sequence[Tuple[str, Optional[str]]],
+    force: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Publish files to every backend concurrently (one thread per backend).
+
+    A backend that fails does not stop the others; each outcome is printed
+    as soon as its backend finishes.
+
+    Args:
+        backends: Backends to publish to
+        files: (file path, name or None) pairs; names default to file names
+        force: Upload even when a target already holds identical bytes
+
+    Returns:
+        One outcome per backend, in backend order, each containing backend
+        (name), target (describe()), results, seconds and error (the
+        exception raised, or None)
+
+    Raises:
+        FileNotFoundError: If a file doesn't exist (checked before any upload)
+        BackendError: If there are no files or names collide
+    """
+    jobs = []
+    for file_path, name in files:
+        path = Path(file_path)
+        if not path.is_file():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        jobs.append((path, name or path.name))
+    names = [name for _, name in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise BackendError(f"Duplicate asset names: {', '.join(duplicates)}")
+    if not jobs:
+        raise BackendError("No files to publish")
+
+    def run(backend: ArtifactBackend) -> Dict[str, Any]:
+        started = time.perf_counter()
+        outcome = {'backend': backend.name, 'target': backend.describe(), 'results': [], 'error': None}
+        try:
+            outcome['results'] = backend.publish(jobs, force=force)
+        except Exception as e:
+            outcome['error'] = e
+        outcome['seconds'] = time.perf_counter() - started
+        return outcome
+
+    outcomes: Dict[int, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=len(backends) or 1) as executor:
+        futures = {executor.submit(run, backend): index for index, backend in enumerate(backends)}
+        for future in as_completed(futures):
+            outcome = future.result()
+            outcomes[futures[future]] = outcome
+            if outcome['error'] is not None:
+                print(f"✗ {outcome['backend']} {outcome['target']}: {outcome['error']}", file=sys.stderr)
+            else:
+                uploaded = sum(1 for result in outcome['results'] if result['uploaded'])
+                print(f"✓ {outcome['backend']} {outcome['target']}: {uploaded} uploaded, "
+                      f"{len(outcome['results']) - uploaded} unchanged in {outcome['seconds']:.1f} s")
+    return [outcomes[index] for index in range(len(backends))]
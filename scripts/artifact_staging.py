@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Artifact Staging Engine
+
+This module places build artifacts at their release names with as little
+disk I/O as the filesystem allows. Strategies are tried in order:
+
+1. reflink         - FICLONE ioctl (copy-on-write clone, Btrfs/XFS/APFS-like)
+2. copy_file_range - in-kernel copy, no user-space buffers
+3. copy            - plain buffered copy (always works)
+
+hardlink (a new directory entry for the same inode) is available but not
+in the default chain: a link to a build output follows it when the build
+tool rewrites the file in place, so an earlier versioned APK would silently
+take on the new bytes. Use it only for sources that are replaced
+atomically (written elsewhere and renamed) or never modified, such as the
+blobs of artifact_store.py.
+
+Every staged file is written to a temporary name in the destination
+directory and moved into place with os.replace(), so readers never see a
+partially written artifact.
+
+When digests are requested the bytes are read exactly once: the plain copy
+hashes each chunk as it is written, and clone/link strategies (which move
+no data) hash the staged file in a single read. copy_file_range is skipped
+in that mode because it would force a second pass for hashing.
+
+With a DigestCache, a destination that already holds the source's bytes is
+left alone: the same inode, or the same size and mtime with a cached digest
+recorded for both files, counts as up to date and no data is read or
+written. Digests then come from the cache.
+
+Requirements:
+- Python 3.7+ (standard library only)
+
+Usage:
+    from artifact_staging import stage_file
+
+    result = stage_file("app-release.apk", "dist/app-latest.apk")
+    print(result['strategy'], result['seconds'])
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+# Linux _IOW(0x94, 9, int); see ioctl_ficlone(2)
+FICLONE = 0x40049409
+
+# Every strategy, and the default chain (no hardlink; see above)
+STRATEGIES = ("reflink", "copy_file_range", "hardlink", "copy")
+DEFAULT_STRATEGIES = ("reflink", "copy_file_range", "copy")
+
+# Strategies that stream bytes through user space and can hash them in-flight
+HASHING_STRATEGIES = ("copy",)
+
+# Strategies skipped when digests are requested (would need a second read)
+NON_HASHING_STRATEGIES = ("copy_file_range",)
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Reported as the strategy when the destination was already up to date
+UP_TO_DATE = "up-to-date"
+
+
+class StagingError(Exception):
+    """Custom exception for artifact staging errors."""
+    pass
+
+
+def _reflink(source: Path, destination: Path) -> None:
+    """Clone source into destination with the FICLONE ioctl."""
+    if fcntl is None:
+        raise OSError("FICLONE is not supported on this platform")
+
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, destination)
+
+
+def _copy_file_range(source: Path, destination: Path) -> None:
+    """Copy source into destination with os.copy_file_range()."""
+    if not hasattr(os, "copy_file_range"):
+        raise OSError("os.copy_file_range is not available")
+
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                raise OSError("copy_file_range made no progress")
+            remaining -= copied
+    shutil.copystat(source, destination)
+
+
+def _hardlink(source: Path, destination: Path) -> None:
+    """Link destination to the same inode as source."""
+    os.link(source, destination)
+
+
+def _copy(source: Path, destination: Path, hashers: Sequence = ()) -> None:
+    """Plain buffered copy preserving metadata, hashing chunks in-flight."""
+    buffer = bytearray(COPY_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        while True:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            chunk = view[:count]
+            for hasher in hashers:
+                hasher.update(chunk)
+            dst.write(chunk)
+    shutil.copystat(source, destination)
+
+
+def _hash_file(path: Path, hashers: Sequence) -> None:
+    """Feed every byte of path to each hasher in a single read pass."""
+    buffer = bytearray(COPY_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, 'rb') as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            for hasher in hashers:
+                hasher.update(view[:count])
+
+
+def compute_digests(path: Union[str, Path], digests: Sequence[str]) -> Dict[str, str]:
+    """
+    Compute several digests of a file in one read pass.
+
+    Args:
+        path: File to hash
+        digests: hashlib algorithm names (e.g. "sha256", "sha512")
+
+    Returns:
+        Mapping of algorithm name to hex digest
+    """
+    hashers = [hashlib.new(name) for name in digests]
+    _hash_file(Path(path), hashers)
+    return {name: hasher.hexdigest() for name, hasher in zip(digests, hashers)}
+
+
+def file_signature(path: Union[str, Path]) -> List[int]:
+    """Identity of a file's current contents: device, inode, size, mtime (ns)."""
+    info = os.stat(path)
+    return [info.st_dev, info.st_ino, info.st_size, info.st_mtime_ns]
+
+
+class DigestCache:
+    """
+    Digests of files keyed by path and file signature, persisted as JSON.
+
+    An entry is only valid while the file's device, inode, size and mtime
+    are unchanged, so edited or replaced files are never served stale
+    digests. The cache is safe to share between staging threads.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize the cache, loading existing entries if present.
+
+        Args:
+            path: JSON file backing the cache
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._entries = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self._entries = {}
+        if not isinstance(self._entries, dict):
+            self._entries = {}
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return os.path.abspath(path)
+
+    def get(self, path: Union[str, Path], digests: Sequence[str] = ()) -> Optional[Dict[str, str]]:
+        """
+        Cached digests of path, if its signature still matches.
+
+        Args:
+            path: File to look up
+            digests: Algorithms that must all be present
+
+        Returns:
+            Mapping of algorithm to hex digest, or None on a miss
+        """
+        try:
+            signature = file_signature(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(self._key(path))
+        if not entry or entry['signature'] != signature:
+            return None
+        if any(name not in entry['digests'] for name in digests):
+            return None
+        return dict(entry['digests'])
+
+    def put(self, path: Union[str, Path], digests: Dict[str, str]) -> None:
+        """
+        Record digests for path at its current signature.
+
+        Args:
+            path: File the digests were computed from
+            digests: Mapping of algorithm to hex digest
+        """
+        signature = file_signature(path)
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            known = entry['digests'] if entry and entry['signature'] == signature else {}
+            self._entries[key] = {'signature': signature, 'digests': {**known, **digests}}
+
+    def save(self) -> None:
+        """Write the cache atomically, dropping entries for changed or missing files."""
+        with self._lock:
+            entries = {}
+            for key, entry in self._entries.items():
+                try:
+                    if file_signature(key) == entry['signature']:
+                        entries[key] = entry
+                except OSError:
+                    continue
+            self._entries = entries
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_name(f".{self.path.name}.tmp-{os.getpid()}")
+            temporary.write_text(json.dumps(entries, indent=1) + "\n", encoding='utf-8')
+            os.replace(temporary, self.path)
+
+
+def is_up_to_date(
+    source: Union[str, Path],
+    destination: Union[str, Path],
+    cache: Optional[DigestCache] = None
+) -> bool:
+    """
+    Check whether destination already holds the bytes of source.
+
+    Both names sharing an inode is conclusive. Otherwise size and mtime must
+    match and the cache must hold the same SHA-256 for both files.
+
+    Args:
+        source: Source file
+        destination: Possibly stale staged file
+        cache: Digest cache consulted for the second check
+
+    Returns:
+        True if staging can be skipped
+    """
+    try:
+        src = file_signature(source)
+        dst = file_signature(destination)
+    except OSError:
+        return False
+
+    if src[:2] == dst[:2]:
+        return True
+    if src[2:] != dst[2:] or cache is None:
+        return False
+
+    src_digests = cache.get(source, ("sha256",))
+    dst_digests = cache.get(destination, ("sha256",))
+    return bool(src_digests and dst_digests and src_digests['sha256'] == dst_digests['sha256'])
+
+
+STRATEGY_FUNCTIONS: Dict[str, Callable[[Path, Path], None]] = {
+    "reflink": _reflink,
+    "copy_file_range": _copy_file_range,
+    "hardlink": _hardlink,
+    "copy": _copy,
+}
+
+
+def _temporary_path(destination: Path) -> Path:
+    """Temporary sibling path used while staging destination."""
+    return destination.with_name(f".{destination.name}.staging-{os.getpid()}")
+
+
+def _discard(path: Path) -> None:
+    """Remove a leftover temporary file, ignoring missing files."""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _record(
+    cache: DigestCache,
+    source: Path,
+    destination: Path,
+    digests: Optional[Dict[str, Any]]
+) -> None:
+    """Remember digests for both names; without new digests reuse the source's."""
+    known = digests or cache.get(source)
+    if known:
+        cache.put(source, known)
+        cache.put(destination, known)
+
+
+def stage_file(
+    source: Union[str, Path],
+    destination: Union[str, Path],
+    strategies: Sequence[str] = DEFAULT_STRATEGIES,
+    digests: Optional[Sequence[str]] = None,
+    cache: Optional[DigestCache] = None
+) -> Dict:
+    """
+    Stage source at destination using the cheapest available strategy.
+
+    Args:
+        source: Path to the existing artifact
+        destination: Path the artifact should appear at (replaced if present)
+        strategies: Strategy names to try, in order of preference
+        digests: hashlib algorithm names to compute in the same pass
+        cache: Digest cache enabling the up-to-date fast path; digests
+            computed here are recorded in it for source and destination
+
+    Returns:
+        Dictionary containing:
+            - strategy: Name of the strategy that succeeded, or "up-to-date"
+            - seconds: Wall-clock time spent staging (including hashing)
+            - bytes: Size of the staged file
+            - path: Destination path
+            - digests: Mapping of algorithm to hex digest (only if requested)
+
+    Raises:
+        StagingError: If a strategy name is unknown or every strategy failed
+    """
+    source = Path(source)
+    destination = Path(destination)
+
+    unknown = [name for name in strategies if name not in STRATEGY_FUNCTIONS]
+    if unknown:
+        raise StagingError(f"Unknown staging strategy: {', '.join(unknown)}")
+
+    if digests:
+        strategies = [name for name in strategies if name not in NON_HASHING_STRATEGIES]
+
+    if not strategies:
+        raise StagingError("At least one staging strategy is required")
+
+    try:
+        algorithms = list(digests or ())
+        for algorithm in algorithms:
+            hashlib.new(algorithm)
+    except ValueError as e:
+        raise StagingError(f"Unsupported digest: {e}")
+
+    started = time.perf_counter()
+
+    if cache is not None and is_up_to_date(source, destination, cache):
+        cached = cache.get(source, algorithms) or cache.get(destination, algorithms)
+        if cached is not None or not algorithms:
+            result = {
+                'strategy': UP_TO_DATE,
+                'seconds': time.perf_counter() - started,
+                'bytes': destination.stat().st_size,
+                'path': str(destination),
+            }
+            if algorithms:
+                result['digests'] = {algorithm: cached[algorithm] for algorithm in algorithms}
+            return result
+
+    temporary = _temporary_path(destination)
+    errors = []
+
+    for name in strategies:
+        _discard(temporary)
+        hashers: List = [hashlib.new(algorithm) for algorithm in algorithms]
+        try:
+            if name in HASHING_STRATEGIES:
+                STRATEGY_FUNCTIONS[name](source, temporary, hashers)
+            else:
+                STRATEGY_FUNCTIONS[name](source, temporary)
+                if hashers:
+                    _hash_file(temporary, hashers)
+            os.replace(temporary, destination)
+            # rename() is a no-op when both names already share an inode
+            _discard(temporary)
+        except OSError as e:
+            errors.append(f"{name}: {e}")
+            continue
+
+        result = {
+            'strategy': name,
+            'seconds': time.perf_counter() - started,
+            'bytes': destination.stat().st_size,
+            'path': str(destination),
+        }
+        if algorithms:
+            result['digests'] = {
+                algorithm: hasher.hexdigest()
+                for algorithm, hasher in zip(algorithms, hashers)
+            }
+        if cache is not None:
+            _record(cache, source, destination, result.get('digests'))
+        return result
+
+    _discard(temporary)
+    raise StagingError(f"Failed to stage {source} -> {destination} ({'; '.join(errors)})")
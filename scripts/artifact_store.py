@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Artifact Store
+
+This module keeps prepared build artifacts once per content in a store
+directory (by default ``<output-dir>/.store``) and makes release names such
+as the versioned and stable APK links into it:
+
+    dist/.store/<sha256>                      <- the only copy of the bytes
+    dist/app-portfolio-release-1.2.0+5.apk    <- hardlink (symlink fallback)
+    dist/app-portfolio-release-latest.apk     <- hardlink (symlink fallback)
+
+Identical rebuilds and re-runs hash the source, find the blob already
+present and only re-point the names, so they cost no extra disk and no copy.
+Blobs are made read-only because every name shares their bytes.
+
+A blob is referenced while another hardlink to it exists (link count > 1)
+or a symlink in a scanned directory points at it; gc() removes the rest.
+
+Requirements:
+- Python 3.7+ (standard library only)
+
+Usage:
+    from artifact_store import ArtifactStore
+
+    store = ArtifactStore("dist/.store")
+    blob = store.put("app-release.apk")
+    store.link(blob['sha256'], "dist/app-portfolio-release-latest.apk")
+    store.gc(["dist"])
+"""
+
+import os
+import re
+import stat
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from artifact_staging import (
+    DEFAULT_STRATEGIES,
+    UP_TO_DATE,
+    DigestCache,
+    StagingError,
+    compute_digests,
+    stage_file
+)
+
+
+STORE_DIRNAME = ".store"
+
+# Strategies that may fill the store; a hardlink would tie the blob to the
+# build output, which the next build overwrites in place
+STORE_STRATEGIES = tuple(name for name in DEFAULT_STRATEGIES if name != "hardlink")
+
+BLOB_NAME = re.compile(r"[0-9a-f]{64}")
+
+
+class ArtifactStoreError(Exception):
+    """Custom exception for artifact store errors."""
+    pass
+
+
+class ArtifactStore:
+    """Content-addressed blob store with hardlinked release names"""
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory (created on first put)
+        """
+        self.root = Path(root)
+
+    def blob_path(self, sha256: str) -> Path:
+        """Path of the blob holding content with the given SHA-256."""
+        return self.root / sha256
+
+    def put(
+        self,
+        source: Union[str, Path],
+        strategies: Sequence[str] = STORE_STRATEGIES,
+        digests: Sequence[str] = ("sha256",),
+        cache: Optional[DigestCache] = None
+    ) -> Dict[str, Any]:
+        """
+        Add a file to the store unless identical content is already present.
+
+        Args:
+            source: File to store
+            strategies: Staging strategies used to fill a missing blob
+            digests: hashlib algorithms to compute (sha256 is always included)
+            cache: Digest cache; a hit skips hashing the source
+
+        Returns:
+            Dictionary containing:
+                - sha256 (and any other requested digests): Hex digests
+                - path: Blob path
+                - size: Blob size in bytes
+                - stored: True if a new blob was written, False if deduplicated
+                - strategy: Staging strategy used (None when deduplicated)
+                - seconds: Wall-clock time including hashing
+
+        Raises:
+            ArtifactStoreError: If the blob cannot be written, or the copied
+                bytes do not match the digest it would be stored under
+        """
+        source = Path(source)
+        started = time.perf_counter()
+        algorithms = ["sha256"] + [name for name in digests if name != "sha256"]
+
+        try:
+            hashes = cache.get(source, algorithms) if cache is not None else None
+            if hashes is None:
+                hashes = compute_digests(source, algorithms)
+                if cache is not None:
+                    cache.put(source, hashes)
+            hashes = {algorithm: hashes[algorithm] for algorithm in algorithms}
+            blob = self.blob_path(hashes['sha256'])
+            strategy = None
+
+            if not blob.exists():
+                self.root.mkdir(parents=True, exist_ok=True)
+                incoming = self.root / f".incoming-{hashes['sha256']}-{os.getpid()}"
+                # The name came from hashing (or the cache) before the copy;
+                # check the copied bytes still match it
+                staged = stage_file(source, incoming, strategies, digests=["sha256"])
+                if staged['digests']['sha256'] != hashes['sha256']:
+                    incoming.unlink()
+                    raise ArtifactStoreError(
+                        f"Failed to store {source}: content changed while it was stored "
+                        f"(expected sha256 {hashes['sha256']}, copied {staged['digests']['sha256']})"
+                    )
+                strategy = staged['strategy']
+                os.chmod(incoming, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                os.replace(incoming, blob)
+        except (StagingError, OSError) as e:
+            raise ArtifactStoreError(f"Failed to store {source}: {e}")
+
+        return {
+            **hashes,
+            'path': str(blob),
+            'size': blob.stat().st_size,
+            'stored': strategy is not None,
+            'strategy': strategy,
+            'seconds': time.perf_counter() - started,
+        }
+
+    def link(self, sha256: str, destination: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Point destination at a blob, replacing whatever is there.
+
+        A hardlink is preferred so the name survives moving the store; a
+        relative symlink is used where hardlinks are unsupported.
+
+        Args:
+            sha256: Blob digest
+            destination: Name to create or replace
+
+        Returns:
+            Dictionary with strategy ('hardlink', 'symlink' or 'up-to-date'
+            when destination already is the blob), seconds and path
+
+        Raises:
+            ArtifactStoreError: If the blob is missing or no link can be made
+        """
+        blob = self.blob_path(sha256)
+        destination = Path(destination)
+        if not blob.is_file():
+            raise ArtifactStoreError(f"Blob not found in store: {sha256}")
+
+        started = time.perf_counter()
+        if destination.exists() and os.path.samefile(blob, destination):
+            return {
+                'strategy': UP_TO_DATE,
+                'seconds': time.perf_counter() - started,
+                'path': str(destination),
+            }
+
+        temporary = destination.with_name(f".{destination.name}.staging-{os.getpid()}")
+        errors = []
+
+        for strategy in ("hardlink", "symlink"):
+            try:
+                if temporary.is_symlink() or temporary.exists():
+                    temporary.unlink()
+                if strategy == "hardlink":
+                    os.link(blob, temporary)
+                else:
+                    os.symlink(os.path.relpath(blob, destination.parent), temporary)
+                os.replace(temporary, destination)
+                # rename() is a no-op when both names already share an inode
+                if temporary.exists():
+                    temporary.unlink()
+            except OSError as e:
+                errors.append(f"{strategy}: {e}")
+                continue
+            return {
+                'strategy': strategy,
+                'seconds': time.perf_counter() - started,
+                'path': str(destination),
+            }
+
+        raise ArtifactStoreError(f"Failed to link {destination} ({'; '.join(errors)})")
+
+    def blobs(self) -> List[Path]:
+        """All blobs currently in the store."""
+        if not self.root.is_dir():
+            return []
+        return sorted(p for p in self.root.iterdir() if BLOB_NAME.fullmatch(p.name))
+
+    def _symlink_targets(self, directories: Sequence[Union[str, Path]]) -> set:
+        """Resolved blob paths referenced by symlinks in directories."""
+        targets = set()
+        for directory in directories:
+            for path in Path(directory).rglob("*"):
+                if path.is_symlink():
+                    targets.add(path.resolve())
+        return targets
+
+    def gc(
+        self,
+        directories: Optional[Sequence[Union[str, Path]]] = None,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Remove blobs that no name references any more.
+
+        Args:
+            directories: Directories to scan for symlinks into the store
+                (defaults to the store's parent directory)
+            dry_run: Report what would be removed without deleting
+
+        Returns:
+            Dictionary containing:
+                - removed: Digests of unreferenced blobs
+                - kept: Number of referenced blobs
+                - reclaimed_bytes: Total size of removed blobs
+                - dry_run: Whether anything was actually deleted
+
+        Raises:
+            ArtifactStoreError: If a blob cannot be removed
+        """
+        if directories is None:
+            directories = [self.root.parent]
+        referenced = self._symlink_targets(directories)
+
+        removed = []
+        kept = 0
+        reclaimed = 0
+        for blob in self.blobs():
+            info = blob.stat()
+            if info.st_nlink > 1 or blob.resolve() in referenced:
+                kept += 1
+                continue
+            if not dry_run:
+                try:
+                    blob.unlink()
+                except OSError as e:
+                    raise ArtifactStoreError(f"Failed to remove blob {blob.name}: {e}")
+            removed.append(blob.name)
+            reclaimed += info.st_size
+
+        return {
+            'removed': removed,
+            'kept': kept,
+            'reclaimed_bytes': reclaimed,
+            'dry_run': dry_run,
+        }
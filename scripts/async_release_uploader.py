@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Asyncio Upload Engine for GitHub Releases
+
+An alternative to GitHubReleaseUploader's thread pool for publishing many
+assets at once (per-ABI APKs, AAB, IPA, symbol zips). PyGithub makes one
+blocking call after another; here every call is a coroutine on a single
+event loop:
+
+1. Every call goes through the shared HTTPPool (http_pool.py): pooled
+   keep-alive connections per host, TCP keepalive and (connect, read)
+   timeouts, driven from the loop on a thread pool as large as the
+   connection pool, so --pool-size, --connect-timeout, --read-timeout and
+   --no-keep-alive apply to both engines
+2. Every call is paced by a RequestScheduler (request_scheduler.py), as in
+   the threaded engine: the write token bucket, spacing once few calls
+   remain in the rate-limit window, and Retry-After pauses shared by all
+   calls
+3. Metadata calls are pipelined: the release lookup runs while local files
+   are hashed, and asset-list pages after the first are fetched together
+4. Uploads, deletes and renames run concurrently under one semaphore, so a
+   batch takes about as long as its slowest upload
+
+Uploads follow the same protocol as GitHubReleaseUploader (temporary name,
+then delete and rename; identical assets skipped; 5xx and dropped
+connections retried with backoff) and return the same per-file results.
+
+Requirements:
+- Python 3.7+
+- requests (installed with PyGithub), plus the helpers shared with
+  upload_to_github_releases.py
+
+Usage:
+    python upload_to_github_releases.py a.apk:a.apk b.aab:b.aab --engine asyncio
+
+    from async_release_uploader import run_upload
+
+    results, stats = run_upload(token, "owner/repo", [("dist/app.apk", "app.apk")])
+"""
+
+import asyncio
+import json
+import mimetypes
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import urlencode, urlsplit
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import RequestException, Timeout
+
+from artifact_backends import ArtifactBackend
+from artifact_staging import compute_digests
+from etag_cache import ETagCache, next_page_url
+from http_pool import HTTPPool
+from request_scheduler import RequestScheduler, header
+from upload_to_github_releases import (
+    GitHubReleaseError,
+    GitHubReleaseUploader,
+    asset_label,
+    format_rate,
+    remote_sha256,
+    transport_retry
+)
+
+
+DEFAULT_API_URL = "https://api.github.com"
+USER_AGENT = "portfolio-release-uploader"
+
+
+class AsyncAPIError(Exception):
+    """Custom exception for GitHub API error responses."""
+
+    def __init__(self, status: int, headers: Mapping[str, str], data: Any):
+        message = data.get('message') if isinstance(data, dict) else None
+        super().__init__(message or f"HTTP {status}")
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+# Transport failures worth retrying (as in GitHubReleaseUploader)
+TRANSPORT_ERRORS = (RequestsConnectionError, Timeout, ConnectionError)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """5xx responses, timeouts and dropped connections are transient."""
+    if isinstance(error, AsyncAPIError):
+        return error.status >= 500
+    return isinstance(error, TRANSPORT_ERRORS)
+
+
+class _AssetView:
+    """Attribute view of asset JSON for remote_sha256()."""
+
+    def __init__(self, asset: Dict[str, Any]):
+        self.digest = asset.get('digest')
+        self.label = asset.get('label')
+
+
+class AsyncReleaseUploader:
+    """
+    Publishes assets to a GitHub release from a single event loop.
+
+    Use as an async context manager so the executor (and a pool the
+    uploader created itself) is closed.
+    """
+
+    RELEASE_TAG = GitHubReleaseUploader.RELEASE_TAG
+    RELEASE_TITLE = GitHubReleaseUploader.RELEASE_TITLE
+    RELEASE_NOTES = GitHubReleaseUploader.RELEASE_NOTES
+    TEMPORARY_MARKER = GitHubReleaseUploader.TEMPORARY_MARKER
+    UPLOAD_RETRIES = GitHubReleaseUploader.UPLOAD_RETRIES
+    RETRY_BASE_DELAY = GitHubReleaseUploader.RETRY_BASE_DELAY
+    RETRY_MAX_DELAY = GitHubReleaseUploader.RETRY_MAX_DELAY
+
+    # Uploads, deletes and renames in flight at once
+    DEFAULT_MAX_CONCURRENT = 8
+
+    # Same stable URLs and backoff as the threaded uploader
+    stable_url = GitHubReleaseUploader.stable_url
+    retry_delay = GitHubReleaseUploader.retry_delay
+
+    def __init__(
+        self,
+        token: str,
+        repository: str,
+        base_url: Optional[str] = None,
+        release_tag: Optional[str] = None,
+        retries: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        etag_cache: Optional[Union[str, Path]] = None,
+        http_pool: Optional[HTTPPool] = None,
+        scheduler: Optional[RequestScheduler] = None
+    ):
+        """
+        Initialize the uploader (no request is made yet).
+
+        Args:
+            token: GitHub authentication token
+            repository: Repository in format "owner/repo"
+            base_url: API root (default: https://api.github.com)
+            release_tag: Release to publish to (default: RELEASE_TAG)
+            retries: Upload retries on transient errors (default: UPLOAD_RETRIES)
+            max_concurrent: Writes in flight at once (default: DEFAULT_MAX_CONCURRENT)
+            etag_cache: JSON file for conditional metadata requests (default: disabled)
+            http_pool: Shared connection pool (default: a new HTTPPool,
+                closed with the uploader)
+            scheduler: Request scheduler pacing every API call (default: a new one)
+
+        Raises:
+            GitHubReleaseError: If the token or repository is invalid
+        """
+        if not token:
+            raise GitHubReleaseError("GitHub token is required")
+        if not repository or "/" not in repository:
+            raise GitHubReleaseError(f"Invalid repository format: {repository}. Expected 'owner/repo'")
+
+        self.token = token
+        self.repository = repository
+        self.base_url = (base_url or DEFAULT_API_URL).rstrip("/")
+        self.release_tag = release_tag or self.RELEASE_TAG
+        self.retries = self.UPLOAD_RETRIES if retries is None else max(0, retries)
+        self.max_concurrent = max(1, max_concurrent or self.DEFAULT_MAX_CONCURRENT)
+        self.etag_cache = ETagCache(etag_cache) if etag_cache else None
+        self._owns_pool = http_pool is None
+        self.http_pool = http_pool if http_pool is not None else HTTPPool(retry=transport_retry())
+        # Blocking calls run here; no more threads than pooled connections
+        self._executor = ThreadPoolExecutor(max_workers=self.http_pool.pool_size,
+                                            thread_name_prefix="async-upload")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.scheduler = scheduler or RequestScheduler()
+        self._not_modified = 0
+
+    async def __aenter__(self) -> "AsyncReleaseUploader":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._executor.shutdown(wait=True)
+        if self._owns_pool:
+            self.http_pool.close()
+
+    def request_stats(self) -> Dict[str, Any]:
+        """
+        API requests made and time spent waiting on rate limits.
+
+        Returns:
+            Same keys as GitHubReleaseUploader.request_stats(), including
+            HTTPPool.stats()
+        """
+        stats = self.scheduler.stats()
+        stats['not_modified'] = self._not_modified
+        stats.update(self.http_pool.stats())
+        return stats
+
+    async def api(
+        self,
+        method: str,
+        url: str,
+        payload: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[Path] = None
+    ) -> Tuple[int, Mapping[str, str], Any]:
+        """
+        Call the API through the scheduler, waiting out rate limits.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL or path under base_url
+            payload: JSON request body
+            headers: Extra request headers
+            body: File to stream as the request body (uploads)
+
+        Returns:
+            Tuple of (status, response headers, decoded JSON or None)
+
+        Raises:
+            AsyncAPIError: For error responses once rate-limit retries are spent
+            requests.exceptions.RequestException: On connection errors and timeouts
+        """
+        if url.startswith("/"):
+            url = self.base_url + url
+        request_headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": USER_AGENT,
+        }
+        request_headers.update(headers or {})
+        data: Union[bytes, Path, None] = body
+        if payload is not None:
+            data = json.dumps(payload).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+
+        loop = asyncio.get_running_loop()
+
+        async def send() -> Tuple[int, Mapping[str, str], Any]:
+            status, response_headers, raw = await loop.run_in_executor(
+                self._executor, self._send, method, url, request_headers, data
+            )
+            self.scheduler.observe(response_headers)
+            try:
+                decoded = json.loads(raw) if raw else None
+            except ValueError:
+                decoded = {'message': raw.decode("utf-8", "replace")}
+            if status >= 400:
+                raise AsyncAPIError(status, response_headers, decoded)
+            return status, response_headers, decoded
+
+        return await self.scheduler.call_async(send, write=method != "GET")
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Union[bytes, Path, None]
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        """One blocking request on an executor thread; file bodies are streamed."""
+        if isinstance(data, Path):
+            with open(data, 'rb') as f:
+                response = self.http_pool.request(method, url, f, headers)
+        else:
+            response = self.http_pool.request(method, url, data, headers)
+        return response.status_code, response.headers, response.content
+
+    async def get_json(self, url: str) -> Tuple[Any, Optional[str]]:
+        """
+        GET through the ETag cache when enabled.
+
+        Returns:
+            Tuple of (JSON body, Link header or None)
+        """
+        entry = self.etag_cache.get(url) if self.etag_cache else None
+        headers = {"If-None-Match": entry['etag']} if entry else {}
+        status, response_headers, body = await self.api("GET", url, headers=headers)
+        if status == 304 and entry is not None:
+            self._not_modified += 1
+            return entry['body'], entry.get('link')
+        link = header(response_headers, "Link")
+        etag = header(response_headers, "ETag")
+        if self.etag_cache is not None and etag:
+            self.etag_cache.put(url, etag, body, link)
+        return body, link
+
+    async def get_or_create_release(self) -> Dict[str, Any]:
+        """
+        The release JSON, created if missing.
+
+        Raises:
+            GitHubReleaseError: If the release cannot be read or created
+        """
+        try:
+            release, _ = await self.get_json(f"/repos/{self.repository}/releases/tags/{self.release_tag}")
+            print(f"✓ Release '{self.release_tag}' found")
+            return release
+        except AsyncAPIError as e:
+            if e.status != 404:
+                raise GitHubReleaseError(f"Failed to get release: {e}")
+        except RequestException as e:
+            raise GitHubReleaseError(f"Failed to get release: {e}")
+
+        print(f"Creating new release: {self.release_tag}")
+        try:
+            _, _, release = await self.api("POST", f"/repos/{self.repository}/releases", {
+                'tag_name': self.release_tag,
+                'name': self.RELEASE_TITLE,
+                'body': self.RELEASE_NOTES,
+                'draft': False,
+                'prerelease': False,
+            })
+        except (AsyncAPIError, RequestException) as e:
+            raise GitHubReleaseError(f"Failed to create release: {e}")
+        print(f"✓ Release '{self.release_tag}' created")
+        return release
+
+    async def list_assets(self, release: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Every asset of a release.
+
+        The first page reveals the page count (Link rel="last"); the
+        remaining pages are requested together.
+        """
+        url = f"{release['url']}/assets?per_page=100"
+        assets, link = await self.get_json(url)
+        assets = list(assets)
+        last = self._last_page(link)
+        if last > 1:
+            pages = await asyncio.gather(*(self.get_json(f"{url}&page={page}") for page in range(2, last + 1)))
+            for body, _ in pages:
+                assets.extend(body)
+        elif next_page_url(link):
+            # No rel="last": follow the links one by one
+            next_url = next_page_url(link)
+            while next_url:
+                body, link = await self.get_json(next_url)
+                assets.extend(body)
+                next_url = next_page_url(link)
+        return assets
+
+    @staticmethod
+    def _last_page(link: Optional[str]) -> int:
+        for part in (link or "").split(","):
+            if 'rel="last"' in part:
+                query = urlsplit(part[part.find("<") + 1:part.find(">")]).query
+                for pair in query.split("&"):
+                    name, _, value = pair.partition("=")
+                    if name == "page" and value.isdigit():
+                        return int(value)
+        return 1
+
+    async def upload_files(
+        self,
+        files: Sequence[Tuple[str, Optional[str]]],
+        max_workers: Optional[int] = None,
+        force: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Upload several files to the release concurrently.
+
+        Args:
+            files: (file path, asset name or None) pairs
+            max_workers: Writes in flight at once (default: max_concurrent)
+            force: Upload even if remote assets are identical
+
+        Returns:
+            Per-file results as returned by GitHubReleaseUploader.upload_files()
+
+        Raises:
+            GitHubReleaseError: If an upload fails or asset names collide
+            FileNotFoundError: If a file doesn't exist
+        """
+        jobs = []
+        for file_path, asset_name in files:
+            file_path_obj = Path(file_path)
+            if not file_path_obj.exists():
+                raise FileNotFoundError(f"File not found: {file_path}")
+            if not file_path_obj.is_file():
+                raise GitHubReleaseError(f"Path is not a file: {file_path}")
+            jobs.append((file_path_obj, asset_name or file_path_obj.name))
+
+        names = [asset_name for _, asset_name in jobs]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise GitHubReleaseError(f"Duplicate asset names: {', '.join(duplicates)}")
+        if not jobs:
+            raise GitHubReleaseError("No files to upload")
+
+        print()
+        print("=" * 60)
+        print("GitHub Releases Upload - Stable URL Generator (asyncio)")
+        print("=" * 60)
+        for file_path_obj, asset_name in jobs:
+            print(f"  {asset_name} <- {file_path_obj} ({file_path_obj.stat().st_size / (1024*1024):.2f} MB)")
+        print()
+
+        print(f"[1/3] Looking up release '{self.release_tag}' while hashing {len(jobs)} file(s)...")
+        loop = asyncio.get_running_loop()
+        hashing = [loop.run_in_executor(None, compute_digests, path, ["sha256"]) for path, _ in jobs]
+        release, *digests = await asyncio.gather(self.get_or_create_release(), *hashing)
+        try:
+            index = {asset['name']: asset for asset in await self.list_assets(release)}
+        except (AsyncAPIError, RequestException) as e:
+            raise GitHubReleaseError(f"Failed to list assets: {e}")
+        if self.etag_cache is not None:
+            self.etag_cache.save()
+
+        workers = max(1, max_workers or self.max_concurrent)
+        self._slots = asyncio.Semaphore(workers)
+        print(f"[2/3] Uploading {len(jobs)} asset(s), up to {workers} at once...")
+        started = time.perf_counter()
+        tasks = [
+            asyncio.ensure_future(self._replace_asset(release, index, path, name, digest['sha256'], force))
+            for (path, name), digest in zip(jobs, digests)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        elapsed = time.perf_counter() - started
+
+        uploaded_bytes = sum(r['size'] for r in results if r['uploaded'])
+        if uploaded_bytes:
+            print(f"  Total: {uploaded_bytes / (1024*1024):.2f} MB in {elapsed:.1f} s "
+                  f"({format_rate(uploaded_bytes / elapsed if elapsed > 0 else uploaded_bytes)})")
+
+        print("[3/3] Generating stable download URLs...")
+        for result in results:
+            print(f"✓ Stable URL: {result['stable_url']}")
+        return list(results)
+
+    async def _replace_asset(
+        self,
+        release: Dict[str, Any],
+        index: Dict[str, Dict[str, Any]],
+        file_path: Path,
+        asset_name: str,
+        sha256: str,
+        force: bool
+    ) -> Dict[str, Any]:
+        """Upload one file under a temporary name and swap it into place."""
+        started = time.perf_counter()
+        size = file_path.stat().st_size
+        result = {
+            'file_path': str(file_path),
+            'asset_name': asset_name,
+            'size': size,
+            'uploaded': False,
+            'stable_url': self.stable_url(asset_name),
+        }
+
+        existing = index.get(asset_name)
+        if (not force and existing is not None and existing.get('size') == size
+                and remote_sha256(_AssetView(existing)) == sha256):
+            print(f"✓ Unchanged {asset_name}, upload skipped")
+            result['seconds'] = time.perf_counter() - started
+            return result
+
+        temporary_prefix = f"{asset_name}{self.TEMPORARY_MARKER}"
+        stale = [asset for name, asset in index.items() if name.startswith(temporary_prefix)]
+        await asyncio.gather(*(self._write("DELETE", asset['url'], quiet=True) for asset in stale))
+
+        label = asset_label(asset_name, sha256)
+        try:
+            asset, stats = await self._upload_stream(release, file_path, temporary_prefix, asset_name, label)
+        except (AsyncAPIError, RequestException) as e:
+            raise GitHubReleaseError(f"Failed to upload asset {asset_name}: {e}")
+
+        try:
+            if existing is not None:
+                await self._write("DELETE", existing['url'])
+        except (AsyncAPIError, RequestException) as e:
+            await self._write("DELETE", asset['url'], quiet=True)
+            raise GitHubReleaseError(f"Failed to replace asset {asset_name}: {e}")
+        try:
+            await self._write("PATCH", asset['url'], {'name': asset_name, 'label': label})
+        except (AsyncAPIError, RequestException) as e:
+            raise GitHubReleaseError(f"Uploaded {asset['name']} but could not rename it to {asset_name}: {e}")
+
+        result.update(uploaded=True, seconds=time.perf_counter() - started, attempts=stats['attempts'],
+                      upload_seconds=stats['upload_seconds'], bytes_per_second=stats['bytes_per_second'])
+        print(f"✓ Uploaded {asset_name} ({result['seconds']:.1f} s, {format_rate(stats['bytes_per_second'])})")
+        return result
+
+    async def _write(self, method: str, url: str, payload: Any = None, quiet: bool = False) -> Any:
+        """A delete or rename, holding a concurrency slot."""
+        async with self._slots:
+            try:
+                return (await self.api(method, url, payload))[2]
+            except (AsyncAPIError, RequestException):
+                if not quiet:
+                    raise
+
+    async def _upload_stream(
+        self,
+        release: Dict[str, Any],
+        file_path: Path,
+        temporary_prefix: str,
+        asset_name: str,
+        label: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Stream file_path to the release, retrying transient failures.
+
+        Returns:
+            Tuple of (uploaded asset JSON, statistics with attempts,
+            upload_seconds and bytes_per_second)
+        """
+        size = file_path.stat().st_size
+        content_type = mimetypes.guess_type(asset_name)[0] or "application/octet-stream"
+        upload_url = release['upload_url'].split("{")[0]
+        attempt = 0
+
+        while True:
+            attempt += 1
+            temporary_name = f"{temporary_prefix}{uuid.uuid4().hex[:8]}"
+            url = f"{upload_url}?{urlencode({'name': temporary_name, 'label': label})}"
+
+            async with self._slots:
+                print(f"  Uploading: {asset_name} (as {temporary_name})")
+                attempt_started = time.perf_counter()
+                try:
+                    _, _, asset = await self.api("POST", url, headers={"Content-Type": content_type}, body=file_path)
+                except (AsyncAPIError, RequestException) as e:
+                    error = e
+                else:
+                    upload_seconds = time.perf_counter() - attempt_started
+                    return asset, {
+                        'attempts': attempt,
+                        'upload_seconds': upload_seconds,
+                        'bytes_per_second': size / upload_seconds if upload_seconds > 0 else float(size),
+                    }
+
+            if attempt > self.retries or not is_retryable(error):
+                raise error
+            delay = self.retry_delay(attempt)
+            print(f"  Warning: Upload of {asset_name} failed ({error}); "
+                  f"retry {attempt}/{self.retries} in {delay:.1f} s")
+            await asyncio.sleep(delay)
+
+
+def run_upload(
+    token: str,
+    repository: str,
+    files: Sequence[Tuple[str, Optional[str]]],
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    **options: Any
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Upload files on a new event loop.
+
+    Args:
+        options: Further AsyncReleaseUploader arguments (base_url, retries,
+            http_pool, ...)
+
+    Returns:
+        Tuple of (per-file results, request statistics)
+
+    Raises:
+        GitHubReleaseError: If an upload fails
+        FileNotFoundError: If a file doesn't exist
+    """
+    async def upload() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        async with AsyncReleaseUploader(token, repository, **options) as uploader:
+            results = await uploader.upload_files(files, max_workers=max_workers, force=force)
+            return results, uploader.request_stats()
+
+    return asyncio.run(upload())
+
+
+class AsyncGitHubBackend(ArtifactBackend):
+    """GitHub Releases through the asyncio engine, as a publish_all() backend."""
+
+    name = "github"
+
+    def __init__(
+        self,
+        token: str,
+        repository: str,
+        max_workers: Optional[int] = None,
+        http_pool: Optional[HTTPPool] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        **options: Any
+    ):
+        """
+        Args:
+            http_pool: Connection pool shared by every publish (default: a
+                new HTTPPool, closed by close())
+            scheduler: Request scheduler shared by every publish (default: a new one)
+            options: Further AsyncReleaseUploader arguments (base_url, retries, ...)
+        """
+        self.token = token
+        self.repository = repository
+        self.max_workers = max_workers
+        self.http_pool = http_pool or HTTPPool(retry=transport_retry())
+        self.scheduler = scheduler or RequestScheduler()
+        self.options = options
+        self._not_modified = 0
+
+    def describe(self) -> str:
+        return f"{self.repository} ({self.options.get('release_tag') or AsyncReleaseUploader.RELEASE_TAG})"
+
+    def publish(self, files: Sequence[Tuple[Path, str]], force: bool = False) -> List[Dict[str, Any]]:
+        results, stats = run_upload(self.token, self.repository, [(str(path), name) for path, name in files],
+                                    max_workers=self.max_workers, force=force, http_pool=self.http_pool,
+                                    scheduler=self.scheduler, **self.options)
+        # Each publish runs its own event loop and uploader; the pool and
+        # scheduler keep their own running totals
+        self._not_modified += stats['not_modified']
+        return [dict(result, url=result['stable_url']) for result in results]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.scheduler.stats()
+        stats['not_modified'] = self._not_modified
+        stats.update(self.http_pool.stats())
+        return stats
+
+    def close(self) -> None:
+        self.http_pool.close()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Release Upload Benchmark
+
+Measures GitHubReleaseUploader against the local fake GitHub API
+(fake_github_releases.py), so upload changes can be compared without a
+token, network or rate-limit budget.
+
+Every combination of engine (threads: GitHubReleaseUploader; asyncio:
+AsyncReleaseUploader), asset size, asset count and worker count is run
+against a fresh server with the chosen latency, bandwidth, error rate and
+rate limits. For each trial the harness reports:
+
+- Wall time and aggregate throughput
+- API calls made by the client and received by the server
+- Upload retries, rate-limit rejections and time spent waiting on them
+- Peak concurrent uploads seen by the server, and the speedup over the
+  single-worker run of the same engine, size and count
+
+Requirements:
+- Python 3.7+
+- PyGithub library (as for upload_to_github_releases.py)
+
+Usage:
+    python benchmark_uploads.py --sizes 256K,4M --counts 1,8 --jobs 1,2,4,8
+    python benchmark_uploads.py --engines threads,asyncio --counts 12 --jobs 4,12
+    python benchmark_uploads.py --latency 0.1 --bandwidth 20M --error-rate 0.05 --json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from async_release_uploader import AsyncReleaseUploader
+from fake_github_releases import FakeGitHubServer
+from request_scheduler import RequestScheduler
+from upload_to_github_releases import GitHubReleaseError, GitHubReleaseUploader
+
+
+SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?)i?B?\s*$", re.IGNORECASE)
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+ENGINES = ("threads", "asyncio")
+
+# Backoff base for upload retries; the uploader's default would make
+# injected errors dominate the measurement
+DEFAULT_RETRY_BASE_DELAY = 0.1
+
+
+class BenchmarkError(Exception):
+    """Custom exception for benchmark errors."""
+    pass
+
+
+def parse_size(text: str) -> int:
+    """Byte count from '512', '256K', '4M', '1.5G' (binary units)."""
+    match = SIZE.match(text)
+    if not match:
+        raise ValueError(f"Invalid size: {text!r} (expected e.g. 512, 256K, 4M)")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def parse_list(text: str, parse=int) -> List[Any]:
+    """Comma-separated values, e.g. '1,2,4'."""
+    return [parse(item) for item in text.split(',') if item.strip()]
+
+
+def format_size(size: int) -> str:
+    for unit in ('G', 'M', 'K'):
+        if size >= SIZE_UNITS[unit] and size % SIZE_UNITS[unit] == 0:
+            return f"{size // SIZE_UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def make_assets(directory: Path, size: int, count: int) -> List[Path]:
+    """Write count files of size random bytes (incompressible, distinct)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = directory / f"asset-{format_size(size)}-{index}.bin"
+        if not path.exists() or path.stat().st_size != size:
+            with open(path, 'wb') as f:
+                remaining = size
+                while remaining > 0:
+                    chunk = min(remaining, 1024 * 1024)
+                    f.write(os.urandom(chunk))
+                    remaining -= chunk
+        paths.append(path)
+    return paths
+
+
+def run_trial(
+    paths: Sequence[Path],
+    jobs: int,
+    server_options: Dict[str, Any],
+    retry_base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+    scheduler_options: Optional[Dict[str, Any]] = None,
+    engine: str = "threads"
+) -> Dict[str, Any]:
+    """
+    Upload paths to a fresh fake server with jobs workers.
+
+    Args:
+        paths: Files to upload
+        jobs: Concurrent uploads (also the scheduler's concurrency limit)
+        server_options: Keyword arguments for FakeGitHubServer
+        retry_base_delay: Upload backoff base in seconds
+        scheduler_options: Extra keyword arguments for RequestScheduler
+            (e.g. write_burst, write_rate; threads engine only)
+        engine: 'threads' or 'asyncio'
+
+    Returns:
+        Dictionary containing seconds, bytes, api_requests,
+        server_requests, retries, rate_limited, wait_seconds,
+        injected_errors and peak_concurrent_uploads
+
+    Raises:
+        BenchmarkError: If an upload fails
+    """
+    files = [(str(path), path.name) for path in paths]
+    total_bytes = sum(path.stat().st_size for path in paths)
+
+    with FakeGitHubServer(**server_options) as server:
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output), redirect_stderr(output):
+                started = time.perf_counter()
+                if engine == "asyncio":
+                    results, api = asyncio.run(upload_async(files, jobs, server.url, retry_base_delay))
+                else:
+                    uploader = GitHubReleaseUploader(
+                        token="benchmark",
+                        repository="benchmark/releases",
+                        scheduler=RequestScheduler(max_concurrent=jobs, **(scheduler_options or {})),
+                        base_url=server.url
+                    )
+                    uploader.RETRY_BASE_DELAY = retry_base_delay
+                    results = uploader.upload_files(files, max_workers=jobs, force=True)
+                    api = uploader.request_stats()
+                seconds = time.perf_counter() - started
+        except GitHubReleaseError as e:
+            raise BenchmarkError(f"{e}\n{output.getvalue()}")
+        served = server.stats()
+
+    return {
+        'seconds': seconds,
+        'bytes': total_bytes,
+        'api_requests': api['requests'],
+        'server_requests': served['requests'],
+        'retries': sum(result.get('attempts', 1) - 1 for result in results),
+        'rate_limited': api['rate_limited'],
+        'wait_seconds': api['wait_seconds'],
+        'injected_errors': served['injected_errors'],
+        'peak_concurrent_uploads': served['peak_concurrent_uploads'],
+    }
+
+
+async def upload_async(files, jobs: int, base_url: str, retry_base_delay: float):
+    """Upload with AsyncReleaseUploader; returns (results, request statistics)."""
+    async with AsyncReleaseUploader("benchmark", "benchmark/releases", base_url=base_url,
+                                    max_concurrent=jobs) as uploader:
+        uploader.RETRY_BASE_DELAY = retry_base_delay
+        results = await uploader.upload_files(files, max_workers=jobs, force=True)
+        return results, uploader.request_stats()
+
+
+def run_benchmark(
+    sizes: Sequence[int],
+    counts: Sequence[int],
+    jobs: Sequence[int],
+    server_options: Optional[Dict[str, Any]] = None,
+    repeat: int = 1,
+    retry_base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+    scheduler_options: Optional[Dict[str, Any]] = None,
+    work_dir: Optional[Path] = None,
+    engines: Sequence[str] = ("threads",)
+) -> List[Dict[str, Any]]:
+    """
+    Run every engine x size x count x jobs combination.
+
+    Each combination is run repeat times and the run with the median wall
+    time is reported. Files are generated in work_dir (default: a
+    temporary directory).
+
+    Returns:
+        One row per combination: engine, size, count, jobs, the run_trial()
+        fields, bytes_per_second and speedup (against the fewest jobs of the
+        same engine, size and count)
+    """
+    server_options = server_options or {}
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="upload-benchmark-") as temporary:
+        directory = work_dir or Path(temporary)
+        for size in sizes:
+            for count in counts:
+                paths = make_assets(directory, size, count)
+                for engine in engines:
+                    baseline = None
+                    for workers in sorted(jobs):
+                        trials = sorted(
+                            (run_trial(paths, workers, server_options, retry_base_delay, scheduler_options, engine)
+                             for _ in range(max(1, repeat))),
+                            key=lambda trial: trial['seconds']
+                        )
+                        row = dict(engine=engine, size=size, count=count, jobs=workers, **trials[len(trials) // 2])
+                        if repeat > 1:
+                            row['seconds_stdev'] = statistics.stdev(trial['seconds'] for trial in trials)
+                        row['bytes_per_second'] = row['bytes'] / row['seconds'] if row['seconds'] > 0 else 0.0
+                        baseline = baseline or row['seconds']
+                        row['speedup'] = baseline / row['seconds'] if row['seconds'] > 0 else 0.0
+                        rows.append(row)
+    return rows
+
+
+def print_table(rows: Sequence[Dict[str, Any]]) -> None:
+    header = (f"{'engine':>7} {'size':>6} {'count':>5} {'jobs':>4} {'seconds':>8} {'MB/s':>8} {'speedup':>7} "
+              f"{'api':>5} {'retries':>7} {'limited':>7} {'waited':>7} {'peak':>4}")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['engine']:>7} {format_size(row['size']):>6} {row['count']:>5} {row['jobs']:>4} "
+              f"{row['seconds']:>8.2f} {row['bytes_per_second'] / (1024*1024):>8.2f} "
+              f"{row['speedup']:>6.2f}x {row['api_requests']:>5} {row['retries']:>7} "
+              f"{row['rate_limited']:>7} {row['wait_seconds']:>6.1f}s {row['peak_concurrent_uploads']:>4}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark release uploads against a local fake GitHub API",
+        epilog="Sizes take K/M/G suffixes (binary). Each trial starts a fresh server."
+    )
+    parser.add_argument(
+        "--engines",
+        default="threads",
+        help=f"Upload engines to compare: {', '.join(ENGINES)} (default: threads)"
+    )
+    parser.add_argument("--sizes", default="256K,4M", help="Asset sizes (default: 256K,4M)")
+    parser.add_argument("--counts", default="1,4", help="Assets per upload batch (default: 1,4)")
+    parser.add_argument("--jobs", default="1,2,4", help="Worker counts to compare (default: 1,2,4)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per combination; the median is kept")
+    parser.add_argument("--latency", type=float, default=0.02, help="Server latency in seconds (default: 0.02)")
+    parser.add_argument("--bandwidth", help="Upload bandwidth per connection, e.g. 20M (default: unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 502")
+    parser.add_argument(
+        "--error-routes",
+        default="upload",
+        help="Comma-separated routes --error-rate applies to (default: upload, the call the "
+             "uploader retries; use 'all' to fail metadata calls too)"
+    )
+    parser.add_argument(
+        "--rate-limit-every",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Refuse every Nth write with a secondary rate limit"
+    )
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds (default: 1)")
+    parser.add_argument(
+        "--retry-base-delay",
+        type=float,
+        default=DEFAULT_RETRY_BASE_DELAY,
+        help=f"Upload backoff base in seconds (default: {DEFAULT_RETRY_BASE_DELAY})"
+    )
+    parser.add_argument(
+        "--write-burst",
+        type=int,
+        help=f"Client write burst (default: {RequestScheduler.DEFAULT_WRITE_BURST}); "
+             f"raise with --write-rate to measure concurrency without write pacing"
+    )
+    parser.add_argument(
+        "--write-rate",
+        type=float,
+        help=f"Client writes per second (default: {RequestScheduler.DEFAULT_WRITE_RATE}); "
+             f"the asyncio engine has no write pacing and only honours Retry-After"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Seed for error injection (default: 1)")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = parse_list(args.sizes, parse_size)
+        counts = parse_list(args.counts)
+        jobs = parse_list(args.jobs)
+        bandwidth = parse_size(args.bandwidth) if args.bandwidth else None
+        engines = parse_list(args.engines, str.strip)
+        unknown = [engine for engine in engines if engine not in ENGINES]
+        if unknown:
+            raise ValueError(f"Unknown engine: {', '.join(unknown)}")
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    if not sizes or not counts or not jobs or min(counts + jobs) < 1:
+        print("ERROR: --sizes, --counts and --jobs need positive values", file=sys.stderr)
+        return 1
+
+    server_options = {
+        'latency': args.latency,
+        'bandwidth': bandwidth,
+        'error_rate': args.error_rate,
+        'error_routes': None if args.error_routes == 'all' else args.error_routes.split(','),
+        'rate_limit_every': args.rate_limit_every,
+        'retry_after': args.retry_after,
+        'seed': args.seed,
+    }
+    try:
+        rows = run_benchmark(
+            sizes, counts, jobs, server_options, args.repeat, args.retry_base_delay,
+            scheduler_options={'write_burst': args.write_burst, 'write_rate': args.write_rate},
+            engines=engines
+        )
+    except BenchmarkError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
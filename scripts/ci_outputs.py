@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Command-Line and GitHub Actions Helpers Shared by the Publishing Scripts
+
+upload_to_github_releases.py and hosting_publisher.py take the same
+'file:name' arguments and report their URLs the same way, as step outputs
+in $GITHUB_OUTPUT or as export lines outside Actions. The helpers live
+here so the offline hosting stager does not have to import the uploader
+(and with it PyGithub).
+
+Requirements:
+- Python 3.7+ (standard library only)
+
+Usage:
+    from ci_outputs import parse_file_spec, write_github_output
+
+    files = [parse_file_spec(spec) for spec in args.files]
+    ...
+    write_github_output({'stable_url': url})
+"""
+
+import os
+import shlex
+from typing import Any, Dict, Optional, Tuple
+
+
+def parse_file_spec(spec: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a 'file:name' argument.
+
+    An existing path is taken as-is (so paths containing ':' still work);
+    otherwise the text after the last ':' is the name.
+
+    Args:
+        spec: 'path' or 'path:name'
+
+    Returns:
+        Tuple of (file path, name or None)
+    """
+    if os.path.exists(spec) or ':' not in spec:
+        return spec, None
+    file_path, name = spec.rsplit(':', 1)
+    return file_path, name or None
+
+
+def write_github_output(outputs: Dict[str, Any]) -> None:
+    """
+    Write step outputs for GitHub Actions.
+
+    Appends name=value lines to $GITHUB_OUTPUT; outside Actions, prints
+    shell-quoted export lines (upper-cased names) instead.
+
+    Args:
+        outputs: Output names to values, in the order to write them
+    """
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, "a") as f:
+            for name, value in outputs.items():
+                f.write(f"{name}={value}\n")
+        print("✓ GitHub Actions output written")
+    else:
+        print("# Environment variable format:")
+        for name, value in outputs.items():
+            print(f"export {name.upper()}={shlex.quote(str(value))}")
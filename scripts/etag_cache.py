@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+On-Disk ETag Cache for Conditional API Requests
+
+GitHub answers a GET carrying 'If-None-Match: <etag>' with 304 Not
+Modified when the resource is unchanged. The reply has no body and does
+not count against the rate limit, so re-reading release metadata becomes
+nearly free, within a run and across runs that keep the cache file (e.g.
+with actions/cache).
+
+Each entry maps a request URL to the ETag, the JSON body and the Link
+header (for pagination) of the last 200 response. The server validates
+every use, so a stale entry costs one full response, never stale data.
+
+Requirements:
+- Python 3.7+ (standard library only)
+
+Usage:
+    from etag_cache import ETagCache
+
+    cache = ETagCache("~/.cache/github-releases/etags.json")
+    entry = cache.get(url)
+    headers = {"If-None-Match": entry['etag']} if entry else {}
+    ...
+    cache.put(url, etag, body, link)
+    cache.save()
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+
+# Link: <https://api.github.com/...&page=2>; rel="next", <...>; rel="last"
+_NEXT_LINK = re.compile(r'<([^>]+)>\s*;\s*rel="next"')
+
+
+def next_page_url(link: Optional[str]) -> Optional[str]:
+    """URL of the next page from a Link header (None on the last page)."""
+    if not link:
+        return None
+    match = _NEXT_LINK.search(link)
+    return match.group(1) if match else None
+
+
+class ETagCache:
+    """
+    Thread-safe URL -> (ETag, JSON body, Link) store backed by a JSON file.
+
+    Entries are loaded on first use; save() writes them back atomically,
+    keeping only the MAX_ENTRIES most recently stored.
+    """
+
+    MAX_ENTRIES = 256
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                entries = json.loads(self.path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                entries = {}
+            self._entries = {
+                url: entry for url, entry in entries.items()
+                if isinstance(entry, dict) and isinstance(entry.get('etag'), str) and 'body' in entry
+            } if isinstance(entries, dict) else {}
+        return self._entries
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached response for url.
+
+        Returns:
+            Dictionary with 'etag', 'body' and 'link' (may be None), or None
+        """
+        with self._lock:
+            return self._load().get(url)
+
+    def put(self, url: str, etag: str, body: Any, link: Optional[str] = None) -> None:
+        """Record the ETag, JSON body and Link header of a 200 response."""
+        with self._lock:
+            self._load()[url] = {'etag': etag, 'body': body, 'link': link, 'stored': time.time()}
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache if it changed; errors are ignored (it is only a cache)."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            newest = sorted(self._entries.items(), key=lambda item: item[1].get('stored', 0), reverse=True)
+            self._entries = dict(newest[:self.MAX_ENTRIES])
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary = self.path.with_name(f".{self.path.name}.tmp-{os.getpid()}")
+                temporary.write_text(json.dumps(self._entries, separators=(',', ':')), encoding='utf-8')
+                os.replace(temporary, self.path)
+                self._dirty = False
+            except (OSError, TypeError, ValueError):
+                pass
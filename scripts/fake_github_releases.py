@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+Local Stand-In for the GitHub Releases API
+
+A small HTTP server implementing the release and asset endpoints that
+PyGithub (and GitHubReleaseUploader) use, so uploads can be benchmarked
+and load-tested without touching github.com:
+
+    GET    /repos/{owner}/{repo}
+    GET    /repos/{owner}/{repo}/releases/tags/{tag}
+    POST   /repos/{owner}/{repo}/releases
+    GET    /repos/{owner}/{repo}/releases/{id}
+    GET    /repos/{owner}/{repo}/releases/{id}/assets   (paginated, ETag/304)
+    POST   /repos/{owner}/{repo}/releases/{id}/assets?name=&label=  (upload)
+    GET    /repos/{owner}/{repo}/releases/assets/{id}
+    PATCH  /repos/{owner}/{repo}/releases/assets/{id}
+    DELETE /repos/{owner}/{repo}/releases/assets/{id}
+
+State is kept in memory; repositories are created on first use and any
+token is accepted. Faults can be injected to exercise the client:
+
+- latency: fixed delay before every response
+- bandwidth: upload bodies are read no faster than this many bytes/s
+- error_rate: fraction of requests (optionally only some routes) answered
+  502 Bad Gateway
+- rate_limit_every: every Nth write is refused with a secondary rate limit
+  (403 + Retry-After)
+- rate_limit: primary budget per window, reported in X-RateLimit-* headers
+  and enforced with 403 once spent
+
+Requirements:
+- Python 3.7+ (standard library only)
+
+Usage:
+    python fake_github_releases.py --port 8080 --latency 0.05 --error-rate 0.1
+
+    from fake_github_releases import FakeGitHubServer
+
+    with FakeGitHubServer(latency=0.02) as server:
+        uploader = GitHubReleaseUploader("token", "owner/repo", base_url=server.url)
+        ...
+        print(server.stats())
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+REPO = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+
+# (method, path pattern, handler method name, route name for statistics)
+ROUTES = [
+    ("GET", REPO + r"$", "get_repo", "repo"),
+    ("GET", REPO + r"/releases/tags/(?P<tag>.+)$", "get_release_by_tag", "release"),
+    ("POST", REPO + r"/releases$", "create_release", "create_release"),
+    ("GET", REPO + r"/releases/(?P<release_id>\d+)$", "get_release", "release"),
+    ("GET", REPO + r"/releases/(?P<release_id>\d+)/assets$", "list_assets", "list_assets"),
+    ("POST", REPO + r"/releases/(?P<release_id>\d+)/assets$", "upload_asset", "upload"),
+    ("GET", REPO + r"/releases/assets/(?P<asset_id>\d+)$", "get_asset", "asset"),
+    ("PATCH", REPO + r"/releases/assets/(?P<asset_id>\d+)$", "update_asset", "update_asset"),
+    ("DELETE", REPO + r"/releases/assets/(?P<asset_id>\d+)$", "delete_asset", "delete_asset"),
+]
+
+WRITE_METHODS = ("POST", "PATCH", "DELETE")
+
+# Request bodies are read this many bytes at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class FakeAPIError(Exception):
+    """Custom exception for fake API error responses."""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def timestamp() -> str:
+    """Current UTC time in GitHub's ISO 8601 format."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """
+    In-memory GitHub Releases API with fault injection.
+
+    Listens on 127.0.0.1 (an ephemeral port by default); start() serves
+    requests from a background thread and stop() shuts it down. Usable as
+    a context manager.
+    """
+
+    daemon_threads = True
+
+    # Primary rate limit window, as on github.com
+    DEFAULT_RATE_LIMIT = 5000
+    RATE_LIMIT_WINDOW = 3600
+
+    # Largest page for list endpoints (GitHub's maximum)
+    MAX_PER_PAGE = 100
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        bandwidth: Optional[float] = None,
+        error_rate: float = 0.0,
+        error_routes: Optional[Sequence[str]] = None,
+        rate_limit_every: int = 0,
+        retry_after: int = 1,
+        rate_limit: Optional[int] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the server (not yet serving).
+
+        Args:
+            port: Port to listen on (default: any free port)
+            latency: Seconds added before every response
+            bandwidth: Upload bytes per second (default: unlimited)
+            error_rate: Fraction of requests answered 502
+            error_routes: Route names error_rate applies to, e.g. ['upload']
+                (default: all; see ROUTES)
+            rate_limit_every: Refuse every Nth write with a secondary limit (0: never)
+            retry_after: Retry-After seconds sent with secondary limits
+            rate_limit: Primary requests per window (default: DEFAULT_RATE_LIMIT)
+            seed: Seed for error injection, for repeatable runs
+        """
+        super().__init__(("127.0.0.1", port), FakeGitHubHandler)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_routes = set(error_routes) if error_routes else None
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit or self.DEFAULT_RATE_LIMIT
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.repos: Dict[str, Dict[str, Any]] = {}
+        self.releases: Dict[int, Dict[str, Any]] = {}
+        self.assets: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 1
+        self._thread: Optional[threading.Thread] = None
+        self._failures: List[Tuple[Optional[str], int]] = []
+
+        self._window_reset = int(time.time()) + self.RATE_LIMIT_WINDOW
+        self._remaining = self.rate_limit
+        self._writes = 0
+        self._requests: Counter = Counter()
+        self._not_modified = 0
+        self._injected_errors = 0
+        self._rate_limited = 0
+        self._bytes_received = 0
+        self._uploads_active = 0
+        self._peak_uploads = 0
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to PyGithub (e.g. http://127.0.0.1:54321)."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "FakeGitHubServer":
+        """Serve requests from a daemon thread."""
+        # A short poll interval keeps stop() quick
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={'poll_interval': 0.05}, name="fake-github", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "FakeGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients that time out hang up before the response is written
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def fail_next(self, status: int, route: Optional[str] = None, count: int = 1) -> None:
+        """
+        Answer the next count requests (to route, or any) with status.
+
+        Args:
+            status: HTTP status, e.g. 502; 403 and 429 are sent as
+                secondary rate limits with Retry-After
+            route: Route name such as 'upload' or 'delete_asset' (see ROUTES)
+            count: Requests to fail
+        """
+        with self.lock:
+            self._failures.extend([(route, status)] * count)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters since the server started.
+
+        Returns:
+            Dictionary containing:
+                - requests: Requests received, including failed ones
+                - by_route: Requests per route name
+                - not_modified: 304 replies to If-None-Match
+                - injected_errors: 5xx replies injected
+                - rate_limited: 403/429 rate-limit replies
+                - bytes_received: Upload bytes received
+                - peak_concurrent_uploads: Most uploads in progress at once
+        """
+        with self.lock:
+            return {
+                'requests': sum(self._requests.values()),
+                'by_route': dict(self._requests),
+                'not_modified': self._not_modified,
+                'injected_errors': self._injected_errors,
+                'rate_limited': self._rate_limited,
+                'bytes_received': self._bytes_received,
+                'peak_concurrent_uploads': self._peak_uploads,
+            }
+
+    def admit(self, method: str, route: str) -> Dict[str, str]:
+        """
+        Count a request and decide whether it is refused.
+
+        Returns:
+            X-RateLimit-* headers for the response
+
+        Raises:
+            FakeAPIError: If a fault is injected or a rate limit applies
+        """
+        with self.lock:
+            self._requests[route] += 1
+            now = time.time()
+            if now >= self._window_reset:
+                self._window_reset = int(now) + self.RATE_LIMIT_WINDOW
+                self._remaining = self.rate_limit
+            self._remaining = max(0, self._remaining - 1)
+            headers = {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(self._remaining),
+                "X-RateLimit-Reset": str(self._window_reset),
+                "X-RateLimit-Resource": "core",
+            }
+
+            status = None
+            for index, (failure_route, failure_status) in enumerate(self._failures):
+                if failure_route in (None, route):
+                    status = failure_status
+                    del self._failures[index]
+                    break
+
+            if method in WRITE_METHODS:
+                self._writes += 1
+                if status is None and self.rate_limit_every and self._writes % self.rate_limit_every == 0:
+                    status = 403
+            if status is None and self._remaining == 0:
+                self._rate_limited += 1
+                raise FakeAPIError(403, "API rate limit exceeded", headers)
+            if (status is None and self.error_rate
+                    and (self.error_routes is None or route in self.error_routes)
+                    and self.random.random() < self.error_rate):
+                status = 502
+
+            if status in (403, 429):
+                self._rate_limited += 1
+                raise FakeAPIError(status, "You have exceeded a secondary rate limit. Please wait a few "
+                                           "minutes before you try again.",
+                                   dict(headers, **{"Retry-After": str(self.retry_after)}))
+            if status is not None:
+                if status >= 500:
+                    self._injected_errors += 1
+                raise FakeAPIError(status, "Bad Gateway" if status == 502 else "Injected error", headers)
+            return headers
+
+    def not_modified(self) -> None:
+        """Count a 304 reply; like GitHub, it is refunded to the rate limit."""
+        with self.lock:
+            self._not_modified += 1
+            self._remaining = min(self.rate_limit, self._remaining + 1)
+
+    def upload_started(self) -> None:
+        with self.lock:
+            self._uploads_active += 1
+            self._peak_uploads = max(self._peak_uploads, self._uploads_active)
+
+    def upload_finished(self, size: int) -> None:
+        with self.lock:
+            self._uploads_active -= 1
+            self._bytes_received += size
+
+    def new_id(self) -> int:
+        """Next object id (caller holds the lock)."""
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def repo(self, owner: str, name: str) -> Dict[str, Any]:
+        """Repository record, created on first use (caller holds the lock)."""
+        full_name = f"{owner}/{name}"
+        if full_name not in self.repos:
+            self.repos[full_name] = {
+                'id': self.new_id(),
+                'name': name,
+                'full_name': full_name,
+                'owner': {'login': owner},
+                'private': False,
+                'url': f"{self.url}/repos/{full_name}",
+                'html_url': f"{self.url}/{full_name}",
+            }
+        return self.repos[full_name]
+
+    def release_json(self, release: Dict[str, Any]) -> Dict[str, Any]:
+        """Release as GitHub returns it, with its current assets (caller holds the lock)."""
+        body = {key: value for key, value in release.items() if not key.startswith('_')}
+        body['assets'] = [self.asset_json(self.assets[asset_id]) for asset_id in release['_assets']]
+        return body
+
+    @staticmethod
+    def asset_json(asset: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in asset.items() if not key.startswith('_')}
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Routes one request to the matching endpoint of FakeGitHubServer."""
+
+    protocol_version = "HTTP/1.1"
+    server: FakeGitHubServer
+
+    def do_GET(self):
+        self.dispatch()
+
+    def do_POST(self):
+        self.dispatch()
+
+    def do_PATCH(self):
+        self.dispatch()
+
+    def do_DELETE(self):
+        self.dispatch()
+
+    def log_message(self, format, *args):
+        # Keep benchmark and test output clean
+        pass
+
+    def dispatch(self) -> None:
+        parts = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.body_read = False
+
+        for method, pattern, handler, route in ROUTES:
+            match = re.match(pattern, parts.path)
+            if method == self.command and match:
+                break
+        else:
+            self.discard_body()
+            self.send_json(404, {'message': "Not Found"})
+            return
+
+        try:
+            headers = self.server.admit(self.command, route)
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            status, body, extra = getattr(self, handler)(**match.groupdict())
+            self.send_json(status, body, dict(headers, **extra))
+        except FakeAPIError as e:
+            self.discard_body()
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            self.send_json(e.status, {'message': str(e)}, e.headers)
+
+    def discard_body(self) -> None:
+        """Read an unread request body so the connection can be reused."""
+        if not self.body_read:
+            self.read_body(keep=False)
+
+    def read_body(self, keep: bool = True) -> bytes:
+        """Read the request body, throttled to the server's bandwidth."""
+        self.body_read = True
+        remaining = int(self.headers.get("Content-Length") or 0)
+        chunks = []
+        started = time.perf_counter()
+        received = 0
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            received += len(chunk)
+            if keep:
+                chunks.append(chunk)
+            if self.server.bandwidth:
+                ahead = received / self.server.bandwidth - (time.perf_counter() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+        return b"".join(chunks)
+
+    def send_json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        if data:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def conditional(self, body: Any) -> Tuple[int, Any, Dict[str, str]]:
+        """200 with an ETag, or 304 if If-None-Match matches it."""
+        etag = 'W/"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.not_modified()
+            return 304, None, {"ETag": etag}
+        return 200, body, {"ETag": etag}
+
+    def json_body(self) -> Dict[str, Any]:
+        try:
+            body = json.loads(self.read_body() or b"{}")
+        except ValueError:
+            raise FakeAPIError(400, "Problems parsing JSON")
+        if not isinstance(body, dict):
+            raise FakeAPIError(400, "Problems parsing JSON")
+        return body
+
+    def find_release(self, owner: str, repo: str, release_id: str) -> Dict[str, Any]:
+        full_name = self.server.repo(owner, repo)['full_name']
+        release = self.server.releases.get(int(release_id))
+        if release is None or release['_repo'] != full_name:
+            raise FakeAPIError(404, "Not Found")
+        return release
+
+    def find_asset(self, owner: str, repo: str, asset_id: str) -> Dict[str, Any]:
+        full_name = self.server.repo(owner, repo)['full_name']
+        asset = self.server.assets.get(int(asset_id))
+        if asset is None or self.server.releases[asset['_release']]['_repo'] != full_name:
+            raise FakeAPIError(404, "Not Found")
+        return asset
+
+    def get_repo(self, owner, repo):
+        with self.server.lock:
+            return 200, self.server.repo(owner, repo), {}
+
+    def get_release_by_tag(self, owner, repo, tag):
+        with self.server.lock:
+            full_name = self.server.repo(owner, repo)['full_name']
+            for release in self.server.releases.values():
+                if release['_repo'] == full_name and release['tag_name'] == tag:
+                    body = self.server.release_json(release)
+                    break
+            else:
+                raise FakeAPIError(404, "Not Found")
+        return self.conditional(body)
+
+    def get_release(self, owner, repo, release_id):
+        with self.server.lock:
+            body = self.server.release_json(self.find_release(owner, repo, release_id))
+        return self.conditional(body)
+
+    def create_release(self, owner, repo):
+        request = self.json_body()
+        tag = request.get('tag_name')
+        if not tag:
+            raise FakeAPIError(422, "Validation Failed: tag_name is missing")
+        with self.server.lock:
+            repo_url = self.server.repo(owner, repo)['url']
+            full_name = f"{owner}/{repo}"
+            if any(r['_repo'] == full_name and r['tag_name'] == tag for r in self.server.releases.values()):
+                raise FakeAPIError(422, "Validation Failed: tag_name already_exists")
+            release_id = self.server.new_id()
+            release = {
+                'id': release_id,
+                'tag_name': tag,
+                'name': request.get('name') or tag,
+                'body': request.get('body') or "",
+                'draft': bool(request.get('draft')),
+                'prerelease': bool(request.get('prerelease')),
+                'created_at': timestamp(),
+                'published_at': timestamp(),
+                'url': f"{repo_url}/releases/{release_id}",
+                'assets_url': f"{repo_url}/releases/{release_id}/assets",
+                'upload_url': f"{repo_url}/releases/{release_id}/assets{{?name,label}}",
+                'html_url': f"{self.server.url}/{full_name}/releases/tag/{tag}",
+                '_repo': full_name,
+                '_assets': [],
+            }
+            self.server.releases[release_id] = release
+            return 201, self.server.release_json(release), {}
+
+    def list_assets(self, owner, repo, release_id):
+        try:
+            per_page = min(self.server.MAX_PER_PAGE, max(1, int(self.query.get('per_page', 30))))
+            page = max(1, int(self.query.get('page', 1)))
+        except ValueError:
+            raise FakeAPIError(400, "Invalid pagination parameters")
+        with self.server.lock:
+            release = self.find_release(owner, repo, release_id)
+            asset_ids = release['_assets']
+            body = [self.server.asset_json(self.server.assets[asset_id])
+                    for asset_id in asset_ids[(page - 1) * per_page:page * per_page]]
+            last_page = max(1, -(-len(asset_ids) // per_page))
+            url = release['assets_url']
+
+        status, body, headers = self.conditional(body)
+        links = []
+        if page < last_page:
+            links.append(f'<{url}?{urlencode({"per_page": per_page, "page": page + 1})}>; rel="next"')
+            links.append(f'<{url}?{urlencode({"per_page": per_page, "page": last_page})}>; rel="last"')
+        if links:
+            headers["Link"] = ", ".join(links)
+        return status, body, headers
+
+    def upload_asset(self, owner, repo, release_id):
+        name = self.query.get('name')
+        if not name:
+            raise FakeAPIError(422, "Validation Failed: name is missing")
+        with self.server.lock:
+            self.find_release(owner, repo, release_id)
+
+        self.server.upload_started()
+        data = b""
+        try:
+            data = self.read_body()
+        finally:
+            self.server.upload_finished(len(data))
+
+        expected = int(self.headers.get("Content-Length") or 0)
+        if len(data) != expected:
+            raise FakeAPIError(400, "Request body shorter than Content-Length")
+
+        with self.server.lock:
+            release = self.find_release(owner, repo, release_id)
+            if any(self.server.assets[asset_id]['name'] == name for asset_id in release['_assets']):
+                raise FakeAPIError(422, "Validation Failed: already_exists")
+            asset_id = self.server.new_id()
+            asset = {
+                'id': asset_id,
+                'name': name,
+                'label': self.query.get('label') or "",
+                'state': "uploaded",
+                'content_type': self.headers.get("Content-Type") or "application/octet-stream",
+                'size': len(data),
+                'digest': "sha256:" + hashlib.sha256(data).hexdigest(),
+                'download_count': 0,
+                'created_at': timestamp(),
+                'updated_at': timestamp(),
+                'url': f"{self.server.repo(owner, repo)['url']}/releases/assets/{asset_id}",
+                'browser_download_url': f"{self.server.url}/{release['_repo']}/releases/download/"
+                                        f"{release['tag_name']}/{name}",
+                '_release': release['id'],
+            }
+            self.server.assets[asset_id] = asset
+            release['_assets'].append(asset_id)
+            return 201, self.server.asset_json(asset), {}
+
+    def get_asset(self, owner, repo, asset_id):
+        with self.server.lock:
+            return 200, self.server.asset_json(self.find_asset(owner, repo, asset_id)), {}
+
+    def update_asset(self, owner, repo, asset_id):
+        request = self.json_body()
+        with self.server.lock:
+            asset = self.find_asset(owner, repo, asset_id)
+            release = self.server.releases[asset['_release']]
+            name = request.get('name') or asset['name']
+            if name != asset['name'] and any(
+                self.server.assets[other]['name'] == name for other in release['_assets']
+            ):
+                raise FakeAPIError(422, "Validation Failed: already_exists")
+            asset['name'] = name
+            asset['browser_download_url'] = (
+                f"{self.server.url}/{release['_repo']}/releases/download/{release['tag_name']}/{name}"
+            )
+            if 'label' in request:
+                asset['label'] = request['label'] or ""
+            asset['updated_at'] = timestamp()
+            return 200, self.server.asset_json(asset), {}
+
+    def delete_asset(self, owner, repo, asset_id):
+        with self.server.lock:
+            asset = self.find_asset(owner, repo, asset_id)
+            self.server.releases[asset['_release']]['_assets'].remove(asset['id'])
+            del self.server.assets[asset['id']]
+        return 204, None, {}
+
+
+def main(argv=None):
+    """Run the fake API in the foreground."""
+    parser = argparse.ArgumentParser(
+        description="Serve a local stand-in for the GitHub Releases API",
+        epilog="Point the uploader at it with --api-url http://127.0.0.1:PORT"
+    )
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--bandwidth", type=float, help="Upload bytes per second (default: unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 502")
+    parser.add_argument(
+        "--error-routes",
+        help="Comma-separated routes --error-rate applies to, e.g. upload,update_asset (default: all)"
+    )
+    parser.add_argument(
+        "--rate-limit-every",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Refuse every Nth write with a secondary rate limit (403 + Retry-After)"
+    )
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds (default: 1)")
+    parser.add_argument("--rate-limit", type=int, help="Primary requests per hour (default: 5000)")
+    parser.add_argument("--seed", type=int, help="Seed for error injection")
+    args = parser.parse_args(argv)
+
+    server = FakeGitHubServer(
+        port=args.port,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        error_rate=args.error_rate,
+        error_routes=args.error_routes.split(',') if args.error_routes else None,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+        rate_limit=args.rate_limit,
+        seed=args.seed
+    )
+    print(f"✓ Fake GitHub API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Local Stand-In for an S3-Compatible Object Store
+
+A small MinIO-style HTTP server (path-style addressing) implementing the
+object calls S3Backend makes, so mirror publishing can be tested and
+benchmarked without a bucket:
+
+    PUT    /{bucket}/{key}
+    HEAD   /{bucket}/{key}
+    GET    /{bucket}/{key}
+    DELETE /{bucket}/{key}
+
+Like S3, every request must carry a valid AWS Signature Version 4 for the
+configured credentials, and a signed body hash must match the body.
+Objects are kept in memory with their x-amz-meta-* metadata. Faults can be
+injected to exercise the client:
+
+- latency: fixed delay before every response
+- bandwidth: upload bodies are read no faster than this many bytes/s
+- fail_next(): answer the next requests with an error status
+
+Requirements:
+- Python 3.7+ (standard library; the signature check reuses
+  artifact_backends.sigv4_signature)
+
+Usage:
+    python fake_s3.py --port 9000 --bucket releases
+
+    from fake_s3 import FakeS3Server
+
+    with FakeS3Server(buckets=["releases"]) as server:
+        backend = S3Backend("releases", server.access_key, server.secret_key, endpoint=server.url)
+        ...
+        print(server.stats())
+"""
+
+import argparse
+import hashlib
+import hmac
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import unquote, urlsplit
+
+from artifact_backends import SIGV4_ALGORITHM, sigv4_signature
+
+
+READ_CHUNK_SIZE = 64 * 1024
+
+AUTHORIZATION = re.compile(
+    rf"{SIGV4_ALGORITHM} Credential=(?P<access_key>[^/]+)/(?P<date>\d{{8}})/(?P<region>[^/]+)/s3/aws4_request,"
+    r"\s*SignedHeaders=(?P<signed_headers>[a-z0-9;-]+),\s*Signature=(?P<signature>[0-9a-f]{64})"
+)
+
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+
+
+class FakeS3Error(Exception):
+    """Custom exception for fake S3 error replies."""
+
+    def __init__(self, status: int, code: str, message: str = ""):
+        super().__init__(message or code)
+        self.status = status
+        self.code = code
+
+
+class FakeS3Server(ThreadingHTTPServer):
+    """
+    In-memory S3-compatible object store with SigV4 verification.
+
+    Listens on 127.0.0.1 (an ephemeral port by default); start() serves
+    requests from a background thread and stop() shuts it down. Usable as
+    a context manager.
+    """
+
+    daemon_threads = True
+
+    DEFAULT_ACCESS_KEY = "minioadmin"
+    DEFAULT_SECRET_KEY = "minioadmin"
+    DEFAULT_REGION = "us-east-1"
+
+    def __init__(
+        self,
+        buckets: Sequence[str] = ("releases",),
+        port: int = 0,
+        access_key: str = DEFAULT_ACCESS_KEY,
+        secret_key: str = DEFAULT_SECRET_KEY,
+        region: str = DEFAULT_REGION,
+        latency: float = 0.0,
+        bandwidth: Optional[float] = None
+    ):
+        """
+        Initialize the server (not yet serving).
+
+        Args:
+            buckets: Buckets that exist (others answer NoSuchBucket)
+            port: Port to listen on (default: any free port)
+            access_key, secret_key: The only accepted credentials
+            region: Region requests must be signed for
+            latency: Seconds added before every response
+            bandwidth: Upload bytes per second (default: unlimited)
+        """
+        super().__init__(("127.0.0.1", port), FakeS3Handler)
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+        self.lock = threading.Lock()
+        self.buckets: Dict[str, Dict[str, Dict[str, Any]]] = {bucket: {} for bucket in buckets}
+        self._thread: Optional[threading.Thread] = None
+        self._failures: List[int] = []
+        self._requests: Counter = Counter()
+        self._injected_errors = 0
+        self._bytes_received = 0
+
+    @property
+    def url(self) -> str:
+        """Endpoint URL to pass to S3Backend (e.g. http://127.0.0.1:54321)."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "FakeS3Server":
+        """Serve requests from a daemon thread."""
+        # A short poll interval keeps stop() quick
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={'poll_interval': 0.05}, name="fake-s3", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "FakeS3Server":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients that time out hang up before the response is written
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def fail_next(self, status: int = 503, count: int = 1) -> None:
+        """Answer the next count requests with status (e.g. 503 SlowDown)."""
+        with self.lock:
+            self._failures.extend([status] * count)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters since the server started.
+
+        Returns:
+            Dictionary containing:
+                - requests: Requests received, including failed ones
+                - by_method: Requests per HTTP method
+                - injected_errors: Error replies injected with fail_next()
+                - bytes_received: Object bytes stored
+        """
+        with self.lock:
+            return {
+                'requests': sum(self._requests.values()),
+                'by_method': dict(self._requests),
+                'injected_errors': self._injected_errors,
+                'bytes_received': self._bytes_received,
+            }
+
+    def admit(self, method: str) -> None:
+        """
+        Count a request and apply injected faults.
+
+        Raises:
+            FakeS3Error: If a fault is injected
+        """
+        with self.lock:
+            self._requests[method] += 1
+            if self._failures:
+                status = self._failures.pop(0)
+                self._injected_errors += 1
+                raise FakeS3Error(status, "SlowDown" if status == 503 else "InternalError")
+
+    def verify(self, method: str, path: str, query: str, headers: Any) -> None:
+        """
+        Check a request's SigV4 Authorization header.
+
+        Raises:
+            FakeS3Error: 403 for missing, foreign or wrong signatures
+        """
+        match = AUTHORIZATION.fullmatch(headers.get("Authorization") or "")
+        if not match:
+            raise FakeS3Error(403, "AccessDenied", "Missing or malformed Authorization")
+        if match.group('access_key') != self.access_key:
+            raise FakeS3Error(403, "InvalidAccessKeyId")
+        if match.group('region') != self.region:
+            raise FakeS3Error(400, "AuthorizationHeaderMalformed")
+
+        amz_date = headers.get("X-Amz-Date") or ""
+        names = match.group('signed_headers').split(";")
+        if "host" not in names or amz_date[:8] != match.group('date'):
+            raise FakeS3Error(403, "SignatureDoesNotMatch")
+        signed = {name: headers.get(name) or "" for name in names}
+        expected = sigv4_signature(self.secret_key, method, path, query, signed,
+                                   headers.get("X-Amz-Content-Sha256") or "", amz_date, self.region)
+        if not hmac.compare_digest(expected, match.group('signature')):
+            raise FakeS3Error(403, "SignatureDoesNotMatch")
+
+    def stored(self, size: int) -> None:
+        with self.lock:
+            self._bytes_received += size
+
+
+class FakeS3Handler(BaseHTTPRequestHandler):
+    """Serves one object request of FakeS3Server."""
+
+    protocol_version = "HTTP/1.1"
+    server: FakeS3Server
+
+    def do_PUT(self):
+        self.dispatch()
+
+    def do_HEAD(self):
+        self.dispatch()
+
+    def do_GET(self):
+        self.dispatch()
+
+    def do_DELETE(self):
+        self.dispatch()
+
+    def log_message(self, format, *args):
+        # Keep benchmark and test output clean
+        pass
+
+    def dispatch(self) -> None:
+        self.body_read = False
+        parts = urlsplit(self.path)
+        try:
+            self.server.admit(self.command)
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            self.server.verify(self.command, parts.path, parts.query, self.headers)
+            bucket, _, key = unquote(parts.path).lstrip("/").partition("/")
+            with self.server.lock:
+                if bucket not in self.server.buckets:
+                    raise FakeS3Error(404, "NoSuchBucket")
+            if not key:
+                raise FakeS3Error(400, "InvalidRequest", "Bucket operations are not supported")
+            getattr(self, f"{self.command.lower()}_object")(bucket, key)
+        except FakeS3Error as e:
+            self.discard_body()
+            self.send_error_xml(e)
+
+    def discard_body(self) -> None:
+        """Read an unread request body so the connection can be reused."""
+        if not self.body_read:
+            self.read_body(keep=False)
+
+    def read_body(self, keep: bool = True) -> bytes:
+        """Read the request body, throttled to the server's bandwidth."""
+        self.body_read = True
+        remaining = int(self.headers.get("Content-Length") or 0)
+        chunks = []
+        started = time.perf_counter()
+        received = 0
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            received += len(chunk)
+            if keep:
+                chunks.append(chunk)
+            if self.server.bandwidth:
+                ahead = received / self.server.bandwidth - (time.perf_counter() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+        return b"".join(chunks)
+
+    def send_error_xml(self, error: FakeS3Error) -> None:
+        data = (f'<?xml version="1.0" encoding="UTF-8"?>\n<Error><Code>{error.code}</Code>'
+                f'<Message>{error}</Message></Error>').encode("utf-8")
+        self.send_response(error.status)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def find_object(self, bucket: str, key: str) -> Dict[str, Any]:
+        with self.server.lock:
+            stored = self.server.buckets[bucket].get(key)
+        if stored is None:
+            raise FakeS3Error(404, "NoSuchKey")
+        return stored
+
+    def send_object_headers(self, stored: Dict[str, Any]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", stored['content_type'])
+        self.send_header("Content-Length", str(len(stored['data'])))
+        self.send_header("ETag", stored['etag'])
+        self.send_header("Last-Modified", stored['last_modified'])
+        for name, value in stored['metadata'].items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def put_object(self, bucket: str, key: str) -> None:
+        data = self.read_body()
+        if len(data) != int(self.headers.get("Content-Length") or 0):
+            raise FakeS3Error(400, "IncompleteBody")
+        payload_hash = self.headers.get("X-Amz-Content-Sha256")
+        if payload_hash != UNSIGNED_PAYLOAD and payload_hash != hashlib.sha256(data).hexdigest():
+            raise FakeS3Error(400, "XAmzContentSHA256Mismatch")
+
+        etag = '"' + hashlib.md5(data).hexdigest() + '"'
+        with self.server.lock:
+            self.server.buckets[bucket][key] = {
+                'data': data,
+                'etag': etag,
+                'content_type': self.headers.get("Content-Type") or "binary/octet-stream",
+                'last_modified': formatdate(usegmt=True),
+                'metadata': {name.lower(): value for name, value in self.headers.items()
+                             if name.lower().startswith("x-amz-meta-")},
+            }
+        self.server.stored(len(data))
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def head_object(self, bucket: str, key: str) -> None:
+        self.send_object_headers(self.find_object(bucket, key))
+
+    def get_object(self, bucket: str, key: str) -> None:
+        stored = self.find_object(bucket, key)
+        self.send_object_headers(stored)
+        self.wfile.write(stored['data'])
+
+    def delete_object(self, bucket: str, key: str) -> None:
+        with self.server.lock:
+            self.server.buckets[bucket].pop(key, None)
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Main entry point for the script"""
+    parser = argparse.ArgumentParser(description="Serve an in-memory S3-compatible object store for local testing")
+    parser.add_argument("--port", type=int, default=9000, help="Port to listen on (default: 9000)")
+    parser.add_argument("--bucket", action="append", help="Bucket to create; repeat for several (default: releases)")
+    parser.add_argument("--access-key", default=FakeS3Server.DEFAULT_ACCESS_KEY, help="Accepted access key")
+    parser.add_argument("--secret-key", default=FakeS3Server.DEFAULT_SECRET_KEY, help="Accepted secret key")
+    parser.add_argument("--region", default=FakeS3Server.DEFAULT_REGION, help="Signing region")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added before every response")
+    parser.add_argument("--bandwidth", type=float, help="Upload bytes per second (default: unlimited)")
+    args = parser.parse_args(argv)
+
+    server = FakeS3Server(
+        buckets=args.bucket or ["releases"],
+        port=args.port,
+        access_key=args.access_key,
+        secret_key=args.secret_key,
+        region=args.region,
+        latency=args.latency,
+        bandwidth=args.bandwidth
+    )
+    print(f"Fake S3 listening on {server.url} (buckets: {', '.join(server.buckets)})")
+    print(f"  AWS_ENDPOINT_URL={server.url} AWS_ACCESS_KEY_ID={server.access_key} "
+          f"AWS_SECRET_ACCESS_KEY={server.secret_key}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,73 +1,142 @@
 #!/usr/bin/env python3
 """
 Simple version extractor from pubspec.yaml
-Usage: python3 scripts/get_version.py [key]
+Usage: python3 scripts/get_version.py [key ...] [--format plain|json|env|github-output]
 """
 
+import argparse
+import json
+import os
+import re
+import shlex
 import sys
-import yaml
 from pathlib import Path
 
+from pubspec_metadata import PubspecError, resolve
 
-def get_value_by_path(data, path):
-    """Get value from nested dict using dot notation"""
-    keys = path.split('.')
-    value = data
-    for key in keys:
-        if isinstance(value, dict) and key in value:
-            value = value[key]
-        else:
-            return None
+
+# Common shortcuts
+SHORTCUTS = {
+    'flutter': 'environment.sdk',
+    'dart': 'environment.sdk',
+    'version': 'version',
+    'name': 'name',
+}
+
+FORMATS = ('plain', 'json', 'env', 'github-output')
+
+
+def clean_sdk_version(value):
+    """Extract minimum version from constraint like ">=3.0.0 <4.0.0" or "^3.0.0" """
+    if '>=' in value:
+        # Extract from ">=3.0.0 <4.0.0"
+        return value.split('>=')[1].split('<')[0].strip()
+    if value.startswith('^'):
+        # Extract from "^3.0.0"
+        return value[1:].strip()
     return value
 
 
-def main():
-    root_dir = Path(__file__).parent.parent
+def query(pubspec_path, keys):
+    """
+    Resolve several keys (shortcuts or dotted paths) in one pass.
+
+    Returns:
+        (values, missing): values keyed by the requested key, and the keys not found
+    """
+    paths = [SHORTCUTS.get(key, key) for key in keys]
+    resolved = resolve(pubspec_path, list(dict.fromkeys(paths)))
+
+    values = {}
+    missing = []
+    for key, path in zip(keys, paths):
+        value = resolved[path]
+        if value is None:
+            missing.append(key)
+            continue
+        # For flutter/dart shortcuts, extract clean version
+        if key in ['flutter', 'dart'] and isinstance(value, str):
+            value = clean_sdk_version(value)
+        values[key] = value
+    return values, missing
+
+
+def output_name(key):
+    """Variable name for a key, e.g. environment.sdk -> environment_sdk"""
+    return re.sub(r'[^A-Za-z0-9_]', '_', key)
+
+
+def format_value(value):
+    """Scalars as-is; mappings and lists as compact JSON"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'), default=str)
+    return str(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Read values from pubspec.yaml",
+        epilog="Shortcuts: flutter/dart (environment.sdk minimum), version, name. "
+               "Any other key is a dotted path such as dependencies.flutter_bloc."
+    )
+    parser.add_argument(
+        "keys",
+        nargs="*",
+        help="Keys to read (default: environment.sdk as-is)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="plain",
+        help="plain: one value per line; json: object keyed by key; "
+             "env: export lines; github-output: append to GITHUB_OUTPUT"
+    )
+    parser.add_argument(
+        "--project-root",
+        help="Project root directory (defaults to script parent directory)"
+    )
+    args = parser.parse_args(argv)
+
+    root_dir = Path(args.project_root) if args.project_root else Path(__file__).parent.parent
     pubspec_path = root_dir / 'pubspec.yaml'
-    
+
     if not pubspec_path.exists():
         print("Error: pubspec.yaml not found", file=sys.stderr)
-        sys.exit(1)
-    
-    with open(pubspec_path, 'r') as f:
-        pubspec = yaml.safe_load(f)
-    
-    if len(sys.argv) < 2:
-        # No argument - print environment.sdk as-is
-        env = pubspec.get('environment', {})
-        sdk = env.get('sdk', '')
-        print(sdk)
-        sys.exit(0)
-    
-    key = sys.argv[1]
-    
-    # Common shortcuts
-    shortcuts = {
-        'flutter': 'environment.sdk',
-        'dart': 'environment.sdk',
-        'version': 'version',
-        'name': 'name',
-    }
-    
-    path = shortcuts.get(key, key)
-    value = get_value_by_path(pubspec, path)
-    
-    if value is None:
-        print(f"Key not found: {key}", file=sys.stderr)
-        sys.exit(1)
-    
-    # For flutter/dart shortcuts, extract clean version
-    if key in ['flutter', 'dart'] and isinstance(value, str):
-        # Extract minimum version from constraint like ">=3.0.0 <4.0.0" or "^3.0.0"
-        if '>=' in value:
-            # Extract from ">=3.0.0 <4.0.0"
-            value = value.split('>=')[1].split('<')[0].strip()
-        elif value.startswith('^'):
-            # Extract from "^3.0.0"
-            value = value[1:].strip()
-    
-    print(value)
+        return 1
+
+    try:
+        if not args.keys:
+            # No argument - print environment.sdk as-is
+            sdk = resolve(pubspec_path, ['environment.sdk'])['environment.sdk']
+            print(sdk if sdk is not None else '')
+            return 0
+
+        values, missing = query(pubspec_path, args.keys)
+    except (PubspecError, IOError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if missing:
+        print(f"Key not found: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    if args.format == 'json':
+        print(json.dumps(values, indent=2, default=str))
+    elif args.format == 'plain':
+        for key in args.keys:
+            print(values[key])
+    else:
+        github_output = os.environ.get("GITHUB_OUTPUT") if args.format == 'github-output' else None
+        if github_output:
+            with open(github_output, "a") as f:
+                for key, value in values.items():
+                    f.write(f"{output_name(key)}={format_value(value)}\n")
+        else:
+            for key, value in values.items():
+                print(f"export {output_name(key).upper()}={shlex.quote(format_value(value))}")
+
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
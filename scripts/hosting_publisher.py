@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Same-Origin APK Publishing to Firebase Hosting
+
+This script stages prepared release artifacts into the Flutter web build
+(build/web/downloads/ by default) so Firebase Hosting serves them from its
+CDN on the web app's own origin, without the cross-origin redirect that a
+github.com/.../releases/latest/download/... link adds.
+
+Features:
+- Zero-copy staging into the public directory (artifact_staging.py), with
+  SHA-256 computed in the same pass and a SHA256SUMS file beside the files
+- Matching firebase.json headers for every staged file: versioned names
+  are cached as immutable, stable names ('-latest') and SHA256SUMS are
+  revalidated, and APKs are served as downloads with the Android MIME type
+- Same-origin download URLs (site from --site-url, or <project>.web.app from
+  .firebaserc) for --dart-define=APK_DOWNLOAD_URL
+- --dry-run: report the URLs and headers without touching any file, so the
+  URL is known before 'flutter build web' runs
+- Works entirely on local directories (no network access)
+- GitHub Actions output support
+
+Requirements:
+- Python 3.7+ (standard library only)
+
+Usage:
+    python hosting_publisher.py <file>[:<name>] [<file>[:<name>] ...] [options]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
+
+from artifact_staging import DEFAULT_STRATEGIES, STRATEGIES, DigestCache, StagingError, stage_file
+from ci_outputs import parse_file_spec, write_github_output
+
+
+DEFAULT_CONFIG = Path(__file__).parent.parent / "firebase.json"
+
+# Versioned release names ('<base>-1.2.0+5.apk', '<base>-1.1.0-to-1.2.0+5.apkpatch');
+# their bytes never change, unlike the stable '-latest' names
+VERSIONED_NAME = re.compile(r"-\d[^/]*\.(?:apk|aab|apkpatch)$")
+
+# Characters Firebase Hosting would read as glob syntax in a header source
+GLOB_CHARACTERS = re.compile(r"[*?\[\]{}!/\\]")
+
+CONTENT_TYPES = {
+    '.apk': "application/vnd.android.package-archive",
+    '.aab': "application/octet-stream",
+    '.apkpatch': "application/octet-stream",
+}
+
+
+class HostingPublishError(Exception):
+    """Custom exception for Firebase Hosting publishing errors."""
+    pass
+
+
+class FirebaseHostingPublisher:
+    """
+    Stages release artifacts into a Firebase Hosting public directory.
+
+    The downloads directory holds exactly the files of the last publish:
+    earlier files are removed, because their header rules are replaced too.
+    """
+
+    DOWNLOADS_DIR = "downloads"
+    SHA256SUMS = "SHA256SUMS"
+    # Dotfiles are excluded from deploys by firebase.json's "**/.*" ignore
+    DIGEST_CACHE = ".staging-cache.json"
+
+    # Versioned files never change; stable names are revalidated with the
+    # CDN's ETag after a short while so a new release shows up promptly
+    IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+    STABLE_CACHE_CONTROL = "public, max-age=300, must-revalidate"
+
+    def __init__(
+        self,
+        config_path: Union[str, Path] = DEFAULT_CONFIG,
+        public_dir: Optional[Union[str, Path]] = None,
+        site_url: Optional[str] = None,
+        downloads_dir: str = DOWNLOADS_DIR,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES
+    ):
+        """
+        Initialize the publisher.
+
+        Args:
+            config_path: firebase.json to read and update
+            public_dir: Hosting public directory (defaults to hosting.public
+                in firebase.json, relative to its directory)
+            site_url: Origin the site is served from (defaults to
+                https://<default project>.web.app from .firebaserc)
+            downloads_dir: Directory under public_dir for the artifacts
+            strategies: Staging strategies to try, in order of preference
+
+        Raises:
+            HostingPublishError: If the config or the site cannot be resolved
+        """
+        self.config_path = Path(config_path)
+        self.config = self._load_config()
+        hosting = self.config['hosting']
+
+        if public_dir is None:
+            if not hosting.get('public'):
+                raise HostingPublishError(f"No hosting.public directory in {self.config_path}")
+            public_dir = self.config_path.parent / hosting['public']
+        self.public_dir = Path(public_dir)
+
+        self.downloads_dir = downloads_dir.strip("/")
+        if not self.downloads_dir or GLOB_CHARACTERS.search(self.downloads_dir.replace("/", "")):
+            raise HostingPublishError(f"Invalid downloads directory: {downloads_dir!r}")
+        self.downloads_path = self.public_dir / self.downloads_dir
+
+        self.site_url = (site_url or self._default_site_url()).rstrip("/")
+        self.strategies = strategies
+
+    def _load_config(self) -> Dict[str, Any]:
+        """Read firebase.json; a single hosting site is supported."""
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            raise HostingPublishError(f"Firebase config not found: {self.config_path}")
+        except (OSError, json.JSONDecodeError) as e:
+            raise HostingPublishError(f"Cannot read {self.config_path}: {e}")
+
+        if not isinstance(config, dict) or not isinstance(config.get('hosting'), dict):
+            raise HostingPublishError(
+                f"{self.config_path} must contain a single 'hosting' object (multi-site configs are not supported)"
+            )
+        return config
+
+    def _default_site_url(self) -> str:
+        """https://<project>.web.app for the default project in .firebaserc."""
+        firebaserc = self.config_path.parent / ".firebaserc"
+        try:
+            with open(firebaserc, "r", encoding="utf-8") as f:
+                project = json.load(f).get('projects', {}).get('default')
+        except (OSError, json.JSONDecodeError, AttributeError):
+            project = None
+        if not project:
+            raise HostingPublishError(f"No default project in {firebaserc}; pass --site-url")
+        return f"https://{project}.web.app"
+
+    @staticmethod
+    def is_immutable(name: str) -> bool:
+        """True if name is a versioned release file whose bytes never change."""
+        return bool(VERSIONED_NAME.search(name))
+
+    def download_path(self, name: str) -> str:
+        """Absolute URL path of a staged file (also its header source)."""
+        return f"/{self.downloads_dir}/{name}"
+
+    def download_url(self, name: str) -> str:
+        """Same-origin URL of a staged file."""
+        return self.site_url + quote(self.download_path(name))
+
+    def header_rules(self, names: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        firebase.json header entries for the given staged files.
+
+        Args:
+            names: File names in the downloads directory
+
+        Returns:
+            One entry per name (exact sources, so rules never overlap)
+        """
+        rules = []
+        for name in names:
+            headers = {
+                'Cache-Control': self.IMMUTABLE_CACHE_CONTROL if self.is_immutable(name)
+                else self.STABLE_CACHE_CONTROL,
+                'X-Content-Type-Options': "nosniff",
+            }
+            content_type = CONTENT_TYPES.get(Path(name).suffix)
+            if content_type:
+                headers['Content-Type'] = content_type
+                headers['Content-Disposition'] = f'attachment; filename="{name}"'
+            elif name == self.SHA256SUMS:
+                headers['Content-Type'] = "text/plain; charset=utf-8"
+            rules.append({
+                'source': self.download_path(name),
+                'headers': [{'key': key, 'value': value} for key, value in headers.items()],
+            })
+        return rules
+
+    def update_config(self, names: Sequence[str]) -> bool:
+        """
+        Replace the downloads header rules in firebase.json.
+
+        Rules for other paths are kept as they are.
+
+        Returns:
+            True if the file was rewritten, False if it already matched
+
+        Raises:
+            HostingPublishError: If the file cannot be written
+        """
+        prefix = self.download_path("")
+        hosting = self.config['hosting']
+        headers = [rule for rule in hosting.get('headers', [])
+                   if not str(rule.get('source', "")).startswith(prefix)]
+        headers.extend(self.header_rules(names))
+        if headers == hosting.get('headers'):
+            return False
+
+        hosting['headers'] = headers
+        temporary = self.config_path.with_name(f".{self.config_path.name}.tmp-{os.getpid()}")
+        try:
+            temporary.write_text(json.dumps(self.config, indent=2) + "\n", encoding="utf-8")
+            os.replace(temporary, self.config_path)
+        except OSError as e:
+            raise HostingPublishError(f"Failed to write {self.config_path}: {e}")
+        finally:
+            if temporary.exists():
+                temporary.unlink()
+        return True
+
+    def plan(self, files: Sequence[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        """
+        Resolve names and URLs for files without touching the disk.
+
+        Args:
+            files: (path, name or None) pairs; the name defaults to the file name
+
+        Returns:
+            List of dictionaries containing source, name, path, url and immutable
+
+        Raises:
+            HostingPublishError: On invalid or duplicate names
+        """
+        entries = []
+        seen = set()
+        for source, name in files:
+            name = name or Path(source).name
+            if not name or name.startswith(".") or GLOB_CHARACTERS.search(name):
+                raise HostingPublishError(f"Invalid download name: {name!r}")
+            if name == self.SHA256SUMS or name in seen:
+                raise HostingPublishError(f"Duplicate download name: {name}")
+            seen.add(name)
+            entries.append({
+                'source': str(source),
+                'name': name,
+                'path': str(self.downloads_path / name),
+                'url': self.download_url(name),
+                'immutable': self.is_immutable(name),
+            })
+        return entries
+
+    def publish(self, files: Sequence[Tuple[str, Optional[str]]]) -> Dict[str, Any]:
+        """
+        Stage files into the downloads directory and update firebase.json.
+
+        Args:
+            files: (path, name or None) pairs; the last one is the download
+                URL for the web app (the stable APK, as with the uploader)
+
+        Returns:
+            Dictionary containing:
+                - files: Plan entries with size, sha256 and strategy added
+                - download_url: URL of the last file
+                - sha256sums_path: Path of SHA256SUMS
+                - removed: Names of earlier files deleted from downloads
+                - config_updated: Whether firebase.json was rewritten
+
+        Raises:
+            FileNotFoundError: If a file does not exist
+            HostingPublishError: If the public directory is missing or staging fails
+        """
+        if not files:
+            raise HostingPublishError("No files to publish")
+        entries = self.plan(files)
+        for entry in entries:
+            if not Path(entry['source']).is_file():
+                raise FileNotFoundError(f"File not found: {entry['source']}")
+        if not self.public_dir.is_dir():
+            raise HostingPublishError(
+                f"Public directory not found: {self.public_dir} (run 'flutter build web' first)"
+            )
+
+        self.downloads_path.mkdir(parents=True, exist_ok=True)
+        cache = DigestCache(self.downloads_path / self.DIGEST_CACHE)
+
+        for entry in entries:
+            try:
+                staged = stage_file(entry['source'], entry['path'], strategies=self.strategies,
+                                    digests=["sha256"], cache=cache)
+            except StagingError as e:
+                raise HostingPublishError(str(e))
+            entry.update(size=staged['bytes'], sha256=staged['digests']['sha256'],
+                         strategy=staged['strategy'])
+            print(f"✓ {entry['name']} ({staged['strategy']}, {staged['bytes']:,} bytes)")
+
+        sums_path = self.downloads_path / self.SHA256SUMS
+        sums_path.write_text("".join(f"{entry['sha256']}  {entry['name']}\n" for entry in entries),
+                             encoding="utf-8")
+
+        keep = {entry['name'] for entry in entries} | {self.SHA256SUMS, self.DIGEST_CACHE}
+        removed = []
+        for path in sorted(self.downloads_path.iterdir()):
+            if path.name not in keep:
+                if path.is_dir() and not path.is_symlink():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+                removed.append(path.name)
+
+        try:
+            cache.save()
+        except OSError:
+            # Only costs the next run its up-to-date fast path
+            pass
+
+        config_updated = self.update_config([entry['name'] for entry in entries] + [self.SHA256SUMS])
+
+        return {
+            'files': entries,
+            'download_url': entries[-1]['url'],
+            'sha256sums_path': str(sums_path),
+            'removed': removed,
+            'config_updated': config_updated,
+        }
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Main entry point for the script"""
+    parser = argparse.ArgumentParser(
+        description="Stage release artifacts into the web build for same-origin downloads from Firebase Hosting",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Download URL for --dart-define before building the web app
+  python hosting_publisher.py dist/app-portfolio-release-latest.apk --dry-run --url-only
+
+  # After 'flutter build web': stage the APKs and update firebase.json
+  python hosting_publisher.py \\
+      dist/app-portfolio-release-1.2.0+5.apk dist/app-portfolio-release-latest.apk --github-output
+
+  # Custom domain
+  python hosting_publisher.py dist/app-portfolio-release-latest.apk --site-url https://example.com
+        """
+    )
+
+    parser.add_argument(
+        "files",
+        nargs="+",
+        metavar="file_path[:name]",
+        help="File to stage, optionally with its download name; the last one is APK_DOWNLOAD_URL"
+    )
+    parser.add_argument(
+        "--config",
+        default=str(DEFAULT_CONFIG),
+        help="firebase.json to update (default: the project's firebase.json)"
+    )
+    parser.add_argument(
+        "--public-dir",
+        help="Hosting public directory (default: hosting.public from the config, i.e. build/web)"
+    )
+    parser.add_argument(
+        "--downloads-dir",
+        default=FirebaseHostingPublisher.DOWNLOADS_DIR,
+        help=f"Directory under the public directory (default: {FirebaseHostingPublisher.DOWNLOADS_DIR})"
+    )
+    parser.add_argument(
+        "--site-url",
+        help="Origin the site is served from (default: https://<project>.web.app from .firebaserc)"
+    )
+    parser.add_argument(
+        "--staging-strategy",
+        action="append",
+        choices=STRATEGIES,
+        help="Staging strategy to try; repeat to set the order "
+             f"(default: {', '.join(DEFAULT_STRATEGIES)}; hardlink only for outputs "
+             f"that are never rewritten in place)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the URLs and header rules without staging or editing firebase.json"
+    )
+    parser.add_argument(
+        "--github-output",
+        action="store_true",
+        help="Output in GitHub Actions format"
+    )
+    parser.add_argument(
+        "--url-only",
+        action="store_true",
+        help="Output only the download URL(s) (for CI/CD pipelines)"
+    )
+
+    args = parser.parse_args(argv)
+    files = [parse_file_spec(spec) for spec in args.files]
+
+    try:
+        publisher = FirebaseHostingPublisher(
+            config_path=args.config,
+            public_dir=args.public_dir,
+            site_url=args.site_url,
+            downloads_dir=args.downloads_dir,
+            strategies=args.staging_strategy or DEFAULT_STRATEGIES
+        )
+
+        if args.dry_run:
+            entries = publisher.plan(files)
+            if not args.url_only:
+                print(f"Would stage into {publisher.downloads_path}:")
+                for entry in entries:
+                    print(f"  {entry['source']} -> {entry['name']}")
+                print(f"Would set headers in {publisher.config_path}:")
+                names = [entry['name'] for entry in entries] + [publisher.SHA256SUMS]
+                print(json.dumps(publisher.header_rules(names), indent=2))
+        else:
+            result = publisher.publish(files)
+            entries = result['files']
+            if not args.url_only:
+                for name in result['removed']:
+                    print(f"✓ Removed {name}")
+                print(f"✓ {publisher.SHA256SUMS} written")
+                print(f"✓ {publisher.config_path} "
+                      f"{'updated' if result['config_updated'] else 'already up to date'}")
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    except HostingPublishError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+    if args.url_only:
+        for entry in entries:
+            print(entry['url'])
+        return 0
+
+    print()
+    print(f"Download URL{'s' if len(entries) > 1 else ''}:")
+    for entry in entries:
+        print(f"  {entry['url']}")
+    print()
+
+    if args.github_output:
+        urls = [entry['url'] for entry in entries]
+        write_github_output({'apk_download_url': urls[-1], 'download_urls': json.dumps(urls)})
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Connection Pool for PyGithub
+
+PyGithub keeps one requests session for the API host, but opens a new
+session (and so a new TCP connection and TLS handshake) for every call to
+another host such as uploads.github.com, and sends those calls without a
+timeout. HTTPPool replaces PyGithub's connection classes on one Github
+client so that every call goes through a single session:
+
+- Pooled keep-alive connections per host (pool_size each), so handshakes
+  are paid once per connection per run
+- TCP keepalive probes, so a peer that vanished is noticed
+- (connect, read) timeouts on every call, uploads included, so a hung
+  connection raises Timeout (which the uploader retries) instead of
+  stalling the job
+- Per-request latency, optionally printed as each call completes, and
+  summarised (p50/p95/max) with the number of connections opened
+
+Requirements:
+- Python 3.7+
+- requests and urllib3 (installed with PyGithub)
+
+Usage:
+    from http_pool import HTTPPool
+
+    pool = HTTPPool(pool_size=8, connect_timeout=5, read_timeout=120, log_requests=True)
+    github = Github(auth=Auth.Token(token))
+    pool.install(github.requester)
+    ...
+    print(pool.stats())
+"""
+
+import socket
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+
+# TCP keepalive: probe after this many idle seconds, then every interval
+KEEPALIVE_IDLE = 60
+KEEPALIVE_INTERVAL = 15
+KEEPALIVE_PROBES = 4
+
+
+def keepalive_socket_options() -> List[Tuple[int, int, int]]:
+    """urllib3 socket options enabling TCP keepalive where the OS supports it."""
+    options = list(HTTPConnection.default_socket_options) + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name, value in (("TCP_KEEPIDLE", KEEPALIVE_IDLE), ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+                        ("TCP_KEEPCNT", KEEPALIVE_PROBES)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+# PyGithub Requester attributes install() replaces
+REQUESTER_ATTRIBUTES = ("_Requester__connectionClass", "_Requester__httpConnectionClass",
+                        "_Requester__httpsConnectionClass")
+
+
+class HTTPPoolError(Exception):
+    """Custom exception for HTTP connection pool errors."""
+    pass
+
+
+def _pygithub_version() -> str:
+    try:
+        import github
+    except ImportError:
+        return "not installed"
+    return getattr(github, "__version__", "unknown version")
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connections send TCP keepalive probes.
+
+    on_connect is called each time a socket is connected, including when
+    urllib3 silently re-dials a pooled connection the server had closed.
+    With keep_alive False every connection is closed once its response
+    has been read, rather than returned to the pool for a server that may
+    be closing it.
+    """
+
+    def __init__(self, on_connect: Optional[Callable[[], None]] = None, keep_alive: bool = True,
+                 **kwargs: Any):
+        self.on_connect = on_connect
+        self.keep_alive = keep_alive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault('socket_options', keepalive_socket_options())
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        if self.on_connect is not None or not self.keep_alive:
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": self._pool_class(HTTPConnectionPool, HTTPConnection),
+                "https": self._pool_class(HTTPSConnectionPool, HTTPSConnection),
+            }
+
+    def _pool_class(self, pool_class: type, connection_class: type) -> type:
+        on_connect = self.on_connect
+        keep_alive = self.keep_alive
+
+        class CountingConnection(connection_class):
+            def connect(self) -> None:
+                super().connect()
+                if on_connect is not None:
+                    on_connect()
+
+        def _put_conn(pool, conn) -> None:
+            if not keep_alive and conn is not None:
+                conn.close()
+            pool_class._put_conn(pool, conn)
+
+        return type(pool_class.__name__, (pool_class,), {'ConnectionCls': CountingConnection,
+                                                         '_put_conn': _put_conn})
+
+
+class HTTPPool:
+    """
+    One requests session shared by every call of a PyGithub client.
+
+    Thread-safe: the uploader's worker threads share the pool.
+    """
+
+    # Connections kept per host; at least the number of concurrent workers
+    DEFAULT_POOL_SIZE = 10
+
+    # Hosts with a pool of their own (API, uploads, and a spare)
+    POOL_HOSTS = 4
+
+    DEFAULT_CONNECT_TIMEOUT = 10.0
+    # Longest silence while waiting for a response; generous because
+    # GitHub answers an upload only after processing the whole file
+    DEFAULT_READ_TIMEOUT = 300.0
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        keep_alive: bool = True,
+        retry: Optional[Union[int, Retry]] = None,
+        log_requests: bool = False,
+        verify: Union[bool, str] = True
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            pool_size: Connections kept per host (default: DEFAULT_POOL_SIZE)
+            connect_timeout: Seconds to establish a connection (default: DEFAULT_CONNECT_TIMEOUT)
+            read_timeout: Seconds without data from the server (default: DEFAULT_READ_TIMEOUT)
+            keep_alive: Reuse connections; False sends 'Connection: close'
+            retry: urllib3 retry policy for the transport (default: none)
+            log_requests: Print method, URL, status and latency of every call to stderr
+            verify: TLS verification (True, False or a CA bundle path)
+        """
+        self.pool_size = max(1, pool_size or self.DEFAULT_POOL_SIZE)
+        self.timeout = (connect_timeout or self.DEFAULT_CONNECT_TIMEOUT,
+                        read_timeout or self.DEFAULT_READ_TIMEOUT)
+        self.keep_alive = keep_alive
+        self.log_requests = log_requests
+        self.verify = verify
+
+        self._lock = threading.Lock()
+        self._latencies: List[float] = []
+        self._errors = 0
+        self._connects = 0
+
+        self.adapter = KeepAliveAdapter(
+            on_connect=self._count_connect,
+            keep_alive=keep_alive,
+            pool_connections=self.POOL_HOSTS,
+            pool_maxsize=self.pool_size,
+            max_retries=retry if retry is not None else 0
+        )
+        self.session = requests.Session()
+        # A non-None auth stops requests from reading credentials from .netrc
+        self.session.auth = lambda request: request
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def connection_class(self, protocol: str) -> type:
+        """
+        Connection class for PyGithub bound to this pool.
+
+        PyGithub instantiates its connection class per host (and per call
+        for hosts other than the API host); instances of this class are
+        thin handles onto the shared session.
+        """
+        pool = self
+
+        class PooledConnection:
+            def __init__(self, host: str, port: Optional[int] = None, *args: Any, **kwargs: Any):
+                self.host = host
+                self.port = port or (443 if protocol == "https" else 80)
+                self.protocol = protocol
+
+            def request(self, verb: str, url: str, input: Any, headers: Dict[str, str], stream: bool = False):
+                self.verb = verb
+                self.url = url
+                self.input = input
+                self.headers = headers
+                self.stream = stream
+
+            def getresponse(self):
+                url = f"{self.protocol}://{self.host}:{self.port}{self.url}"
+                return pool.send(self.verb, url, self.input, self.headers, self.stream)
+
+            def close(self) -> None:
+                # The pool owns the connections
+                pass
+
+        PooledConnection.__name__ = f"Pooled{protocol.upper()}Connection"
+        return PooledConnection
+
+    def install(self, requester: Any) -> None:
+        """
+        Route a PyGithub Requester's calls through this pool.
+
+        Requester exposes connection classes only as name-mangled private
+        attributes; they are overridden on this instance alone, so other
+        clients in the process are unaffected. The PyGithub versions this
+        is tested with are pinned in requirements.txt.
+
+        Raises:
+            HTTPPoolError: If this PyGithub version lacks the expected
+                attributes (rather than silently keeping its own connections)
+        """
+        missing = [name for name in REQUESTER_ATTRIBUTES if not hasattr(requester, name)]
+        if missing:
+            raise HTTPPoolError(
+                f"Cannot install the connection pool: {type(requester).__name__} has no "
+                f"{', '.join(missing)} (PyGithub {_pygithub_version()}; see scripts/requirements.txt "
+                f"for the supported range)"
+            )
+        http_class = self.connection_class("http")
+        https_class = self.connection_class("https")
+        scheme = urlsplit(str(getattr(requester, 'base_url', ""))).scheme
+        requester._Requester__httpConnectionClass = http_class
+        requester._Requester__httpsConnectionClass = https_class
+        requester._Requester__connectionClass = http_class if scheme == "http" else https_class
+
+    def request(
+        self,
+        verb: str,
+        url: str,
+        data: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """
+        Send one request through the session (timing and logging it).
+
+        Redirects are not followed.
+
+        Raises:
+            requests.exceptions.RequestException: On connection errors and timeouts
+        """
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                verb, url, headers=headers, data=data, timeout=self.timeout,
+                verify=self.verify, allow_redirects=False, stream=stream
+            )
+        except requests.exceptions.RequestException as e:
+            self._record(verb, url, None, time.perf_counter() - started, type(e).__name__)
+            raise
+        self._record(verb, url, response.status_code, time.perf_counter() - started)
+        return response
+
+    def send(self, verb: str, url: str, data: Any, headers: Dict[str, str], stream: bool = False):
+        """
+        Send one PyGithub request through the session.
+
+        Returns:
+            PyGithub's RequestsResponse wrapper
+
+        Raises:
+            requests.exceptions.RequestException: On connection errors and timeouts
+        """
+        from github.Requester import RequestsResponse
+
+        return RequestsResponse(self.request(verb, url, data, headers, stream))
+
+    def connections_opened(self) -> int:
+        """TCP connections opened so far (each https one is a TLS handshake)."""
+        with self._lock:
+            return self._connects
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Latency and connection counters.
+
+        Returns:
+            Dictionary containing:
+                - http_requests: Requests sent (failed ones included)
+                - http_errors: Requests that raised (timeouts, resets)
+                - connections: TCP connections opened
+                - latency_p50_ms, latency_p95_ms, latency_max_ms: Request
+                  latency (None before the first request)
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            errors = self._errors
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        return {
+            'http_requests': len(latencies),
+            'http_errors': errors,
+            'connections': self.connections_opened(),
+            'latency_p50_ms': percentile(0.5),
+            'latency_p95_ms': percentile(0.95),
+            'latency_max_ms': latencies[-1] * 1000 if latencies else None,
+        }
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.session.close()
+
+    def _count_connect(self) -> None:
+        with self._lock:
+            self._connects += 1
+
+    def _record(self, verb: str, url: str, status: Optional[int], seconds: float, error: str = "") -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+            if status is None:
+                self._errors += 1
+        if self.log_requests:
+            outcome = status if status is not None else f"✗ {error}"
+            print(f"  HTTP {verb} {url.split('?')[0]} -> {outcome} in {seconds * 1000:.0f} ms", file=sys.stderr)
@@ -12,29 +12,61 @@ Features:
 - Version extraction from pubspec.yaml
 - Automatic file renaming with version
 - Dual naming strategy (versioned + stable)
+- Zero-copy staging (reflink, copy_file_range, copy fallback)
+- Single-pass SHA-256/SHA-512 checksum manifest (checksums.json, SHA256SUMS)
+- Batch mode for split-per-ABI APKs and AAB bundles (globs, thread pool)
+- analyze: mmap-based size breakdown from the ZIP central directory
+- diff: release-over-release size diff with budget gate
+- Optional delta patch from the previous versioned APK (see apk_delta.py)
+- Optional content-addressed store (<output>/.store) with hardlinked names
+- gc: prune store blobs no name references any more
 - GitHub Actions output support
 - Comprehensive validation
 
 Requirements:
 - Python 3.7+
-- PyYAML library
+- PyYAML library (only for pubspec.yaml files the fast path cannot read)
 
 Usage:
     python prepare_apk.py <source_apk> [options]
+    python prepare_apk.py <source|glob> [<source|glob> ...] [options]
+    python prepare_apk.py analyze <apk> [options]
+    python prepare_apk.py diff <apk> [--previous <apk>] [budget options]
+    python prepare_apk.py gc <output_dir> [--dry-run]
 """
 
 import argparse
+import glob
+import json
 import os
-import shutil
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-try:
-    import yaml
-except ImportError:
-    print("ERROR: PyYAML library not found. Install with: pip install PyYAML", file=sys.stderr)
-    sys.exit(1)
+from apk_analyzer import (
+    APKAnalysisError,
+    analyze_apk,
+    check_budgets,
+    diff_apks,
+    format_diff,
+    format_report,
+    load_budgets
+)
+from apk_delta import PATCH_SUFFIX, APKDeltaError, create_patch, read_patch_header
+from artifact_staging import (
+    DEFAULT_STRATEGIES,
+    STRATEGIES,
+    UP_TO_DATE,
+    DigestCache,
+    StagingError,
+    compute_digests,
+    stage_file
+)
+from artifact_store import STORE_DIRNAME, ArtifactStore, ArtifactStoreError
+from pubspec_metadata import PubspecError, resolve
 
 
 class APKPreparationError(Exception):
@@ -42,6 +74,24 @@ class APKPreparationError(Exception):
     pass
 
 
+def version_key(version: str) -> Tuple:
+    """
+    Sort key for pubspec versions such as 1.2.3, 1.2.3+4 or 0.1.0-beta.
+    
+    Pre-releases sort before the matching release; build numbers break ties.
+    
+    Args:
+        version: Version string
+    
+    Returns:
+        Tuple usable as a sort key
+    """
+    core, _, build = version.partition('+')
+    core, _, pre = core.partition('-')
+    numbers = tuple(int(part) if part.isdigit() else 0 for part in core.split('.'))
+    return (numbers, 0 if pre else 1, pre, int(build) if build.isdigit() else 0)
+
+
 class APKPreparer:
     """
     Handles APK preparation with versioning.
@@ -49,9 +99,16 @@ class APKPreparer:
     This class implements:
     1. Version extraction from pubspec.yaml
     2. APK file copying and renaming
-    3. Validation and error handling
+    3. Checksum manifest generation
+    4. Validation and error handling
     """
     
+    SUPPORTED_EXTENSIONS = ('.apk', '.aab')
+    CHECKSUM_ALGORITHMS = ("sha256", "sha512")
+    CHECKSUMS_JSON = "checksums.json"
+    SHA256SUMS = "SHA256SUMS"
+    DIGEST_CACHE = ".staging-cache.json"
+    
     def __init__(self, project_root: Optional[Path] = None):
         """
         Initialize the APK preparer.
@@ -68,6 +125,9 @@ class APKPreparer:
         
         if not self.pubspec_path.exists():
             raise APKPreparationError(f"pubspec.yaml not found at: {self.pubspec_path}")
+        
+        self._digest_caches: Dict[Path, DigestCache] = {}
+        self._cache_lock = threading.Lock()
     
     def extract_version(self) -> str:
         """
@@ -80,10 +140,7 @@ class APKPreparer:
             APKPreparationError: If version cannot be extracted
         """
         try:
-            with open(self.pubspec_path, 'r', encoding='utf-8') as f:
-                pubspec = yaml.safe_load(f)
-            
-            version = pubspec.get('version')
+            version = resolve(self.pubspec_path, ["version"])['version']
             
             if not version:
                 raise APKPreparationError("Version field not found in pubspec.yaml")
@@ -97,8 +154,8 @@ class APKPreparer:
             
             return version.strip()
             
-        except yaml.YAMLError as e:
-            raise APKPreparationError(f"Failed to parse pubspec.yaml: {e}")
+        except PubspecError as e:
+            raise APKPreparationError(str(e))
         except IOError as e:
             raise APKPreparationError(f"Failed to read pubspec.yaml: {e}")
     
@@ -107,7 +164,7 @@ class APKPreparer:
         Validate that the source APK exists and is a file.
         
         Args:
-            source_path: Path to source APK
+            source_path: Path to source APK or AAB
         
         Raises:
             FileNotFoundError: If APK doesn't exist
@@ -119,23 +176,396 @@ class APKPreparer:
         if not source_path.is_file():
             raise APKPreparationError(f"Source path is not a file: {source_path}")
         
-        # Validate it's an APK file
-        if not source_path.suffix.lower() == '.apk':
-            raise APKPreparationError(f"Source file is not an APK: {source_path}")
+        # Validate it's an APK or App Bundle
+        if source_path.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
+            raise APKPreparationError(f"Source file is not an APK or AAB: {source_path}")
+    
+    def expand_sources(self, sources: Sequence[str]) -> List[Path]:
+        """
+        Expand glob patterns and plain paths into a list of artifacts.
+        
+        Args:
+            sources: File paths and/or glob patterns
+        
+        Returns:
+            Sorted, de-duplicated list of resolved artifact paths
+        
+        Raises:
+            APKPreparationError: If a pattern matches nothing
+        """
+        resolved = []
+        for source in sources:
+            if glob.has_magic(source):
+                matches = [
+                    Path(match) for match in sorted(glob.glob(source))
+                    if Path(match).suffix.lower() in self.SUPPORTED_EXTENSIONS
+                ]
+                if not matches:
+                    raise APKPreparationError(f"No APK or AAB files match: {source}")
+                resolved.extend(matches)
+            else:
+                resolved.append(Path(source))
+        
+        unique = []
+        for path in (p.resolve() for p in resolved):
+            if path not in unique:
+                unique.append(path)
+        return unique
+    
+    @staticmethod
+    def artifact_variant(source_path: Path) -> str:
+        """
+        Derive the build variant from a Flutter output filename.
+        
+        Examples: app-release.apk -> "", app-arm64-v8a-release.apk -> "arm64-v8a"
+        
+        Args:
+            source_path: Path to source artifact
+        
+        Returns:
+            Variant string (empty for the universal build)
+        """
+        stem = source_path.stem
+        if stem.startswith("app-"):
+            stem = stem[len("app-"):]
+        if stem.endswith("-release") or stem == "release":
+            stem = stem[:-len("release")].rstrip("-")
+        return stem
+    
+    @staticmethod
+    def find_previous_versioned(
+        directory: Path,
+        base_name: str,
+        version: str,
+        suffix: str = ".apk",
+        variant: str = ""
+    ) -> Optional[Path]:
+        """
+        Find the newest versioned artifact older than version in directory.
+        
+        Args:
+            directory: Directory holding versioned outputs
+            base_name: Base name used for output files
+            version: Current version (excluded along with anything newer)
+            suffix: Artifact extension
+            variant: Optional variant inserted after the base name
+        
+        Returns:
+            Path to the previous versioned artifact, or None
+        """
+        stem = f"{base_name}-{variant}" if variant else base_name
+        pattern = re.compile(rf"{re.escape(stem)}-(\d[^/]*){re.escape(suffix)}")
+        current = version_key(version)
+        
+        candidates = []
+        for path in Path(directory).glob(f"{stem}-*{suffix}"):
+            match = pattern.fullmatch(path.name)
+            if match and version_key(match.group(1)) < current:
+                candidates.append((version_key(match.group(1)), path))
+        
+        return max(candidates)[1] if candidates else None
+    
+    def _output_dir(self, output_dir: Optional[str], source_path: Path) -> Path:
+        """Resolve (and create) the output directory for a source artifact."""
+        if output_dir:
+            output_path = Path(output_dir).resolve()
+            output_path.mkdir(parents=True, exist_ok=True)
+            return output_path
+        return source_path.parent
+    
+    def _stage_artifact(
+        self,
+        source_path: Path,
+        output_path: Path,
+        version: str,
+        base_name: str,
+        strategies: Sequence[str],
+        checksums: bool,
+        variant: str = "",
+        verbose: bool = False,
+        store: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Stage one artifact under its versioned and stable names.
+        
+        Args:
+            source_path: Validated source artifact
+            output_path: Directory receiving the staged files
+            version: Version string used in the versioned name
+            base_name: Base name for output files
+            strategies: Staging strategies to try, in order of preference
+            checksums: Compute digests while staging the versioned file
+            variant: Optional variant inserted after the base name
+            verbose: Print per-step progress
+            store: Link both names into the output directory's content store
+        
+        Returns:
+            Result dictionary for this artifact (see prepare_apk_files)
+        
+        Raises:
+            APKPreparationError: If staging or verification fails
+        """
+        stem = f"{base_name}-{variant}" if variant else base_name
+        suffix = source_path.suffix.lower()
+        kind = suffix.lstrip('.').upper()
+        
+        # Generate filenames
+        versioned_name = f"{stem}-{version}{suffix}"
+        stable_name = f"{stem}-latest{suffix}"
+        
+        versioned_path = output_path / versioned_name
+        stable_path = output_path / stable_name
+        
+        # Get source file size
+        source_size = source_path.stat().st_size
+        if verbose:
+            print(f"  Source {kind} size: {source_size / (1024*1024):.2f} MB")
+        
+        if store:
+            versioned_staging, stable_staging, blob = self._link_from_store(
+                source_path, versioned_path, stable_path, checksums, kind, verbose
+            )
+        else:
+            blob = None
+            versioned_staging, stable_staging = self._stage_copies(
+                source_path, versioned_path, stable_path, strategies, checksums, kind, verbose
+            )
+        
+        # Verify copies
+        if not versioned_path.exists() or versioned_path.stat().st_size != source_size:
+            raise APKPreparationError(f"Versioned {kind} verification failed")
+        
+        if not stable_path.exists() or stable_path.stat().st_size != source_size:
+            raise APKPreparationError(f"Stable {kind} verification failed")
+        
+        result = {
+            'version': version,
+            'source_path': str(source_path),
+            'variant': variant,
+            'size': source_size,
+            'versioned_path': str(versioned_path),
+            'versioned_name': versioned_name,
+            'stable_path': str(stable_path),
+            'stable_name': stable_name,
+            'staging': {
+                'versioned': {
+                    'strategy': versioned_staging['strategy'],
+                    'seconds': versioned_staging['seconds'],
+                },
+                'stable': {
+                    'strategy': stable_staging['strategy'],
+                    'seconds': stable_staging['seconds'],
+                },
+            },
+        }
+        
+        if blob:
+            result['blob'] = {
+                'sha256': blob['sha256'],
+                'path': blob['path'],
+                'stored': blob['stored'],
+            }
+        
+        # Both names hold the same bytes, so the single pass covers both
+        if checksums:
+            result.update(versioned_staging['digests'])
+        
+        return result
+    
+    def _stage_copies(
+        self,
+        source_path: Path,
+        versioned_path: Path,
+        stable_path: Path,
+        strategies: Sequence[str],
+        checksums: bool,
+        kind: str,
+        verbose: bool
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Stage source at both names with the staging engine."""
+        # Stage versioned name
+        if verbose:
+            print(f"[2/3] Creating versioned {kind}: {versioned_path.name}...")
+        try:
+            versioned_staging = stage_file(
+                source_path,
+                versioned_path,
+                strategies,
+                digests=self.CHECKSUM_ALGORITHMS if checksums else None,
+                cache=self._digest_cache(versioned_path.parent)
+            )
+            if verbose:
+                print(f"✓ {self._staged_verb(versioned_staging)}: {versioned_path} "
+                      f"({self._describe_staging(versioned_staging)})")
+        except (StagingError, IOError) as e:
+            raise APKPreparationError(f"Failed to create versioned {kind}: {e}")
+        
+        # Stage stable name
+        if verbose:
+            print(f"[3/3] Creating stable {kind}: {stable_path.name}...")
+        try:
+            stable_staging = stage_file(
+                source_path,
+                stable_path,
+                strategies,
+                cache=self._digest_cache(stable_path.parent)
+            )
+            if verbose:
+                print(f"✓ {self._staged_verb(stable_staging)}: {stable_path} "
+                      f"({self._describe_staging(stable_staging)})")
+        except (StagingError, IOError) as e:
+            raise APKPreparationError(f"Failed to create stable {kind}: {e}")
+        
+        return versioned_staging, stable_staging
+    
+    def _link_from_store(
+        self,
+        source_path: Path,
+        versioned_path: Path,
+        stable_path: Path,
+        checksums: bool,
+        kind: str,
+        verbose: bool
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """Put source into the output directory's store and link both names to it."""
+        store = ArtifactStore(versioned_path.parent / STORE_DIRNAME)
+        
+        if verbose:
+            print(f"[2/3] Storing {kind} in {store.root}...")
+        try:
+            blob = store.put(
+                source_path,
+                digests=self.CHECKSUM_ALGORITHMS if checksums else ("sha256",),
+                cache=self._digest_cache(versioned_path.parent)
+            )
+            if verbose:
+                state = "stored" if blob['stored'] else "already present"
+                print(f"✓ Blob {blob['sha256'][:12]} {state}")
+            
+            if verbose:
+                print(f"[3/3] Linking {versioned_path.name} and {stable_path.name}...")
+            versioned_staging = store.link(blob['sha256'], versioned_path)
+            stable_staging = store.link(blob['sha256'], stable_path)
+        except ArtifactStoreError as e:
+            raise APKPreparationError(f"Failed to store {kind}: {e}")
+        
+        if verbose:
+            print(f"✓ Linked: {versioned_path} ({self._describe_staging(versioned_staging)})")
+            print(f"✓ Linked: {stable_path} ({self._describe_staging(stable_staging)})")
+        
+        if checksums:
+            versioned_staging['digests'] = {
+                algorithm: blob[algorithm] for algorithm in self.CHECKSUM_ALGORITHMS
+            }
+        return versioned_staging, stable_staging, blob
+    
+    def create_delta(
+        self,
+        result: Dict[str, Any],
+        base_name: str,
+        max_workers: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Create a delta patch from the previous versioned APK to this one.
+        
+        Args:
+            result: Result of staging one artifact
+            base_name: Base name for output files
+            max_workers: Process pool size for per-entry diffing
+        
+        Returns:
+            Dictionary with delta_path, delta_name, delta_size and delta_from,
+            or None when there is no previous versioned APK
+        
+        Raises:
+            APKPreparationError: If patch generation fails
+        """
+        versioned_path = Path(result['versioned_path'])
+        if versioned_path.suffix.lower() != '.apk':
+            return None
+        
+        previous = self.find_previous_versioned(
+            versioned_path.parent,
+            base_name,
+            result['version'],
+            versioned_path.suffix.lower(),
+            result.get('variant', "")
+        )
+        if previous is None:
+            return None
+        
+        stem = f"{base_name}-{result['variant']}" if result.get('variant') else base_name
+        previous_version = previous.name[len(stem) + 1:-len(previous.suffix)]
+        delta_name = f"{stem}-{previous_version}-to-{result['version']}{PATCH_SUFFIX}"
+        delta_path = versioned_path.parent / delta_name
+        
+        if self._delta_is_current(delta_path, previous, result):
+            return {
+                'delta_path': str(delta_path),
+                'delta_name': delta_name,
+                'delta_size': delta_path.stat().st_size,
+                'delta_from': previous_version,
+            }
+        
+        try:
+            patch = create_patch(previous, versioned_path, delta_path, max_workers=max_workers)
+        except (APKDeltaError, IOError) as e:
+            raise APKPreparationError(f"Failed to create delta patch: {e}")
+        
+        return {
+            'delta_path': str(delta_path),
+            'delta_name': delta_name,
+            'delta_size': patch['patch_size'],
+            'delta_from': previous_version,
+        }
+    
+    def _delta_is_current(self, delta_path: Path, previous: Path, result: Dict[str, Any]) -> bool:
+        """Whether an existing patch already maps previous to this artifact."""
+        if 'sha256' not in result or not delta_path.exists():
+            return False
+        try:
+            header = read_patch_header(delta_path)
+        except (APKDeltaError, IOError):
+            return False
+        if header['new_sha256'] != result['sha256']:
+            return False
+        
+        cache = self._digest_cache(previous.parent)
+        cached = cache.get(previous, ("sha256",))
+        if cached is None:
+            cached = compute_digests(previous, ("sha256",))
+            cache.put(previous, cached)
+        return header['old_sha256'] == cached['sha256']
+    
+    def _manifest_entries(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Checksum manifest entries for both names of a staged artifact."""
+        digests = {algorithm: result[algorithm] for algorithm in self.CHECKSUM_ALGORITHMS}
+        return [
+            {'name': result['versioned_name'], 'size': result['size'], **digests},
+            {'name': result['stable_name'], 'size': result['size'], **digests},
+        ]
     
     def prepare_apk_files(
         self,
         source_apk: str,
         output_dir: Optional[str] = None,
-        base_name: str = "app-portfolio-release"
-    ) -> Dict[str, str]:
+        base_name: str = "app-portfolio-release",
+        strategies: Sequence[str] = DEFAULT_STRATEGIES,
+        checksums: bool = True,
+        delta: bool = False,
+        store: bool = False
+    ) -> Dict[str, Any]:
         """
         Prepare APK files with versioned and stable names.
         
         Args:
-            source_apk: Path to source APK file
+            source_apk: Path to source APK (or AAB) file
             output_dir: Output directory (defaults to same as source)
             base_name: Base name for output files
+            strategies: Staging strategies to try, in order of preference
+            checksums: Compute digests while staging and write the manifest
+            delta: Also create a patch from the previous versioned APK
+            store: Keep one copy per content in <output>/.store and link both names to it
         
         Returns:
             Dictionary containing:
@@ -144,6 +574,12 @@ class APKPreparer:
                 - versioned_name: Filename of versioned APK
                 - stable_path: Path to stable APK
                 - stable_name: Filename of stable APK
+                - staging: Strategy and timing used for each output
+                - sha256, sha512: Digests of the APK (if checksums enabled)
+                - checksums_path, sha256sums_path: Manifest paths (if checksums enabled)
+                - delta_path, delta_name, delta_size, delta_from: Patch (if delta
+                  enabled and a previous versioned APK exists)
+                - blob: sha256, path and stored flag of the store blob (if store enabled)
         
         Raises:
             APKPreparationError: If preparation fails
@@ -155,62 +591,627 @@ class APKPreparer:
         self.validate_source_apk(source_path)
         
         # Determine output directory
-        if output_dir:
-            output_path = Path(output_dir).resolve()
-            output_path.mkdir(parents=True, exist_ok=True)
-        else:
-            output_path = source_path.parent
+        output_path = self._output_dir(output_dir, source_path)
         
         # Extract version
         print("[1/3] Extracting version from pubspec.yaml...")
         version = self.extract_version()
         print(f"✓ Version extracted: {version}")
         
-        # Generate filenames
-        versioned_name = f"{base_name}-{version}.apk"
-        stable_name = f"{base_name}-latest.apk"
+        result = self._stage_artifact(
+            source_path,
+            output_path,
+            version,
+            base_name,
+            strategies,
+            checksums,
+            verbose=True,
+            store=store
+        )
         
-        versioned_path = output_path / versioned_name
-        stable_path = output_path / stable_name
+        if checksums:
+            result.update(self.write_checksum_manifest(
+                output_path, version, self._manifest_entries(result)
+            ))
+            print(f"✓ SHA-256: {result['sha256']}")
         
-        # Get source file size
-        source_size = source_path.stat().st_size
-        print(f"  Source APK size: {source_size / (1024*1024):.2f} MB")
+        if delta:
+            patch = self.create_delta(result, base_name)
+            if patch:
+                result.update(patch)
+                print(f"✓ Delta from {patch['delta_from']}: {patch['delta_name']} "
+                      f"({patch['delta_size'] / (1024*1024):.2f} MB)")
+            else:
+                print("  No previous versioned APK found; delta skipped")
         
-        # Copy to versioned name
-        print(f"[2/3] Creating versioned APK: {versioned_name}...")
-        try:
-            shutil.copy2(source_path, versioned_path)
-            print(f"✓ Created: {versioned_path}")
-        except IOError as e:
-            raise APKPreparationError(f"Failed to create versioned APK: {e}")
+        self._save_digest_caches()
+        return result
+    
+    def prepare_batch(
+        self,
+        sources: Sequence[str],
+        output_dir: Optional[str] = None,
+        base_name: str = "app-portfolio-release",
+        strategies: Sequence[str] = DEFAULT_STRATEGIES,
+        checksums: bool = True,
+        max_workers: Optional[int] = None,
+        delta: bool = False,
+        store: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Prepare several artifacts (split-per-ABI APKs, AABs) in one run.
         
-        # Copy to stable name
-        print(f"[3/3] Creating stable APK: {stable_name}...")
-        try:
-            shutil.copy2(source_path, stable_path)
-            print(f"✓ Created: {stable_path}")
-        except IOError as e:
-            raise APKPreparationError(f"Failed to create stable APK: {e}")
+        The version is read once and every artifact is staged concurrently
+        on a thread pool (staging is I/O bound and releases the GIL).
         
-        # Verify copies
-        if not versioned_path.exists() or versioned_path.stat().st_size != source_size:
-            raise APKPreparationError("Versioned APK verification failed")
+        Args:
+            sources: File paths and/or glob patterns
+            output_dir: Output directory (defaults to each source's directory)
+            base_name: Base name for output files
+            strategies: Staging strategies to try, in order of preference
+            checksums: Compute digests and write one manifest per directory
+            max_workers: Thread pool size (defaults to the artifact count,
+                capped at the CPU count)
+            delta: Also create patches from the previous versioned APKs
+            store: Link outputs into each output directory's content store
         
-        if not stable_path.exists() or stable_path.stat().st_size != source_size:
-            raise APKPreparationError("Stable APK verification failed")
+        Returns:
+            Dictionary containing:
+                - version: Extracted version string
+                - artifacts: Per-artifact results (see prepare_apk_files)
+                - manifests: checksums_path/sha256sums_path per output directory
+        
+        Raises:
+            APKPreparationError: If preparation fails
+            FileNotFoundError: If a source doesn't exist
+        """
+        source_paths = self.expand_sources(sources)
+        if not source_paths:
+            raise APKPreparationError("No source artifacts given")
+        
+        for source_path in source_paths:
+            self.validate_source_apk(source_path)
+        
+        print("[1/3] Extracting version from pubspec.yaml...")
+        version = self.extract_version()
+        print(f"✓ Version extracted: {version}")
+        
+        jobs = []
+        claimed = {}
+        for source_path in source_paths:
+            output_path = self._output_dir(output_dir, source_path)
+            variant = self.artifact_variant(source_path)
+            key = (output_path, variant, source_path.suffix.lower())
+            if key in claimed:
+                raise APKPreparationError(
+                    f"Output name collision between {claimed[key]} and {source_path}"
+                )
+            claimed[key] = source_path
+            jobs.append((source_path, output_path, variant))
         
+        print(f"[2/3] Staging {len(jobs)} artifact(s)...")
+        if max_workers is not None and max_workers < 1:
+            raise APKPreparationError(f"max_workers must be at least 1, got {max_workers}")
+        workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    self._stage_artifact,
+                    source_path,
+                    output_path,
+                    version,
+                    base_name,
+                    strategies,
+                    checksums,
+                    variant,
+                    store=store
+                )
+                for source_path, output_path, variant in jobs
+            ]
+            artifacts = [future.result() for future in futures]
+        
+        for artifact in artifacts:
+            print(f"✓ {artifact['versioned_name']} ({self._describe_staging(artifact['staging']['versioned'])})")
+            print(f"✓ {artifact['stable_name']} ({self._describe_staging(artifact['staging']['stable'])})")
+        
+        manifests = []
+        if checksums:
+            print("[3/3] Writing checksum manifests...")
+            by_directory: Dict[str, List[Dict[str, Any]]] = {}
+            for artifact in artifacts:
+                directory = str(Path(artifact['versioned_path']).parent)
+                by_directory.setdefault(directory, []).extend(self._manifest_entries(artifact))
+            for directory, entries in by_directory.items():
+                manifests.append(self.write_checksum_manifest(Path(directory), version, entries))
+                print(f"✓ Manifest: {manifests[-1]['checksums_path']}")
+        
+        if delta:
+            for artifact in artifacts:
+                patch = self.create_delta(artifact, base_name)
+                if patch:
+                    artifact.update(patch)
+                    print(f"✓ Delta: {patch['delta_name']}")
+        
+        self._save_digest_caches()
         return {
             'version': version,
-            'versioned_path': str(versioned_path),
-            'versioned_name': versioned_name,
-            'stable_path': str(stable_path),
-            'stable_name': stable_name,
+            'artifacts': artifacts,
+            'manifests': manifests,
+        }
+    
+    def write_checksum_manifest(
+        self,
+        output_path: Path,
+        version: str,
+        files: List[Dict[str, Any]]
+    ) -> Dict[str, str]:
+        """
+        Write checksums.json and SHA256SUMS beside the prepared files.
+        
+        Args:
+            output_path: Directory holding the prepared files
+            version: Version string recorded in checksums.json
+            files: Entries with name, size, sha256 and sha512 keys
+        
+        Returns:
+            Dictionary containing checksums_path and sha256sums_path
+        
+        Raises:
+            APKPreparationError: If the manifest cannot be written
+        """
+        checksums_path = output_path / self.CHECKSUMS_JSON
+        sha256sums_path = output_path / self.SHA256SUMS
+        
+        manifest = {
+            'version': version,
+            'files': {
+                entry['name']: {
+                    'size': entry['size'],
+                    **{algorithm: entry[algorithm] for algorithm in self.CHECKSUM_ALGORITHMS},
+                }
+                for entry in files
+            },
         }
+        sums = "".join(f"{entry['sha256']}  {entry['name']}\n" for entry in files)
+        
+        try:
+            self._write_atomic(checksums_path, json.dumps(manifest, indent=2) + "\n")
+            self._write_atomic(sha256sums_path, sums)
+        except IOError as e:
+            raise APKPreparationError(f"Failed to write checksum manifest: {e}")
+        
+        return {
+            'checksums_path': str(checksums_path),
+            'sha256sums_path': str(sha256sums_path),
+        }
+    
+    @staticmethod
+    def _write_atomic(path: Path, content: str) -> None:
+        """Write text to path via a temporary file and rename."""
+        temporary = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        temporary.write_text(content, encoding='utf-8')
+        os.replace(temporary, path)
+    
+    def _digest_cache(self, output_path: Path) -> DigestCache:
+        """Digest cache shared by every artifact staged into output_path."""
+        with self._cache_lock:
+            if output_path not in self._digest_caches:
+                self._digest_caches[output_path] = DigestCache(output_path / self.DIGEST_CACHE)
+            return self._digest_caches[output_path]
+    
+    def _save_digest_caches(self) -> None:
+        """Persist digest caches; failing to save only costs the next fast path."""
+        for cache in self._digest_caches.values():
+            try:
+                cache.save()
+            except OSError as e:
+                print(f"  Warning: could not save {cache.path}: {e}", file=sys.stderr)
+    
+    @staticmethod
+    def _staged_verb(staging: Dict[str, Any]) -> str:
+        """Progress verb for a staging result."""
+        return "Up to date" if staging['strategy'] == UP_TO_DATE else "Created"
+    
+    @staticmethod
+    def _describe_staging(staging: Dict[str, Any]) -> str:
+        """Human-readable strategy and duration for a staging result."""
+        return f"{staging['strategy']}, {staging['seconds'] * 1000:.1f} ms"
+
+
+def _print_single_result(result: Dict[str, Any], args: argparse.Namespace) -> None:
+    """Print and export the result of a single-artifact run."""
+    # Output results
+    print()
+    print("=" * 60)
+    print("Preparation Complete!")
+    print("=" * 60)
+    print(f"Version: {result['version']}")
+    print()
+    print("Versioned APK:")
+    print(f"  Name: {result['versioned_name']}")
+    print(f"  Path: {result['versioned_path']}")
+    print()
+    print("Stable APK:")
+    print(f"  Name: {result['stable_name']}")
+    print(f"  Path: {result['stable_path']}")
+    print()
+    print("Staging:")
+    for label, staging in result['staging'].items():
+        print(f"  {label}: {APKPreparer._describe_staging(staging)}")
+    if 'blob' in result:
+        state = "new" if result['blob']['stored'] else "deduplicated"
+        print(f"  store: {result['blob']['path']} ({state})")
+    if 'checksums_path' in result:
+        print()
+        print("Checksums:")
+        print(f"  SHA-256: {result['sha256']}")
+        print(f"  Manifest: {result['checksums_path']}")
+    if 'delta_path' in result:
+        print()
+        print(f"Delta patch (from {result['delta_from']}):")
+        print(f"  Name: {result['delta_name']}")
+        print(f"  Size: {result['delta_size'] / (1024*1024):.2f} MB")
+    print("=" * 60)
+    print()
+    
+    # JSON output
+    if args.json:
+        print(json.dumps(result, indent=2))
+    
+    # GitHub Actions output
+    if args.github_output:
+        github_output = os.environ.get("GITHUB_OUTPUT")
+        if github_output:
+            with open(github_output, "a") as f:
+                f.write(f"version={result['version']}\n")
+                f.write(f"versioned_path={result['versioned_path']}\n")
+                f.write(f"versioned_name={result['versioned_name']}\n")
+                f.write(f"stable_path={result['stable_path']}\n")
+                f.write(f"stable_name={result['stable_name']}\n")
+                f.write(f"staging_strategy={result['staging']['versioned']['strategy']}\n")
+                if 'checksums_path' in result:
+                    f.write(f"sha256={result['sha256']}\n")
+                    f.write(f"checksums_path={result['checksums_path']}\n")
+                    f.write(f"sha256sums_path={result['sha256sums_path']}\n")
+                if 'delta_path' in result:
+                    f.write(f"delta_path={result['delta_path']}\n")
+                    f.write(f"delta_name={result['delta_name']}\n")
+            print("✓ GitHub Actions outputs written")
+        else:
+            print("# Environment variable format:")
+            print(f"export VERSION='{result['version']}'")
+            print(f"export VERSIONED_PATH='{result['versioned_path']}'")
+            print(f"export VERSIONED_NAME='{result['versioned_name']}'")
+            print(f"export STABLE_PATH='{result['stable_path']}'")
+            print(f"export STABLE_NAME='{result['stable_name']}'")
+            print(f"export STAGING_STRATEGY='{result['staging']['versioned']['strategy']}'")
+            if 'checksums_path' in result:
+                print(f"export SHA256='{result['sha256']}'")
+                print(f"export CHECKSUMS_PATH='{result['checksums_path']}'")
+                print(f"export SHA256SUMS_PATH='{result['sha256sums_path']}'")
+            if 'delta_path' in result:
+                print(f"export DELTA_PATH='{result['delta_path']}'")
+                print(f"export DELTA_NAME='{result['delta_name']}'")
+
+
+def _print_batch_result(result: Dict[str, Any], args: argparse.Namespace) -> None:
+    """Print and export the combined result of a batch run."""
+    print()
+    print("=" * 60)
+    print("Preparation Complete!")
+    print("=" * 60)
+    print(f"Version: {result['version']}")
+    print(f"Artifacts: {len(result['artifacts'])}")
+    for artifact in result['artifacts']:
+        print()
+        print(f"{artifact['variant'] or 'universal'} ({Path(artifact['source_path']).name}):")
+        print(f"  Versioned: {artifact['versioned_path']}")
+        print(f"  Stable: {artifact['stable_path']}")
+    for manifest in result['manifests']:
+        print()
+        print(f"Manifest: {manifest['checksums_path']}")
+    print("=" * 60)
+    print()
+    
+    if args.json:
+        print(json.dumps(result, indent=2))
+    
+    if args.github_output:
+        summary = [
+            {
+                key: artifact[key]
+                for key in ('variant', 'versioned_path', 'versioned_name',
+                            'stable_path', 'stable_name', 'sha256', 'delta_path', 'delta_name')
+                if key in artifact
+            }
+            for artifact in result['artifacts']
+        ]
+        artifacts_json = json.dumps(summary, separators=(',', ':'))
+        github_output = os.environ.get("GITHUB_OUTPUT")
+        if github_output:
+            with open(github_output, "a") as f:
+                f.write(f"version={result['version']}\n")
+                f.write(f"artifact_count={len(result['artifacts'])}\n")
+                f.write(f"artifacts={artifacts_json}\n")
+            print("✓ GitHub Actions outputs written")
+        else:
+            print("# Environment variable format:")
+            print(f"export VERSION='{result['version']}'")
+            print(f"export ARTIFACT_COUNT='{len(result['artifacts'])}'")
+            print(f"export ARTIFACTS='{artifacts_json}'")
+
+
+def analyze_main(argv: Sequence[str]) -> int:
+    """Entry point for the 'analyze' subcommand"""
+    parser = argparse.ArgumentParser(
+        prog="prepare_apk.py analyze",
+        description="Size breakdown of an APK/AAB from its ZIP central directory (no extraction)"
+    )
+    parser.add_argument(
+        "apk",
+        help="Path to the APK or AAB to analyze"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of largest entries to list (default: 10)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the report as JSON"
+    )
+    parser.add_argument(
+        "--github-output",
+        action="store_true",
+        help="Write total sizes in GitHub Actions format"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        report = analyze_apk(args.apk, top=args.top)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    except APKAnalysisError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("=" * 60)
+        print(f"APK Composition - {Path(args.apk).name}")
+        print("=" * 60)
+        print(f"File size: {report['file_size'] / (1024*1024):.2f} MB, {report['entries']} entries")
+        print()
+        print(format_report(report))
+    
+    if args.github_output:
+        github_output = os.environ.get("GITHUB_OUTPUT")
+        if github_output:
+            with open(github_output, "a") as f:
+                f.write(f"apk_size={report['file_size']}\n")
+                f.write(f"apk_uncompressed_size={report['uncompressed_size']}\n")
+        else:
+            print(f"export APK_SIZE='{report['file_size']}'")
+            print(f"export APK_UNCOMPRESSED_SIZE='{report['uncompressed_size']}'")
+    
+    return 0
+
+
+def _parse_group_sizes(values: Optional[Sequence[str]]) -> Dict[str, str]:
+    """Parse repeated GROUP=SIZE arguments."""
+    sizes = {}
+    for value in values or ():
+        group, separator, size = value.rpartition('=')
+        if not separator or not group:
+            raise APKAnalysisError(f"Expected GROUP=SIZE, got: {value}")
+        sizes[group] = size
+    return sizes
+
+
+def diff_main(argv: Sequence[str]) -> int:
+    """Entry point for the 'diff' subcommand"""
+    parser = argparse.ArgumentParser(
+        prog="prepare_apk.py diff",
+        description="Compare an APK with the previous versioned APK and enforce size budgets",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Compare with the previous app-portfolio-release-<version>.apk next to it
+  python prepare_apk.py diff dist/app-portfolio-release-latest.apk
+  
+  # Fail when the APK exceeds 30 MB or grows by more than 500 KB
+  python prepare_apk.py diff dist/app-portfolio-release-latest.apk \\
+      --max-total-size 30MB --max-total-growth 500KB --group-budget fonts=1MB
+  
+  # Budgets from a JSON file
+  python prepare_apk.py diff new.apk --previous old.apk --budget-file apk-budgets.json
+        """
+    )
+    parser.add_argument(
+        "apk",
+        help="Path to the new APK"
+    )
+    parser.add_argument(
+        "--previous",
+        help="Previous APK (defaults to the newest older versioned APK in the same directory)"
+    )
+    parser.add_argument(
+        "--base-name",
+        default="app-portfolio-release",
+        help="Base name of versioned files (default: app-portfolio-release)"
+    )
+    parser.add_argument(
+        "--project-root",
+        help="Project root directory (defaults to script parent directory)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of top growers to list (default: 10)"
+    )
+    parser.add_argument(
+        "--budget-file",
+        help="JSON file with total, total_growth, groups and group_growth budgets"
+    )
+    parser.add_argument(
+        "--max-total-size",
+        help="Fail if the APK is larger than this (e.g. 30MB)"
+    )
+    parser.add_argument(
+        "--max-total-growth",
+        help="Fail if the APK grew by more than this (e.g. 500KB)"
+    )
+    parser.add_argument(
+        "--group-budget",
+        action="append",
+        metavar="GROUP=SIZE",
+        help="Maximum compressed size of a group; repeatable (e.g. fonts=1MB)"
+    )
+    parser.add_argument(
+        "--group-growth-budget",
+        action="append",
+        metavar="GROUP=SIZE",
+        help="Maximum growth of a group; repeatable (e.g. lib/arm64-v8a=200KB)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the diff as JSON"
+    )
+    parser.add_argument(
+        "--github-output",
+        action="store_true",
+        help="Write size delta and budget status in GitHub Actions format"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        budgets = load_budgets(
+            args.budget_file,
+            total=args.max_total_size,
+            total_growth=args.max_total_growth,
+            groups=_parse_group_sizes(args.group_budget),
+            group_growth=_parse_group_sizes(args.group_growth_budget)
+        )
+        
+        previous = args.previous
+        if previous is None:
+            project_root = Path(args.project_root) if args.project_root else None
+            version = APKPreparer(project_root=project_root).extract_version()
+            new_path = Path(args.apk).resolve()
+            previous = APKPreparer.find_previous_versioned(
+                new_path.parent, args.base_name, version, new_path.suffix.lower()
+            )
+        
+        diff = diff_apks(previous, args.apk, top=args.top)
+        violations = check_budgets(diff, budgets)
+        diff['budget_violations'] = violations
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    except (APKAnalysisError, APKPreparationError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    
+    if args.json:
+        print(json.dumps(diff, indent=2))
+    else:
+        print("=" * 60)
+        print("APK Size Diff")
+        print("=" * 60)
+        print(format_diff(diff))
+        print()
+        if violations:
+            for violation in violations:
+                print(f"✗ {violation}")
+        else:
+            print("✓ All size budgets met")
+    
+    if args.github_output:
+        github_output = os.environ.get("GITHUB_OUTPUT")
+        if github_output:
+            with open(github_output, "a") as f:
+                f.write(f"apk_size={diff['new_size']}\n")
+                f.write(f"apk_size_delta={diff['delta']}\n")
+                f.write(f"budget_ok={'false' if violations else 'true'}\n")
+        else:
+            print(f"export APK_SIZE='{diff['new_size']}'")
+            print(f"export APK_SIZE_DELTA='{diff['delta']}'")
+            print(f"export BUDGET_OK='{'false' if violations else 'true'}'")
+    
+    if violations:
+        print(f"ERROR: {len(violations)} size budget(s) exceeded", file=sys.stderr)
+        return 1
+    
+    return 0
 
 
-def main():
+def gc_main(argv: Sequence[str]) -> int:
+    """Entry point for the 'gc' subcommand"""
+    parser = argparse.ArgumentParser(
+        prog="prepare_apk.py gc",
+        description=f"Remove {STORE_DIRNAME} blobs that no prepared file links to any more"
+    )
+    parser.add_argument(
+        "output_dir",
+        help=f"Output directory holding the {STORE_DIRNAME} store"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List unreferenced blobs without deleting them"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the result as JSON"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    output_dir = Path(args.output_dir)
+    if not output_dir.is_dir():
+        print(f"ERROR: Output directory not found: {output_dir}", file=sys.stderr)
+        return 1
+    
+    try:
+        result = ArtifactStore(output_dir / STORE_DIRNAME).gc([output_dir], dry_run=args.dry_run)
+    except ArtifactStoreError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        action = "Would remove" if args.dry_run else "Removed"
+        for sha256 in result['removed']:
+            print(f"  {action}: {sha256}")
+        print(f"✓ {action} {len(result['removed'])} blob(s), kept {result['kept']}, "
+              f"reclaimed {result['reclaimed_bytes'] / (1024*1024):.2f} MB")
+    
+    return 0
+
+
+SUBCOMMANDS = {
+    'analyze': analyze_main,
+    'diff': diff_main,
+    'gc': gc_main,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None):
     """Main entry point for the script"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+    
     parser = argparse.ArgumentParser(
         description="Prepare APK files with versioned and stable names",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -227,12 +1228,24 @@ Examples:
   
   # With GitHub Actions output
   python prepare_apk.py app-release.apk --github-output
+  
+  # Batch: split-per-ABI APKs and the App Bundle in one run
+  python prepare_apk.py 'build/app/outputs/flutter-apk/app-*-release.apk' \\
+      build/app/outputs/bundle/release/app-release.aab --output-dir dist/ --json
+  
+  # Size breakdown of an APK (see 'prepare_apk.py analyze --help')
+  python prepare_apk.py analyze dist/app-portfolio-release-latest.apk
+  
+  # Deduplicate builds through dist/.store, then prune unreferenced blobs
+  python prepare_apk.py app-release.apk --output-dir dist/ --store
+  python prepare_apk.py gc dist/
         """
     )
     
     parser.add_argument(
         "source_apk",
-        help="Path to source APK file"
+        nargs="+",
+        help="Path to source APK/AAB file; several paths or glob patterns enable batch mode"
     )
     parser.add_argument(
         "--output-dir",
@@ -243,6 +1256,34 @@ Examples:
         default="app-portfolio-release",
         help="Base name for output files (default: app-portfolio-release)"
     )
+    parser.add_argument(
+        "--staging-strategy",
+        action="append",
+        choices=STRATEGIES,
+        help="Staging strategy to try; repeat to set the order "
+             f"(default: {', '.join(DEFAULT_STRATEGIES)}; hardlink only for outputs "
+             f"that are never rewritten in place)"
+    )
+    parser.add_argument(
+        "--no-checksums",
+        action="store_true",
+        help="Skip SHA-256/SHA-512 computation and the checksum manifest"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Worker threads for batch mode (default: one per artifact, at most the CPU count)"
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Create a delta patch from the previous versioned APK in the output directory"
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help=f"Keep one copy per content in <output-dir>/{STORE_DIRNAME} and hardlink both names to it"
+    )
     parser.add_argument(
         "--project-root",
         help="Project root directory (defaults to script parent directory)"
@@ -258,66 +1299,48 @@ Examples:
         help="Output results as JSON"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    batch = len(args.source_apk) > 1 or glob.has_magic(args.source_apk[0])
     
     try:
         print("=" * 60)
         print("APK Preparation - Version Management")
         print("=" * 60)
-        print(f"Source: {args.source_apk}")
+        print(f"Source: {' '.join(args.source_apk)}")
         print()
         
         # Initialize preparer
         project_root = Path(args.project_root) if args.project_root else None
         preparer = APKPreparer(project_root=project_root)
         
-        # Prepare APK files
-        result = preparer.prepare_apk_files(
-            source_apk=args.source_apk,
-            output_dir=args.output_dir,
-            base_name=args.base_name
-        )
+        strategies = args.staging_strategy or DEFAULT_STRATEGIES
         
-        # Output results
-        print()
-        print("=" * 60)
-        print("Preparation Complete!")
-        print("=" * 60)
-        print(f"Version: {result['version']}")
-        print()
-        print("Versioned APK:")
-        print(f"  Name: {result['versioned_name']}")
-        print(f"  Path: {result['versioned_path']}")
-        print()
-        print("Stable APK:")
-        print(f"  Name: {result['stable_name']}")
-        print(f"  Path: {result['stable_path']}")
-        print("=" * 60)
-        print()
-        
-        # JSON output
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2))
-        
-        # GitHub Actions output
-        if args.github_output:
-            github_output = os.environ.get("GITHUB_OUTPUT")
-            if github_output:
-                with open(github_output, "a") as f:
-                    f.write(f"version={result['version']}\n")
-                    f.write(f"versioned_path={result['versioned_path']}\n")
-                    f.write(f"versioned_name={result['versioned_name']}\n")
-                    f.write(f"stable_path={result['stable_path']}\n")
-                    f.write(f"stable_name={result['stable_name']}\n")
-                print("✓ GitHub Actions outputs written")
-            else:
-                print("# Environment variable format:")
-                print(f"export VERSION='{result['version']}'")
-                print(f"export VERSIONED_PATH='{result['versioned_path']}'")
-                print(f"export VERSIONED_NAME='{result['versioned_name']}'")
-                print(f"export STABLE_PATH='{result['stable_path']}'")
-                print(f"export STABLE_NAME='{result['stable_name']}'")
+        if batch:
+            result = preparer.prepare_batch(
+                sources=args.source_apk,
+                output_dir=args.output_dir,
+                base_name=args.base_name,
+                strategies=strategies,
+                checksums=not args.no_checksums,
+                max_workers=args.jobs,
+                delta=args.delta,
+                store=args.store
+            )
+            _print_batch_result(result, args)
+        else:
+            # Prepare APK files
+            result = preparer.prepare_apk_files(
+                source_apk=args.source_apk[0],
+                output_dir=args.output_dir,
+                base_name=args.base_name,
+                strategies=strategies,
+                checksums=not args.no_checksums,
+                delta=args.delta,
+                store=args.store
+            )
+            _print_single_result(result, args)
         
         return 0
         
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Shared pubspec.yaml Metadata Resolver
+
+This module answers "what is the value of key X in pubspec.yaml" for the
+release scripts without paying for a full YAML parse on every call:
+
+1. Cache     - values already resolved for this pubspec (keyed by mtime and
+               size) are read from .dart_tool/pubspec_metadata.json
+2. Fast path - top-level scalars (version, name, ...) and environment.sdk
+               are read with a line-oriented scan; PyYAML is not imported
+3. Fallback  - anything the scan cannot answer with certainty (nested
+               paths, flow/block values, values YAML would not type as a
+               string) is resolved with a full PyYAML parse
+
+Requirements:
+- Python 3.7+
+- PyYAML library (only imported by the fallback)
+
+Usage:
+    from pubspec_metadata import resolve
+
+    values = resolve("pubspec.yaml", ["version", "name", "environment.sdk"])
+    print(values['version'])
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+
+CACHE_RELATIVE_PATH = Path(".dart_tool") / "pubspec_metadata.json"
+
+# Keys the line scanner can answer: top-level scalars plus these children
+FAST_SECTIONS = {"environment": ("sdk", "flutter")}
+
+_KEY_LINE = re.compile(r"([A-Za-z_][\w-]*)\s*:(?:\s+(.*))?$")
+
+# Plain scalars PyYAML's implicit resolvers would not load as a string
+# (YAML 1.1 bool, int, float, null, timestamp and value)
+_NON_STRING = re.compile(
+    r"yes|Yes|YES|no|No|NO|true|True|TRUE|false|False|FALSE|on|On|ON|off|Off|OFF"
+    r"|[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+][0-9]+)?"
+    r"|\.[0-9][0-9_]*(?:[eE][-+][0-9]+)?"
+    r"|[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*"
+    r"|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN)"
+    r"|[-+]?0b[0-1_]+|[-+]?0[0-7_]+|[-+]?(?:0|[1-9][0-9_]*)|[-+]?0x[0-9a-fA-F_]+"
+    r"|[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+"
+    r"|~|null|Null|NULL|="
+    r"|[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}(?:(?:[Tt]|[ \t]+)[0-9]{1,2}:[0-9]{2}:[0-9]{2}.*)?"
+)
+
+
+class PubspecError(Exception):
+    """Custom exception for pubspec.yaml resolution errors."""
+    pass
+
+
+def get_value_by_path(data: Any, path: str) -> Any:
+    """Get value from nested dict using dot notation"""
+    keys = path.split('.')
+    value = data
+    for key in keys:
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            return None
+    return value
+
+
+def _parse_scalar(raw: str) -> Optional[str]:
+    """
+    Interpret a single-line YAML value as a string if that is unambiguous.
+
+    Returns:
+        The string value, or None when full YAML is needed
+    """
+    raw = raw.strip()
+    if not raw:
+        return None
+
+    if raw[0] == "'":
+        end = raw.find("'", 1)
+        if end < 0 or "''" in raw or raw[end + 1:].strip()[:1] not in ("", "#"):
+            return None
+        return raw[1:end]
+
+    if raw[0] == '"':
+        end = raw.find('"', 1)
+        if end < 0 or "\\" in raw[:end] or raw[end + 1:].strip()[:1] not in ("", "#"):
+            return None
+        return raw[1:end]
+
+    # Strip a trailing comment; '#' only starts one after whitespace
+    value = re.split(r"\s#", raw, maxsplit=1)[0].strip()
+    if not value or value[0] in "[]{}|>&*!%@`,?-:#" or _NON_STRING.fullmatch(value):
+        return None
+    if ": " in value or value.endswith(":"):
+        return None
+    return value
+
+
+def scan_scalars(text: str) -> Dict[str, str]:
+    """
+    Line-oriented scan of pubspec.yaml for simple string scalars.
+
+    Only unindented 'key: value' lines and the children listed in
+    FAST_SECTIONS are considered. Keys whose values are not plain one-line
+    strings are omitted so that callers fall back to a full parse.
+
+    Args:
+        text: pubspec.yaml content
+
+    Returns:
+        Mapping of dotted key path to string value
+    """
+    values: Dict[str, str] = {}
+    section = None
+    child_indent = None
+    last_path = None
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if stripped in ("---", "...") or line.startswith(("\t", "%")):
+            # Multiple documents, directives or tab indentation: leave it to YAML
+            return {}
+
+        indent = len(line) - len(line.lstrip(" "))
+        match = _KEY_LINE.match(stripped)
+
+        if indent == 0:
+            section = None
+            child_indent = None
+            last_path = None
+            if not match:
+                continue
+            path, raw = match.group(1), match.group(2)
+            if raw is None or not raw.split('#')[0].strip():
+                section = path if path in FAST_SECTIONS else None
+                values.pop(path, None)
+                continue
+        elif section is not None and (child_indent is None or indent == child_indent):
+            child_indent = indent
+            last_path = None
+            if not match or match.group(1) not in FAST_SECTIONS[section]:
+                continue
+            path, raw = f"{section}.{match.group(1)}", match.group(2) or ""
+        else:
+            # Continuation of the previous value (e.g. a multi-line plain scalar)
+            if last_path is not None:
+                values.pop(last_path, None)
+            continue
+
+        parsed = _parse_scalar(raw)
+        if parsed is None:
+            values.pop(path, None)
+            last_path = None
+        else:
+            values[path] = parsed
+            last_path = path
+
+    return values
+
+
+def load_pubspec(pubspec_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Fully parse pubspec.yaml with PyYAML.
+
+    Args:
+        pubspec_path: Path to pubspec.yaml
+
+    Returns:
+        Parsed document (empty dict for an empty file)
+
+    Raises:
+        PubspecError: If PyYAML is missing or the file is invalid
+    """
+    try:
+        import yaml
+    except ImportError:
+        raise PubspecError("PyYAML library not found. Install with: pip install PyYAML")
+
+    try:
+        with open(pubspec_path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        raise PubspecError(f"Failed to parse pubspec.yaml: {e}")
+
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise PubspecError("pubspec.yaml must contain a mapping at the top level")
+    return data
+
+
+def _cache_path(pubspec_path: Path) -> Path:
+    return pubspec_path.parent / CACHE_RELATIVE_PATH
+
+
+def _read_cache(cache_path: Path, signature: List[int]) -> Dict[str, Any]:
+    """Cached values for this pubspec signature (empty on any mismatch)."""
+    try:
+        cached = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cached, dict) or cached.get('signature') != signature:
+        return {}
+    values = cached.get('values')
+    return values if isinstance(values, dict) else {}
+
+
+def _write_cache(cache_path: Path, signature: List[int], values: Dict[str, Any]) -> None:
+    """Persist resolved values; the cache is an optimisation, so errors are ignored."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = cache_path.with_name(f".{cache_path.name}.tmp-{os.getpid()}")
+        temporary.write_text(
+            json.dumps({'signature': signature, 'values': values}, indent=1) + "\n",
+            encoding='utf-8'
+        )
+        os.replace(temporary, cache_path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def resolve(
+    pubspec_path: Union[str, Path],
+    keys: Sequence[str],
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Resolve dotted key paths from pubspec.yaml.
+
+    Args:
+        pubspec_path: Path to pubspec.yaml
+        keys: Dotted key paths (e.g. "version", "environment.sdk")
+        use_cache: Read and update the mtime-keyed cache file
+
+    Returns:
+        Mapping of each key to its value (None when the key is absent)
+
+    Raises:
+        FileNotFoundError: If pubspec.yaml doesn't exist
+        PubspecError: If the full YAML fallback fails
+        IOError: If pubspec.yaml cannot be read
+    """
+    pubspec_path = Path(pubspec_path)
+    info = pubspec_path.stat()
+    signature = [info.st_mtime_ns, info.st_size]
+    cache_path = _cache_path(pubspec_path)
+
+    cached = _read_cache(cache_path, signature) if use_cache else {}
+    values = {key: cached[key] for key in keys if key in cached}
+    missing = [key for key in keys if key not in values]
+
+    if missing:
+        scanned = scan_scalars(pubspec_path.read_text(encoding='utf-8'))
+        for key in list(missing):
+            if key in scanned:
+                values[key] = scanned[key]
+                missing.remove(key)
+
+    if missing:
+        document = load_pubspec(pubspec_path)
+        for key in missing:
+            values[key] = get_value_by_path(document, key)
+
+    if use_cache and any(key not in cached for key in keys):
+        _write_cache(cache_path, signature, {**cached, **values})
+
+    return {key: values[key] for key in keys}
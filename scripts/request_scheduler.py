@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Rate-Limit-Aware Request Scheduler
+
+This module sits between the release scripts and an HTTP API client (such
+as PyGithub) and decides when each call may be sent:
+
+1. Queueing     - at most max_concurrent calls are in flight; the rest wait
+                  (uploads, marked transfer=True, are not counted)
+2. Write budget - mutating calls draw from a token bucket (a burst, then a
+                  steady rate), following GitHub's advice to space out
+                  POST/PATCH/PUT/DELETE requests
+3. Primary      - X-RateLimit-Remaining/Reset: when the budget runs low the
+   limit          remaining calls are spread until the reset, and no call
+                  is sent while it is exhausted
+4. Secondary    - 403/429 responses carrying Retry-After (or a rate-limit
+   limit          message) pause every caller and the call is retried
+
+Waits longer than max_wait are not taken: the original error is raised so
+a CI job fails promptly instead of hanging. Every call and every second
+spent waiting is counted for the run summary.
+
+Requirements:
+- Python 3.7+ (standard library only)
+
+Usage:
+    from request_scheduler import RequestScheduler
+
+    scheduler = RequestScheduler()
+    release = scheduler.call(lambda: repo.get_release("latest"))
+    scheduler.call(lambda: asset.delete_asset(), write=True)
+    print(scheduler.stats())
+
+    # From an event loop (async_release_uploader.py)
+    await scheduler.call_async(send_coroutine_function, write=True)
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, ContextManager, Dict, Mapping, Optional, Tuple
+
+
+# Wait suggested by GitHub for a secondary limit without Retry-After
+SECONDARY_LIMIT_WAIT = 60.0
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    Backoff before retry number attempt (1-based).
+
+    Exponential with "equal jitter": half of the capped delay is kept and
+    the other half is random, so concurrent callers do not retry in step.
+    """
+    delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def header(headers: Optional[Mapping[str, Any]], name: str) -> Optional[str]:
+    """Case-insensitive header lookup (None if absent)."""
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if str(key).lower() == name:
+            return str(value)
+    return None
+
+
+def parse_rate_limit(headers: Optional[Mapping[str, Any]]) -> Optional[Tuple[int, int, float]]:
+    """
+    Primary rate limit state from X-RateLimit-* headers.
+
+    Returns:
+        Tuple of (remaining, limit, reset epoch seconds), or None if absent
+    """
+    try:
+        remaining = int(float(header(headers, "X-RateLimit-Remaining")))
+        limit = int(float(header(headers, "X-RateLimit-Limit")))
+        reset = float(header(headers, "X-RateLimit-Reset"))
+    except (TypeError, ValueError):
+        return None
+    return remaining, limit, reset
+
+
+def rate_limit_wait(error: BaseException, now: float) -> Optional[float]:
+    """
+    Seconds to wait before retrying a call that failed on a rate limit.
+
+    Args:
+        error: Exception raised by the API client; its 'status' and
+            'headers' attributes are inspected (PyGithub's GithubException
+            carries both)
+        now: Current wall-clock time (epoch seconds)
+
+    Returns:
+        Wait in seconds, or None if the error is not a rate limit
+    """
+    status = getattr(error, 'status', None)
+    if status not in (403, 429):
+        return None
+    headers = getattr(error, 'headers', None)
+
+    retry_after = header(headers, "Retry-After")
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+    limits = parse_rate_limit(headers)
+    if limits is not None and limits[0] == 0:
+        return max(0.0, limits[2] - now)
+
+    if status == 429 or "rate limit" in str(error).lower():
+        return SECONDARY_LIMIT_WAIT
+    return None
+
+
+class RequestScheduler:
+    """
+    Paces API calls from any number of threads.
+
+    Calls are functions taking no arguments; the scheduler runs them when
+    the concurrency limit, write budget and observed rate limits allow,
+    and retries them after rate-limit errors.
+    """
+
+    # Calls in flight at once; the rest queue
+    DEFAULT_MAX_CONCURRENT = 4
+
+    # Write token bucket: a burst of this many, then this many per second
+    DEFAULT_WRITE_BURST = 10
+    DEFAULT_WRITE_RATE = 1.0
+
+    # Once fewer calls than this remain, spread them until the reset
+    LOW_REMAINING = 50
+
+    # Rate-limit retries per call, and the longest single wait taken
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_MAX_WAIT = 900.0
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        write_burst: Optional[int] = None,
+        write_rate: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        limits: Optional[Callable[[], Optional[Tuple[int, int, float]]]] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrent: Calls in flight at once (default: DEFAULT_MAX_CONCURRENT)
+            write_burst: Writes sent without spacing (default: DEFAULT_WRITE_BURST)
+            write_rate: Sustained writes per second (default: DEFAULT_WRITE_RATE)
+            max_retries: Retries after rate-limit errors (default: DEFAULT_MAX_RETRIES)
+            max_wait: Longest wait in seconds before giving up (default: DEFAULT_MAX_WAIT)
+            limits: Callable returning the client's latest (remaining, limit,
+                reset epoch) after a successful call, or None if unknown
+        """
+        self.max_concurrent = max(1, max_concurrent or self.DEFAULT_MAX_CONCURRENT)
+        self.write_burst = max(1, write_burst or self.DEFAULT_WRITE_BURST)
+        self.write_rate = write_rate or self.DEFAULT_WRITE_RATE
+        self.max_retries = self.DEFAULT_MAX_RETRIES if max_retries is None else max(0, max_retries)
+        self.max_wait = self.DEFAULT_MAX_WAIT if max_wait is None else max_wait
+        self.limits = limits
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._write_tokens = float(self.write_burst)
+        self._write_refilled = time.monotonic()
+        self._next_call = 0.0
+        self._paused_until = 0.0
+        self._spacing = 0.0
+
+        self._requests = 0
+        self._rate_limited = 0
+        self._wait_seconds = 0.0
+        self._rate_limit: Optional[Tuple[int, int, float]] = None
+
+    def call(self, fn: Callable[[], Any], write: bool = False, transfer: bool = False) -> Any:
+        """
+        Run fn once the scheduler allows it, retrying rate-limit errors.
+
+        A call waits for its send time without holding a slot, and for any
+        pause set meanwhile; the slot is taken only while fn runs.
+
+        Args:
+            fn: API call taking no arguments
+            write: The call creates, changes or deletes something
+            transfer: fn sends a large body (an asset upload); it is paced
+                like any call but takes no slot, so uploads do not starve
+                metadata calls (the caller bounds how many run at once)
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            Whatever fn raises, once retries are exhausted, the wait would
+            exceed max_wait, or the error is not a rate limit
+        """
+        attempt = 0
+        while True:
+            self._wait(*self._reserve(write))
+            with self._slot(transfer):
+                try:
+                    result = fn()
+                except Exception as e:
+                    if not self._retry(e, attempt):
+                        raise
+                    attempt += 1
+                    continue
+                self._count()
+
+            self._observe_client()
+            return result
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]], write: bool = False) -> Any:
+        """
+        Coroutine version of call() for clients on an event loop.
+
+        Waits are taken with asyncio.sleep and no slot is held: the loop
+        bounds its own concurrency. The write budget, spacing, pauses and
+        counters are shared with threaded callers.
+
+        Args:
+            fn: Coroutine function taking no arguments
+            write: The call creates, changes or deletes something
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            Whatever fn raises, as for call()
+        """
+        attempt = 0
+        while True:
+            seconds, paused_until = self._reserve(write)
+            while seconds > 0:
+                self._count_wait(seconds)
+                await asyncio.sleep(seconds)
+                seconds, paused_until = self._extended_pause(paused_until)
+            try:
+                result = await fn()
+            except Exception as e:
+                if not self._retry(e, attempt):
+                    raise
+                attempt += 1
+                continue
+            self._count()
+
+            self._observe_client()
+            return result
+
+    def observe(self, headers: Optional[Mapping[str, Any]]) -> None:
+        """Update pacing from a response's X-RateLimit-* headers."""
+        limits = parse_rate_limit(headers)
+        if limits is not None:
+            self.observe_limits(*limits)
+
+    def observe_limits(self, remaining: int, limit: int, reset: float) -> None:
+        """
+        Update pacing from the primary rate limit state.
+
+        Args:
+            remaining: Calls left in the current window
+            limit: Calls allowed per window
+            reset: Window reset time (epoch seconds)
+        """
+        until_reset = max(0.0, reset - time.time())
+        with self._lock:
+            self._rate_limit = (remaining, limit, reset)
+            if remaining <= 0:
+                self._paused_until = max(self._paused_until, time.monotonic() + until_reset)
+                self._spacing = 0.0
+            elif remaining < self.LOW_REMAINING:
+                self._spacing = until_reset / remaining
+            else:
+                self._spacing = 0.0
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for seconds (e.g. after Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters for this scheduler.
+
+        Returns:
+            Dictionary containing:
+                - requests: Calls sent, including retried ones
+                - rate_limited: Calls rejected by a rate limit
+                - wait_seconds: Time callers spent waiting (summed over threads)
+                - remaining, limit: Last primary rate limit seen (None if unknown)
+        """
+        with self._lock:
+            remaining, limit = self._rate_limit[:2] if self._rate_limit else (None, None)
+            return {
+                'requests': self._requests,
+                'rate_limited': self._rate_limited,
+                'wait_seconds': self._wait_seconds,
+                'remaining': remaining,
+                'limit': limit,
+            }
+
+    def _reserve(self, write: bool) -> Tuple[float, float]:
+        """
+        Claim the next send time for a call.
+
+        Returns:
+            Tuple of (seconds to wait, pause deadline seen)
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until, self._next_call)
+
+            if write:
+                # Refill up to the burst size, then take a token (possibly
+                # going negative, which pushes this call later)
+                elapsed = now - self._write_refilled
+                self._write_tokens = min(float(self.write_burst), self._write_tokens + elapsed * self.write_rate)
+                self._write_refilled = now
+                self._write_tokens -= 1.0
+                if self._write_tokens < 0:
+                    start = max(start, now - self._write_tokens / self.write_rate)
+
+            if self._spacing:
+                self._next_call = start + self._spacing
+            return start - now, self._paused_until
+
+    def _retry(self, error: Exception, attempt: int) -> bool:
+        """Count a failed call; True if it is to be retried (every caller is paused first)."""
+        wait = rate_limit_wait(error, time.time())
+        self._count(rate_limited=wait is not None)
+        if wait is None or attempt >= self.max_retries or wait > self.max_wait:
+            return False
+        self.pause(wait)
+        self.observe(getattr(error, 'headers', None))
+        return True
+
+    def _observe_client(self) -> None:
+        if self.limits is not None:
+            limits = self.limits()
+            if limits is not None:
+                self.observe_limits(*limits)
+
+    def _slot(self, transfer: bool) -> ContextManager[Any]:
+        return nullcontext() if transfer else self._slots
+
+    def _wait(self, seconds: float, paused_until: float) -> None:
+        while seconds > 0:
+            self._count_wait(seconds)
+            time.sleep(seconds)
+            seconds, paused_until = self._extended_pause(paused_until)
+
+    def _extended_pause(self, paused_until: float) -> Tuple[float, float]:
+        """
+        A pause recorded by another caller while this one slept still applies.
+
+        Returns:
+            Tuple of (seconds left of a pause set after paused_until was
+            seen, or 0, and the pause deadline now seen)
+        """
+        with self._lock:
+            if self._paused_until <= paused_until:
+                return 0.0, paused_until
+            return self._paused_until - time.monotonic(), self._paused_until
+
+    def _count_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._wait_seconds += seconds
+
+    def _count(self, rate_limited: bool = False) -> None:
+        with self._lock:
+            self._requests += 1
+            if rate_limited:
+                self._rate_limited += 1
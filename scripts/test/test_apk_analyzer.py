@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the APK composition analyzer.
+
+Tests cover:
+- Central directory parsing against zipfile
+- Entry grouping (ABIs, dex, Flutter assets, fonts, res, AAB modules)
+- Report aggregation and formatting
+- Error handling for non-ZIP input
+- Entry diff, size budgets and the 'diff' subcommand
+- The 'analyze' subcommand of prepare_apk.py
+"""
+
+import json
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apk_analyzer import (
+    APKAnalysisError,
+    analyze_apk,
+    bundle_modules,
+    check_budgets,
+    classify_entry,
+    diff_apks,
+    format_diff,
+    format_report,
+    load_budgets,
+    parse_size,
+    read_central_directory
+)
+
+
+def build_apk(path: Path, entries, comment: bytes = b"") -> Path:
+    """Write a ZIP archive with the given {name: bytes} entries."""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+        archive.comment = comment
+    return path
+
+
+class TestCentralDirectory(unittest.TestCase):
+    """Test cases for read_central_directory()"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_matches_zipfile(self):
+        """Test parsed records agree with the standard library"""
+        apk = build_apk(self.temp_dir / "app.apk", {
+            "classes.dex": b"dex" * 1000,
+            "lib/arm64-v8a/libapp.so": bytes(range(256)) * 40,
+            "assets/flutter_assets/AssetManifest.json": b"{}",
+            "res/layout/ünïcode.xml": b"<x/>",
+        })
+
+        entries = read_central_directory(apk)
+
+        with zipfile.ZipFile(apk) as archive:
+            expected = [
+                (info.filename, info.CRC, info.compress_size, info.file_size)
+                for info in archive.infolist()
+            ]
+        self.assertEqual(
+            [(e.name, e.crc32, e.compressed_size, e.uncompressed_size) for e in entries],
+            expected
+        )
+
+    def test_signature_inside_comment(self):
+        """Test a fake EOCD signature in the archive comment is skipped"""
+        apk = build_apk(
+            self.temp_dir / "app.apk",
+            {"classes.dex": b"dex"},
+            comment=b"PK\x05\x06 not a real record"
+        )
+
+        entries = read_central_directory(apk)
+
+        self.assertEqual([e.name for e in entries], ["classes.dex"])
+
+    def test_not_a_zip(self):
+        """Test non-ZIP input raises APKAnalysisError"""
+        bogus = self.temp_dir / "bogus.apk"
+        bogus.write_bytes(b"definitely not a zip" * 10)
+
+        with self.assertRaises(APKAnalysisError):
+            read_central_directory(bogus)
+
+    def test_empty_file(self):
+        """Test empty input raises APKAnalysisError"""
+        empty = self.temp_dir / "empty.apk"
+        empty.write_bytes(b"")
+
+        with self.assertRaises(APKAnalysisError):
+            read_central_directory(empty)
+
+    def test_missing_file(self):
+        """Test missing input raises FileNotFoundError"""
+        with self.assertRaises(FileNotFoundError):
+            read_central_directory(self.temp_dir / "missing.apk")
+
+
+class TestClassifyEntry(unittest.TestCase):
+    """Test cases for classify_entry()"""
+
+    def test_groups(self):
+        """Test typical Flutter APK and AAB paths"""
+        cases = [
+            ("lib/arm64-v8a/libflutter.so", "lib/arm64-v8a"),
+            ("lib/x86_64/libapp.so", "lib/x86_64"),
+            ("classes.dex", "classes*.dex"),
+            ("classes2.dex", "classes*.dex"),
+            ("assets/flutter_assets/fonts/montserrat/Montserrat-Bold.ttf", "fonts"),
+            ("assets/flutter_assets/assets/img/avatar.jpg", "assets/flutter_assets (images)"),
+            ("assets/flutter_assets/AssetManifest.bin", "assets/flutter_assets"),
+            ("assets/dexopt/baseline.prof", "assets"),
+            ("res/drawable-xxhdpi/splash.png", "res"),
+            ("resources.arsc", "resources.arsc"),
+            ("META-INF/CERT.RSA", "META-INF"),
+            ("AndroidManifest.xml", "other"),
+            ("base/lib/armeabi-v7a/libapp.so", "lib/armeabi-v7a"),
+            ("base/dex/classes.dex", "classes*.dex"),
+            ("base/assets/flutter_assets/NOTICES.Z", "assets/flutter_assets"),
+            ("base/res/values/strings.xml", "res"),
+        ]
+        for name, expected in cases:
+            with self.subTest(name=name):
+                self.assertEqual(classify_entry(name), expected)
+
+    def test_module_prefix_needs_known_module(self):
+        """Test only bundle modules are stripped, not APK directories like assets/res/"""
+        self.assertEqual(classify_entry("assets/res/x.png", ()), "assets")
+        self.assertEqual(classify_entry("assets/res/x.png"), "assets")
+        self.assertEqual(classify_entry("base/lib/x86_64/libapp.so", ()), "other")
+        self.assertEqual(classify_entry("maps/lib/x86_64/libmaps.so", {"base", "maps"}), "lib/x86_64")
+
+    def test_bundle_modules(self):
+        """Test modules are the directories holding a manifest"""
+        names = ["base/manifest/AndroidManifest.xml", "maps/manifest/AndroidManifest.xml",
+                 "base/dex/classes.dex", "assets/res/x.png", "AndroidManifest.xml"]
+
+        self.assertEqual(bundle_modules(names), {"base", "maps"})
+        self.assertEqual(bundle_modules(["AndroidManifest.xml", "assets/res/x.png"]), set())
+
+
+class TestAnalyzeAPK(unittest.TestCase):
+    """Test cases for analyze_apk() and the analyze subcommand"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.apk = build_apk(self.temp_dir / "app.apk", {
+            "classes.dex": b"d" * 4000,
+            "lib/arm64-v8a/libflutter.so": b"a" * 9000,
+            "lib/armeabi-v7a/libflutter.so": b"b" * 8000,
+            "assets/flutter_assets/fonts/Montserrat-Regular.ttf": b"f" * 3000,
+            "assets/flutter_assets/fonts/Montserrat-Bold.ttf": b"g" * 3000,
+            "res/": b"",
+        })
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_breakdown(self):
+        """Test totals and per-group aggregation"""
+        report = analyze_apk(self.apk, top=2)
+
+        self.assertEqual(report['entries'], 5)
+        self.assertEqual(report['uncompressed_size'], 27000)
+        groups = {g['group']: g for g in report['groups']}
+        self.assertEqual(groups['fonts']['files'], 2)
+        self.assertEqual(groups['fonts']['uncompressed_size'], 6000)
+        self.assertEqual(groups['lib/arm64-v8a']['uncompressed_size'], 9000)
+        self.assertEqual(
+            sum(g['compressed_size'] for g in report['groups']),
+            report['compressed_size']
+        )
+        self.assertEqual(len(report['largest']), 2)
+
+    def test_format_report(self):
+        """Test the text table lists every group and the total"""
+        text = format_report(analyze_apk(self.apk))
+
+        for label in ("lib/arm64-v8a", "classes*.dex", "fonts", "Total"):
+            self.assertIn(label, text)
+
+    def test_analyze_subcommand_json(self):
+        """Test 'prepare_apk.py analyze --json' prints the report"""
+        from prepare_apk import main
+
+        with patch('builtins.print') as mock_print:
+            exit_code = main(["analyze", str(self.apk), "--json"])
+
+        self.assertEqual(exit_code, 0)
+        report = json.loads(mock_print.call_args_list[0][0][0])
+        self.assertEqual(report['entries'], 5)
+
+    def test_analyze_subcommand_missing_file(self):
+        """Test the analyze subcommand fails cleanly on a missing file"""
+        from prepare_apk import main
+
+        with patch('sys.stderr'):
+            exit_code = main(["analyze", str(self.temp_dir / "missing.apk")])
+
+        self.assertEqual(exit_code, 1)
+
+
+class TestDiffAndBudgets(unittest.TestCase):
+    """Test cases for diff_apks() and budget checks"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        rng = random.Random(0)
+        noise = bytes(rng.getrandbits(8) for _ in range(20000))
+        self.old = build_apk(self.temp_dir / "app-portfolio-release-1.0.0+1.apk", {
+            "classes.dex": b"dex-v1" * 500,
+            "lib/arm64-v8a/libapp.so": noise[:10000],
+            "assets/flutter_assets/old.json": b"{}",
+            "res/raw/same.bin": b"same" * 100,
+        })
+        self.new = build_apk(self.temp_dir / "app-portfolio-release-1.1.0+2.apk", {
+            "classes.dex": b"dex-v2" * 500,
+            "lib/arm64-v8a/libapp.so": noise,
+            "assets/flutter_assets/fonts/Montserrat-Black.ttf": noise[:5000],
+            "res/raw/same.bin": b"same" * 100,
+        })
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_diff_statuses_and_growers(self):
+        """Test added/removed/changed detection and growth ordering"""
+        diff = diff_apks(self.old, self.new, top=5)
+
+        self.assertEqual(diff['changes'], {'added': 1, 'removed': 1, 'changed': 2})
+        self.assertEqual(diff['delta'], self.new.stat().st_size - self.old.stat().st_size)
+        growers = [change['name'] for change in diff['top_growers']]
+        self.assertEqual(growers[0], "lib/arm64-v8a/libapp.so")
+        self.assertIn("assets/flutter_assets/fonts/Montserrat-Black.ttf", growers)
+        self.assertNotIn("res/raw/same.bin", growers)
+        self.assertIn("Top growers", format_diff(diff))
+
+    def test_diff_without_baseline(self):
+        """Test a missing previous APK counts everything as added"""
+        diff = diff_apks(None, self.new)
+
+        self.assertEqual(diff['old_size'], 0)
+        self.assertEqual(diff['changes']['added'], 4)
+
+    def test_growth_budgets_skipped_without_baseline(self):
+        """Test growth budgets are n/a when there is no previous APK"""
+        diff = diff_apks(None, self.new)
+
+        violations = check_budgets(diff, load_budgets(
+            total="1KB",
+            total_growth="0",
+            group_growth={"lib/arm64-v8a": "0"}
+        ))
+        self.assertEqual(len(violations), 1)
+        self.assertIn("Total size", violations[0])
+        self.assertIn("growth budgets n/a", format_diff(diff))
+
+    def test_parse_size(self):
+        """Test size strings with binary units"""
+        self.assertEqual(parse_size("512KB"), 512 * 1024)
+        self.assertEqual(parse_size("1.5M"), int(1.5 * 1024 * 1024))
+        self.assertEqual(parse_size("42"), 42)
+        with self.assertRaises(APKAnalysisError):
+            parse_size("lots")
+
+    def test_budgets_from_file_and_overrides(self):
+        """Test file budgets merge with command-line overrides"""
+        budget_file = self.temp_dir / "budgets.json"
+        budget_file.write_text(json.dumps({"total": "30MB", "groups": {"fonts": "1MB"}}))
+
+        budgets = load_budgets(budget_file, total_growth="1KB", groups={"res": "2KB"})
+
+        self.assertEqual(budgets['total'], 30 * 1024 * 1024)
+        self.assertEqual(budgets['total_growth'], 1024)
+        self.assertEqual(budgets['groups'], {"fonts": 1024 * 1024, "res": 2048})
+
+    def test_check_budgets(self):
+        """Test violations are reported per budget"""
+        diff = diff_apks(self.old, self.new)
+
+        self.assertEqual(check_budgets(diff, load_budgets(total="30MB")), [])
+        violations = check_budgets(diff, load_budgets(
+            total="1KB",
+            total_growth="0",
+            groups={"lib/arm64-v8a": "1KB"},
+            group_growth={"fonts": "10"}
+        ))
+        self.assertEqual(len(violations), 4)
+
+    def test_diff_subcommand_finds_previous_and_gates(self):
+        """Test 'prepare_apk.py diff' picks the previous version and fails over budget"""
+        from prepare_apk import main
+
+        (self.temp_dir / "pubspec.yaml").write_text("name: portfolio\nversion: 1.1.0+2\n")
+
+        with patch('builtins.print') as mock_print:
+            exit_code = main([
+                "diff", str(self.new),
+                "--project-root", str(self.temp_dir),
+                "--json",
+            ])
+        self.assertEqual(exit_code, 0)
+        report = json.loads(mock_print.call_args_list[0][0][0])
+        self.assertEqual(Path(report['old_path']).name, self.old.name)
+
+        with patch('builtins.print'):
+            exit_code = main([
+                "diff", str(self.new),
+                "--previous", str(self.old),
+                "--max-total-growth", "0",
+            ])
+        self.assertEqual(exit_code, 1)
+
+        self.old.unlink()
+        with patch('builtins.print'):
+            exit_code = main([
+                "diff", str(self.new),
+                "--project-root", str(self.temp_dir),
+                "--max-total-growth", "0",
+            ])
+        self.assertEqual(exit_code, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
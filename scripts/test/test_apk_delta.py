@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the APK delta patch tool.
+
+Tests cover:
+- Block-matching diff primitives
+- Patch creation, application and verification round trips
+- Unchanged entries copied without diffing
+- Deflated entries diffed on inflated content, with byte-exact re-deflation
+- Rejection of wrong base APKs and corrupt patches
+- Delta generation from APKPreparer
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import apk_delta
+from apk_delta import (
+    APKDeltaError,
+    apply_patch,
+    create_patch,
+    diff_bytes,
+    read_patch_header,
+    verify_patch
+)
+
+
+def build_apk(path: Path, entries) -> Path:
+    """Write an APK-like ZIP; .so entries are stored like modern AGP output."""
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in entries.items():
+            info = zipfile.ZipInfo(name)
+            info.compress_type = zipfile.ZIP_STORED if name.endswith('.so') else zipfile.ZIP_DEFLATED
+            archive.writestr(info, data)
+    return path
+
+
+class TestDiffBytes(unittest.TestCase):
+    """Test cases for diff_bytes()"""
+
+    def rebuild(self, old: bytes, ops) -> bytes:
+        """Replay instructions against old"""
+        out = bytearray()
+        for op in ops:
+            out += old[op[1]:op[1] + op[2]] if op[0] == 'C' else op[1]
+        return bytes(out)
+
+    def test_insertion_is_mostly_copied(self):
+        """Test an insertion produces copies around a small literal"""
+        rng = random.Random(3)
+        old = bytes(rng.getrandbits(8) for _ in range(50000))
+        new = old[:20000] + b"inserted!" + old[20000:]
+
+        ops = diff_bytes(old, new)
+
+        self.assertEqual(self.rebuild(old, ops), new)
+        literal = sum(len(op[1]) for op in ops if op[0] == 'D')
+        self.assertLess(literal, 100)
+
+    def test_short_inputs_are_literal(self):
+        """Test inputs shorter than a block become a single literal"""
+        self.assertEqual(diff_bytes(b"abc", b"abd"), [('D', b"abd")])
+
+    def test_old_base_offsets_copies(self):
+        """Test COPY offsets are relative to the containing file"""
+        old = bytes(range(256)) * 4
+        ops = diff_bytes(old, old, old_base=1000)
+
+        self.assertEqual(ops[1], ('C', 1000, len(old)))
+
+
+class TestPatchRoundTrip(unittest.TestCase):
+    """Test cases for create_patch(), apply_patch() and verify_patch()"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        rng = random.Random(7)
+        library = bytes(rng.getrandbits(8) for _ in range(300000))
+        image = bytes(rng.getrandbits(8) for _ in range(40000))
+
+        self.old = build_apk(self.temp_dir / "app-portfolio-release-1.0.0+1.apk", {
+            "AndroidManifest.xml": b"<manifest/>" * 20,
+            "classes.dex": b"dex-one" * 3000,
+            "lib/arm64-v8a/libapp.so": library,
+            "assets/flutter_assets/assets/img/avatar.jpg": image,
+        })
+        self.new = build_apk(self.temp_dir / "app-portfolio-release-1.1.0+2.apk", {
+            "AndroidManifest.xml": b"<manifest/>" * 20,
+            "classes.dex": b"dex-two" * 3000,
+            "lib/arm64-v8a/libapp.so": library[:150000] + b"new code" * 64 + library[150000:],
+            "assets/flutter_assets/assets/img/avatar.jpg": image,
+            "assets/flutter_assets/NOTICES.Z": b"notices" * 100,
+        })
+        self.patch_path = self.temp_dir / "update.apkpatch"
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip_is_byte_exact(self):
+        """Test applying the patch reproduces the new APK exactly"""
+        result = create_patch(self.old, self.new, self.patch_path, max_workers=2)
+        output = self.temp_dir / "rebuilt.apk"
+
+        applied = apply_patch(self.old, self.patch_path, output)
+
+        self.assertEqual(output.read_bytes(), self.new.read_bytes())
+        self.assertEqual(applied['size'], self.new.stat().st_size)
+        self.assertLess(result['patch_size'], self.new.stat().st_size // 5)
+        self.assertEqual(result['entries'], 5)
+
+    def test_unchanged_entries_are_not_diffed(self):
+        """Test only entries whose CRC changed go through the diff worker"""
+        with patch.object(apk_delta, 'POOL_THRESHOLD', 1 << 40), \
+                patch.object(apk_delta, '_diff_segment', wraps=apk_delta._diff_segment) as spy, \
+                patch.object(apk_delta, '_diff_deflated_segment',
+                             wraps=apk_delta._diff_deflated_segment) as deflated_spy:
+            result = create_patch(self.old, self.new, self.patch_path)
+
+        self.assertEqual(result['entries_copied'], 2)
+        self.assertEqual(result['entries_diffed'], 3)
+        # 3 changed/new entries plus the central directory; classes.dex is
+        # deflated in both APKs and diffed on its inflated content
+        self.assertEqual(spy.call_count + deflated_spy.call_count, 4)
+        self.assertEqual(deflated_spy.call_count, 1)
+
+    def test_verify(self):
+        """Test dry-run verification with and without an expected APK"""
+        create_patch(self.old, self.new, self.patch_path)
+
+        self.assertTrue(verify_patch(self.old, self.patch_path)['valid'])
+        self.assertTrue(verify_patch(self.old, self.patch_path, self.new)['valid'])
+        mismatch = verify_patch(self.old, self.patch_path, self.old)
+        self.assertFalse(mismatch['valid'])
+        self.assertIn("differs", mismatch['reason'])
+
+    def test_header(self):
+        """Test the patch header records both APKs"""
+        create_patch(self.old, self.new, self.patch_path)
+
+        header = read_patch_header(self.patch_path)
+
+        self.assertEqual(header['old_name'], self.old.name)
+        self.assertEqual(header['new_size'], self.new.stat().st_size)
+
+    def test_newer_format_rejected(self):
+        """Test a patch from a newer tool is refused rather than misapplied"""
+        create_patch(self.old, self.new, self.patch_path)
+
+        with patch.object(apk_delta, 'PATCH_FORMAT', 1):
+            with self.assertRaises(APKDeltaError):
+                read_patch_header(self.patch_path)
+
+    def test_wrong_base_apk(self):
+        """Test a patch refuses to apply to a different APK"""
+        create_patch(self.old, self.new, self.patch_path)
+        output = self.temp_dir / "rebuilt.apk"
+
+        with self.assertRaises(APKDeltaError):
+            apply_patch(self.new, self.patch_path, output)
+        self.assertFalse(output.exists())
+
+    def test_empty_files(self):
+        """Test empty inputs are reported as APKDeltaError rather than an mmap failure"""
+        empty = self.temp_dir / "empty.apk"
+        empty.touch()
+        output = self.temp_dir / "rebuilt.apk"
+
+        for old, new in ((empty, self.new), (self.old, empty)):
+            with self.subTest(old=old.name, new=new.name), self.assertRaises(APKDeltaError):
+                create_patch(old, new, self.patch_path)
+        self.assertFalse(self.patch_path.exists())
+
+        create_patch(self.old, self.new, self.patch_path)
+        with self.assertRaises(APKDeltaError):
+            apply_patch(empty, self.patch_path, output)
+        self.assertFalse(output.exists())
+
+    def test_not_a_patch(self):
+        """Test non-patch input is rejected"""
+        bogus = self.temp_dir / "bogus.apkpatch"
+        bogus.write_bytes(b"garbage")
+
+        with self.assertRaises(APKDeltaError):
+            read_patch_header(bogus)
+
+
+class TestDeflatedEntries(unittest.TestCase):
+    """Test cases for diffing deflated entries on their inflated content"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        rng = random.Random(11)
+        words = [bytes(rng.choice(b"abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+                 for _ in range(2000)]
+        self.plain = b" ".join(rng.choice(words) for _ in range(60000))
+        # A small edit near the start changes almost every compressed byte after it
+        self.edited = self.plain[:1000] + b"changed " + self.plain[1000:]
+
+    def build(self, name, data, level=None):
+        with zipfile.ZipFile(self.temp_dir / name, 'w') as archive:
+            info = zipfile.ZipInfo("classes.dex")
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, data, compresslevel=level)
+        return self.temp_dir / name
+
+    def round_trip(self, old, new):
+        patch_path = self.temp_dir / "update.apkpatch"
+        result = create_patch(old, new, patch_path, max_workers=1)
+        output = self.temp_dir / "rebuilt.apk"
+        apply_patch(old, patch_path, output)
+        self.assertEqual(output.read_bytes(), new.read_bytes())
+        return result
+
+    def test_deflate_level_is_found(self):
+        """Test the level that reproduces a stream byte-for-byte is found"""
+        for level in (1, 6, 9):
+            with self.subTest(level=level):
+                compressed = apk_delta._deflate(self.plain, level)
+
+                found = apk_delta.deflate_level(compressed, self.plain)
+
+                self.assertEqual(apk_delta._deflate(self.plain, found), compressed)
+
+    def test_small_edit_gives_small_patch(self):
+        """Test an edit to a deflated entry costs about the edit, not the entry"""
+        old = self.build("old.apk", self.plain)
+        new = self.build("new.apk", self.edited, level=9)
+
+        result = self.round_trip(old, new)
+
+        compressed_size = zipfile.ZipFile(new).getinfo("classes.dex").compress_size
+        self.assertLess(result['patch_size'], compressed_size // 20)
+
+    def test_unknown_deflater_falls_back(self):
+        """Test an entry no zlib level reproduces is diffed as compressed bytes"""
+        old = self.build("old.apk", self.plain)
+        new = self.build("new.apk", self.edited)
+
+        # Inline, so the patched levels are seen by the worker
+        with patch.object(apk_delta, 'DEFLATE_LEVELS', ()), patch.object(apk_delta, 'POOL_THRESHOLD', 1 << 40):
+            result = self.round_trip(old, new)
+
+        compressed_size = zipfile.ZipFile(new).getinfo("classes.dex").compress_size
+        self.assertGreater(result['patch_size'], compressed_size // 2)
+
+
+class TestPreparerDelta(unittest.TestCase):
+    """Test cases for delta generation in APKPreparer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.dist = self.temp_dir / "dist"
+        self.dist.mkdir()
+        (self.temp_dir / "pubspec.yaml").write_text("name: portfolio\nversion: 1.1.0+2\n")
+        self.old = build_apk(self.dist / "app-portfolio-release-1.0.0+1.apk", {
+            "classes.dex": b"old" * 1000,
+        })
+        self.source = build_apk(self.temp_dir / "app-release.apk", {
+            "classes.dex": b"new" * 1000,
+        })
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_prepare_with_delta(self):
+        """Test --delta produces a patch from the previous versioned APK"""
+        from prepare_apk import APKPreparer
+
+        preparer = APKPreparer(project_root=self.temp_dir)
+        with patch('builtins.print'):
+            result = preparer.prepare_apk_files(
+                str(self.source), output_dir=str(self.dist), delta=True
+            )
+
+        self.assertEqual(result['delta_from'], "1.0.0+1")
+        self.assertEqual(result['delta_name'], "app-portfolio-release-1.0.0+1-to-1.1.0+2.apkpatch")
+        self.assertTrue(verify_patch(self.old, result['delta_path'], result['versioned_path'])['valid'])
+
+    def test_prepare_rerun_reuses_delta(self):
+        """Test an up-to-date patch is not regenerated on re-runs"""
+        from prepare_apk import APKPreparer
+
+        with patch('builtins.print'):
+            first = APKPreparer(project_root=self.temp_dir).prepare_apk_files(
+                str(self.source), output_dir=str(self.dist), delta=True
+            )
+            with patch('prepare_apk.create_patch') as mock_create:
+                second = APKPreparer(project_root=self.temp_dir).prepare_apk_files(
+                    str(self.source), output_dir=str(self.dist), delta=True
+                )
+
+        mock_create.assert_not_called()
+        self.assertEqual(second['delta_path'], first['delta_path'])
+        self.assertEqual(second['delta_size'], first['delta_size'])
+
+    def test_prepare_delta_without_previous(self):
+        """Test delta is skipped when no previous version exists"""
+        from prepare_apk import APKPreparer
+
+        self.old.unlink()
+        preparer = APKPreparer(project_root=self.temp_dir)
+        with patch('builtins.print'):
+            result = preparer.prepare_apk_files(
+                str(self.source), output_dir=str(self.dist), delta=True
+            )
+
+        self.assertNotIn('delta_path', result)
+
+
+if __name__ == "__main__":
+    unittest.main()
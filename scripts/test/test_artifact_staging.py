@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the artifact staging engine.
+
+Tests cover:
+- Strategy selection and fallback order
+- Content and metadata preservation
+- Replacing existing destinations
+- Single-pass digest computation
+- Digest cache and the up-to-date fast path
+- Error handling
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import artifact_staging
+from artifact_staging import (
+    UP_TO_DATE,
+    DigestCache,
+    StagingError,
+    compute_digests,
+    is_up_to_date,
+    stage_file
+)
+
+
+class TestStageFile(unittest.TestCase):
+    """Test cases for stage_file()"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source = self.temp_dir / "app-release.apk"
+        self.content = b"PK\x03\x04" + b"apk payload" * 1000
+        self.source.write_bytes(self.content)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_default_strategies_produce_identical_copy(self):
+        """Test default staging yields identical content and reports timing"""
+        destination = self.temp_dir / "out.apk"
+
+        result = stage_file(self.source, destination)
+
+        self.assertIn(result['strategy'], artifact_staging.DEFAULT_STRATEGIES)
+        self.assertGreaterEqual(result['seconds'], 0)
+        self.assertEqual(result['bytes'], len(self.content))
+        self.assertEqual(destination.read_bytes(), self.content)
+
+    def test_each_strategy_or_clean_failure(self):
+        """Test every strategy either stages correctly or raises StagingError"""
+        for name in artifact_staging.STRATEGIES:
+            with self.subTest(strategy=name):
+                destination = self.temp_dir / f"{name}.apk"
+                try:
+                    result = stage_file(self.source, destination, [name])
+                except StagingError:
+                    self.assertFalse(destination.exists())
+                    continue
+                self.assertEqual(result['strategy'], name)
+                self.assertEqual(destination.read_bytes(), self.content)
+
+    def test_hardlink_shares_inode(self):
+        """Test hardlink strategy does not duplicate data"""
+        destination = self.temp_dir / "linked.apk"
+
+        stage_file(self.source, destination, ["hardlink"])
+
+        self.assertEqual(destination.stat().st_ino, self.source.stat().st_ino)
+
+    def test_falls_back_in_order(self):
+        """Test unsupported strategies fall through to the next one"""
+        destination = self.temp_dir / "out.apk"
+
+        def unsupported(source, target):
+            raise OSError(95, "Operation not supported")
+
+        with patch.dict(artifact_staging.STRATEGY_FUNCTIONS, {
+            "reflink": unsupported,
+            "copy_file_range": unsupported,
+        }):
+            result = stage_file(self.source, destination)
+
+        self.assertEqual(result['strategy'], "copy")
+        self.assertEqual(destination.read_bytes(), self.content)
+
+    def test_default_does_not_follow_in_place_rebuild(self):
+        """Test a build output rewritten in place leaves the staged copy alone"""
+        destination = self.temp_dir / "app-1.0.0+1.apk"
+        stage_file(self.source, destination)
+
+        with open(self.source, 'r+b') as f:
+            f.write(b"rebuilt")
+
+        self.assertNotIn("hardlink", artifact_staging.DEFAULT_STRATEGIES)
+        self.assertNotEqual(destination.stat().st_ino, self.source.stat().st_ino)
+        self.assertEqual(destination.read_bytes(), self.content)
+
+    def test_copy_preserves_mtime(self):
+        """Test plain copy keeps source metadata"""
+        os.utime(self.source, (1_600_000_000, 1_600_000_000))
+        destination = self.temp_dir / "copied.apk"
+
+        stage_file(self.source, destination, ["copy"])
+
+        self.assertEqual(int(destination.stat().st_mtime), 1_600_000_000)
+
+    def test_replaces_existing_destination(self):
+        """Test staging overwrites a stale destination without leftovers"""
+        destination = self.temp_dir / "out.apk"
+        destination.write_bytes(b"stale")
+
+        for name in ("hardlink", "copy"):
+            with self.subTest(strategy=name):
+                stage_file(self.source, destination, [name])
+                self.assertEqual(destination.read_bytes(), self.content)
+
+        leftovers = [p.name for p in self.temp_dir.iterdir() if ".staging-" in p.name]
+        self.assertEqual(leftovers, [])
+
+    def test_restaging_same_inode_leaves_no_temporary(self):
+        """Test re-linking an already linked destination cleans up"""
+        destination = self.temp_dir / "linked.apk"
+
+        stage_file(self.source, destination, ["hardlink"])
+        stage_file(self.source, destination, ["hardlink"])
+
+        leftovers = [p.name for p in self.temp_dir.iterdir() if ".staging-" in p.name]
+        self.assertEqual(leftovers, [])
+
+    def test_digests_match_hashlib(self):
+        """Test digests are computed for every strategy that succeeds"""
+        expected = {
+            'sha256': hashlib.sha256(self.content).hexdigest(),
+            'sha512': hashlib.sha512(self.content).hexdigest(),
+        }
+        for name in ("reflink", "hardlink", "copy"):
+            with self.subTest(strategy=name):
+                try:
+                    result = stage_file(
+                        self.source, self.temp_dir / f"{name}.apk", [name],
+                        digests=("sha256", "sha512")
+                    )
+                except StagingError:
+                    continue
+                self.assertEqual(result['digests'], expected)
+
+    def test_copy_hashes_in_flight(self):
+        """Test plain copy does not re-read the file to hash it"""
+        with patch.object(artifact_staging, "_hash_file") as mock_hash:
+            result = stage_file(
+                self.source, self.temp_dir / "out.apk", ["copy"], digests=("sha256",)
+            )
+
+        mock_hash.assert_not_called()
+        self.assertEqual(result['digests']['sha256'], hashlib.sha256(self.content).hexdigest())
+
+    def test_digests_skip_copy_file_range(self):
+        """Test copy_file_range is not used when digests are requested"""
+        result = stage_file(
+            self.source, self.temp_dir / "out.apk",
+            ["copy_file_range", "copy"], digests=("sha256",)
+        )
+
+        self.assertEqual(result['strategy'], "copy")
+
+    def test_no_digests_by_default(self):
+        """Test digests are omitted unless requested"""
+        result = stage_file(self.source, self.temp_dir / "out.apk", ["copy"])
+
+        self.assertNotIn('digests', result)
+
+    def test_unsupported_digest(self):
+        """Test unknown digest algorithms are rejected"""
+        with self.assertRaises(StagingError):
+            stage_file(self.source, self.temp_dir / "out.apk", digests=("nope",))
+
+    def test_compute_digests(self):
+        """Test standalone digest helper"""
+        self.assertEqual(
+            compute_digests(self.source, ["sha256"]),
+            {'sha256': hashlib.sha256(self.content).hexdigest()}
+        )
+
+    def test_unknown_strategy(self):
+        """Test unknown strategy names are rejected"""
+        with self.assertRaises(StagingError) as context:
+            stage_file(self.source, self.temp_dir / "out.apk", ["teleport"])
+
+        self.assertIn("Unknown staging strategy", str(context.exception))
+
+    def test_all_strategies_fail(self):
+        """Test StagingError when nothing works"""
+        with self.assertRaises(StagingError):
+            stage_file(self.temp_dir / "missing.apk", self.temp_dir / "out.apk", ["copy"])
+
+
+class TestUpToDate(unittest.TestCase):
+    """Test cases for DigestCache and the up-to-date fast path"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source = self.temp_dir / "app-release.apk"
+        self.content = b"PK\x03\x04" + b"apk payload" * 1000
+        self.source.write_bytes(self.content)
+        self.cache = DigestCache(self.temp_dir / "cache.json")
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def fail_all_strategies(self):
+        """Patch every strategy to fail so any staging attempt is visible"""
+        def unsupported(*args):
+            raise OSError(95, "Operation not supported")
+
+        return patch.dict(artifact_staging.STRATEGY_FUNCTIONS, {
+            name: unsupported for name in artifact_staging.STRATEGIES
+        })
+
+    def test_rerun_skips_copy_and_hashing(self):
+        """Test a second stage with the cache does no I/O"""
+        destination = self.temp_dir / "out.apk"
+        stage_file(self.source, destination, ["copy"], digests=("sha256",), cache=self.cache)
+
+        with self.fail_all_strategies(), patch.object(artifact_staging, "_hash_file") as mock_hash:
+            result = stage_file(self.source, destination, ["copy"], digests=("sha256",), cache=self.cache)
+
+        mock_hash.assert_not_called()
+        self.assertEqual(result['strategy'], UP_TO_DATE)
+        self.assertEqual(result['digests'], {'sha256': self.sha256})
+
+    def test_same_inode_is_up_to_date(self):
+        """Test a hardlinked destination needs no cache"""
+        destination = self.temp_dir / "linked.apk"
+        os.link(self.source, destination)
+
+        self.assertTrue(is_up_to_date(self.source, destination))
+
+    def test_same_size_and_mtime_needs_cached_digest(self):
+        """Test size and mtime alone are not trusted without digests"""
+        destination = self.temp_dir / "out.apk"
+        destination.write_bytes(b"X" * len(self.content))
+        mtime = self.source.stat().st_mtime_ns
+        os.utime(destination, ns=(mtime, mtime))
+
+        self.assertFalse(is_up_to_date(self.source, destination, self.cache))
+
+        result = stage_file(self.source, destination, ["copy"], cache=self.cache)
+
+        self.assertEqual(result['strategy'], "copy")
+        self.assertEqual(destination.read_bytes(), self.content)
+
+    def test_changed_source_restages(self):
+        """Test modifying the source invalidates the fast path"""
+        destination = self.temp_dir / "out.apk"
+        stage_file(self.source, destination, ["copy"], digests=("sha256",), cache=self.cache)
+        self.source.write_bytes(b"rebuilt" * 10)
+
+        result = stage_file(self.source, destination, ["copy"], digests=("sha256",), cache=self.cache)
+
+        self.assertEqual(result['strategy'], "copy")
+        self.assertEqual(destination.read_bytes(), b"rebuilt" * 10)
+
+    def test_missing_digest_restages(self):
+        """Test a fast path is not taken when requested digests are unknown"""
+        destination = self.temp_dir / "out.apk"
+        stage_file(self.source, destination, ["copy"], digests=("sha256",), cache=self.cache)
+
+        result = stage_file(self.source, destination, ["copy"], digests=("sha512",), cache=self.cache)
+
+        self.assertEqual(result['strategy'], "copy")
+        self.assertEqual(self.cache.get(self.source, ("sha256", "sha512"))['sha256'], self.sha256)
+
+    def test_cache_persists_and_prunes(self):
+        """Test saved entries survive reload and stale ones are dropped"""
+        gone = self.temp_dir / "gone.apk"
+        gone.write_bytes(b"gone")
+        self.cache.put(self.source, {'sha256': self.sha256})
+        self.cache.put(gone, {'sha256': "0" * 64})
+        gone.unlink()
+
+        self.cache.save()
+        reloaded = DigestCache(self.temp_dir / "cache.json")
+
+        self.assertEqual(reloaded.get(self.source), {'sha256': self.sha256})
+        self.assertIsNone(reloaded.get(gone))
+
+    def test_corrupt_cache_is_ignored(self):
+        """Test an unreadable cache file starts empty"""
+        path = self.temp_dir / "cache.json"
+        path.write_text("{not json")
+
+        self.assertIsNone(DigestCache(path).get(self.source))
+
+
+if __name__ == "__main__":
+    unittest.main()
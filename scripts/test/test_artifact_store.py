@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-addressed artifact store.
+
+Tests cover:
+- Deduplicated puts and read-only blobs
+- Copied bytes checked against the blob name
+- Hardlinked names and the symlink fallback
+- Garbage collection of unreferenced blobs
+- Store mode and the 'gc' subcommand of prepare_apk.py
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import artifact_store
+from artifact_staging import DigestCache
+from artifact_store import ArtifactStore, ArtifactStoreError
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Test cases for ArtifactStore"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.dist = self.temp_dir / "dist"
+        self.dist.mkdir()
+        self.store = ArtifactStore(self.dist / ".store")
+        self.source = self.temp_dir / "app-release.apk"
+        self.content = b"PK\x03\x04" + b"apk payload" * 1000
+        self.source.write_bytes(self.content)
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_put_deduplicates(self):
+        """Test identical content is stored once"""
+        first = self.store.put(self.source)
+        second = self.store.put(self.source)
+
+        self.assertTrue(first['stored'])
+        self.assertFalse(second['stored'])
+        self.assertIsNone(second['strategy'])
+        self.assertEqual(first['sha256'], self.sha256)
+        self.assertEqual(Path(first['path']).name, self.sha256)
+        self.assertEqual(len(self.store.blobs()), 1)
+
+    def test_put_does_not_hardlink_source(self):
+        """Test the blob is independent of the build output"""
+        blob = Path(self.store.put(self.source)['path'])
+
+        self.assertNotEqual(blob.stat().st_ino, self.source.stat().st_ino)
+        self.assertFalse(blob.stat().st_mode & 0o222)
+
+    def test_put_extra_digests(self):
+        """Test requested digests are computed in the same pass"""
+        blob = self.store.put(self.source, digests=("sha256", "sha512"))
+
+        self.assertEqual(blob['sha512'], hashlib.sha512(self.content).hexdigest())
+
+    def test_put_rejects_source_changed_after_hashing(self):
+        """Test a source rewritten between hashing and copying is not stored under the old digest"""
+        compute_digests = artifact_store.compute_digests
+
+        def hash_then_rewrite(path, algorithms):
+            hashes = compute_digests(path, algorithms)
+            Path(path).write_bytes(b"rebuilt while storing")
+            return hashes
+
+        with patch.object(artifact_store, 'compute_digests', hash_then_rewrite):
+            with self.assertRaisesRegex(ArtifactStoreError, "changed"):
+                self.store.put(self.source)
+
+        self.assertEqual(self.store.blobs(), [])
+        self.assertEqual(list(self.store.root.iterdir()), [])
+
+    def test_put_rejects_stale_cache_hit(self):
+        """Test a cached digest that no longer matches the bytes is not trusted"""
+        cache = DigestCache(self.temp_dir / "digests.json")
+        cache.put(self.source, {'sha256': hashlib.sha256(b"an older build").hexdigest()})
+
+        with self.assertRaises(ArtifactStoreError):
+            self.store.put(self.source, cache=cache)
+
+        self.assertEqual(self.store.blobs(), [])
+
+    def test_link_shares_blob_inode(self):
+        """Test names are hardlinks to the blob"""
+        self.store.put(self.source)
+        name = self.dist / "app-latest.apk"
+        name.write_bytes(b"stale")
+
+        result = self.store.link(self.sha256, name)
+        self.store.link(self.sha256, name)
+
+        self.assertEqual(result['strategy'], "hardlink")
+        self.assertEqual(name.stat().st_ino, self.store.blob_path(self.sha256).stat().st_ino)
+        leftovers = [p.name for p in self.dist.iterdir() if ".staging-" in p.name]
+        self.assertEqual(leftovers, [])
+
+    def test_link_symlink_fallback(self):
+        """Test a relative symlink is used where hardlinks fail"""
+        self.store.put(self.source)
+        name = self.dist / "app-latest.apk"
+
+        with patch.object(artifact_store.os, "link", side_effect=OSError(1, "Operation not permitted")):
+            result = self.store.link(self.sha256, name)
+
+        self.assertEqual(result['strategy'], "symlink")
+        self.assertTrue(name.is_symlink())
+        self.assertFalse(os.path.isabs(os.readlink(name)))
+        self.assertEqual(name.read_bytes(), self.content)
+
+    def test_link_missing_blob(self):
+        """Test linking an unknown digest fails"""
+        with self.assertRaises(ArtifactStoreError):
+            self.store.link("0" * 64, self.dist / "app.apk")
+
+    def test_gc_removes_only_unreferenced(self):
+        """Test gc keeps hardlinked and symlinked blobs"""
+        other = self.temp_dir / "other.apk"
+        other.write_bytes(b"other build")
+        orphan = self.temp_dir / "orphan.apk"
+        orphan.write_bytes(b"orphaned build")
+
+        self.store.put(self.source)
+        self.store.link(self.sha256, self.dist / "app-latest.apk")
+        other_sha = self.store.put(other)['sha256']
+        os.symlink(os.path.relpath(self.store.blob_path(other_sha), self.dist),
+                   self.dist / "other.apk")
+        orphan_sha = self.store.put(orphan)['sha256']
+
+        dry = self.store.gc(dry_run=True)
+        self.assertEqual(dry['removed'], [orphan_sha])
+        self.assertTrue(self.store.blob_path(orphan_sha).exists())
+
+        result = self.store.gc()
+        self.assertEqual(result['removed'], [orphan_sha])
+        self.assertEqual(result['kept'], 2)
+        self.assertEqual(result['reclaimed_bytes'], len(b"orphaned build"))
+        self.assertFalse(self.store.blob_path(orphan_sha).exists())
+
+    def test_gc_missing_store(self):
+        """Test gc on a directory without a store is a no-op"""
+        result = ArtifactStore(self.temp_dir / "none" / ".store").gc([self.temp_dir])
+
+        self.assertEqual(result['removed'], [])
+
+
+class TestPreparerStore(unittest.TestCase):
+    """Test cases for store mode in prepare_apk.py"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.dist = self.temp_dir / "dist"
+        (self.temp_dir / "pubspec.yaml").write_text("name: portfolio\nversion: 1.0.0+1\n")
+        self.source = self.temp_dir / "app-release.apk"
+        self.content = b"PK\x03\x04" + b"apk payload" * 1000
+        self.source.write_bytes(self.content)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def prepare(self):
+        """Run a store-mode preparation quietly"""
+        from prepare_apk import APKPreparer
+
+        preparer = APKPreparer(project_root=self.temp_dir)
+        with patch('builtins.print'):
+            return preparer.prepare_apk_files(
+                str(self.source), output_dir=str(self.dist), store=True
+            )
+
+    def test_names_link_into_store(self):
+        """Test both names share the blob and checksums are still written"""
+        result = self.prepare()
+
+        blob = Path(result['blob']['path'])
+        self.assertEqual(blob.parent, self.dist / ".store")
+        self.assertEqual(Path(result['versioned_path']).stat().st_ino, blob.stat().st_ino)
+        self.assertEqual(Path(result['stable_path']).stat().st_ino, blob.stat().st_ino)
+        self.assertEqual(result['sha256'], hashlib.sha256(self.content).hexdigest())
+        manifest = json.loads(Path(result['checksums_path']).read_text())
+        self.assertEqual(manifest['files'][result['stable_name']]['sha256'], result['sha256'])
+
+    def test_rerun_is_deduplicated(self):
+        """Test an identical rebuild adds no blob"""
+        self.assertTrue(self.prepare()['blob']['stored'])
+        self.assertFalse(self.prepare()['blob']['stored'])
+        self.assertEqual(len(ArtifactStore(self.dist / ".store").blobs()), 1)
+
+    def test_gc_subcommand(self):
+        """Test 'prepare_apk.py gc' prunes blobs of deleted names"""
+        from prepare_apk import main
+
+        result = self.prepare()
+        Path(result['versioned_path']).unlink()
+        Path(result['stable_path']).unlink()
+
+        with patch('builtins.print') as mock_print:
+            exit_code = main(["gc", str(self.dist), "--json"])
+
+        self.assertEqual(exit_code, 0)
+        report = json.loads(mock_print.call_args_list[0][0][0])
+        self.assertEqual(report['removed'], [result['sha256']])
+        self.assertEqual(ArtifactStore(self.dist / ".store").blobs(), [])
+
+    def test_gc_subcommand_missing_directory(self):
+        """Test the gc subcommand fails cleanly on a missing directory"""
+        from prepare_apk import main
+
+        with patch('sys.stderr'):
+            exit_code = main(["gc", str(self.temp_dir / "missing")])
+
+        self.assertEqual(exit_code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
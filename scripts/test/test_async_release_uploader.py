@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio upload engine.
+
+Uploads run against the local fake GitHub API over real HTTP.
+
+Tests cover:
+- Keep-alive connection reuse through the shared HTTPPool
+- Pool options (size, timeouts, keep-alive) on the asyncio engine
+- Concurrent uploads, replacement and unchanged assets
+- Retries on 5xx and Retry-After rate limits
+- Pacing through the shared RequestScheduler
+- Concurrent asset-list pages and the ETag cache
+- The --engine asyncio command line option
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from requests.exceptions import Timeout
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from async_release_uploader import AsyncReleaseUploader, run_upload
+from fake_github_releases import FakeGitHubServer
+from http_pool import HTTPPool
+from request_scheduler import RequestScheduler
+from upload_to_github_releases import GitHubReleaseError, main
+
+
+class TestAsyncReleaseUploader(unittest.TestCase):
+    """End-to-end tests of AsyncReleaseUploader against FakeGitHubServer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.server = FakeGitHubServer(seed=1).start()
+        self.addCleanup(self.server.stop)
+        self.output = io.StringIO()
+        for redirect in (redirect_stdout(self.output), redirect_stderr(self.output)):
+            redirect.__enter__()
+            self.addCleanup(redirect.__exit__, None, None, None)
+
+    def write(self, name, data):
+        path = self.temp_dir / name
+        path.write_bytes(data)
+        return str(path)
+
+    def upload(self, files, **options):
+        async def run():
+            async with AsyncReleaseUploader("token", "owner/repo", base_url=self.server.url, **options) as uploader:
+                uploader.RETRY_BASE_DELAY = 0.01
+                results = await uploader.upload_files(files, force=options.pop('force', False))
+                return results, uploader.request_stats()
+
+        return asyncio.run(run())
+
+    def remote_assets(self):
+        with self.server.lock:
+            return {asset['name']: asset for asset in self.server.assets.values()}
+
+    def test_uploads_run_concurrently(self):
+        """Test every asset is uploaded at once on pooled connections"""
+        self.server.bandwidth = 200_000
+        files = [(self.write(f"app-{abi}.apk", abi.encode() * 10_000), f"app-{abi}.apk")
+                 for abi in ("arm64", "armv7", "x86_64", "x86")]
+
+        results, stats = self.upload(files)
+
+        self.assertTrue(all(result['uploaded'] for result in results))
+        self.assertEqual([result['asset_name'] for result in results], [name for _, name in files])
+        self.assertEqual(self.server.stats()['peak_concurrent_uploads'], 4)
+        self.assertEqual(sorted(self.remote_assets()), sorted(name for _, name in files))
+        self.assertLessEqual(stats['connections'], 4)
+        self.assertEqual(stats['requests'], self.server.stats()['requests'])
+
+    def test_labels_carry_digest(self):
+        """Test the asset label records the SHA-256"""
+        self.upload([(self.write("app.apk", b"payload"), "app.apk")])
+
+        self.assertIn(hashlib.sha256(b"payload").hexdigest(), self.remote_assets()["app.apk"]['label'])
+
+    def test_replace_and_skip_unchanged(self):
+        """Test changed files replace the asset and identical ones are skipped"""
+        path = self.write("app.apk", b"old")
+        self.upload([(path, "app.apk")])
+        self.write("app.apk", b"new content")
+
+        replaced, _ = self.upload([(path, "app.apk")])
+        unchanged, stats = self.upload([(path, "app.apk")])
+
+        self.assertTrue(replaced[0]['uploaded'])
+        self.assertFalse(unchanged[0]['uploaded'])
+        self.assertEqual(list(self.remote_assets()), ["app.apk"])
+        self.assertEqual(self.remote_assets()["app.apk"]['size'], len(b"new content"))
+        # Release lookup and asset list only
+        self.assertEqual(stats['requests'], 2)
+
+    def test_transient_upload_error_is_retried(self):
+        """Test a 502 upload is retried under a new temporary name"""
+        self.server.fail_next(502, route='upload')
+
+        results, _ = self.upload([(self.write("app.apk", b"payload"), "app.apk")])
+
+        self.assertEqual(results[0]['attempts'], 2)
+        self.assertEqual(list(self.remote_assets()), ["app.apk"])
+
+    def test_client_errors_are_not_retried(self):
+        """Test a 4xx upload fails at once"""
+        self.server.fail_next(422, route='upload')
+
+        with self.assertRaises(GitHubReleaseError):
+            self.upload([(self.write("app.apk", b"payload"), "app.apk")])
+        self.assertEqual(self.server.stats()['by_route']['upload'], 1)
+
+    def test_rate_limit_is_waited_out(self):
+        """Test a secondary rate limit is retried after Retry-After"""
+        self.server.retry_after = 0
+        self.server.fail_next(429, route='update_asset')
+
+        _, stats = self.upload([(self.write("app.apk", b"payload"), "app.apk")])
+
+        self.assertEqual(stats['rate_limited'], 1)
+        self.assertEqual(list(self.remote_assets()), ["app.apk"])
+
+    def test_asset_pages_are_fetched(self):
+        """Test every page of a long asset list is read"""
+        files = [(self.write(f"a{index}.bin", bytes([index])), f"a{index}.bin") for index in range(5)]
+        self.upload(files)
+        self.server.MAX_PER_PAGE = 2
+
+        results, stats = self.upload(files)
+
+        self.assertFalse(any(result['uploaded'] for result in results))
+        self.assertEqual(stats['requests'], 4)
+
+    def test_etag_cache_revalidates(self):
+        """Test cached release metadata is answered 304"""
+        path = self.write("app.apk", b"payload")
+        cache = self.temp_dir / "etags.json"
+        self.upload([(path, "app.apk")], etag_cache=cache)
+        self.upload([(path, "app.apk")], etag_cache=cache)
+
+        _, stats = self.upload([(path, "app.apk")], etag_cache=cache)
+
+        self.assertEqual(stats['not_modified'], 2)
+
+    def test_shared_pool_options(self):
+        """Test a caller's pool is used, left open, and its keep-alive setting honoured"""
+        pool = HTTPPool(pool_size=2, keep_alive=False)
+        self.addCleanup(pool.close)
+        files = [(self.write(f"a{index}.bin", bytes([index])), f"a{index}.bin") for index in range(3)]
+
+        _, stats = self.upload(files, http_pool=pool)
+
+        self.assertEqual(stats['http_requests'], self.server.stats()['requests'])
+        # A new connection for every call
+        self.assertEqual(stats['connections'], stats['http_requests'])
+        self.assertLessEqual(self.server.stats()['peak_concurrent_uploads'], 2)
+
+    def test_pool_read_timeout(self):
+        """Test the pool's read timeout applies to calls from the event loop"""
+        pool = HTTPPool(read_timeout=0.1)
+        self.addCleanup(pool.close)
+        self.server.latency = 1.0
+
+        with self.assertRaises(GitHubReleaseError) as raised:
+            self.upload([(self.write("app.apk", b"payload"), "app.apk")], http_pool=pool)
+        self.assertIsInstance(raised.exception.__context__, Timeout)
+        self.assertEqual(pool.stats()['http_errors'], 1)
+
+    def test_writes_draw_on_scheduler_budget(self):
+        """Test uploads and renames are spaced by the scheduler's write budget"""
+        scheduler = RequestScheduler(write_burst=1, write_rate=20.0)
+        files = [(self.write(f"a{index}.bin", bytes([index])), f"a{index}.bin") for index in range(3)]
+
+        _, stats = self.upload(files, scheduler=scheduler)
+
+        # Three uploads and three renames; five of them wait for a token
+        self.assertGreaterEqual(stats['wait_seconds'], 0.2)
+        self.assertEqual(stats['requests'], scheduler.stats()['requests'])
+        self.assertEqual(stats['requests'], self.server.stats()['requests'])
+
+    def test_shared_pause_is_honoured(self):
+        """Test a Retry-After pause recorded by another caller holds the event loop's calls"""
+        scheduler = RequestScheduler()
+        scheduler.pause(0.3)
+        started = time.monotonic()
+
+        self.upload([(self.write("app.apk", b"payload"), "app.apk")], scheduler=scheduler)
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+        self.assertGreater(scheduler.stats()['wait_seconds'], 0)
+
+    def test_missing_file(self):
+        """Test missing files are reported before any request"""
+        with self.assertRaises(FileNotFoundError):
+            self.upload([(str(self.temp_dir / "missing.apk"), None)])
+        self.assertEqual(self.server.stats()['requests'], 0)
+
+    def test_run_upload(self):
+        """Test the synchronous wrapper returns results and statistics"""
+        results, stats = run_upload("token", "owner/repo", [(self.write("app.apk", b"x"), None)],
+                                    base_url=self.server.url)
+
+        self.assertEqual(results[0]['asset_name'], "app.apk")
+        self.assertGreater(stats['requests'], 0)
+
+    def test_main_engine_asyncio(self):
+        """Test --engine asyncio publishes through the event loop"""
+        output_file = self.temp_dir / "github_output"
+        env = {"GITHUB_TOKEN": "token", "GITHUB_REPOSITORY": "owner/repo", "GITHUB_OUTPUT": str(output_file)}
+        files = [f"{self.write('a.apk', b'a')}:a.apk", f"{self.write('b.aab', b'b')}:b.aab"]
+
+        with patch.dict(os.environ, env):
+            code = main(files + ["--engine", "asyncio", "--api-url", self.server.url, "--github-output",
+                                 "--no-keep-alive", "--pool-size", "2"])
+
+        self.assertEqual(code, 0)
+        self.assertRegex(self.output.getvalue(), r"HTTP: (\d+) call\(s\) on \1 connection\(s\)")
+        self.assertEqual(sorted(self.remote_assets()), ["a.apk", "b.aab"])
+        self.assertIn("stable_url=https://github.com/owner/repo/releases/latest/download/b.aab",
+                      output_file.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
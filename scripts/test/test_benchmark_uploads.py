@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the release upload benchmark.
+
+Tests cover:
+- Size and list parsing
+- Asset generation
+- A small benchmark run against the fake API
+"""
+
+import io
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmark_uploads import format_size, main, make_assets, parse_list, parse_size, run_benchmark
+
+
+class TestParsing(unittest.TestCase):
+    """Test cases for parse_size(), parse_list() and format_size()"""
+
+    def test_parse_size(self):
+        """Test binary suffixes"""
+        self.assertEqual(parse_size("512"), 512)
+        self.assertEqual(parse_size("256K"), 256 * 1024)
+        self.assertEqual(parse_size("4MiB"), 4 * 1024 * 1024)
+        self.assertEqual(parse_size("1.5g"), int(1.5 * 1024 ** 3))
+
+    def test_parse_size_invalid(self):
+        """Test unknown units are rejected"""
+        with self.assertRaises(ValueError):
+            parse_size("4X")
+
+    def test_parse_list(self):
+        """Test comma-separated values"""
+        self.assertEqual(parse_list("1, 2,4,"), [1, 2, 4])
+        self.assertEqual(parse_list("1K,2M", parse_size), [1024, 2 * 1024 * 1024])
+
+    def test_format_size(self):
+        """Test sizes are shortened when exact"""
+        self.assertEqual(format_size(4 * 1024 * 1024), "4M")
+        self.assertEqual(format_size(1000), "1000B")
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test cases for make_assets() and run_benchmark()"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_make_assets(self):
+        """Test files have the requested size and differ"""
+        paths = make_assets(self.temp_dir, 3000, 2)
+
+        self.assertEqual([path.stat().st_size for path in paths], [3000, 3000])
+        self.assertNotEqual(paths[0].read_bytes(), paths[1].read_bytes())
+
+    def test_run_benchmark_rows(self):
+        """Test one row per combination with API counts and speedup"""
+        rows = run_benchmark(
+            sizes=[2048], counts=[2], jobs=[2, 1],
+            scheduler_options={'write_burst': 100, 'write_rate': 100.0},
+            work_dir=self.temp_dir
+        )
+
+        self.assertEqual([(row['count'], row['jobs']) for row in rows], [(2, 1), (2, 2)])
+        for row in rows:
+            self.assertEqual(row['bytes'], 4096)
+            self.assertEqual(row['api_requests'], row['server_requests'])
+            self.assertEqual(row['retries'], 0)
+            self.assertGreater(row['bytes_per_second'], 0)
+        self.assertEqual(rows[0]['speedup'], 1.0)
+        self.assertLessEqual(rows[1]['peak_concurrent_uploads'], 2)
+
+    def test_engines_are_compared(self):
+        """Test one row per engine with the same workload"""
+        rows = run_benchmark(
+            sizes=[1024], counts=[3], jobs=[3],
+            scheduler_options={'write_burst': 100, 'write_rate': 100.0},
+            work_dir=self.temp_dir,
+            engines=["threads", "asyncio"]
+        )
+
+        self.assertEqual([row['engine'] for row in rows], ["threads", "asyncio"])
+        for row in rows:
+            self.assertEqual(row['bytes'], 3072)
+            self.assertEqual(row['api_requests'], row['server_requests'])
+
+    def test_injected_upload_errors_are_counted(self):
+        """Test retries show up when every other upload fails"""
+        rows = run_benchmark(
+            sizes=[1024], counts=[3], jobs=[1],
+            server_options={'error_rate': 0.5, 'error_routes': ['upload'], 'seed': 3},
+            retry_base_delay=0.0,
+            scheduler_options={'write_burst': 100, 'write_rate': 100.0},
+            work_dir=self.temp_dir
+        )
+
+        self.assertEqual(rows[0]['retries'], rows[0]['injected_errors'])
+
+    def test_main_json(self):
+        """Test the command line prints JSON rows"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main(["--sizes", "1K", "--counts", "1", "--jobs", "1", "--latency", "0", "--json"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(len(json.loads(output.getvalue())), 1)
+
+    def test_main_rejects_bad_arguments(self):
+        """Test invalid sizes and engines return 1"""
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            self.assertEqual(main(["--sizes", "big"]), 1)
+            self.assertEqual(main(["--engines", "fibers"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared command-line and GitHub Actions helpers.
+
+Tests cover:
+- file:name argument parsing
+- Step outputs in $GITHUB_OUTPUT and shell-quoted export lines
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ci_outputs import parse_file_spec, write_github_output
+
+
+class TestParseFileSpec(unittest.TestCase):
+    """Test cases for parse_file_spec()"""
+
+    def test_file_spec(self):
+        """Test file:name parsing and existing paths containing ':'"""
+        temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, temp_dir)
+        existing = temp_dir / "odd:name.apk"
+        existing.write_bytes(b"x")
+
+        self.assertEqual(parse_file_spec("dist/app.apk:app-latest.apk"), ("dist/app.apk", "app-latest.apk"))
+        self.assertEqual(parse_file_spec("dist/app.apk"), ("dist/app.apk", None))
+        self.assertEqual(parse_file_spec("dist/app.apk:"), ("dist/app.apk", None))
+        self.assertEqual(parse_file_spec(str(existing)), (str(existing), None))
+
+
+class TestWriteGithubOutput(unittest.TestCase):
+    """Test cases for write_github_output()"""
+
+    def test_github_output_file(self):
+        """Test outputs are appended to $GITHUB_OUTPUT in order"""
+        temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, temp_dir)
+        output_file = temp_dir / "github_output"
+        output_file.write_text("earlier=1\n")
+
+        with patch.dict(os.environ, {"GITHUB_OUTPUT": str(output_file)}), redirect_stdout(io.StringIO()):
+            write_github_output({'stable_url': "https://example.com/a.apk", 'api_requests': 3})
+
+        self.assertEqual(output_file.read_text(),
+                         "earlier=1\nstable_url=https://example.com/a.apk\napi_requests=3\n")
+
+    def test_export_lines(self):
+        """Test export lines are upper-cased and shell-quoted outside Actions"""
+        output = io.StringIO()
+
+        with patch.dict(os.environ, clear=True), redirect_stdout(output):
+            write_github_output({'stable_url': "https://example.com/a.apk", 'urls': '["it\'s"]'})
+
+        self.assertEqual(output.getvalue().splitlines(), [
+            "# Environment variable format:",
+            "export STABLE_URL=https://example.com/a.apk",
+            "export URLS='[\"it'\"'\"'s\"]'",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
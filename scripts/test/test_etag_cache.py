@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the on-disk ETag cache.
+
+Tests cover:
+- Link header pagination parsing
+- Round trip through the cache file
+- Unreadable cache files and entry pruning
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from etag_cache import ETagCache, next_page_url
+
+
+class TestNextPageUrl(unittest.TestCase):
+    """Test cases for next_page_url()"""
+
+    def test_next_link(self):
+        """Test the rel="next" URL is extracted"""
+        link = ('<https://api.github.com/repositories/1/releases/2/assets?per_page=100&page=2>; rel="next", '
+                '<https://api.github.com/repositories/1/releases/2/assets?per_page=100&page=3>; rel="last"')
+
+        self.assertEqual(
+            next_page_url(link),
+            "https://api.github.com/repositories/1/releases/2/assets?per_page=100&page=2"
+        )
+
+    def test_last_page(self):
+        """Test no next page on the last page or without a Link header"""
+        self.assertIsNone(next_page_url('<https://api.github.com/x?page=1>; rel="first"'))
+        self.assertIsNone(next_page_url(None))
+
+
+class TestETagCache(unittest.TestCase):
+    """Test cases for ETagCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / "cache" / "etags.json"
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Test entries saved by one instance are read by the next"""
+        cache = ETagCache(self.path)
+        cache.put("https://api.github.com/a", 'W/"abc"', {"id": 1}, '<b>; rel="next"')
+        cache.save()
+
+        entry = ETagCache(self.path).get("https://api.github.com/a")
+
+        self.assertEqual(entry['etag'], 'W/"abc"')
+        self.assertEqual(entry['body'], {"id": 1})
+        self.assertEqual(entry['link'], '<b>; rel="next"')
+
+    def test_unreadable_file_is_empty(self):
+        """Test a corrupt cache file behaves like an empty cache"""
+        self.path.parent.mkdir()
+        self.path.write_text("{not json")
+
+        self.assertIsNone(ETagCache(self.path).get("https://api.github.com/a"))
+
+    def test_save_without_changes_writes_nothing(self):
+        """Test reads alone never create the file"""
+        cache = ETagCache(self.path)
+        cache.get("https://api.github.com/a")
+        cache.save()
+
+        self.assertFalse(self.path.exists())
+
+    def test_oldest_entries_are_pruned(self):
+        """Test only the most recently stored entries are kept"""
+        cache = ETagCache(self.path)
+        with patch.object(ETagCache, 'MAX_ENTRIES', 2):
+            for index in range(3):
+                with patch('etag_cache.time.time', return_value=1000.0 + index):
+                    cache.put(f"https://api.github.com/{index}", f'"{index}"', [])
+            cache.save()
+
+        self.assertEqual(sorted(json.loads(self.path.read_text())), [
+            "https://api.github.com/1",
+            "https://api.github.com/2",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
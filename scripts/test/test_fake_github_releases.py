@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Tests for the local fake GitHub Releases API.
+
+The server is exercised over real HTTP, both directly and through
+GitHubReleaseUploader (PyGithub), so these double as end-to-end tests of
+the upload path.
+
+Tests cover:
+- Release and asset endpoints (create, list, upload, rename, delete)
+- Pagination, ETags and 304 Not Modified
+- Injected errors, secondary rate limits and the primary budget
+- Uploads, replacement, retries and sync through the uploader
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_github_releases import FakeGitHubServer
+from request_scheduler import RequestScheduler
+from upload_to_github_releases import GitHubReleaseUploader, main
+
+
+def request(server, method, path, body=None, headers=None):
+    """Send a request; returns (status, headers, decoded JSON or None)."""
+    data = body if isinstance(body, bytes) or body is None else json.dumps(body).encode()
+    req = urllib.request.Request(server.url + path, data=data, method=method, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req) as response:
+            status, response_headers, payload = response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        status, response_headers, payload = e.code, e.headers, e.read()
+    return status, response_headers, json.loads(payload) if payload else None
+
+
+class TestFakeGitHubServer(unittest.TestCase):
+    """Test cases for the endpoints served by FakeGitHubServer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.server = FakeGitHubServer(seed=1).start()
+        self.addCleanup(self.server.stop)
+
+    def create_release(self, tag="latest"):
+        status, _, release = request(self.server, "POST", "/repos/o/r/releases", {'tag_name': tag})
+        self.assertEqual(status, 201)
+        return release
+
+    def upload(self, release, name, data=b"payload"):
+        return request(self.server, "POST", f"/repos/o/r/releases/{release['id']}/assets?name={name}",
+                       data, {"Content-Type": "application/octet-stream"})
+
+    def test_release_lifecycle(self):
+        """Test create, upload, rename and delete"""
+        release = self.create_release()
+
+        status, _, asset = self.upload(release, "app.apk", b"apk bytes")
+        self.assertEqual(status, 201)
+        self.assertEqual(asset['size'], 9)
+        self.assertEqual(asset['digest'], "sha256:" + hashlib.sha256(b"apk bytes").hexdigest())
+
+        status, _, renamed = request(self.server, "PATCH", f"/repos/o/r/releases/assets/{asset['id']}",
+                                     {'name': "app-latest.apk", 'label': "stable"})
+        self.assertEqual(status, 200)
+        self.assertEqual((renamed['name'], renamed['label']), ("app-latest.apk", "stable"))
+
+        status, _, fetched = request(self.server, "GET", "/repos/o/r/releases/tags/latest")
+        self.assertEqual([a['name'] for a in fetched['assets']], ["app-latest.apk"])
+
+        status, _, _ = request(self.server, "DELETE", f"/repos/o/r/releases/assets/{asset['id']}")
+        self.assertEqual(status, 204)
+        status, _, _ = request(self.server, "GET", f"/repos/o/r/releases/assets/{asset['id']}")
+        self.assertEqual(status, 404)
+
+    def test_name_clashes_are_rejected(self):
+        """Test duplicate tags and asset names return 422"""
+        release = self.create_release()
+        self.upload(release, "app.apk")
+
+        self.assertEqual(request(self.server, "POST", "/repos/o/r/releases", {'tag_name': "latest"})[0], 422)
+        self.assertEqual(self.upload(release, "app.apk")[0], 422)
+
+    def test_missing_release_is_404(self):
+        """Test unknown tags and paths return 404"""
+        self.assertEqual(request(self.server, "GET", "/repos/o/r/releases/tags/nope")[0], 404)
+        self.assertEqual(request(self.server, "GET", "/nothing/here")[0], 404)
+
+    def test_pagination_and_etags(self):
+        """Test Link headers page through assets and If-None-Match gets 304"""
+        release = self.create_release()
+        for index in range(5):
+            self.upload(release, f"asset-{index}.bin")
+        path = f"/repos/o/r/releases/{release['id']}/assets?per_page=2"
+
+        status, headers, page = request(self.server, "GET", path)
+        self.assertEqual(len(page), 2)
+        self.assertIn('rel="next"', headers["Link"])
+        self.assertIn("page=3", headers["Link"])
+
+        status, _, body = request(self.server, "GET", path, headers={"If-None-Match": headers["ETag"]})
+        self.assertEqual((status, body), (304, None))
+        self.assertEqual(self.server.stats()['not_modified'], 1)
+
+        status, headers, page = request(self.server, "GET", path + "&page=3")
+        self.assertEqual([a['name'] for a in page], ["asset-4.bin"])
+        self.assertNotIn("Link", headers)
+
+    def test_rate_limit_headers(self):
+        """Test every response reports the primary budget"""
+        _, headers, _ = request(self.server, "GET", "/repos/o/r")
+
+        self.assertEqual(headers["X-RateLimit-Limit"], "5000")
+        self.assertEqual(headers["X-RateLimit-Remaining"], "4999")
+
+    def test_primary_limit_is_enforced(self):
+        """Test requests are refused once the budget is spent"""
+        server = FakeGitHubServer(rate_limit=2).start()
+        self.addCleanup(server.stop)
+
+        self.assertEqual(request(server, "GET", "/repos/o/r")[0], 200)
+        status, headers, body = request(server, "GET", "/repos/o/r")
+
+        self.assertEqual(status, 403)
+        self.assertEqual(headers["X-RateLimit-Remaining"], "0")
+        self.assertIn("rate limit", body['message'])
+
+    def test_fail_next_targets_route(self):
+        """Test injected failures hit only the chosen route"""
+        release = self.create_release()
+        self.server.fail_next(502, route='upload')
+
+        self.assertEqual(request(self.server, "GET", "/repos/o/r")[0], 200)
+        self.assertEqual(self.upload(release, "app.apk")[0], 502)
+        self.assertEqual(self.upload(release, "app.apk")[0], 201)
+        self.assertEqual(self.server.stats()['injected_errors'], 1)
+
+    def test_secondary_limit_every_nth_write(self):
+        """Test every Nth write is refused with Retry-After"""
+        server = FakeGitHubServer(rate_limit_every=2, retry_after=7).start()
+        self.addCleanup(server.stop)
+
+        self.assertEqual(request(server, "POST", "/repos/o/r/releases", {'tag_name': "a"})[0], 201)
+        status, headers, body = request(server, "POST", "/repos/o/r/releases", {'tag_name': "b"})
+
+        self.assertEqual(status, 403)
+        self.assertEqual(headers["Retry-After"], "7")
+        self.assertIn("secondary rate limit", body['message'])
+
+    def test_error_rate_limited_to_routes(self):
+        """Test error_rate spares routes outside error_routes"""
+        server = FakeGitHubServer(error_rate=1.0, error_routes=['upload']).start()
+        self.addCleanup(server.stop)
+
+        status, _, release = request(server, "POST", "/repos/o/r/releases", {'tag_name': "latest"})
+        self.assertEqual(status, 201)
+        status, _, _ = request(server, "POST", f"/repos/o/r/releases/{release['id']}/assets?name=a", b"x")
+        self.assertEqual(status, 502)
+
+
+class TestUploaderAgainstFakeServer(unittest.TestCase):
+    """End-to-end tests of GitHubReleaseUploader over HTTP"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.server = FakeGitHubServer(seed=1).start()
+        self.addCleanup(self.server.stop)
+        self.output = io.StringIO()
+        for redirect in (redirect_stdout(self.output), redirect_stderr(self.output)):
+            redirect.__enter__()
+            self.addCleanup(redirect.__exit__, None, None, None)
+
+    def uploader(self, **kwargs):
+        uploader = GitHubReleaseUploader(
+            "token", "owner/repo", base_url=self.server.url,
+            scheduler=RequestScheduler(write_burst=100, write_rate=100.0), **kwargs
+        )
+        uploader.RETRY_BASE_DELAY = 0.01
+        return uploader
+
+    def write(self, name, data):
+        path = self.temp_dir / name
+        path.write_bytes(data)
+        return str(path)
+
+    def remote_assets(self):
+        with self.server.lock:
+            return {asset['name']: asset for asset in self.server.assets.values()}
+
+    def test_upload_creates_release_and_asset(self):
+        """Test a first upload creates the release and the named asset"""
+        path = self.write("app.apk", b"A" * 300_000)
+
+        url = self.uploader().upload_file(path, "app-latest.apk")
+
+        self.assertEqual(url, "https://github.com/owner/repo/releases/latest/download/app-latest.apk")
+        asset = self.remote_assets()["app-latest.apk"]
+        self.assertEqual(asset['size'], 300_000)
+        self.assertIn(hashlib.sha256(b"A" * 300_000).hexdigest(), asset['label'])
+
+    def test_replace_and_skip_unchanged(self):
+        """Test new content replaces the asset and identical content is skipped"""
+        path = self.write("app.apk", b"old")
+        self.uploader().upload_file(path, "app.apk")
+        self.write("app.apk", b"new content")
+
+        results = self.uploader().upload_files([(path, "app.apk")])
+        again = self.uploader().upload_files([(path, "app.apk")])
+
+        self.assertTrue(results[0]['uploaded'])
+        self.assertFalse(again[0]['uploaded'])
+        self.assertEqual(list(self.remote_assets()), ["app.apk"])
+        self.assertEqual(self.remote_assets()["app.apk"]['size'], len(b"new content"))
+
+    def test_transient_upload_error_is_retried(self):
+        """Test a 502 on upload is retried and leaves no temporary asset"""
+        path = self.write("app.apk", b"payload")
+        self.server.fail_next(502, route='upload')
+
+        results = self.uploader().upload_files([(path, "app.apk")])
+
+        self.assertEqual(results[0]['attempts'], 2)
+        self.assertEqual(list(self.remote_assets()), ["app.apk"])
+
+    def test_secondary_limit_is_waited_out(self):
+        """Test a rate-limited write is retried after Retry-After"""
+        server = FakeGitHubServer(retry_after=0).start()
+        self.addCleanup(server.stop)
+        self.server = server
+        path = self.write("app.apk", b"payload")
+        server.fail_next(403, route='update_asset')
+
+        uploader = self.uploader()
+        uploader.upload_file(path, "app.apk")
+
+        self.assertEqual(uploader.request_stats()['rate_limited'], 1)
+        self.assertEqual(list(self.remote_assets()), ["app.apk"])
+
+    def test_request_counts_match_server(self):
+        """Test the client's request count agrees with the server's"""
+        paths = [(self.write(f"a{index}.bin", bytes([index]) * 1000), f"a{index}.bin") for index in range(3)]
+
+        uploader = self.uploader()
+        uploader.upload_files(paths, max_workers=3)
+
+        self.assertEqual(uploader.request_stats()['requests'], self.server.stats()['requests'])
+        self.assertEqual(self.server.stats()['by_route']['upload'], 3)
+
+    def test_etag_cache_gets_not_modified(self):
+        """Test a second run revalidates metadata with 304s"""
+        path = self.write("app.apk", b"payload")
+        cache = self.temp_dir / "etags.json"
+        self.uploader(etag_cache=cache).upload_file(path, "app.apk")
+        self.uploader(etag_cache=cache).upload_file(path, "app.apk")
+
+        uploader = self.uploader(etag_cache=cache)
+        uploader.upload_file(path, "app.apk")
+
+        self.assertGreaterEqual(uploader.request_stats()['not_modified'], 1)
+
+    def test_sync_round_trip(self):
+        """Test sync uploads new files and deletes extras"""
+        source = self.temp_dir / "dist"
+        source.mkdir()
+        (source / "a.apk").write_bytes(b"a")
+        (source / "b.apk").write_bytes(b"b")
+        uploader = self.uploader()
+        release = uploader.get_or_create_release()
+        uploader.apply_sync(release, uploader.plan_sync(release, source))
+        (source / "b.apk").unlink()
+
+        uploader = self.uploader()
+        release = uploader.get_or_create_release()
+        result = uploader.apply_sync(release, uploader.plan_sync(release, source, delete=True))
+
+        self.assertEqual(result['deleted'], ["b.apk"])
+        self.assertEqual(list(self.remote_assets()), ["a.apk"])
+
+    def test_release_index_is_uploaded_last(self):
+        """Test --release-index publishes latest.json after the APKs with either engine"""
+        versioned = self.write("app-portfolio-release-1.2.0+5.apk", b"apk")
+        stable = self.write("app-portfolio-release-latest.apk", b"apk")
+        index_path = self.temp_dir / "index" / "latest.json"
+        env = {"GITHUB_TOKEN": "token", "GITHUB_REPOSITORY": "owner/repo"}
+
+        for engine in ("threads", "asyncio"):
+            with patch.dict(os.environ, env):
+                code = main([versioned, stable, "--api-url", self.server.url, "--engine", engine,
+                             "--release-index", str(index_path), "--version", "1.2.0+5"])
+
+            self.assertEqual(code, 0)
+            names = [asset['name'] for asset in sorted(self.remote_assets().values(), key=lambda a: a['id'])]
+            self.assertEqual(names[-1], "latest.json")
+            index = json.loads(index_path.read_text())
+            self.assertEqual(index['version'], "1.2.0+5")
+            self.assertEqual(index['url'],
+                             "https://github.com/owner/repo/releases/latest/download/app-portfolio-release-latest.apk")
+            self.assertEqual(self.remote_assets()["latest.json"]['digest'],
+                             "sha256:" + hashlib.sha256(index_path.read_bytes()).hexdigest())
+        # The second run found an identical index and left it alone
+        self.assertEqual(self.server.stats()['by_route']['upload'], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
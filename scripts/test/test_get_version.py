@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pubspec.yaml value extractor.
+
+Tests cover:
+- Single-key compatibility (shortcuts, dotted paths, default)
+- Multi-key queries in json, env and github-output formats
+- Missing keys and missing pubspec.yaml
+- The metadata cache staying out of git status
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import get_version
+from get_version import main
+
+
+class TestGetVersion(unittest.TestCase):
+    """Test cases for get_version.main()"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "pubspec.yaml").write_text("""name: portfolio
+version: 1.2.0+7
+environment:
+  sdk: '>=3.0.0 <4.0.0'
+dependencies:
+  flutter:
+    sdk: flutter
+  url_launcher: ^6.3.1
+""")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_main(self, *argv, env=None):
+        """Run main() and return (exit code, printed lines)"""
+        with patch('builtins.print') as mock_print, \
+                patch.dict(os.environ, env or {}, clear=env is not None):
+            exit_code = main([*argv, "--project-root", str(self.temp_dir)])
+        return exit_code, [call[0][0] for call in mock_print.call_args_list if call[0]]
+
+    def test_single_key_compatibility(self):
+        """Test one key prints the bare value as before"""
+        self.assertEqual(self.run_main("version"), (0, ["1.2.0+7"]))
+        self.assertEqual(self.run_main("flutter"), (0, ["3.0.0"]))
+        self.assertEqual(self.run_main("dependencies.url_launcher"), (0, ["^6.3.1"]))
+        self.assertEqual(self.run_main(), (0, [">=3.0.0 <4.0.0"]))
+
+    def test_multi_key_single_resolve(self):
+        """Test several keys are resolved with one resolver call"""
+        with patch.object(get_version, "resolve", wraps=get_version.resolve) as spy:
+            exit_code, lines = self.run_main("version", "name", "flutter", "--format", "json")
+
+        self.assertEqual(exit_code, 0)
+        spy.assert_called_once()
+        self.assertEqual(json.loads(lines[0]), {
+            'version': "1.2.0+7",
+            'name': "portfolio",
+            'flutter': "3.0.0",
+        })
+
+    def test_env_format(self):
+        """Test export lines use upper-cased, sanitised names"""
+        exit_code, lines = self.run_main("version", "environment.sdk", "--format", "env")
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(lines, [
+            "export VERSION=1.2.0+7",
+            "export ENVIRONMENT_SDK='>=3.0.0 <4.0.0'",
+        ])
+
+    def test_env_format_quotes_values(self):
+        """Test export lines stay valid shell when a value contains quotes"""
+        (self.temp_dir / "pubspec.yaml").write_text(
+            "name: portfolio\nversion: 1.0.0\ndescription: \"Ada's portfolio; $(rm -rf ~)\"\n"
+        )
+
+        exit_code, lines = self.run_main("description", "--format", "env")
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(lines, ["export DESCRIPTION='Ada'\"'\"'s portfolio; $(rm -rf ~)'"])
+
+    def test_github_output_format(self):
+        """Test values are appended to GITHUB_OUTPUT"""
+        output_file = self.temp_dir / "github_output"
+
+        exit_code, lines = self.run_main(
+            "version", "name", "dependencies.flutter", "--format", "github-output",
+            env={"GITHUB_OUTPUT": str(output_file)}
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(lines, [])
+        self.assertEqual(output_file.read_text().splitlines(), [
+            "version=1.2.0+7",
+            "name=portfolio",
+            'dependencies_flutter={"sdk":"flutter"}',
+        ])
+
+    def test_github_output_without_env(self):
+        """Test github-output falls back to export lines outside Actions"""
+        exit_code, lines = self.run_main("version", "--format", "github-output", env={})
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(lines, ["export VERSION=1.2.0+7"])
+
+    def test_missing_keys(self):
+        """Test missing keys are reported together and nothing is written"""
+        output_file = self.temp_dir / "github_output"
+
+        with patch('sys.stderr'):
+            exit_code, _ = self.run_main(
+                "version", "nope", "also.nope", "--format", "github-output",
+                env={"GITHUB_OUTPUT": str(output_file)}
+            )
+
+        self.assertEqual(exit_code, 1)
+        self.assertFalse(output_file.exists())
+
+    def test_missing_pubspec(self):
+        """Test a missing pubspec.yaml fails cleanly"""
+        (self.temp_dir / "pubspec.yaml").unlink()
+
+        with patch('sys.stderr'):
+            exit_code, _ = self.run_main("version")
+
+        self.assertEqual(exit_code, 1)
+
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_cache_is_ignored_by_git(self):
+        """Test running the script in a checkout leaves git status clean"""
+        repo_root = Path(__file__).parent.parent.parent
+        shutil.copy(repo_root / ".gitignore", self.temp_dir / ".gitignore")
+        git = ["git", "-C", str(self.temp_dir), "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run(git + ["init", "-q"], check=True)
+        subprocess.run(git + ["add", "-A"], check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "pubspec"], check=True)
+
+        subprocess.run([sys.executable, str(repo_root / "scripts" / "get_version.py"), "version",
+                        "--project-root", str(self.temp_dir)], check=True, capture_output=True)
+
+        self.assertTrue((self.temp_dir / ".dart_tool" / "pubspec_metadata.json").exists())
+        status = subprocess.run(git + ["status", "--porcelain", "--untracked-files=all"],
+                                check=True, capture_output=True, text=True)
+        self.assertEqual(status.stdout, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
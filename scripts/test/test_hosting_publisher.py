@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Unit tests for same-origin publishing to Firebase Hosting.
+
+Tests cover:
+- Staging into the public directory with SHA256SUMS
+- firebase.json header rules (immutable vs stable names)
+- Replacing files and rules from an earlier publish
+- Site URL resolution from .firebaserc
+- Error handling and the command line
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from hosting_publisher import FirebaseHostingPublisher, HostingPublishError, main
+
+
+VERSIONED = "app-portfolio-release-1.2.0+5.apk"
+STABLE = "app-portfolio-release-latest.apk"
+
+
+class TestFirebaseHostingPublisher(unittest.TestCase):
+    """Test cases for FirebaseHostingPublisher"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.config_path = self.temp_dir / "firebase.json"
+        self.config_path.write_text(json.dumps({
+            'hosting': {
+                'public': "build/web",
+                'headers': [{'source': "**/*.js", 'headers': [{'key': "Cache-Control", 'value': "no-cache"}]}],
+                'rewrites': [{'source': "**", 'destination': "/index.html"}],
+            },
+        }))
+        (self.temp_dir / ".firebaserc").write_text(json.dumps({'projects': {'default': "demo-site"}}))
+        self.public_dir = self.temp_dir / "build" / "web"
+        self.public_dir.mkdir(parents=True)
+        self.dist = self.temp_dir / "dist"
+        self.dist.mkdir()
+        self.apk = self.dist / VERSIONED
+        self.apk.write_bytes(b"apk bytes")
+        os.link(self.apk, self.dist / STABLE)
+
+    def publish(self, files, **options):
+        publisher = FirebaseHostingPublisher(self.config_path, **options)
+        with redirect_stdout(io.StringIO()):
+            return publisher.publish(files)
+
+    def headers(self):
+        rules = json.loads(self.config_path.read_text())['hosting']['headers']
+        return {rule['source']: {header['key']: header['value'] for header in rule['headers']} for rule in rules}
+
+    def test_publish_stages_files(self):
+        """Test files land in build/web/downloads with same-origin URLs"""
+        result = self.publish([(str(self.apk), None), (str(self.dist / STABLE), None)])
+
+        downloads = self.public_dir / "downloads"
+        self.assertEqual((downloads / STABLE).read_bytes(), b"apk bytes")
+        self.assertEqual(result['download_url'],
+                         f"https://demo-site.web.app/downloads/{STABLE}")
+        self.assertEqual(result['files'][0]['url'],
+                         "https://demo-site.web.app/downloads/app-portfolio-release-1.2.0%2B5.apk")
+        digest = hashlib.sha256(b"apk bytes").hexdigest()
+        self.assertEqual((downloads / "SHA256SUMS").read_text(),
+                         f"{digest}  {VERSIONED}\n{digest}  {STABLE}\n")
+        self.assertTrue(result['config_updated'])
+
+    def test_header_rules(self):
+        """Test versioned files are immutable and stable names revalidate"""
+        self.publish([(str(self.apk), None), (str(self.dist / STABLE), None)])
+        headers = self.headers()
+
+        self.assertIn("immutable", headers[f"/downloads/{VERSIONED}"]['Cache-Control'])
+        self.assertIn("must-revalidate", headers[f"/downloads/{STABLE}"]['Cache-Control'])
+        self.assertIn("must-revalidate", headers["/downloads/SHA256SUMS"]['Cache-Control'])
+        self.assertEqual(headers[f"/downloads/{STABLE}"]['Content-Type'],
+                         "application/vnd.android.package-archive")
+        self.assertEqual(headers[f"/downloads/{STABLE}"]['Content-Disposition'],
+                         f'attachment; filename="{STABLE}"')
+        # Unrelated rules and rewrites are kept
+        self.assertEqual(headers["**/*.js"], {'Cache-Control': "no-cache"})
+        self.assertEqual(json.loads(self.config_path.read_text())['hosting']['rewrites'],
+                         [{'source': "**", 'destination': "/index.html"}])
+
+    def test_republish_replaces_previous(self):
+        """Test earlier files and rules are dropped and unchanged runs leave the config alone"""
+        old = self.dist / "app-portfolio-release-1.1.0+4.apk"
+        old.write_bytes(b"old")
+        self.publish([(str(old), None), (str(self.dist / STABLE), None)])
+
+        result = self.publish([(str(self.apk), None), (str(self.dist / STABLE), None)])
+        again = self.publish([(str(self.apk), None), (str(self.dist / STABLE), None)])
+
+        self.assertEqual(result['removed'], [old.name])
+        self.assertNotIn(f"/downloads/{old.name}", self.headers())
+        self.assertEqual(sorted(path.name for path in (self.public_dir / "downloads").iterdir()),
+                         [".staging-cache.json", "SHA256SUMS", VERSIONED, STABLE])
+        self.assertFalse(again['config_updated'])
+        self.assertEqual(again['files'][0]['strategy'], "up-to-date")
+
+    def test_custom_names_and_site(self):
+        """Test file:name pairs, --site-url and the downloads directory"""
+        result = self.publish([(str(self.apk), "portfolio.apk")], site_url="https://example.com/",
+                              downloads_dir="/files/android/")
+
+        self.assertEqual(result['download_url'], "https://example.com/files/android/portfolio.apk")
+        self.assertTrue((self.public_dir / "files" / "android" / "portfolio.apk").exists())
+        self.assertIn("/files/android/portfolio.apk", self.headers())
+
+    def test_site_url_requires_project(self):
+        """Test a missing .firebaserc project asks for --site-url"""
+        (self.temp_dir / ".firebaserc").unlink()
+
+        with self.assertRaises(HostingPublishError):
+            FirebaseHostingPublisher(self.config_path)
+
+    def test_multi_site_config_rejected(self):
+        """Test a list of hosting targets is reported"""
+        self.config_path.write_text(json.dumps({'hosting': [{'target': "a"}, {'target': "b"}]}))
+
+        with self.assertRaises(HostingPublishError):
+            FirebaseHostingPublisher(self.config_path)
+
+    def test_invalid_names(self):
+        """Test glob characters, dotfiles and duplicates are rejected"""
+        publisher = FirebaseHostingPublisher(self.config_path)
+
+        for files in ([(str(self.apk), "app*.apk")], [(str(self.apk), ".hidden")],
+                      [(str(self.apk), "SHA256SUMS")], [(str(self.apk), "a.apk"), (str(self.apk), "a.apk")]):
+            with self.assertRaises(HostingPublishError):
+                publisher.plan(files)
+
+    def test_missing_public_dir(self):
+        """Test publishing before 'flutter build web' fails clearly"""
+        shutil.rmtree(self.public_dir)
+
+        with self.assertRaises(HostingPublishError):
+            self.publish([(str(self.apk), None)])
+
+    def test_missing_file(self):
+        """Test missing files are reported before anything is staged"""
+        with self.assertRaises(FileNotFoundError):
+            self.publish([(str(self.apk), None), (str(self.dist / "missing.apk"), None)])
+        self.assertFalse((self.public_dir / "downloads").exists())
+
+
+class TestMain(unittest.TestCase):
+    """Test cases for the command line"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.config_path = self.temp_dir / "firebase.json"
+        self.config_path.write_text(json.dumps({'hosting': {'public': "public"}}))
+        (self.temp_dir / "public").mkdir()
+        self.apk = self.temp_dir / STABLE
+        self.apk.write_bytes(b"apk")
+
+    def test_dry_run_url_only(self):
+        """Test --dry-run prints the URL and touches nothing"""
+        config = self.config_path.read_text()
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            code = main([str(self.apk), "--config", str(self.config_path), "--site-url",
+                         "https://example.com", "--dry-run", "--url-only"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(output.getvalue(), f"https://example.com/downloads/{STABLE}\n")
+        self.assertEqual(self.config_path.read_text(), config)
+        self.assertFalse((self.temp_dir / "public" / "downloads").exists())
+
+    def test_github_output(self):
+        """Test APK_DOWNLOAD_URL is written for the web build"""
+        output_file = self.temp_dir / "github_output"
+
+        with patch.dict(os.environ, {"GITHUB_OUTPUT": str(output_file)}), redirect_stdout(io.StringIO()):
+            code = main([str(self.apk), "--config", str(self.config_path), "--site-url",
+                         "https://example.com", "--github-output"])
+
+        self.assertEqual(code, 0)
+        self.assertIn(f"apk_download_url=https://example.com/downloads/{STABLE}\n", output_file.read_text())
+        self.assertTrue((self.temp_dir / "public" / "downloads" / STABLE).exists())
+
+    def test_github_output_export_lines(self):
+        """Test export lines are shell-quoted outside Actions"""
+        output = io.StringIO()
+
+        with patch.dict(os.environ, clear=True), redirect_stdout(output):
+            code = main([str(self.apk), "--config", str(self.config_path), "--site-url",
+                         "https://example.com", "--dry-run", "--github-output"])
+
+        self.assertEqual(code, 0)
+        self.assertIn(f"export APK_DOWNLOAD_URL=https://example.com/downloads/{STABLE}\n", output.getvalue())
+        self.assertIn(f"export DOWNLOAD_URLS='[\"https://example.com/downloads/{STABLE}\"]'\n",
+                      output.getvalue())
+
+    def test_standard_library_only(self):
+        """Test importing the publisher does not pull in PyGithub or requests"""
+        script = ("import sys; import hosting_publisher; "
+                  "print(sorted(m for m in ('github', 'requests', 'urllib3', 'upload_to_github_releases') "
+                  "if m in sys.modules))")
+
+        result = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent.parent,
+                                capture_output=True, text=True, check=True)
+
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_errors_return_1(self):
+        """Test errors are printed to stderr"""
+        errors = io.StringIO()
+
+        with redirect_stdout(io.StringIO()), redirect_stderr(errors):
+            code = main([str(self.apk), "--config", str(self.temp_dir / "missing.json")])
+
+        self.assertEqual(code, 1)
+        self.assertIn("Firebase config not found", errors.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared HTTP connection pool.
+
+Calls are made through PyGithub against the local fake GitHub API.
+
+Tests cover:
+- Routing a Github client's calls through the pool
+- Connection reuse for API and upload calls
+- Read timeouts on a stalled server
+- Keep-alive off, request logging and latency statistics
+- The PyGithub internals the pool relies on
+- Command line options
+"""
+
+import io
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import unittest
+import warnings
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from github import Auth, Github
+from requests.exceptions import Timeout
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_github_releases import FakeGitHubServer
+from http_pool import REQUESTER_ATTRIBUTES, HTTPPool, HTTPPoolError, keepalive_socket_options
+from upload_to_github_releases import GitHubReleaseError, GitHubReleaseUploader, main
+
+
+class TestHTTPPool(unittest.TestCase):
+    """Test cases for HTTPPool"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.server = FakeGitHubServer().start()
+        self.addCleanup(self.server.stop)
+
+    def client(self, pool):
+        client = Github(auth=Auth.Token("token"), base_url=self.server.url, retry=None)
+        pool.install(client.requester)
+        self.addCleanup(pool.close)
+        return client
+
+    def test_calls_share_connections(self):
+        """Test sequential calls reuse one keep-alive connection"""
+        pool = HTTPPool()
+        github = self.client(pool)
+
+        for _ in range(5):
+            github.get_repo("owner/repo")
+
+        stats = pool.stats()
+        self.assertEqual(stats['http_requests'], 5)
+        self.assertEqual(stats['connections'], 1)
+        self.assertEqual(self.server.stats()['requests'], 5)
+
+    def test_keep_alive_off(self):
+        """Test every call opens a connection when keep-alive is off"""
+        pool = HTTPPool(keep_alive=False)
+        github = self.client(pool)
+
+        for _ in range(3):
+            github.get_repo("owner/repo")
+
+        self.assertEqual(pool.stats()['connections'], 3)
+
+    def test_read_timeout(self):
+        """Test a stalled server raises Timeout instead of hanging"""
+        self.server.latency = 2.0
+        pool = HTTPPool(read_timeout=0.2)
+        github = self.client(pool)
+
+        with self.assertRaises(Timeout):
+            github.get_repo("owner/repo")
+        self.assertEqual(pool.stats()['http_errors'], 1)
+
+    def test_log_requests(self):
+        """Test each call is printed with its status and latency"""
+        pool = HTTPPool(log_requests=True)
+        github = self.client(pool)
+        output = io.StringIO()
+
+        with redirect_stderr(output):
+            github.get_repo("owner/repo")
+
+        self.assertRegex(output.getvalue(), r"HTTP GET http://127\.0\.0\.1:\d+/repos/owner/repo -> 200 in \d+ ms")
+
+    def test_stats_before_requests(self):
+        """Test latency is unknown before the first call"""
+        stats = HTTPPool().stats()
+
+        self.assertEqual((stats['http_requests'], stats['connections']), (0, 0))
+        self.assertIsNone(stats['latency_p95_ms'])
+
+    def test_install_requires_pygithub_internals(self):
+        """Test install() fails loudly on clients it cannot route"""
+        with self.assertRaisesRegex(HTTPPoolError, "_Requester__connectionClass"):
+            HTTPPool().install(object())
+
+    def test_installed_pygithub_has_requester_internals(self):
+        """Test the installed PyGithub still has the private attributes install() overrides"""
+        requester = Github(auth=Auth.Token("token"), base_url=self.server.url).requester
+
+        missing = [name for name in REQUESTER_ATTRIBUTES if not hasattr(requester, name)]
+
+        self.assertEqual(missing, [], f"The installed PyGithub no longer has {', '.join(missing)}; "
+                                      f"update http_pool.py before widening the pin in requirements.txt")
+
+    def test_uploader_reports_unsupported_pygithub(self):
+        """Test the uploader turns a failed install into GitHubReleaseError"""
+        with patch("http_pool.REQUESTER_ATTRIBUTES", ("_Requester__removedAttribute",)), \
+                redirect_stdout(io.StringIO()):
+            with self.assertRaisesRegex(GitHubReleaseError, "requirements.txt"):
+                GitHubReleaseUploader("token", "owner/repo", base_url=self.server.url)
+        self.assertEqual(self.server.stats()['requests'], 0)
+
+    def test_keepalive_socket_options(self):
+        """Test TCP keepalive is enabled on pooled sockets"""
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), keepalive_socket_options())
+
+
+class TestUploaderConnections(unittest.TestCase):
+    """Test cases for GitHubReleaseUploader's use of the pool"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.server = FakeGitHubServer().start()
+        self.addCleanup(self.server.stop)
+        self.files = []
+        for index in range(6):
+            path = self.temp_dir / f"app-{index}.apk"
+            path.write_bytes(bytes([index]) * 5000)
+            self.files.append((str(path), path.name))
+
+    def test_uploads_reuse_connections(self):
+        """Test a batch opens at most one connection per worker"""
+        with redirect_stdout(io.StringIO()):
+            uploader = GitHubReleaseUploader("token", "owner/repo", base_url=self.server.url)
+            uploader.upload_files(self.files, max_workers=2)
+
+        stats = uploader.request_stats()
+        self.assertEqual(stats['http_requests'], stats['requests'])
+        self.assertLessEqual(stats['connections'], 2)
+
+    def test_uploader_uses_token_auth(self):
+        """Test the client is built without PyGithub's deprecated login_or_token argument"""
+        with warnings.catch_warnings(), redirect_stdout(io.StringIO()):
+            warnings.simplefilter("error", DeprecationWarning)
+            uploader = GitHubReleaseUploader("token", "owner/repo", base_url=self.server.url)
+
+        self.assertIsInstance(uploader.github.requester.auth, Auth.Token)
+
+    def test_main_http_options(self):
+        """Test pool options are accepted and calls are logged"""
+        env = {"GITHUB_TOKEN": "token", "GITHUB_REPOSITORY": "owner/repo"}
+        output = io.StringIO()
+        errors = io.StringIO()
+
+        with patch.dict(os.environ, env), redirect_stdout(output), redirect_stderr(errors):
+            code = main([f"{path}:{name}" for path, name in self.files[:2]] + [
+                "--api-url", self.server.url, "--pool-size", "2", "--connect-timeout", "5",
+                "--read-timeout", "30", "--log-requests"
+            ])
+
+        self.assertEqual(code, 0)
+        self.assertIn("HTTP POST", errors.getvalue())
+        self.assertRegex(output.getvalue(), r"HTTP: \d+ call\(s\) on \d+ connection\(s\), latency p50")
+
+
+if __name__ == "__main__":
+    unittest.main()
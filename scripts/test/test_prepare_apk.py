@@ -6,14 +6,19 @@ Tests cover:
 - Version extraction from pubspec.yaml
 - APK file validation
 - File copying and renaming
+- Checksum manifest generation
+- Batch mode (globs, split-per-ABI APKs, AABs)
 - Error handling
 - Output generation
 """
 
+import hashlib
+import json
 import os
 import sys
 import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock, patch, mock_open
 
@@ -22,7 +27,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from prepare_apk import (
     APKPreparer,
-    APKPreparationError
+    APKPreparationError,
+    version_key
 )
 
 
@@ -167,6 +173,15 @@ version: {version}
         
         self.assertIn("not an APK", str(context.exception))
     
+    def test_validate_source_aab_success(self):
+        """Test App Bundles are accepted"""
+        test_aab = self.test_project_root / "app-release.aab"
+        test_aab.write_bytes(b"fake aab content")
+        
+        preparer = APKPreparer(project_root=self.test_project_root)
+        
+        preparer.validate_source_apk(test_aab)
+    
     def test_prepare_apk_files_success(self):
         """Test successful APK preparation"""
         # Create a source APK
@@ -240,6 +255,93 @@ version: {version}
         self.assertTrue(versioned_path.exists())
         self.assertTrue(stable_path.exists())
     
+    def test_prepare_apk_files_reports_staging(self):
+        """Test staging strategy and timing are reported for each output"""
+        source_apk = self.test_project_root / "app-release.apk"
+        source_apk.write_bytes(b"fake apk content")
+        
+        preparer = APKPreparer(project_root=self.test_project_root)
+        result = preparer.prepare_apk_files(
+            str(source_apk),
+            output_dir=str(self.test_project_root / "dist"),
+            strategies=["copy"]
+        )
+        
+        for label in ('versioned', 'stable'):
+            self.assertEqual(result['staging'][label]['strategy'], "copy")
+            self.assertGreaterEqual(result['staging'][label]['seconds'], 0)
+    
+    def test_prepare_apk_files_writes_checksum_manifest(self):
+        """Test checksums.json and SHA256SUMS are written beside the APKs"""
+        source_apk = self.test_project_root / "app-release.apk"
+        content = b"fake apk content"
+        source_apk.write_bytes(content)
+        sha256 = hashlib.sha256(content).hexdigest()
+        
+        preparer = APKPreparer(project_root=self.test_project_root)
+        result = preparer.prepare_apk_files(
+            str(source_apk),
+            output_dir=str(self.test_project_root / "dist")
+        )
+        
+        self.assertEqual(result['sha256'], sha256)
+        self.assertEqual(result['sha512'], hashlib.sha512(content).hexdigest())
+        
+        manifest = json.loads(Path(result['checksums_path']).read_text())
+        self.assertEqual(manifest['version'], "1.0.0+1")
+        self.assertEqual(
+            manifest['files'][result['stable_name']],
+            {'size': len(content), 'sha256': sha256, 'sha512': result['sha512']}
+        )
+        
+        sums = Path(result['sha256sums_path']).read_text().splitlines()
+        self.assertEqual(sums, [
+            f"{sha256}  {result['versioned_name']}",
+            f"{sha256}  {result['stable_name']}",
+        ])
+    
+    def test_prepare_apk_files_without_checksums(self):
+        """Test checksum manifest can be disabled"""
+        source_apk = self.test_project_root / "app-release.apk"
+        source_apk.write_bytes(b"fake apk content")
+        output_dir = self.test_project_root / "dist"
+        
+        preparer = APKPreparer(project_root=self.test_project_root)
+        result = preparer.prepare_apk_files(
+            str(source_apk),
+            output_dir=str(output_dir),
+            checksums=False
+        )
+        
+        self.assertNotIn('sha256', result)
+        self.assertFalse((output_dir / "checksums.json").exists())
+
+    def test_prepare_apk_files_rerun_is_up_to_date(self):
+        """Test a re-run skips staging but reports the same outputs"""
+        import artifact_staging
+
+        source_apk = self.test_project_root / "app-release.apk"
+        source_apk.write_bytes(b"fake apk content")
+        output_dir = self.test_project_root / "dist"
+
+        first = APKPreparer(project_root=self.test_project_root).prepare_apk_files(
+            str(source_apk), output_dir=str(output_dir), strategies=["copy"]
+        )
+        (output_dir / "checksums.json").unlink()
+
+        with patch.dict(artifact_staging.STRATEGY_FUNCTIONS, {"copy": MagicMock(side_effect=OSError)}), \
+                patch.object(artifact_staging, "_hash_file") as mock_hash:
+            second = APKPreparer(project_root=self.test_project_root).prepare_apk_files(
+                str(source_apk), output_dir=str(output_dir), strategies=["copy"]
+            )
+
+        mock_hash.assert_not_called()
+        for label in ('versioned', 'stable'):
+            self.assertEqual(second['staging'][label]['strategy'], "up-to-date")
+        for key in ('versioned_path', 'stable_path', 'sha256', 'sha512', 'checksums_path'):
+            self.assertEqual(second[key], first[key])
+        self.assertTrue((output_dir / "checksums.json").exists())
+
     def test_prepare_apk_files_source_not_found(self):
         """Test APK preparation fails when source doesn't exist"""
         preparer = APKPreparer(project_root=self.test_project_root)
@@ -269,6 +371,177 @@ version: {version}
         self.assertTrue(versioned_path.exists())
 
 
+class TestBatchPreparation(unittest.TestCase):
+    """Test cases for batch preparation of several artifacts"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_project_root = Path(self.temp_dir)
+        (self.test_project_root / "pubspec.yaml").write_text("name: portfolio\nversion: 3.1.0+7\n")
+        
+        self.apk_dir = self.test_project_root / "flutter-apk"
+        self.apk_dir.mkdir()
+        self.abis = ["arm64-v8a", "armeabi-v7a", "x86_64"]
+        for abi in self.abis:
+            (self.apk_dir / f"app-{abi}-release.apk").write_bytes(abi.encode() * 100)
+        self.aab = self.test_project_root / "app-release.aab"
+        self.aab.write_bytes(b"aab" * 100)
+        self.output_dir = self.test_project_root / "dist"
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        if Path(self.temp_dir).exists():
+            shutil.rmtree(self.temp_dir)
+    
+    def test_artifact_variant(self):
+        """Test variant extraction from Flutter output names"""
+        cases = [
+            ("app-release.apk", ""),
+            ("app-arm64-v8a-release.apk", "arm64-v8a"),
+            ("app-release.aab", ""),
+            ("custom.apk", "custom"),
+        ]
+        for filename, expected in cases:
+            with self.subTest(filename=filename):
+                self.assertEqual(APKPreparer.artifact_variant(Path(filename)), expected)
+    
+    def test_prepare_batch_globs_and_aab(self):
+        """Test glob expansion and AAB inputs produce one combined result"""
+        preparer = APKPreparer(project_root=self.test_project_root)
+        
+        with patch.object(preparer, 'extract_version', wraps=preparer.extract_version) as spy:
+            result = preparer.prepare_batch(
+                [str(self.apk_dir / "app-*-release.apk"), str(self.aab)],
+                output_dir=str(self.output_dir)
+            )
+        
+        spy.assert_called_once()
+        self.assertEqual(result['version'], "3.1.0+7")
+        names = sorted(artifact['versioned_name'] for artifact in result['artifacts'])
+        self.assertEqual(names, [
+            "app-portfolio-release-3.1.0+7.aab",
+            "app-portfolio-release-arm64-v8a-3.1.0+7.apk",
+            "app-portfolio-release-armeabi-v7a-3.1.0+7.apk",
+            "app-portfolio-release-x86_64-3.1.0+7.apk",
+        ])
+        for artifact in result['artifacts']:
+            self.assertEqual(
+                Path(artifact['stable_path']).read_bytes(),
+                Path(artifact['source_path']).read_bytes()
+            )
+        
+        self.assertEqual(len(result['manifests']), 1)
+        manifest = json.loads(Path(result['manifests'][0]['checksums_path']).read_text())
+        self.assertEqual(len(manifest['files']), 8)
+        self.assertIn("app-portfolio-release-x86_64-latest.apk", manifest['files'])
+    
+    def test_prepare_batch_glob_without_matches(self):
+        """Test an empty glob is reported instead of silently ignored"""
+        preparer = APKPreparer(project_root=self.test_project_root)
+        
+        with self.assertRaises(APKPreparationError) as context:
+            preparer.prepare_batch([str(self.test_project_root / "*.nothing.apk")])
+        
+        self.assertIn("No APK or AAB files match", str(context.exception))
+    
+    def test_prepare_batch_name_collision(self):
+        """Test two sources mapping to the same output name are rejected"""
+        other_dir = self.test_project_root / "other"
+        other_dir.mkdir()
+        duplicate = other_dir / "app-x86_64-release.apk"
+        duplicate.write_bytes(b"different")
+        
+        preparer = APKPreparer(project_root=self.test_project_root)
+        
+        with self.assertRaises(APKPreparationError) as context:
+            preparer.prepare_batch(
+                [str(self.apk_dir / "app-x86_64-release.apk"), str(duplicate)],
+                output_dir=str(self.output_dir)
+            )
+        
+        self.assertIn("collision", str(context.exception))
+    
+    def test_prepare_batch_workers_capped_at_cpu_count(self):
+        """Test the default pool is no larger than the CPU count"""
+        preparer = APKPreparer(project_root=self.test_project_root)
+        
+        with patch('prepare_apk.os.cpu_count', return_value=2), \
+                patch('prepare_apk.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as executor, \
+                patch('sys.stdout'):
+            preparer.prepare_batch([str(self.apk_dir / "*.apk")], output_dir=str(self.output_dir))
+        
+        self.assertEqual(executor.call_args.kwargs['max_workers'], 2)
+    
+    def test_main_rejects_zero_jobs(self):
+        """Test --jobs 0 is a usage error rather than a crash"""
+        from prepare_apk import main
+        
+        with patch('sys.stderr'), self.assertRaises(SystemExit) as context:
+            main([str(self.apk_dir / "*.apk"), "--jobs", "0"])
+        
+        self.assertEqual(context.exception.code, 2)
+    
+    def test_main_batch_github_output(self):
+        """Test batch CLI writes a single combined GITHUB_OUTPUT block"""
+        from prepare_apk import main
+        
+        github_output = self.test_project_root / "github_output"
+        with patch.dict(os.environ, {"GITHUB_OUTPUT": str(github_output)}):
+            with patch('sys.stdout'):
+                exit_code = main([
+                    str(self.apk_dir / "*.apk"),
+                    "--output-dir", str(self.output_dir),
+                    "--project-root", str(self.test_project_root),
+                    "--github-output",
+                ])
+        
+        self.assertEqual(exit_code, 0)
+        lines = dict(
+            line.split("=", 1) for line in github_output.read_text().splitlines()
+        )
+        self.assertEqual(lines['version'], "3.1.0+7")
+        self.assertEqual(lines['artifact_count'], "3")
+        self.assertEqual(len(json.loads(lines['artifacts'])), 3)
+
+
+class TestVersionOrdering(unittest.TestCase):
+    """Test cases for version sorting and previous-version lookup"""
+    
+    def test_version_key_ordering(self):
+        """Test pre-releases, releases and build numbers sort correctly"""
+        versions = ["1.0.0+1", "0.1.0-beta", "1.10.0", "1.2.0+3", "0.1.0", "1.2.0+10"]
+        
+        self.assertEqual(
+            sorted(versions, key=version_key),
+            ["0.1.0-beta", "0.1.0", "1.0.0+1", "1.2.0+3", "1.2.0+10", "1.10.0"]
+        )
+    
+    def test_find_previous_versioned(self):
+        """Test the newest older versioned APK is selected"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            directory = Path(temp_dir)
+            for name in [
+                "app-portfolio-release-1.0.0+1.apk",
+                "app-portfolio-release-1.2.0+3.apk",
+                "app-portfolio-release-1.3.0+4.apk",
+                "app-portfolio-release-latest.apk",
+                "app-portfolio-release-x86_64-1.2.5.apk",
+            ]:
+                (directory / name).write_bytes(b"x")
+            
+            previous = APKPreparer.find_previous_versioned(
+                directory, "app-portfolio-release", "1.3.0+4"
+            )
+            none = APKPreparer.find_previous_versioned(
+                directory, "app-portfolio-release", "1.0.0+1"
+            )
+        
+        self.assertEqual(previous.name, "app-portfolio-release-1.2.0+3.apk")
+        self.assertIsNone(none)
+
+
 class TestFilenameGeneration(unittest.TestCase):
     """Test cases for filename generation logic"""
     
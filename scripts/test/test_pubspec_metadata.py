@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared pubspec.yaml metadata resolver.
+
+Tests cover:
+- Line-oriented fast path agreement with PyYAML
+- Fallback to PyYAML for values the fast path cannot type
+- mtime-keyed cache reuse and invalidation
+- Error handling
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pubspec_metadata
+from pubspec_metadata import (
+    PubspecError,
+    get_value_by_path,
+    resolve,
+    scan_scalars
+)
+
+
+PUBSPEC = """name: portfolio
+description: Portfolio web page.
+publish_to: none
+
+# Version: MAJOR.MINOR.PATCH+BUILD_NUMBER
+version: 1.0.0+1 # trailing comment
+
+environment:
+  sdk: '>=3.0.0 <4.0.0'
+  flutter: ">=3.38.0"
+dependencies:
+  flutter:
+    sdk: flutter
+  cupertino_icons: ^1.0.2
+"""
+
+
+class TestScanScalars(unittest.TestCase):
+    """Test cases for scan_scalars()"""
+
+    def test_matches_yaml(self):
+        """Test every scanned value agrees with PyYAML"""
+        scanned = scan_scalars(PUBSPEC)
+        document = yaml.safe_load(PUBSPEC)
+
+        self.assertEqual(scanned['version'], "1.0.0+1")
+        self.assertEqual(scanned['environment.sdk'], ">=3.0.0 <4.0.0")
+        for key, value in scanned.items():
+            with self.subTest(key=key):
+                self.assertEqual(get_value_by_path(document, key), value)
+
+    def test_values_yaml_would_not_type_as_string(self):
+        """Test non-string plain scalars are left to PyYAML"""
+        for raw in ("1.0", "2", "true", "no", "~", "2024-01-02", "0x1F", "1:20", "[1, 2]", "'it''s'", "a: b"):
+            with self.subTest(raw=raw):
+                self.assertNotIn('version', scan_scalars(f"version: {raw}\n"))
+
+    def test_multiline_values_are_left_to_yaml(self):
+        """Test folded continuation lines invalidate the scanned value"""
+        text = "description: Portfolio\n  web page.\nversion: 1.0.0\n"
+
+        scanned = scan_scalars(text)
+
+        self.assertNotIn('description', scanned)
+        self.assertEqual(scanned['version'], "1.0.0")
+
+    def test_nested_keys_are_not_section_children(self):
+        """Test only direct children of environment are scanned"""
+        text = "environment:\n  other:\n    sdk: nope\n  sdk: '>=3.0.0'\n"
+
+        self.assertEqual(scan_scalars(text), {'environment.sdk': ">=3.0.0"})
+
+    def test_multiple_documents_disable_fast_path(self):
+        """Test document markers leave everything to PyYAML"""
+        self.assertEqual(scan_scalars("version: 1.0.0\n---\nversion: 2.0.0\n"), {})
+
+
+class TestResolve(unittest.TestCase):
+    """Test cases for resolve()"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.pubspec = self.temp_dir / "pubspec.yaml"
+        self.pubspec.write_text(PUBSPEC)
+        self.cache = self.temp_dir / ".dart_tool" / "pubspec_metadata.json"
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_fast_path_does_not_parse_yaml(self):
+        """Test simple keys resolve without PyYAML"""
+        with patch.object(pubspec_metadata, "load_pubspec") as mock_load:
+            values = resolve(self.pubspec, ["version", "name", "environment.sdk"])
+
+        mock_load.assert_not_called()
+        self.assertEqual(values, {
+            'version': "1.0.0+1",
+            'name': "portfolio",
+            'environment.sdk': ">=3.0.0 <4.0.0",
+        })
+
+    def test_nested_and_missing_keys_fall_back(self):
+        """Test nested paths and absent keys go through PyYAML"""
+        values = resolve(self.pubspec, ["dependencies.flutter.sdk", "missing.key"])
+
+        self.assertEqual(values, {'dependencies.flutter.sdk': "flutter", 'missing.key': None})
+
+    def test_cache_is_reused(self):
+        """Test a second lookup reads neither the scanner nor PyYAML"""
+        resolve(self.pubspec, ["version", "dependencies.cupertino_icons"])
+        self.assertTrue(self.cache.exists())
+
+        with patch.object(pubspec_metadata, "scan_scalars") as mock_scan, \
+                patch.object(pubspec_metadata, "load_pubspec") as mock_load:
+            values = resolve(self.pubspec, ["version", "dependencies.cupertino_icons"])
+
+        mock_scan.assert_not_called()
+        mock_load.assert_not_called()
+        self.assertEqual(values['dependencies.cupertino_icons'], "^1.0.2")
+
+    def test_cache_invalidated_by_edit(self):
+        """Test editing pubspec.yaml invalidates cached values"""
+        resolve(self.pubspec, ["version"])
+        self.pubspec.write_text(PUBSPEC.replace("1.0.0+1", "1.1.0+22"))
+        stat = self.pubspec.stat()
+        os.utime(self.pubspec, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(resolve(self.pubspec, ["version"])['version'], "1.1.0+22")
+
+    def test_corrupt_cache_is_ignored(self):
+        """Test an unreadable cache falls back to the file"""
+        self.cache.parent.mkdir()
+        self.cache.write_text("{not json")
+
+        self.assertEqual(resolve(self.pubspec, ["name"])['name'], "portfolio")
+        self.assertEqual(json.loads(self.cache.read_text())['values']['name'], "portfolio")
+
+    def test_without_cache(self):
+        """Test use_cache=False leaves no cache file behind"""
+        resolve(self.pubspec, ["version"], use_cache=False)
+
+        self.assertFalse(self.cache.exists())
+
+    def test_non_string_version_uses_yaml_type(self):
+        """Test values PyYAML types as numbers are returned as such"""
+        self.pubspec.write_text("name: portfolio\nversion: 1.0\n")
+
+        self.assertEqual(resolve(self.pubspec, ["version"])['version'], 1.0)
+
+    def test_invalid_yaml(self):
+        """Test a broken file raises PubspecError when the fallback is needed"""
+        self.pubspec.write_text("name: [unterminated\n")
+
+        with self.assertRaises(PubspecError):
+            resolve(self.pubspec, ["name"])
+
+    def test_missing_file(self):
+        """Test a missing pubspec.yaml raises FileNotFoundError"""
+        with self.assertRaises(FileNotFoundError):
+            resolve(self.temp_dir / "missing.yaml", ["version"])
+
+
+if __name__ == "__main__":
+    unittest.main()
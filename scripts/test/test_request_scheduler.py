@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the rate-limit-aware request scheduler.
+
+Tests cover:
+- X-RateLimit-* and Retry-After parsing
+- Retrying rate-limited calls and giving up on long waits
+- Write token bucket and primary limit pacing
+- Concurrency limit
+- Request and wait statistics
+- Coroutine calls from an event loop
+"""
+
+import asyncio
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import the script
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from request_scheduler import (
+    SECONDARY_LIMIT_WAIT,
+    RequestScheduler,
+    parse_rate_limit,
+    rate_limit_wait
+)
+
+
+class FakeAPIError(Exception):
+    """Error shaped like PyGithub's GithubException"""
+
+    def __init__(self, status, message="", headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class FakeClock:
+    """Stand-in for the time module where sleeping advances the clock"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimitParsing(unittest.TestCase):
+    """Test cases for parse_rate_limit() and rate_limit_wait()"""
+
+    def test_parse_rate_limit(self):
+        """Test headers are read case-insensitively"""
+        headers = {"x-ratelimit-remaining": "12", "X-RateLimit-Limit": "5000", "x-ratelimit-reset": "1700000000"}
+
+        self.assertEqual(parse_rate_limit(headers), (12, 5000, 1700000000.0))
+        self.assertIsNone(parse_rate_limit({"x-ratelimit-remaining": "12"}))
+        self.assertIsNone(parse_rate_limit(None))
+
+    def test_retry_after_wins(self):
+        """Test Retry-After is used as-is"""
+        error = FakeAPIError(403, "secondary rate limit", {"Retry-After": "7"})
+
+        self.assertEqual(rate_limit_wait(error, 1000.0), 7.0)
+
+    def test_exhausted_primary_limit_waits_for_reset(self):
+        """Test remaining 0 waits until X-RateLimit-Reset"""
+        error = FakeAPIError(403, "API rate limit exceeded", {
+            "X-RateLimit-Remaining": "0", "X-RateLimit-Limit": "5000", "X-RateLimit-Reset": "1030",
+        })
+
+        self.assertEqual(rate_limit_wait(error, 1000.0), 30.0)
+
+    def test_secondary_limit_without_headers(self):
+        """Test a rate-limit message alone waits the secondary default"""
+        error = FakeAPIError(403, "You have exceeded a secondary rate limit")
+
+        self.assertEqual(rate_limit_wait(error, 1000.0), SECONDARY_LIMIT_WAIT)
+        self.assertEqual(rate_limit_wait(FakeAPIError(429), 1000.0), SECONDARY_LIMIT_WAIT)
+
+    def test_other_errors_are_not_rate_limits(self):
+        """Test permission and server errors are left to the caller"""
+        self.assertIsNone(rate_limit_wait(FakeAPIError(403, "Resource not accessible by integration"), 0))
+        self.assertIsNone(rate_limit_wait(FakeAPIError(502, "Bad Gateway", {"Retry-After": "1"}), 0))
+        self.assertIsNone(rate_limit_wait(ValueError("boom"), 0))
+
+
+class TestRequestScheduler(unittest.TestCase):
+    """Test cases for RequestScheduler"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.clock = FakeClock()
+        patcher = patch('request_scheduler.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rate_limited_call_is_retried(self):
+        """Test a Retry-After response pauses and retries the call"""
+        outcomes = [FakeAPIError(429, headers={"Retry-After": "5"}), "ok"]
+
+        def fn():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        scheduler = RequestScheduler()
+
+        self.assertEqual(scheduler.call(fn), "ok")
+        self.assertEqual(self.clock.slept, [5.0])
+        stats = scheduler.stats()
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['rate_limited'], 1)
+        self.assertEqual(stats['wait_seconds'], 5.0)
+
+    def test_long_wait_raises(self):
+        """Test a wait beyond max_wait raises instead of sleeping"""
+        def fn():
+            raise FakeAPIError(403, "rate limit", {"Retry-After": "3600"})
+
+        scheduler = RequestScheduler(max_wait=60)
+
+        with self.assertRaises(FakeAPIError):
+            scheduler.call(fn)
+        self.assertEqual(self.clock.slept, [])
+
+    def test_retries_are_bounded(self):
+        """Test a call rate-limited every time gives up after max_retries"""
+        calls = []
+
+        def fn():
+            calls.append(1)
+            raise FakeAPIError(429, headers={"Retry-After": "1"})
+
+        with self.assertRaises(FakeAPIError):
+            RequestScheduler(max_retries=2).call(fn)
+        self.assertEqual(len(calls), 3)
+
+    def test_other_errors_propagate(self):
+        """Test non-rate-limit errors are raised on the first attempt"""
+        def fn():
+            raise FakeAPIError(404, "Not Found")
+
+        scheduler = RequestScheduler()
+
+        with self.assertRaises(FakeAPIError):
+            scheduler.call(fn)
+        self.assertEqual(scheduler.stats()['requests'], 1)
+        self.assertEqual(self.clock.slept, [])
+
+    def test_write_burst_then_steady_rate(self):
+        """Test writes beyond the burst are spaced at the write rate"""
+        scheduler = RequestScheduler(write_burst=2, write_rate=2.0)
+
+        for _ in range(4):
+            scheduler.call(lambda: None, write=True)
+        scheduler.call(lambda: None)
+
+        # Third and fourth writes each wait 0.5 s; reads are not throttled
+        self.assertEqual(self.clock.slept, [0.5, 0.5])
+
+    def test_exhausted_limit_pauses_until_reset(self):
+        """Test no call is sent while the primary budget is exhausted"""
+        scheduler = RequestScheduler()
+        scheduler.observe({
+            "X-RateLimit-Remaining": "0", "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Reset": str(self.clock.now + 30),
+        })
+
+        scheduler.call(lambda: None)
+
+        self.assertEqual(self.clock.slept, [30.0])
+        self.assertEqual(scheduler.stats()['remaining'], 0)
+
+    def test_low_remaining_spreads_calls(self):
+        """Test the last few calls are spread until the reset"""
+        scheduler = RequestScheduler()
+        scheduler.observe_limits(10, 5000, self.clock.now + 100)
+
+        for _ in range(3):
+            scheduler.call(lambda: None)
+
+        # Spaced 10 s apart: the first is immediate
+        self.assertEqual(self.clock.slept, [10.0, 10.0])
+
+    def test_limits_callable_is_observed(self):
+        """Test limits reported by the client after each call are recorded"""
+        scheduler = RequestScheduler(limits=lambda: (4321, 5000, self.clock.now + 600))
+
+        scheduler.call(lambda: None)
+
+        stats = scheduler.stats()
+        self.assertEqual((stats['remaining'], stats['limit']), (4321, 5000))
+
+    def test_concurrency_is_bounded(self):
+        """Test calls beyond max_concurrent queue"""
+        scheduler = RequestScheduler(max_concurrent=2)
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def fn():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            # request_scheduler.time is fake; hold the slot with an Event
+            threading.Event().wait(0.02)
+            with lock:
+                active[0] -= 1
+
+        threads = [threading.Thread(target=scheduler.call, args=(fn,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(scheduler.stats()['requests'], 6)
+
+    def test_slot_is_free_while_waiting(self):
+        """Test a call waiting for its send time does not hold a slot"""
+        scheduler = RequestScheduler(max_concurrent=1, write_burst=1, write_rate=1.0)
+        free = []
+        sleep = self.clock.sleep
+
+        def check_and_sleep(seconds):
+            free.append(scheduler._slots.acquire(blocking=False))
+            if free[-1]:
+                scheduler._slots.release()
+            sleep(seconds)
+
+        self.clock.sleep = check_and_sleep
+        scheduler.call(lambda: None, write=True)
+        scheduler.call(lambda: None, write=True)
+
+        self.assertEqual(free, [True])
+
+    def test_pause_set_during_wait_is_honoured(self):
+        """Test a Retry-After pause recorded by another thread mid-wait holds the waiting call"""
+        scheduler = RequestScheduler(write_burst=1, write_rate=1.0)
+        scheduler.call(lambda: None, write=True)
+        waiting = threading.Event()
+        paused = threading.Event()
+        sleep = self.clock.sleep
+
+        def blocking_sleep(seconds):
+            waiting.set()
+            paused.wait(5)
+            sleep(seconds)
+
+        self.clock.sleep = blocking_sleep
+        started = self.clock.now
+        sent_at = []
+        thread = threading.Thread(target=scheduler.call, args=(lambda: sent_at.append(self.clock.now),),
+                                  kwargs={'write': True})
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(paused.set)
+        waiting.wait(5)
+
+        scheduler.pause(30)
+        paused.set()
+        thread.join(5)
+
+        # One second for the write token, then the rest of the pause
+        self.assertEqual(self.clock.slept, [1.0, 29.0])
+        self.assertEqual(sent_at, [started + 30])
+        self.assertEqual(scheduler.stats()['wait_seconds'], 30.0)
+
+    def test_transfers_do_not_take_slots(self):
+        """Test a running upload does not block metadata calls"""
+        scheduler = RequestScheduler(max_concurrent=1)
+        started = threading.Event()
+        finish = threading.Event()
+
+        def upload():
+            started.set()
+            finish.wait(5)
+            return "asset"
+
+        thread = threading.Thread(target=scheduler.call, args=(upload,), kwargs={'write': True, 'transfer': True})
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(finish.set)
+        started.wait(5)
+
+        self.assertEqual(scheduler.call(lambda: "release"), "release")
+        self.assertFalse(finish.is_set())
+        finish.set()
+        thread.join()
+        self.assertEqual(scheduler.stats()['requests'], 2)
+
+    def test_call_async_is_paced_and_retried(self):
+        """Test coroutine calls share the write budget and retry rate limits"""
+        async def fake_sleep(seconds):
+            self.clock.sleep(seconds)
+
+        outcomes = [FakeAPIError(429, headers={"Retry-After": "5"}), "ok"]
+
+        async def fn():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        async def noop():
+            return None
+
+        scheduler = RequestScheduler(write_burst=1, write_rate=2.0)
+        scheduler.call(lambda: None, write=True)
+
+        with patch('request_scheduler.asyncio.sleep', fake_sleep):
+            result = asyncio.run(scheduler.call_async(fn, write=True))
+            asyncio.run(scheduler.call_async(noop))
+
+        self.assertEqual(result, "ok")
+        # A token after 0.5 s, then the Retry-After pause (by then the
+        # bucket has refilled); the read is not throttled
+        self.assertEqual(self.clock.slept, [0.5, 5.0])
+        stats = scheduler.stats()
+        self.assertEqual(stats['requests'], 4)
+        self.assertEqual(stats['rate_limited'], 1)
+        self.assertEqual(stats['wait_seconds'], 5.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,12 +7,25 @@ Tests cover:
 - Error handling
 - URL generation
 - File checks
+- Batch uploads (file:asset-name pairs)
+- Skipping uploads of identical assets
+- Streamed uploads, retries with backoff and throughput statistics
+- Rate-limit handling through the request scheduler
+- Conditional metadata requests through the ETag cache
+- Retention-policy pruning of versioned assets
+- Directory sync plans (upload, rename, delete) and their application
 """
 
+import hashlib
+import json
 import os
+import shutil
 import sys
+import tempfile
 import unittest
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, mock_open
 
 # Add parent directory to path to import the script
@@ -20,7 +33,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from upload_to_github_releases import (
     GitHubReleaseUploader,
-    GitHubReleaseError
+    GitHubReleaseError,
+    asset_label,
+    build_release_index,
+    main,
+    parse_duration,
+    parse_file_spec,
+    remote_sha256,
+    versioned_asset_pattern,
+    write_release_index
 )
 
 
@@ -44,7 +65,7 @@ class TestGitHubReleaseUploader(unittest.TestCase):
         uploader = GitHubReleaseUploader(self.mock_token, self.mock_repo)
         
         self.assertEqual(uploader.repository, self.mock_repo)
-        mock_github.assert_called_once_with(self.mock_token)
+        self.assertEqual(mock_github.call_args.kwargs['auth'].token, self.mock_token)
         mock_github_instance.get_repo.assert_called_once_with(self.mock_repo)
     
     def test_init_no_token(self):
@@ -121,6 +142,43 @@ class TestGitHubReleaseUploader(unittest.TestCase):
         self.assertTrue(result)
         mock_asset.delete_asset.assert_called_once()
     
+    @patch('upload_to_github_releases.Github')
+    def test_asset_index_fetched_once(self, mock_github):
+        """Test assets are listed once per release and the index tracks changes"""
+        mock_github_instance = MagicMock()
+        mock_repo_instance = MagicMock()
+        mock_repo_instance.name = "repo"
+        mock_github_instance.get_repo.return_value = mock_repo_instance
+        mock_github.return_value = mock_github_instance
+        
+        mock_release = MagicMock()
+        mock_release.id = 42
+        old_assets = []
+        for name in ("app-1.0.0.apk", "app-latest.apk"):
+            asset = MagicMock()
+            asset.name = name
+            old_assets.append(asset)
+        mock_release.get_assets.return_value = old_assets
+        mock_new_asset = MagicMock()
+        mock_release.upload_asset_from_memory.return_value = mock_new_asset
+        
+        uploader = GitHubReleaseUploader(self.mock_token, self.mock_repo)
+        with tempfile.TemporaryDirectory() as temp_dir, patch('builtins.print'):
+            local = Path(temp_dir) / "app-latest.apk"
+            local.write_bytes(b"new build")
+            self.assertTrue(uploader.delete_existing_asset(mock_release, "app-1.0.0.apk"))
+            self.assertFalse(uploader.delete_existing_asset(mock_release, "app-1.0.0.apk"))
+            self.assertFalse(uploader.delete_existing_asset(mock_release, "missing.apk"))
+            uploader._replace_asset(mock_release, local, "app-latest.apk")
+        
+        mock_release.get_assets.assert_called_once()
+        old_assets[0].delete_asset.assert_called_once()
+        old_assets[1].delete_asset.assert_called_once()
+        self.assertEqual(
+            uploader.asset_index(mock_release),
+            {"app-latest.apk": mock_new_asset.update_asset.return_value}
+        )
+    
     @patch('upload_to_github_releases.Github')
     def test_upload_file_not_found(self, mock_github):
         """Test upload fails when file doesn't exist"""
@@ -135,9 +193,11 @@ class TestGitHubReleaseUploader(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             uploader.upload_file("/non/existent/file.apk")
     
+    @patch('upload_to_github_releases.open', mock_open(read_data=b""), create=True)
+    @patch('upload_to_github_releases.compute_digests', return_value={'sha256': "0" * 64})
     @patch('upload_to_github_releases.Path')
     @patch('upload_to_github_releases.Github')
-    def test_stable_url_generation(self, mock_github, mock_path):
+    def test_stable_url_generation(self, mock_github, mock_path, mock_digests):
         """Test stable URL is generated correctly"""
         mock_github_instance = MagicMock()
         mock_repo_instance = MagicMock()
@@ -162,6 +222,774 @@ class TestGitHubReleaseUploader(unittest.TestCase):
         self.assertEqual(stable_url, expected_url)
 
 
+class TestBatchUpload(unittest.TestCase):
+    """Test cases for uploading several assets in one run"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.versioned = self.temp_dir / "app-1.2.0+5.apk"
+        self.versioned.write_bytes(b"versioned")
+        self.stable = self.temp_dir / "app-latest.apk"
+        self.stable.write_bytes(b"stable")
+        
+        patcher = patch('upload_to_github_releases.Github')
+        mock_github = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_repo = MagicMock()
+        self.mock_repo.name = "repo"
+        self.mock_release = MagicMock()
+        self.mock_release.get_assets.return_value = []
+        self.mock_repo.get_release.return_value = self.mock_release
+        mock_github.return_value.get_repo.return_value = self.mock_repo
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_parse_file_spec(self):
+        """Test file:asset-name parsing"""
+        self.assertEqual(parse_file_spec("dist/app.apk:app-latest.apk"), ("dist/app.apk", "app-latest.apk"))
+        self.assertEqual(parse_file_spec("dist/app.apk"), ("dist/app.apk", None))
+        
+        existing = self.temp_dir / "odd:name.apk"
+        existing.write_bytes(b"x")
+        self.assertEqual(parse_file_spec(str(existing)), (str(existing), None))
+    
+    def test_upload_files_single_release_lookup(self):
+        """Test the release is fetched once and every file is uploaded"""
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with patch('builtins.print'):
+            results = uploader.upload_files([
+                (str(self.versioned), "app-portfolio-release-1.2.0+5.apk"),
+                (str(self.stable), "app-portfolio-release-latest.apk"),
+            ], max_workers=2)
+        
+        self.mock_repo.get_release.assert_called_once_with("latest")
+        self.assertEqual(self.mock_release.upload_asset_from_memory.call_count, 2)
+        self.assertEqual([r['asset_name'] for r in results], [
+            "app-portfolio-release-1.2.0+5.apk",
+            "app-portfolio-release-latest.apk",
+        ])
+        self.assertEqual(
+            results[1]['stable_url'],
+            "https://github.com/owner/repo/releases/latest/download/app-portfolio-release-latest.apk"
+        )
+    
+    def test_upload_files_duplicate_names(self):
+        """Test two files cannot target the same asset name"""
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with self.assertRaises(GitHubReleaseError):
+            uploader.upload_files([(str(self.versioned), "app.apk"), (str(self.stable), "app.apk")])
+        self.mock_release.upload_asset_from_memory.assert_not_called()
+    
+    def test_upload_files_missing_file(self):
+        """Test all files are checked before anything is uploaded"""
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with self.assertRaises(FileNotFoundError):
+            uploader.upload_files([(str(self.versioned), None), (str(self.temp_dir / "missing.apk"), None)])
+        self.mock_release.upload_asset_from_memory.assert_not_called()
+    
+    def remote_asset(self, name: str, content: bytes, digest=None, label=None):
+        """Existing release asset carrying metadata for content"""
+        asset = MagicMock()
+        asset.name = name
+        asset.size = len(content)
+        asset.digest = digest
+        asset.label = label
+        return asset
+    
+    def test_identical_asset_is_skipped(self):
+        """Test matching size and digest skip delete and upload"""
+        sha256 = hashlib.sha256(b"stable").hexdigest()
+        by_digest = self.remote_asset("app-latest.apk", b"stable", digest=f"sha256:{sha256}")
+        by_label = self.remote_asset("app-1.2.0+5.apk", b"versioned",
+                                     label=asset_label("app-1.2.0+5.apk", hashlib.sha256(b"versioned").hexdigest()))
+        self.mock_release.get_assets.return_value = [by_digest, by_label]
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with patch('builtins.print'):
+            results = uploader.upload_files([
+                (str(self.versioned), "app-1.2.0+5.apk"),
+                (str(self.stable), "app-latest.apk"),
+            ])
+        
+        self.assertEqual([r['uploaded'] for r in results], [False, False])
+        self.mock_release.upload_asset_from_memory.assert_not_called()
+        by_digest.delete_asset.assert_not_called()
+        by_label.delete_asset.assert_not_called()
+    
+    def test_changed_asset_is_replaced(self):
+        """Test a digest mismatch replaces the asset and labels it with the new digest"""
+        stale = self.remote_asset("app-latest.apk", b"stable", digest="sha256:" + "0" * 64)
+        self.mock_release.get_assets.return_value = [stale]
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with patch('builtins.print'):
+            uploader.upload_file(str(self.stable), "app-latest.apk")
+        
+        stale.delete_asset.assert_called_once()
+        self.assertEqual(
+            self.mock_release.upload_asset_from_memory.call_args.kwargs['label'],
+            f"app-latest.apk [sha256:{hashlib.sha256(b'stable').hexdigest()}]"
+        )
+    
+    def test_force_uploads_identical_asset(self):
+        """Test force bypasses the identical-asset check"""
+        sha256 = hashlib.sha256(b"stable").hexdigest()
+        self.mock_release.get_assets.return_value = [
+            self.remote_asset("app-latest.apk", b"stable", digest=f"sha256:{sha256}")
+        ]
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with patch('builtins.print'):
+            uploader.upload_file(str(self.stable), "app-latest.apk", force=True)
+        
+        self.mock_release.upload_asset_from_memory.assert_called_once()
+    
+    def test_replace_is_upload_then_swap(self):
+        """Test the old asset is deleted only after the new one is uploaded"""
+        old = self.remote_asset("app-latest.apk", b"old build")
+        leftover = self.remote_asset("app-latest.apk.uploading-deadbeef", b"partial")
+        self.mock_release.get_assets.return_value = [old, leftover]
+        calls = MagicMock()
+        calls.attach_mock(old.delete_asset, "delete_old")
+        calls.attach_mock(self.mock_release.upload_asset_from_memory, "upload")
+        new_asset = self.mock_release.upload_asset_from_memory.return_value
+        calls.attach_mock(new_asset.update_asset, "rename")
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with patch('builtins.print'):
+            uploader.upload_file(str(self.stable), "app-latest.apk")
+        
+        leftover.delete_asset.assert_called_once()
+        self.assertEqual([c[0] for c in calls.mock_calls], ["upload", "delete_old", "rename"])
+        temporary_name = self.mock_release.upload_asset_from_memory.call_args.kwargs['name']
+        self.assertTrue(temporary_name.startswith("app-latest.apk.uploading-"))
+        new_asset.update_asset.assert_called_once_with(
+            name="app-latest.apk",
+            label=asset_label("app-latest.apk", hashlib.sha256(b"stable").hexdigest())
+        )
+        self.assertEqual(list(uploader.asset_index(self.mock_release)), ["app-latest.apk"])
+    
+    def test_failed_upload_keeps_old_asset(self):
+        """Test a failed upload never removes the serving asset"""
+        from github import GithubException
+        
+        old = self.remote_asset("app-latest.apk", b"old build")
+        self.mock_release.get_assets.return_value = [old]
+        self.mock_release.upload_asset_from_memory.side_effect = GithubException(502, {'message': 'Bad Gateway'}, {})
+        uploader = GitHubReleaseUploader("token", "owner/repo", retries=2)
+        
+        with patch('builtins.print'), patch('upload_to_github_releases.time.sleep') as mock_sleep, \
+                self.assertRaises(GitHubReleaseError):
+            uploader.upload_file(str(self.stable), "app-latest.apk")
+        
+        old.delete_asset.assert_not_called()
+        self.assertEqual(self.mock_release.upload_asset_from_memory.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+    
+    def test_transient_errors_are_retried(self):
+        """Test 5xx responses and connection resets are retried under fresh names"""
+        from github import GithubException
+        
+        new_asset = MagicMock()
+        self.mock_release.upload_asset_from_memory.side_effect = [
+            GithubException(503, {'message': 'Service Unavailable'}, {}),
+            ConnectionResetError(104, "Connection reset by peer"),
+            new_asset,
+        ]
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with patch('builtins.print'), patch('upload_to_github_releases.time.sleep') as mock_sleep:
+            results = uploader.upload_files([(str(self.stable), "app-latest.apk")])
+        
+        self.assertEqual(mock_sleep.call_count, 2)
+        first, second = (call.args[0] for call in mock_sleep.call_args_list)
+        self.assertTrue(1.0 <= first <= 2.0 and 2.0 <= second <= 4.0)
+        names = [call.kwargs['name'] for call in self.mock_release.upload_asset_from_memory.call_args_list]
+        self.assertEqual(len(set(names)), 3)
+        new_asset.update_asset.assert_called_once()
+        self.assertEqual(results[0]['attempts'], 3)
+        self.assertGreater(results[0]['bytes_per_second'], 0)
+    
+    def test_client_errors_are_not_retried(self):
+        """Test 4xx responses fail immediately"""
+        from github import GithubException
+        
+        self.mock_release.upload_asset_from_memory.side_effect = GithubException(
+            422, {'message': 'Validation Failed'}, {}
+        )
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with patch('builtins.print'), patch('upload_to_github_releases.time.sleep') as mock_sleep, \
+                self.assertRaises(GitHubReleaseError):
+            uploader.upload_file(str(self.stable), "app-latest.apk")
+        
+        mock_sleep.assert_not_called()
+        self.mock_release.upload_asset_from_memory.assert_called_once()
+    
+    def test_rate_limited_upload_waits_for_retry_after(self):
+        """Test a secondary rate limit is waited out by the scheduler, not the upload retry"""
+        from github import GithubException
+        
+        self.mock_release.upload_asset_from_memory.side_effect = [
+            GithubException(403, {'message': 'You have exceeded a secondary rate limit'}, {'retry-after': '7'}),
+            MagicMock(),
+        ]
+        clock = MagicMock()
+        clock.monotonic.return_value = clock.time.return_value = 1000.0
+        
+        with patch('request_scheduler.time', clock):
+            uploader = GitHubReleaseUploader("token", "owner/repo")
+            with patch('builtins.print'), patch('upload_to_github_releases.time.sleep') as mock_backoff:
+                uploader.upload_file(str(self.stable), "app-latest.apk")
+        
+        mock_backoff.assert_not_called()
+        clock.sleep.assert_called_with(7.0)
+        stats = uploader.request_stats()
+        self.assertEqual(stats['rate_limited'], 1)
+        self.assertEqual(stats['requests'], 6)
+    
+    def test_upload_is_streamed_in_chunks(self):
+        """Test the request body is read from disk a bounded chunk at a time"""
+        content = bytes(range(256)) * 40
+        self.stable.write_bytes(content)
+        chunks = []
+        
+        def upload(file_like, file_size, name, content_type, label):
+            while True:
+                chunk = file_like.read()
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            self.assertEqual(file_size, len(content))
+            self.assertEqual(content_type, "application/vnd.android.package-archive")
+            return MagicMock()
+        
+        self.mock_release.upload_asset_from_memory.side_effect = upload
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with patch('builtins.print'), patch.object(GitHubReleaseUploader, 'UPLOAD_CHUNK_SIZE', 1000):
+            uploader.upload_file(str(self.stable), "app-latest.apk")
+        
+        self.assertEqual(b"".join(chunks), content)
+        self.assertEqual(max(len(chunk) for chunk in chunks), 1000)
+    
+    def test_remote_sha256(self):
+        """Test digest precedence and label parsing"""
+        self.assertEqual(remote_sha256(self.remote_asset("a", b"", digest="sha256:" + "a" * 64)), "a" * 64)
+        self.assertEqual(remote_sha256(self.remote_asset("a", b"", label="a [sha256:" + "b" * 64 + "]")), "b" * 64)
+        self.assertIsNone(remote_sha256(self.remote_asset("a", b"", label="a")))
+    
+    def test_main_batch_github_output(self):
+        """Test stable_url is the last file and stable_urls lists all"""
+        output_file = self.temp_dir / "github_output"
+        env = {"GITHUB_TOKEN": "token", "GITHUB_REPOSITORY": "owner/repo", "GITHUB_OUTPUT": str(output_file)}
+        
+        with patch.dict(os.environ, env), patch('builtins.print'):
+            exit_code = main([
+                f"{self.versioned}:app-portfolio-release-1.2.0+5.apk",
+                f"{self.stable}:app-portfolio-release-latest.apk",
+                "--github-output",
+            ])
+        
+        self.assertEqual(exit_code, 0)
+        lines = output_file.read_text().splitlines()
+        self.assertEqual(
+            lines[0],
+            "stable_url=https://github.com/owner/repo/releases/latest/download/app-portfolio-release-latest.apk"
+        )
+        self.assertTrue(lines[1].startswith('stable_urls=["https://github.com/owner/repo/'))
+    
+    def test_main_asset_name_with_several_files(self):
+        """Test --asset-name is rejected for several files"""
+        with patch('sys.stderr'):
+            exit_code = main([str(self.versioned), str(self.stable), "--asset-name", "x.apk"])
+        
+        self.assertEqual(exit_code, 1)
+    
+    def test_main_rejects_bad_jobs(self):
+        """Test --jobs below 1 is a usage error rather than a crash or the default"""
+        for jobs in ("0", "-1"):
+            with self.subTest(jobs=jobs), patch('sys.stderr'), self.assertRaises(SystemExit) as context:
+                main([str(self.versioned), "--jobs", jobs])
+            self.assertEqual(context.exception.code, 2)
+
+
+class TestConditionalMetadata(unittest.TestCase):
+    """Test cases for release and asset reads through the ETag cache"""
+    
+    RELEASE_URL = "https://api.github.com/repos/owner/repo/releases/tags/latest"
+    ASSETS_URL = "https://api.github.com/repos/owner/repo/releases/7/assets?per_page=100"
+    ASSETS_PAGE_2 = "https://api.github.com/repositories/1/releases/7/assets?per_page=100&page=2"
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache_path = self.temp_dir / "etags.json"
+        
+        patcher = patch('upload_to_github_releases.Github')
+        self.mock_github = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.mock_github.get_repo.return_value.url = "https://api.github.com/repos/owner/repo"
+        self.mock_github.create_from_raw_data.side_effect = lambda klass, raw: SimpleNamespace(**raw)
+        self.requester = self.mock_github.requester
+        self.requester.rate_limiting = (-1, -1)
+        self.sent = []
+        self.responses = {
+            self.RELEASE_URL: ('"r1"', None, {
+                'id': 7, 'url': "https://api.github.com/repos/owner/repo/releases/7",
+            }),
+            self.ASSETS_URL: ('"a1"', f'<{self.ASSETS_PAGE_2}>; rel="next"', [{'name': "app-1.0.0.apk"}]),
+            self.ASSETS_PAGE_2: ('"a2"', None, [{'name': "app-latest.apk"}]),
+        }
+        self.requester.requestJson.side_effect = self.respond
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def respond(self, verb, url, headers=None):
+        """Fake API: 304 when If-None-Match carries the current ETag"""
+        etag, link, body = self.responses[url]
+        self.sent.append((url, (headers or {}).get("If-None-Match")))
+        response_headers = {'etag': etag}
+        if link:
+            response_headers['link'] = link
+        if (headers or {}).get("If-None-Match") == etag:
+            return 304, response_headers, ""
+        return 200, response_headers, json.dumps(body)
+    
+    def read_metadata(self):
+        """Release and asset names as seen by a fresh uploader"""
+        uploader = GitHubReleaseUploader("token", "owner/repo", etag_cache=self.cache_path)
+        with patch('builtins.print'):
+            release = uploader.get_or_create_release()
+        return uploader, release, sorted(uploader.asset_index(release))
+    
+    def test_second_run_is_not_modified(self):
+        """Test a later run revalidates with If-None-Match and reuses cached bodies"""
+        _, first_release, first_names = self.read_metadata()
+        self.sent.clear()
+        
+        uploader, release, names = self.read_metadata()
+        
+        self.assertEqual(self.sent, [
+            (self.RELEASE_URL, '"r1"'),
+            (self.ASSETS_URL, '"a1"'),
+            (self.ASSETS_PAGE_2, '"a2"'),
+        ])
+        self.assertEqual(release.id, first_release.id)
+        self.assertEqual(names, first_names)
+        self.assertEqual(names, ["app-1.0.0.apk", "app-latest.apk"])
+        self.assertEqual(uploader.request_stats()['not_modified'], 3)
+    
+    def test_changed_resource_is_refetched(self):
+        """Test a new ETag replaces the cached body"""
+        self.read_metadata()
+        self.responses[self.ASSETS_PAGE_2] = ('"a3"', None, [{'name': "app-2.0.0.apk"}])
+        
+        uploader, _, names = self.read_metadata()
+        
+        self.assertEqual(names, ["app-1.0.0.apk", "app-2.0.0.apk"])
+        self.assertEqual(uploader.request_stats()['not_modified'], 2)
+        cached = json.loads(self.cache_path.read_text())
+        self.assertEqual(cached[self.ASSETS_PAGE_2]['etag'], '"a3"')
+    
+    def test_missing_release_is_created(self):
+        """Test a 404 from the conditional read falls back to creating the release"""
+        from github import UnknownObjectException
+        
+        self.requester.requestJson.side_effect = None
+        self.requester.requestJson.return_value = (404, {}, '{"message": "Not Found"}')
+        self.requester.createException.return_value = UnknownObjectException(404, {'message': "Not Found"}, {})
+        uploader = GitHubReleaseUploader("token", "owner/repo", etag_cache=self.cache_path)
+        
+        with patch('builtins.print'):
+            release = uploader.get_or_create_release()
+        
+        self.assertEqual(release, self.mock_github.get_repo.return_value.create_git_release.return_value)
+
+
+class TestPrune(unittest.TestCase):
+    """Test cases for the retention policy and the prune subcommand"""
+    
+    NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        patcher = patch('upload_to_github_releases.Github')
+        mock_github = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_repo = MagicMock()
+        self.mock_repo.name = "repo"
+        self.mock_release = MagicMock()
+        self.mock_repo.get_release.return_value = self.mock_release
+        mock_github.return_value.get_repo.return_value = self.mock_repo
+        
+        self.assets = [
+            self.asset("app-portfolio-release-1.0.0+1.apk", days_old=90, size=10),
+            self.asset("app-portfolio-release-1.2.0+4.apk", days_old=40, size=20),
+            self.asset("app-portfolio-release-1.2.0+4.aab", days_old=40, size=25),
+            self.asset("app-portfolio-release-1.10.0+5.apk", days_old=3, size=30, sha256="c" * 64),
+            self.asset("app-portfolio-release-1.2.0+4-to-1.10.0+5.apkpatch", days_old=3, size=5),
+            self.asset("app-portfolio-release-1.9.0+3.apk", days_old=20, size=40),
+            self.asset("app-portfolio-release-latest.apk", days_old=3, size=30, sha256="c" * 64),
+            self.asset("app-portfolio-release-latest.apk.uploading-deadbeef", days_old=300, size=1),
+            self.asset("notes.txt", days_old=300, size=1),
+        ]
+        self.mock_release.get_assets.return_value = self.assets
+    
+    def asset(self, name, days_old, size, sha256=None):
+        """Release asset created days_old days before NOW"""
+        asset = MagicMock()
+        asset.name = name
+        asset.size = size
+        asset.created_at = self.NOW - timedelta(days=days_old)
+        asset.digest = f"sha256:{sha256}" if sha256 else None
+        asset.label = None
+        return asset
+    
+    def names(self, assets):
+        """Sorted asset names"""
+        return sorted(asset.name for asset in assets)
+    
+    def test_parse_duration(self):
+        """Test duration suffixes; a bare number means days"""
+        self.assertEqual(parse_duration("30d"), timedelta(days=30))
+        self.assertEqual(parse_duration("12h"), timedelta(hours=12))
+        self.assertEqual(parse_duration("2w"), timedelta(weeks=2))
+        self.assertEqual(parse_duration("7"), timedelta(days=7))
+        with self.assertRaises(ValueError):
+            parse_duration("soon")
+    
+    def test_versioned_asset_pattern(self):
+        """Test versioned APKs, bundles and patches match; stable and temporary names do not"""
+        pattern = versioned_asset_pattern("app-portfolio-release")
+        
+        self.assertEqual(pattern.fullmatch("app-portfolio-release-1.2.0+4.aab").group('version'), "1.2.0+4")
+        self.assertEqual(
+            pattern.fullmatch("app-portfolio-release-1.0.0+1-to-1.1.0+2.apkpatch").group('version'),
+            "1.1.0+2"
+        )
+        self.assertIsNone(pattern.fullmatch("app-portfolio-release-latest.apk"))
+        self.assertIsNone(pattern.fullmatch("app-portfolio-release-1.0.0.apk.uploading-deadbeef"))
+    
+    def test_keep_last_orders_by_version(self):
+        """Test keep-last keeps the newest versions by version order, not name order"""
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        kept, doomed = uploader.plan_prune(self.assets, keep_last=2, now=self.NOW)
+        
+        self.assertEqual(self.names(kept), [
+            "app-portfolio-release-1.10.0+5.apk",
+            "app-portfolio-release-1.2.0+4-to-1.10.0+5.apkpatch",
+            "app-portfolio-release-1.9.0+3.apk",
+        ])
+        self.assertEqual(self.names(doomed), [
+            "app-portfolio-release-1.0.0+1.apk",
+            "app-portfolio-release-1.2.0+4.aab",
+            "app-portfolio-release-1.2.0+4.apk",
+        ])
+    
+    def test_keep_newer_than_and_stable(self):
+        """Test age keeps recent versions and the stable asset's version is always kept"""
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        self.assets[3].created_at = self.NOW - timedelta(days=400)
+        
+        kept, doomed = uploader.plan_prune(
+            self.assets, keep_last=1, keep_newer_than=timedelta(days=30), now=self.NOW
+        )
+        
+        # 1.10.0+5 matches the stable digest; 1.9.0+3 is 20 days old
+        self.assertIn("app-portfolio-release-1.10.0+5.apk", self.names(kept))
+        self.assertIn("app-portfolio-release-1.9.0+3.apk", self.names(kept))
+        self.assertEqual(len(doomed), 3)
+    
+    def test_dry_run_deletes_nothing(self):
+        """Test a dry run reports deletions and space without deleting"""
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        result = uploader.prune(keep_last=2, dry_run=True)
+        
+        self.assertTrue(result['dry_run'])
+        self.assertEqual(len(result['deleted']), 3)
+        self.assertEqual(result['reclaimed_bytes'], 10 + 20 + 25)
+        for asset in self.assets:
+            asset.delete_asset.assert_not_called()
+    
+    def test_prune_deletes_and_reports_failures(self):
+        """Test doomed assets are deleted concurrently and failures are reported"""
+        from github import GithubException
+        
+        self.assets[0].delete_asset.side_effect = GithubException(500, {'message': 'Server Error'}, {})
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        result = uploader.prune(keep_last=2, max_workers=3)
+        
+        self.assertEqual(sorted(result['deleted']), [
+            "app-portfolio-release-1.2.0+4.aab",
+            "app-portfolio-release-1.2.0+4.apk",
+        ])
+        self.assertEqual(result['failed'], [{'name': "app-portfolio-release-1.0.0+1.apk", 'error': "Server Error"}])
+        self.assertEqual(result['reclaimed_bytes'], 45)
+        self.assets[6].delete_asset.assert_not_called()
+        self.assets[7].delete_asset.assert_not_called()
+        self.assertNotIn("app-portfolio-release-1.2.0+4.apk", uploader.asset_index(self.mock_release))
+    
+    def test_prune_main_json(self):
+        """Test the prune subcommand prints a JSON report"""
+        env = {"GITHUB_TOKEN": "token", "GITHUB_REPOSITORY": "owner/repo"}
+        
+        with patch.dict(os.environ, env), patch('builtins.print') as mock_print:
+            exit_code = main(["prune", "--keep-last", "3", "--dry-run", "--json"])
+        
+        self.assertEqual(exit_code, 0)
+        report = json.loads(mock_print.call_args_list[-1].args[0])
+        self.assertEqual(report['deleted'], ["app-portfolio-release-1.0.0+1.apk"])
+    
+    def test_prune_main_rejects_bad_duration(self):
+        """Test an invalid --keep-newer-than fails before any API call"""
+        env = {"GITHUB_TOKEN": "token", "GITHUB_REPOSITORY": "owner/repo"}
+        
+        with patch.dict(os.environ, env), patch('sys.stderr'):
+            self.assertEqual(main(["prune", "--keep-newer-than", "later"]), 1)
+        self.mock_repo.get_release.assert_not_called()
+    
+    def test_prune_main_rejects_bad_jobs(self):
+        """Test --jobs below 1 fails before any API call"""
+        for jobs in ("0", "-1"):
+            with self.subTest(jobs=jobs), patch('sys.stderr'), self.assertRaises(SystemExit) as context:
+                main(["prune", "--keep-last", "3", "--jobs", jobs])
+            self.assertEqual(context.exception.code, 2)
+        self.mock_repo.get_release.assert_not_called()
+
+
+class TestSync(unittest.TestCase):
+    """Test cases for plan_sync(), apply_sync() and the sync subcommand"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.dist = self.temp_dir / "dist"
+        self.dist.mkdir()
+        self.files = {
+            "app-portfolio-release-1.1.0+2.apk": b"new build",
+            "app-portfolio-release-latest.apk": b"new build",
+            "SHA256SUMS": b"sums",
+            "notes.txt": b"unchanged notes",
+        }
+        for name, content in self.files.items():
+            (self.dist / name).write_bytes(content)
+        (self.dist / ".staging-cache.json").write_text("{}")
+        
+        patcher = patch('upload_to_github_releases.Github')
+        mock_github = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_repo = MagicMock()
+        self.mock_repo.name = "repo"
+        self.mock_release = MagicMock()
+        self.mock_repo.get_release.return_value = self.mock_release
+        mock_github.return_value.get_repo.return_value = self.mock_repo
+        
+        self.remote = {
+            # Same bytes as the new versioned file under an old name
+            "app-portfolio-release-1.1.0+2-rc.apk": self.asset("app-portfolio-release-1.1.0+2-rc.apk", b"new build"),
+            "app-portfolio-release-latest.apk": self.asset("app-portfolio-release-latest.apk", b"old build"),
+            "notes.txt": self.asset("notes.txt", b"unchanged notes"),
+            "app-portfolio-release-1.0.0+1.apk": self.asset("app-portfolio-release-1.0.0+1.apk", b"old build"),
+            "app-portfolio-release-latest.apk.uploading-deadbeef": self.asset(
+                "app-portfolio-release-latest.apk.uploading-deadbeef", b"partial"
+            ),
+        }
+        self.mock_release.get_assets.return_value = list(self.remote.values())
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def asset(self, name, content):
+        """Remote asset whose digest matches content"""
+        asset = MagicMock()
+        asset.name = name
+        asset.size = len(content)
+        asset.digest = f"sha256:{hashlib.sha256(content).hexdigest()}"
+        asset.label = None
+        return asset
+    
+    def test_plan_without_delete(self):
+        """Test only changed files are uploaded and nothing is renamed or deleted"""
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        plan = uploader.plan_sync(self.mock_release, self.dist)
+        
+        self.assertEqual(plan['unchanged'], ["notes.txt"])
+        self.assertEqual(sorted(entry['name'] for entry in plan['upload']), [
+            "SHA256SUMS", "app-portfolio-release-1.1.0+2.apk", "app-portfolio-release-latest.apk",
+        ])
+        self.assertEqual(plan['rename'], [])
+        self.assertEqual(plan['delete'], [])
+        replaced = {entry['name']: entry['replace'] for entry in plan['upload']}
+        self.assertTrue(replaced["app-portfolio-release-latest.apk"])
+        self.assertFalse(replaced["SHA256SUMS"])
+    
+    def test_plan_with_delete_renames_matching_bytes(self):
+        """Test an asset about to be deleted is renamed instead of re-uploaded"""
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        plan = uploader.plan_sync(self.mock_release, self.dist, delete=True)
+        
+        self.assertEqual([(entry['from'], entry['to']) for entry in plan['rename']], [
+            ("app-portfolio-release-1.1.0+2-rc.apk", "app-portfolio-release-1.1.0+2.apk"),
+        ])
+        self.assertEqual(sorted(entry['name'] for entry in plan['upload']), [
+            "SHA256SUMS", "app-portfolio-release-latest.apk",
+        ])
+        self.assertEqual(plan['upload_bytes'], len(b"sums") + len(b"new build"))
+        self.assertEqual([entry['name'] for entry in plan['delete']], ["app-portfolio-release-1.0.0+1.apk"])
+    
+    def test_plan_reuses_staging_cache_digests(self):
+        """Test digests recorded by prepare_apk are not recomputed"""
+        from artifact_staging import DigestCache
+        
+        cache = DigestCache(self.dist / ".staging-cache.json")
+        for name, content in self.files.items():
+            cache.put(self.dist / name, {'sha256': hashlib.sha256(content).hexdigest()})
+        cache.save()
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        
+        with patch('upload_to_github_releases.compute_digests') as mock_digests:
+            uploader.plan_sync(self.mock_release, self.dist)
+        
+        mock_digests.assert_not_called()
+    
+    def test_apply_runs_renames_uploads_then_deletes(self):
+        """Test the plan is applied and deletes come after every upload"""
+        uploader = GitHubReleaseUploader("token", "owner/repo")
+        plan = uploader.plan_sync(self.mock_release, self.dist, delete=True)
+        calls = MagicMock()
+        calls.attach_mock(self.mock_release.upload_asset_from_memory, "upload")
+        calls.attach_mock(self.remote["app-portfolio-release-1.0.0+1.apk"].delete_asset, "delete")
+        
+        with patch('builtins.print'):
+            result = uploader.apply_sync(self.mock_release, plan, max_workers=2)
+        
+        self.assertEqual(result['failed'], [])
+        self.assertEqual(result['renamed'], ["app-portfolio-release-1.1.0+2.apk"])
+        self.assertEqual(sorted(result['uploaded']), ["SHA256SUMS", "app-portfolio-release-latest.apk"])
+        self.assertEqual(result['deleted'], ["app-portfolio-release-1.0.0+1.apk"])
+        self.assertEqual([c[0] for c in calls.mock_calls][-1], "delete")
+        self.remote["app-portfolio-release-1.1.0+2-rc.apk"].update_asset.assert_called_once_with(
+            name="app-portfolio-release-1.1.0+2.apk",
+            label=asset_label("app-portfolio-release-1.1.0+2.apk", hashlib.sha256(b"new build").hexdigest())
+        )
+        self.remote["notes.txt"].delete_asset.assert_not_called()
+    
+    def test_sync_main_dry_run(self):
+        """Test --dry-run prints the plan and changes nothing"""
+        env = {"GITHUB_TOKEN": "token", "GITHUB_REPOSITORY": "owner/repo"}
+        
+        with patch.dict(os.environ, env), patch('builtins.print') as mock_print:
+            exit_code = main(["sync", str(self.dist), "--release", "nightly", "--delete", "--dry-run", "--json"])
+        
+        self.assertEqual(exit_code, 0)
+        self.mock_repo.get_release.assert_called_once_with("nightly")
+        report = json.loads(mock_print.call_args_list[-1].args[0])
+        self.assertIsNone(report['result'])
+        self.assertEqual(len(report['plan']['rename']), 1)
+        self.mock_release.upload_asset_from_memory.assert_not_called()
+        for asset in self.remote.values():
+            asset.delete_asset.assert_not_called()
+    
+    def test_sync_main_rejects_bad_jobs(self):
+        """Test --jobs below 1 fails before any API call"""
+        for jobs in ("0", "-1"):
+            with self.subTest(jobs=jobs), patch('sys.stderr'), self.assertRaises(SystemExit) as context:
+                main(["sync", str(self.dist), "--jobs", jobs])
+            self.assertEqual(context.exception.code, 2)
+        self.mock_repo.get_release.assert_not_called()
+    
+    def test_stable_url_for_other_release(self):
+        """Test non-default releases use the tag download URL"""
+        uploader = GitHubReleaseUploader("token", "owner/repo", release_tag="nightly")
+        
+        self.assertEqual(
+            uploader.stable_url("app.apk"),
+            "https://github.com/owner/repo/releases/download/nightly/app.apk"
+        )
+
+
+class TestReleaseIndex(unittest.TestCase):
+    """Test cases for build_release_index() and write_release_index()"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.files = []
+        for name, data in (("app-portfolio-release-1.2.0+5.apk", b"new apk"),
+                           ("app-portfolio-release-latest.apk", b"new apk"),
+                           ("app-portfolio-release-1.1.0+4-to-1.2.0+5.apkpatch", b"patch"),
+                           ("app-portfolio-release-1.0.0+1-to-1.2.0+5.apkpatch", b"older patch")):
+            (self.temp_dir / name).write_bytes(data)
+            self.files.append((str(self.temp_dir / name), name))
+        self.urls = {name: f"https://github.com/owner/repo/releases/latest/download/{name}" for _, name in self.files}
+    
+    def test_index_describes_stable_artifact(self):
+        """Test version, size, digest and URLs of the stable APK"""
+        index = build_release_index(self.files[:2], "1.2.0+5", self.urls)
+        
+        self.assertEqual(index, {
+            'version': "1.2.0+5",
+            'name': "app-portfolio-release-latest.apk",
+            'size': 7,
+            'sha256': hashlib.sha256(b"new apk").hexdigest(),
+            'url': self.urls["app-portfolio-release-latest.apk"],
+            'versioned_url': self.urls["app-portfolio-release-1.2.0+5.apk"],
+        })
+    
+    def test_delta_from_newest_source(self):
+        """Test the patch from the most recent earlier version is offered"""
+        index = build_release_index(self.files, "1.2.0+5", self.urls)
+        
+        self.assertEqual(index['name'], "app-portfolio-release-latest.apk")
+        self.assertEqual(index['delta'], {
+            'from_version': "1.1.0+4",
+            'name': "app-portfolio-release-1.1.0+4-to-1.2.0+5.apkpatch",
+            'size': 5,
+            'sha256': hashlib.sha256(b"patch").hexdigest(),
+            'url': self.urls["app-portfolio-release-1.1.0+4-to-1.2.0+5.apkpatch"],
+        })
+    
+    def test_other_versions_are_ignored(self):
+        """Test assets of another version are not referenced"""
+        index = build_release_index(self.files, "1.3.0+6", self.urls)
+        
+        self.assertNotIn('versioned_url', index)
+        self.assertNotIn('delta', index)
+    
+    def test_patches_only(self):
+        """Test an index needs an APK or AAB"""
+        with self.assertRaises(GitHubReleaseError):
+            build_release_index(self.files[2:], "1.2.0+5", self.urls)
+    
+    def test_write_is_deterministic(self):
+        """Test the same index produces identical bytes"""
+        index = build_release_index(self.files, "1.2.0+5", self.urls)
+        path = write_release_index(self.temp_dir / "out" / "latest.json", index)
+        first = path.read_bytes()
+        
+        write_release_index(path, build_release_index(self.files, "1.2.0+5", self.urls))
+        
+        self.assertEqual(path.read_bytes(), first)
+        self.assertEqual(json.loads(first), index)
+        self.assertEqual(sorted(p.name for p in path.parent.iterdir()), ["latest.json"])
+
+
 class TestMainFunction(unittest.TestCase):
     """Test cases for main() function and CLI"""
     
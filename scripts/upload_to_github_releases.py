@@ -8,6 +8,37 @@ download URL that remains constant across builds.
 Features:
 - Publishes to 'latest' release tag (creates if missing)
 - Overwrites existing assets for stable URLs
+- Batch mode: several file:asset-name pairs uploaded concurrently with one
+  authentication and one release lookup
+- Skips re-uploading assets whose size and SHA-256 already match (digest
+  from GitHub's asset metadata or the "[sha256:...]" label we set)
+- Zero-downtime replace: upload to a temporary name, then delete the old
+  asset and rename the new one, so stable URLs never 404 during an upload
+- Streams uploads from disk in bounded chunks and retries 5xx responses and
+  dropped connections with exponential backoff and jitter
+- Reports upload throughput (bytes/s) and total time per asset
+- Rate-limit aware: API calls are queued and paced by RequestScheduler
+  (X-RateLimit-* and Retry-After), with request and wait counts reported
+- Optional ETag cache (--etag-cache): release and asset-list reads are sent
+  with If-None-Match, and 304 Not Modified replies are served from disk
+- 'prune' subcommand: retention policy (keep last N versions, keep newer
+  than a duration, always keep the stable asset) with concurrent deletes
+- 'sync' subcommand: plan/apply a release to mirror a local directory,
+  uploading only changed files and renaming assets whose bytes are already
+  on the release
+- --engine asyncio: uploads, deletes and renames from one event loop over
+  the same connection pool (async_release_uploader.py)
+- Every call, uploads included, shares one keep-alive connection pool
+  with connect/read timeouts (--pool-size, --connect-timeout,
+  --read-timeout); --log-requests prints per-call latency
+- Optional release index (--release-index): latest.json with the pubspec
+  version, size, SHA-256, stable URL and delta patch URL, uploaded after
+  the assets so one conditional GET answers "is there an update?"
+- Mirrors (--mirror-dir, --mirror-s3): the same files are published to
+  local directories and S3-compatible buckets concurrently with GitHub
+  (artifact_backends.py), so a slow GitHub upload does not delay them
+- Any GitHub-compatible API root (--api-url or GITHUB_API_URL), e.g. GitHub
+  Enterprise or the local fake in fake_github_releases.py
 - Validates file existence and GitHub authentication
 - GitHub Actions compatible with output support
 - Comprehensive error handling
@@ -19,26 +50,261 @@ Requirements:
 
 Usage:
     python upload_to_github_releases.py <file_path> --asset-name <name> [options]
+    python upload_to_github_releases.py <file>:<asset-name> [<file>:<asset-name> ...] [options]
+    python upload_to_github_releases.py prune [--keep-last N] [--keep-newer-than 30d] [--dry-run]
+    python upload_to_github_releases.py sync <directory> [--release TAG] [--delete] [--dry-run]
 """
 
 import argparse
+import json
+import mimetypes
 import os
+import re
 import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 try:
-    from github import Github, GithubException, UnknownObjectException
+    from github import Auth, Consts, Github, GithubException, UnknownObjectException
+    from github.GitRelease import GitRelease
+    from github.GitReleaseAsset import GitReleaseAsset
+    from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+    from urllib3.util.retry import Retry
 except ImportError:
     print("ERROR: PyGithub library not found. Install with: pip install PyGithub", file=sys.stderr)
     sys.exit(1)
 
+from artifact_backends import ArtifactBackend, BackendError, LocalBackend, S3Backend, publish_all
+from artifact_staging import DigestCache, compute_digests
+from ci_outputs import parse_file_spec, write_github_output
+from etag_cache import ETagCache, next_page_url
+from http_pool import HTTPPool, HTTPPoolError
+from prepare_apk import APKPreparationError, APKPreparer, version_key
+from request_scheduler import RequestScheduler, backoff_delay, header
+
 
 class GitHubReleaseError(Exception):
     """Custom exception for GitHub release errors."""
     pass
 
 
+LABEL_DIGEST = re.compile(r"\[sha256:([0-9a-f]{64})\]")
+
+# Errors an upload attempt can fail with; only some are worth retrying
+UPLOAD_ERRORS = (GithubException, RequestsConnectionError, Timeout, ConnectionError)
+
+
+def asset_label(asset_name: str, sha256: str) -> str:
+    """Asset label carrying the content digest, e.g. 'app.apk [sha256:ab12...]'."""
+    return f"{asset_name} [sha256:{sha256}]"
+
+
+def remote_sha256(asset) -> Optional[str]:
+    """
+    SHA-256 of a release asset as recorded by GitHub or in our label.
+    
+    Args:
+        asset: GitHub ReleaseAsset object
+    
+    Returns:
+        Hex digest, or None if the asset carries no digest
+    """
+    digest = getattr(asset, 'digest', None)
+    if isinstance(digest, str) and digest.startswith("sha256:"):
+        return digest[len("sha256:"):]
+    
+    label = getattr(asset, 'label', None)
+    if isinstance(label, str):
+        match = LABEL_DIGEST.search(label)
+        if match:
+            return match.group(1)
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether a failed upload attempt is transient.
+    
+    GitHub 5xx responses, timeouts and dropped or reset connections are
+    retried; 4xx responses (bad credentials, name clashes) are not.
+    """
+    if isinstance(error, GithubException):
+        return error.status is not None and error.status >= 500
+    return isinstance(error, (RequestsConnectionError, Timeout, ConnectionError))
+
+
+def describe_error(error: BaseException) -> str:
+    """Short message for an upload error."""
+    if isinstance(error, GithubException) and isinstance(error.data, dict):
+        return error.data.get('message', str(error))
+    return str(error) or type(error).__name__
+
+
+def format_rate(bytes_per_second: float) -> str:
+    """Human-readable throughput, e.g. '12.34 MB/s'."""
+    return f"{bytes_per_second / (1024*1024):.2f} MB/s"
+
+
+class ProgressReader:
+    """
+    File wrapper handed to the HTTP client as the request body.
+    
+    Every read returns at most chunk_size bytes, so the upload is streamed
+    from disk with bounded memory, and the bytes sent are counted.
+    """
+    
+    def __init__(self, file_obj, size: int, chunk_size: int):
+        self._file = file_obj
+        self.size = size
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0 or size > self.chunk_size:
+            size = self.chunk_size
+        data = self._file.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*([smhdw]?)")
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, '': 86400}
+
+
+def transport_retry() -> Retry:
+    """
+    Retry policy for the HTTP transport.
+    
+    PyGithub's default retry sleeps through rate limits where the
+    scheduler cannot see them, and its own request spacing is not shared
+    between threads; keep only idempotent 5xx retries.
+    """
+    return Retry(
+        total=3,
+        backoff_factor=1.0,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False
+    )
+
+
+def parse_duration(text: str) -> timedelta:
+    """
+    Parse a duration such as '30d', '12h', '2w' or '90' (days).
+    
+    Raises:
+        ValueError: If the text is not a duration
+    """
+    match = DURATION.fullmatch(text.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {text!r} (expected e.g. 30d, 12h, 2w)")
+    return timedelta(seconds=float(match.group(1)) * DURATION_UNITS[match.group(2)])
+
+
+def versioned_asset_pattern(base_name: str) -> "re.Pattern":
+    """
+    Pattern for versioned assets of base_name.
+    
+    Matches '<base>-<version>.apk/.aab' and delta patches
+    '<base>-<from>-to-<version>.apkpatch'; group 'version' is the version
+    the asset belongs to (a patch belongs to its target). Stable names
+    ('<base>-latest.apk') and temporary uploads never match.
+    """
+    return re.compile(
+        rf"{re.escape(base_name)}-(?:(?P<source>\d[^/]*?)-to-)?(?P<version>\d[^/]*?)"
+        rf"(?P<suffix>\.apk|\.aab|\.apkpatch)"
+    )
+
+
+RELEASE_INDEX_NAME = "latest.json"
+
+STABLE_NAME = re.compile(r"(?P<base>.+)-latest(?P<suffix>\.[^.]+)$")
+
+
+def build_release_index(
+    files: Sequence[Tuple[str, Optional[str]]],
+    version: str,
+    urls: Dict[str, str]
+) -> Dict[str, Any]:
+    """
+    Release index (latest.json) describing a publish.
+    
+    The primary artifact is the last file that is not a delta patch (the
+    stable-name APK in the usual versioned + stable pair). A delta patch is
+    included when a published '<base>-<from>-to-<version>.apkpatch' targets
+    this version. No timestamps are recorded, so an unchanged release
+    produces an identical index (same ETag, no re-upload).
+    
+    Args:
+        files: (file path, asset name or None) pairs that were published
+        version: Release version (pubspec.yaml)
+        urls: Stable download URL by asset name
+    
+    Returns:
+        Dictionary containing version, name, size, sha256, url and, when
+        available, versioned_url and delta (from_version, name, size,
+        sha256, url)
+    
+    Raises:
+        GitHubReleaseError: If no file other than delta patches was published
+    """
+    named = [(Path(path), name or Path(path).name) for path, name in files]
+    artifacts = [(path, name) for path, name in named if not name.endswith(".apkpatch")]
+    if not artifacts:
+        raise GitHubReleaseError("Release index needs an APK or AAB among the published files")
+    
+    path, name = artifacts[-1]
+    index = {
+        'version': version,
+        'name': name,
+        'size': path.stat().st_size,
+        'sha256': compute_digests(path, ["sha256"])['sha256'],
+        'url': urls[name],
+    }
+    
+    match = STABLE_NAME.match(name)
+    pattern = versioned_asset_pattern(match.group('base') if match else Path(name).stem)
+    patches = []
+    for other_path, other_name in named:
+        versioned = pattern.fullmatch(other_name)
+        if not versioned or versioned.group('version') != version:
+            continue
+        if versioned.group('source'):
+            patches.append((version_key(versioned.group('source')), versioned.group('source'), other_path, other_name))
+        elif versioned.group('suffix') == (match.group('suffix') if match else Path(name).suffix):
+            index['versioned_url'] = urls[other_name]
+    
+    if patches:
+        _, source, patch_path, patch_name = max(patches)
+        index['delta'] = {
+            'from_version': source,
+            'name': patch_name,
+            'size': patch_path.stat().st_size,
+            'sha256': compute_digests(patch_path, ["sha256"])['sha256'],
+            'url': urls[patch_name],
+        }
+    return index
+
+
+def write_release_index(path: Union[str, Path], index: Dict[str, Any]) -> Path:
+    """Write the release index as JSON via a temporary file and rename."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    temporary.write_text(json.dumps(index, indent=2) + "\n", encoding='utf-8')
+    os.replace(temporary, path)
+    return path
+
+
 class GitHubReleaseUploader:
     """
     Handles uploading artifacts to GitHub Releases with stable URLs.
@@ -46,8 +312,8 @@ class GitHubReleaseUploader:
     This class implements the complete workflow:
     1. Authenticate with GitHub
     2. Get or create 'latest' release
-    3. Delete existing asset (if present)
-    4. Upload new asset
+    3. Upload new asset under a temporary name
+    4. Delete existing asset (if present) and rename the new one into place
     5. Generate stable download URL
     """
     
@@ -55,13 +321,49 @@ class GitHubReleaseUploader:
     RELEASE_TITLE = "Latest Build"
     RELEASE_NOTES = "CI-managed rolling release. This is automatically updated on every push to develop branch."
     
-    def __init__(self, token: str, repository: str):
+    # Concurrent uploads in batch mode; GitHub throttles aggressive parallelism
+    DEFAULT_UPLOAD_WORKERS = 4
+    
+    # New content is uploaded as '<name>.uploading-<id>' and renamed into place
+    TEMPORARY_MARKER = ".uploading-"
+    
+    # Versions kept by 'prune' when no retention rule is given
+    DEFAULT_KEEP_LAST = 10
+    
+    # Request body is read from disk this many bytes at a time
+    UPLOAD_CHUNK_SIZE = 1024 * 1024
+    
+    # Retries after the first attempt; the delay doubles from the base
+    # delay up to the cap, and a random part of it is dropped (jitter)
+    UPLOAD_RETRIES = 4
+    RETRY_BASE_DELAY = 2.0
+    RETRY_MAX_DELAY = 60.0
+    
+    def __init__(
+        self,
+        token: str,
+        repository: str,
+        retries: Optional[int] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        etag_cache: Optional[Union[str, Path]] = None,
+        release_tag: Optional[str] = None,
+        base_url: Optional[str] = None,
+        http_pool: Optional[HTTPPool] = None
+    ):
         """
         Initialize the GitHub Release uploader.
         
         Args:
             token: GitHub authentication token
             repository: Repository in format "owner/repo"
+            retries: Upload retries on transient errors (default: UPLOAD_RETRIES)
+            scheduler: Request scheduler pacing every API call (default: a new one)
+            etag_cache: JSON file for conditional metadata requests (default: disabled)
+            release_tag: Release to publish to (default: RELEASE_TAG)
+            base_url: API root, e.g. for GitHub Enterprise or a local fake
+                (default: https://api.github.com)
+            http_pool: Connection pool and timeouts for every API and upload
+                call (default: a new HTTPPool)
         
         Raises:
             GitHubReleaseError: If authentication fails
@@ -72,21 +374,47 @@ class GitHubReleaseUploader:
         if not repository or "/" not in repository:
             raise GitHubReleaseError(f"Invalid repository format: {repository}. Expected 'owner/repo'")
         
+        self.retries = self.UPLOAD_RETRIES if retries is None else max(0, retries)
+        self.release_tag = release_tag or self.RELEASE_TAG
+        self.scheduler = scheduler or RequestScheduler(limits=self._rate_limits)
+        self.etag_cache = ETagCache(etag_cache) if etag_cache else None
+        self._not_modified = 0
+        self._stats_lock = threading.Lock()
+        
+        # release id -> {asset name: asset}, filled once per release
+        self._asset_index: Dict[Any, Dict[str, Any]] = {}
+        self._index_lock = threading.Lock()
+        
+        retry = transport_retry()
+        self.http_pool = http_pool or HTTPPool(retry=retry)
+        
         try:
-            self.github = Github(token)
-            self.repo = self.github.get_repo(repository)
+            self.github = Github(
+                auth=Auth.Token(token),
+                base_url=base_url or Consts.DEFAULT_BASE_URL,
+                timeout=int(self.http_pool.timeout[1]),
+                retry=retry,
+                seconds_between_requests=None,
+                seconds_between_writes=None
+            )
+            # Uploads go to another host; without the pool each one opens
+            # a new session with no timeout
+            self.http_pool.install(self.github.requester)
+            self.repo = self.scheduler.call(lambda: self.github.get_repo(repository))
             self.repository = repository
             
             # Test authentication
             _ = self.repo.name
             print(f"✓ Authenticated to repository: {repository}")
             
+        except HTTPPoolError as e:
+            raise GitHubReleaseError(str(e))
         except GithubException as e:
             raise GitHubReleaseError(f"GitHub authentication failed: {e.data.get('message', str(e))}")
     
     def get_or_create_release(self):
         """
-        Get the 'latest' release or create it if it doesn't exist.
+        Get the release (default 'latest') or create it if it doesn't exist.
         
         Returns:
             GitHub Release object
@@ -94,32 +422,133 @@ class GitHubReleaseUploader:
         Raises:
             GitHubReleaseError: If unable to get or create release
         """
-        print(f"[1/3] Checking for release '{self.RELEASE_TAG}'...")
+        print(f"[1/3] Checking for release '{self.release_tag}'...")
         
         try:
             # Try to get existing release
-            release = self.repo.get_release(self.RELEASE_TAG)
-            print(f"✓ Release '{self.RELEASE_TAG}' found")
+            release = self._get_release()
+            print(f"✓ Release '{self.release_tag}' found")
             return release
             
         except UnknownObjectException:
             # Release doesn't exist, create it
-            print(f"Creating new release: {self.RELEASE_TAG}")
+            print(f"Creating new release: {self.release_tag}")
             
             try:
-                release = self.repo.create_git_release(
-                    tag=self.RELEASE_TAG,
+                release = self.scheduler.call(lambda: self.repo.create_git_release(
+                    tag=self.release_tag,
                     name=self.RELEASE_TITLE,
                     message=self.RELEASE_NOTES,
                     draft=False,
                     prerelease=False
-                )
-                print(f"✓ Release '{self.RELEASE_TAG}' created")
+                ), write=True)
+                print(f"✓ Release '{self.release_tag}' created")
                 return release
                 
             except GithubException as e:
                 raise GitHubReleaseError(f"Failed to create release: {e.data.get('message', str(e))}")
     
+    def _get_release(self):
+        """
+        Fetch the release (through the ETag cache when enabled).
+        
+        Raises:
+            UnknownObjectException: If the release does not exist
+            GithubException: For other API errors
+        """
+        if self.etag_cache is None:
+            return self.scheduler.call(lambda: self.repo.get_release(self.release_tag))
+        body, _ = self._conditional_get(f"{self.repo.url}/releases/tags/{self.release_tag}")
+        return self.github.create_from_raw_data(GitRelease, body)
+    
+    def asset_index(self, release) -> Dict[str, Any]:
+        """
+        Name-to-asset index of a release.
+        
+        The paginated asset list is fetched once per release; uploads and
+        deletes made through this uploader keep the index current.
+        
+        Args:
+            release: GitHub Release object
+        
+        Returns:
+            Mapping of asset name to GitHub ReleaseAsset object
+        
+        Raises:
+            GithubException: If the asset list cannot be fetched
+        """
+        with self._index_lock:
+            if release.id not in self._asset_index:
+                if self.etag_cache is None:
+                    assets = self.scheduler.call(lambda: list(release.get_assets()))
+                else:
+                    assets = self._list_assets_conditionally(release)
+                self._asset_index[release.id] = {asset.name: asset for asset in assets}
+            return self._asset_index[release.id]
+    
+    def _list_assets_conditionally(self, release) -> List[Any]:
+        """Every asset of a release, page by page, through the ETag cache."""
+        assets = []
+        url = f"{release.url}/assets?per_page=100"
+        while url:
+            body, link = self._conditional_get(url)
+            assets.extend(self.github.create_from_raw_data(GitReleaseAsset, raw) for raw in body)
+            url = next_page_url(link)
+        return assets
+    
+    def _conditional_get(self, url: str) -> Tuple[Any, Optional[str]]:
+        """
+        GET an API URL with If-None-Match from the ETag cache.
+        
+        Args:
+            url: API URL
+        
+        Returns:
+            Tuple of (JSON body, Link header or None); the cached copy on
+            304 Not Modified
+        
+        Raises:
+            GithubException: For error responses (UnknownObjectException on 404)
+        """
+        requester = self.github.requester
+        entry = self.etag_cache.get(url)
+        
+        def fetch():
+            headers = {"If-None-Match": entry['etag']} if entry else {}
+            status, response_headers, output = requester.requestJson("GET", url, headers=headers)
+            if status >= 400:
+                try:
+                    data = json.loads(output) if output else None
+                except ValueError:
+                    data = {'message': output}
+                raise requester.createException(status, response_headers, data)
+            return status, response_headers, output
+        
+        status, response_headers, output = self.scheduler.call(fetch)
+        if status == 304 and entry is not None:
+            with self._stats_lock:
+                self._not_modified += 1
+            return entry['body'], entry.get('link')
+        
+        body = json.loads(output)
+        link = header(response_headers, "Link")
+        etag = header(response_headers, "ETag")
+        if etag:
+            self.etag_cache.put(url, etag, body, link)
+            self.etag_cache.save()
+        return body, link
+    
+    def _index_asset(self, release, asset_name: str, asset: Optional[Any]) -> None:
+        """Record an uploaded asset (or a deletion when asset is None) in the index."""
+        with self._index_lock:
+            index = self._asset_index.get(release.id)
+            if index is None:
+                return
+            if asset is None:
+                index.pop(asset_name, None)
+            else:
+                index[asset_name] = asset
+    
     def delete_existing_asset(self, release, asset_name: str) -> bool:
         """
         Delete an existing asset if it exists (for overwrite behavior).
@@ -132,12 +561,13 @@ class GitHubReleaseUploader:
             True if asset was deleted, False if it didn't exist
         """
         try:
-            for asset in release.get_assets():
-                if asset.name == asset_name:
-                    print(f"  Deleting existing asset: {asset_name}")
-                    asset.delete_asset()
-                    return True
-            return False
+            asset = self.asset_index(release).get(asset_name)
+            if asset is None:
+                return False
+            print(f"  Deleting existing asset: {asset_name}")
+            self.scheduler.call(asset.delete_asset, write=True)
+            self._index_asset(release, asset_name, None)
+            return True
         except GithubException as e:
             print(f"  Warning: Could not delete existing asset: {e.data.get('message', str(e))}", file=sys.stderr)
             return False
@@ -145,14 +575,18 @@ class GitHubReleaseUploader:
     def upload_file(
         self,
         file_path: str,
-        asset_name: Optional[str] = None
+        asset_name: Optional[str] = None,
+        force: bool = False
     ) -> str:
         """
         Upload a file to GitHub Releases 'latest' tag with overwrite support.
         
+        An existing asset with the same size and SHA-256 is left in place.
+        
         Args:
             file_path: Path to the file to upload
             asset_name: Name for the asset (defaults to filename)
+            force: Upload even if the remote asset is identical
         
         Returns:
             Stable download URL
@@ -185,33 +619,1058 @@ class GitHubReleaseUploader:
         # Get or create the release
         release = self.get_or_create_release()
         
-        # Delete existing asset (overwrite behavior)
         print("[2/3] Preparing to upload asset...")
-        self.delete_existing_asset(release, asset_name)
-        
-        # Upload the new asset
-        try:
-            print(f"  Uploading: {asset_name}")
-            release.upload_asset(
-                path=str(file_path_obj),
-                label=asset_name,
-                name=asset_name
-            )
+        stats = self._replace_asset(release, file_path_obj, asset_name, force)
+        if stats is not None:
             print("✓ Asset uploaded successfully")
-            
-        except GithubException as e:
-            raise GitHubReleaseError(f"Failed to upload asset: {e.data.get('message', str(e))}")
+            print(f"  Throughput: {format_rate(stats['bytes_per_second'])}, "
+                  f"{stats['upload_seconds']:.1f} s "
+                  f"({stats['attempts']} attempt{'s' if stats['attempts'] > 1 else ''})")
+        else:
+            print("✓ Asset unchanged, upload skipped")
         
         # Generate stable URL
         print("[3/3] Generating stable download URL...")
-        stable_url = f"https://github.com/{self.repository}/releases/latest/download/{asset_name}"
+        stable_url = self.stable_url(asset_name)
         print(f"✓ Stable URL: {stable_url}")
         
         return stable_url
+    
+    def _rate_limits(self) -> Optional[Tuple[int, int, float]]:
+        """Primary rate limit state PyGithub recorded from the last response."""
+        requester = getattr(getattr(self, 'github', None), 'requester', None)
+        rate_limiting = getattr(requester, 'rate_limiting', None)
+        reset = getattr(requester, 'rate_limiting_resettime', None)
+        if (not isinstance(rate_limiting, tuple) or len(rate_limiting) != 2
+                or rate_limiting[1] < 0 or not isinstance(reset, (int, float))):
+            return None
+        return rate_limiting[0], rate_limiting[1], float(reset)
+    
+    def request_stats(self) -> Dict[str, Any]:
+        """
+        API requests made and time spent waiting on rate limits.
+        
+        Returns:
+            RequestScheduler.stats() plus not_modified (conditional requests
+            answered 304 from the ETag cache) and HTTPPool.stats()
+        """
+        stats = self.scheduler.stats()
+        with self._stats_lock:
+            stats['not_modified'] = self._not_modified
+        stats.update(self.http_pool.stats())
+        return stats
+    
+    def stable_url(self, asset_name: str) -> str:
+        """Stable download URL of an asset on the release."""
+        if self.release_tag == self.RELEASE_TAG:
+            return f"https://github.com/{self.repository}/releases/latest/download/{asset_name}"
+        return f"https://github.com/{self.repository}/releases/download/{self.release_tag}/{asset_name}"
+    
+    def _replace_asset(
+        self,
+        release,
+        file_path: Path,
+        asset_name: str,
+        force: bool = False,
+        sha256: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Upload file_path as asset_name, replacing any existing asset.
+        
+        Args:
+            sha256: Digest of file_path if already known (hashed otherwise)
+        
+        Returns:
+            Upload statistics (see _upload_stream), or None if an identical
+            asset exists
+        
+        Raises:
+            GitHubReleaseError: If upload fails
+        """
+        size = file_path.stat().st_size
+        sha256 = sha256 or compute_digests(file_path, ["sha256"])['sha256']
+        
+        try:
+            existing = self.asset_index(release).get(asset_name)
+        except GithubException as e:
+            print(f"  Warning: Could not list existing assets: {e.data.get('message', str(e))}", file=sys.stderr)
+            existing = None
+        if (not force and existing is not None and existing.size == size
+                and remote_sha256(existing) == sha256):
+            print(f"  Unchanged: {asset_name} (sha256 {sha256[:12]})")
+            return None
+        
+        # Leftovers of interrupted runs would block or confuse the swap
+        temporary_prefix = f"{asset_name}{self.TEMPORARY_MARKER}"
+        try:
+            stale = [name for name in self.asset_index(release) if name.startswith(temporary_prefix)]
+        except GithubException:
+            stale = []
+        for name in stale:
+            self.delete_existing_asset(release, name)
+        
+        # Upload under a temporary name so the old asset keeps serving
+        label = asset_label(asset_name, sha256)
+        try:
+            asset, temporary_name, stats = self._upload_stream(
+                release, file_path, temporary_prefix, asset_name, label
+            )
+            self._index_asset(release, temporary_name, asset)
+        except UPLOAD_ERRORS as e:
+            raise GitHubReleaseError(f"Failed to upload asset {asset_name}: {describe_error(e)}")
+        
+        self._swap_asset(release, asset, temporary_name, asset_name, label)
+        return stats
+    
+    def _upload_stream(
+        self,
+        release,
+        file_path: Path,
+        temporary_prefix: str,
+        asset_name: str,
+        label: str
+    ) -> Tuple[Any, str, Dict[str, Any]]:
+        """
+        Stream file_path to the release, retrying transient failures.
+        
+        Each attempt reopens the file and uses a fresh temporary name, since
+        a request that failed mid-response may still have created the asset;
+        such leftovers are removed by the next run.
+        
+        Returns:
+            Tuple of (uploaded asset, its temporary name, statistics):
+                - size: Bytes uploaded
+                - attempts: Attempts made, including the successful one
+                - upload_seconds: Duration of the successful attempt
+                - bytes_per_second: Throughput of the successful attempt
+                - total_seconds: Duration including failed attempts and waits
+        
+        Raises:
+            GithubException, ConnectionError, Timeout: If the last attempt
+                fails or the error is not transient
+        """
+        size = file_path.stat().st_size
+        content_type = mimetypes.guess_type(asset_name)[0] or "application/octet-stream"
+        started = time.perf_counter()
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            temporary_name = f"{temporary_prefix}{uuid.uuid4().hex[:8]}"
+            print(f"  Uploading: {asset_name} (as {temporary_name})")
+            
+            def send():
+                with open(file_path, 'rb') as f:
+                    return release.upload_asset_from_memory(
+                        ProgressReader(f, size, self.UPLOAD_CHUNK_SIZE),
+                        size,
+                        name=temporary_name,
+                        content_type=content_type,
+                        label=label
+                    )
+            
+            attempt_started = time.perf_counter()
+            try:
+                asset = self.scheduler.call(send, write=True, transfer=True)
+            except UPLOAD_ERRORS as e:
+                if attempt > self.retries or not is_retryable(e):
+                    raise
+                delay = self.retry_delay(attempt)
+                print(f"  Warning: Upload of {asset_name} failed ({describe_error(e)}); "
+                      f"retry {attempt}/{self.retries} in {delay:.1f} s", file=sys.stderr)
+                time.sleep(delay)
+                continue
+            
+            finished = time.perf_counter()
+            upload_seconds = finished - attempt_started
+            return asset, temporary_name, {
+                'size': size,
+                'attempts': attempt,
+                'upload_seconds': upload_seconds,
+                'bytes_per_second': size / upload_seconds if upload_seconds > 0 else float(size),
+                'total_seconds': finished - started,
+            }
+    
+    def retry_delay(self, attempt: int) -> float:
+        """
+        Backoff before retry number attempt (1-based).
+        
+        Exponential with "equal jitter": half of the capped delay is kept and
+        the other half is random, so concurrent uploads do not retry in step.
+        """
+        return backoff_delay(attempt, self.RETRY_BASE_DELAY, self.RETRY_MAX_DELAY)
+    
+    def _swap_asset(self, release, asset, temporary_name: str, asset_name: str, label: str) -> None:
+        """
+        Replace asset_name with an uploaded temporary asset.
+        
+        The old asset is deleted and the new one renamed straight after, so
+        the stable URL is unavailable only between those two API calls.
+        
+        Raises:
+            GitHubReleaseError: If the old asset cannot be removed or the rename fails
+        """
+        try:
+            previous = self.asset_index(release).get(asset_name)
+            if previous is not None:
+                self.scheduler.call(previous.delete_asset, write=True)
+                self._index_asset(release, asset_name, None)
+        except GithubException as e:
+            self.delete_existing_asset(release, temporary_name)
+            raise GitHubReleaseError(
+                f"Failed to replace asset {asset_name}: {e.data.get('message', str(e))}"
+            )
+        
+        try:
+            renamed = self.scheduler.call(lambda: asset.update_asset(name=asset_name, label=label), write=True)
+        except GithubException as e:
+            raise GitHubReleaseError(
+                f"Uploaded {temporary_name} but could not rename it to {asset_name}: "
+                f"{e.data.get('message', str(e))}"
+            )
+        self._index_asset(release, temporary_name, None)
+        self._index_asset(release, asset_name, renamed)
+    
+    def upload_files(
+        self,
+        files: Sequence[Tuple[str, Optional[str]]],
+        max_workers: Optional[int] = None,
+        force: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Upload several files to the 'latest' release concurrently.
+        
+        The release is looked up (or created) once and shared by every
+        upload; uploads run on a bounded thread pool.
+        
+        Args:
+            files: (file path, asset name or None) pairs
+            max_workers: Concurrent uploads (default: DEFAULT_UPLOAD_WORKERS)
+            force: Upload even if remote assets are identical
+        
+        Returns:
+            Per-file results, in input order, each containing:
+                - file_path, asset_name, size
+                - uploaded: False if an identical asset was already present
+                - stable_url: Stable download URL
+                - seconds: Time spent replacing the asset
+                - attempts, upload_seconds, bytes_per_second: Upload
+                  statistics (uploaded files only)
+        
+        Raises:
+            GitHubReleaseError: If an upload fails or asset names collide
+            FileNotFoundError: If a file doesn't exist
+        """
+        jobs = []
+        for file_path, asset_name in files:
+            file_path_obj = Path(file_path)
+            if not file_path_obj.exists():
+                raise FileNotFoundError(f"File not found: {file_path}")
+            if not file_path_obj.is_file():
+                raise GitHubReleaseError(f"Path is not a file: {file_path}")
+            jobs.append((file_path_obj, asset_name or file_path_obj.name))
+        
+        names = [asset_name for _, asset_name in jobs]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise GitHubReleaseError(f"Duplicate asset names: {', '.join(duplicates)}")
+        if not jobs:
+            raise GitHubReleaseError("No files to upload")
+        
+        print()
+        print("=" * 60)
+        print("GitHub Releases Upload - Stable URL Generator")
+        print("=" * 60)
+        for file_path_obj, asset_name in jobs:
+            print(f"  {asset_name} <- {file_path_obj} ({file_path_obj.stat().st_size / (1024*1024):.2f} MB)")
+        print()
+        
+        release = self.get_or_create_release()
+        
+        workers = min(len(jobs), max_workers or self.DEFAULT_UPLOAD_WORKERS)
+        print(f"[2/3] Uploading {len(jobs)} asset(s) with {workers} worker(s)...")
+        
+        def upload(job: Tuple[Path, str]) -> Dict[str, Any]:
+            file_path_obj, asset_name = job
+            started = time.perf_counter()
+            stats = self._replace_asset(release, file_path_obj, asset_name, force)
+            result = {
+                'file_path': str(file_path_obj),
+                'asset_name': asset_name,
+                'size': file_path_obj.stat().st_size,
+                'uploaded': stats is not None,
+                'stable_url': self.stable_url(asset_name),
+                'seconds': time.perf_counter() - started,
+            }
+            if stats is not None:
+                result['attempts'] = stats['attempts']
+                result['upload_seconds'] = stats['upload_seconds']
+                result['bytes_per_second'] = stats['bytes_per_second']
+            return result
+        
+        started = time.perf_counter()
+        results: Dict[str, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(upload, job) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['asset_name']] = result
+                if result['uploaded']:
+                    print(f"✓ Uploaded {result['asset_name']} ({result['seconds']:.1f} s, "
+                          f"{format_rate(result['bytes_per_second'])})")
+                else:
+                    print(f"✓ Unchanged {result['asset_name']}, upload skipped")
+        elapsed = time.perf_counter() - started
+        
+        uploaded_bytes = sum(r['size'] for r in results.values() if r['uploaded'])
+        if uploaded_bytes:
+            print(f"  Total: {uploaded_bytes / (1024*1024):.2f} MB in {elapsed:.1f} s "
+                  f"({format_rate(uploaded_bytes / elapsed if elapsed > 0 else uploaded_bytes)})")
+        
+        print("[3/3] Generating stable download URLs...")
+        ordered = [results[asset_name] for asset_name in names]
+        for result in ordered:
+            print(f"✓ Stable URL: {result['stable_url']}")
+        
+        return ordered
+    
+    def plan_prune(
+        self,
+        assets: Sequence[Any],
+        base_name: str = "app-portfolio-release",
+        keep_last: Optional[int] = None,
+        keep_newer_than: Optional[timedelta] = None,
+        now: Optional[datetime] = None
+    ) -> Tuple[List[Any], List[Any]]:
+        """
+        Split versioned assets into those to keep and those to delete.
+        
+        A version is kept when any rule applies:
+        - it is among the keep_last newest versions
+        - one of its assets was created within keep_newer_than
+        - it has the same SHA-256 as a stable ('-latest') asset
+        With no rules given, DEFAULT_KEEP_LAST applies. The newest version
+        is always kept. Assets that are not versioned assets of base_name
+        (stable names, other files) are never touched.
+        
+        Args:
+            assets: Release assets
+            base_name: Base name of versioned assets
+            keep_last: Versions to keep, newest first
+            keep_newer_than: Keep versions with an asset younger than this
+            now: Reference time (default: current UTC time)
+        
+        Returns:
+            Tuple of (kept assets, assets to delete)
+        """
+        if keep_last is None and keep_newer_than is None:
+            keep_last = self.DEFAULT_KEEP_LAST
+        now = now or datetime.now(timezone.utc)
+        pattern = versioned_asset_pattern(base_name)
+        
+        by_version: Dict[str, List[Any]] = {}
+        for asset in assets:
+            match = pattern.fullmatch(asset.name)
+            if match:
+                by_version.setdefault(match.group('version'), []).append(asset)
+        
+        stable_digests = {
+            remote_sha256(asset) for asset in assets
+            if asset.name.startswith(f"{base_name}-latest")
+        } - {None}
+        
+        ordered = sorted(by_version, key=version_key, reverse=True)
+        kept_versions = set(ordered[:max(1, keep_last or 1)])
+        for version in ordered:
+            for asset in by_version[version]:
+                if remote_sha256(asset) in stable_digests:
+                    kept_versions.add(version)
+                created = getattr(asset, 'created_at', None)
+                if keep_newer_than is None or not isinstance(created, datetime):
+                    continue
+                if created.tzinfo is None:
+                    created = created.replace(tzinfo=timezone.utc)
+                if now - created < keep_newer_than:
+                    kept_versions.add(version)
+        
+        kept, doomed = [], []
+        for version in ordered:
+            (kept if version in kept_versions else doomed).extend(by_version[version])
+        return kept, doomed
+    
+    def prune(
+        self,
+        base_name: str = "app-portfolio-release",
+        keep_last: Optional[int] = None,
+        keep_newer_than: Optional[timedelta] = None,
+        dry_run: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Delete versioned assets of the 'latest' release outside the retention policy.
+        
+        Args:
+            base_name: Base name of versioned assets
+            keep_last: Versions to keep (see plan_prune)
+            keep_newer_than: Keep versions with an asset younger than this
+            dry_run: Report what would be deleted without deleting
+            max_workers: Concurrent deletes (default: DEFAULT_UPLOAD_WORKERS)
+        
+        Returns:
+            Dictionary containing:
+                - kept: Names of versioned assets kept
+                - deleted: Names deleted (or that would be, in a dry run)
+                - failed: {'name', 'error'} for deletes that failed
+                - reclaimed_bytes: Total size of the deleted assets
+                - dry_run: Whether anything was deleted
+        
+        Raises:
+            GitHubReleaseError: If the release or its assets cannot be read
+        """
+        try:
+            release = self._get_release()
+            assets = list(self.asset_index(release).values())
+        except UnknownObjectException:
+            raise GitHubReleaseError(f"Release '{self.release_tag}' not found")
+        except GithubException as e:
+            raise GitHubReleaseError(f"Failed to list release assets: {describe_error(e)}")
+        
+        kept, doomed = self.plan_prune(assets, base_name, keep_last, keep_newer_than)
+        result = {
+            'kept': [asset.name for asset in kept],
+            'deleted': [],
+            'failed': [],
+            'reclaimed_bytes': 0,
+            'dry_run': dry_run,
+        }
+        if dry_run:
+            result['deleted'] = [asset.name for asset in doomed]
+            result['reclaimed_bytes'] = sum(asset.size for asset in doomed)
+            return result
+        
+        def delete(asset) -> Optional[str]:
+            try:
+                self.scheduler.call(asset.delete_asset, write=True)
+            except UPLOAD_ERRORS as e:
+                return describe_error(e)
+            self._index_asset(release, asset.name, None)
+            return None
+        
+        if doomed:
+            workers = min(len(doomed), max_workers or self.DEFAULT_UPLOAD_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for asset, error in zip(doomed, executor.map(delete, doomed)):
+                    if error is None:
+                        result['deleted'].append(asset.name)
+                        result['reclaimed_bytes'] += asset.size
+                    else:
+                        result['failed'].append({'name': asset.name, 'error': error})
+        return result
+    
+    def _local_files(self, directory: Path) -> List[Dict[str, Any]]:
+        """
+        Regular files of directory with size and SHA-256.
+        
+        Hidden entries (the staging cache, the content store, temporary
+        files) are skipped. Digests recorded by prepare_apk in the
+        directory's staging cache are reused while the file is unchanged.
+        """
+        paths = sorted(
+            path for path in directory.iterdir()
+            if not path.name.startswith('.') and path.is_file()
+        )
+        cache_path = directory / APKPreparer.DIGEST_CACHE
+        cache = DigestCache(cache_path) if cache_path.is_file() else None
+        
+        def describe(path: Path) -> Dict[str, Any]:
+            digests = cache.get(path, ["sha256"]) if cache else None
+            if digests is None:
+                digests = compute_digests(path, ["sha256"])
+            return {'name': path.name, 'path': path, 'size': path.stat().st_size, 'sha256': digests['sha256']}
+        
+        with ThreadPoolExecutor(max_workers=min(len(paths), self.DEFAULT_UPLOAD_WORKERS) or 1) as executor:
+            return list(executor.map(describe, paths))
+    
+    def plan_sync(self, release, directory: Union[str, Path], delete: bool = False) -> Dict[str, Any]:
+        """
+        Compute the changes that make the release mirror directory.
+        
+        Files are matched to assets by name, then by size and SHA-256:
+        - same name, size and digest: unchanged
+        - same bytes under a name with no local file (only when delete is
+          True, as the old name disappears): rename that asset, nothing
+          is uploaded
+        - otherwise: upload (replacing an asset of that name, if any)
+        Assets with no local file are deleted only when delete is True.
+        Temporary upload leftovers are ignored.
+        
+        Args:
+            release: GitHub Release object
+            directory: Local directory to mirror (not recursive)
+            delete: Delete assets that have no local counterpart
+        
+        Returns:
+            Dictionary containing:
+                - upload: {'name', 'path', 'size', 'sha256', 'replace'} per file
+                - rename: {'from', 'to', 'size', 'sha256'} per asset
+                - delete: {'name', 'size'} per asset
+                - unchanged: Names already in sync
+                - upload_bytes: Total bytes to upload
+        """
+        local = self._local_files(Path(directory))
+        remote = {
+            name: asset for name, asset in self.asset_index(release).items()
+            if self.TEMPORARY_MARKER not in name
+        }
+        wanted = {entry['name'] for entry in local}
+        
+        # Assets that are about to be deleted can be renamed instead
+        spare: Dict[Tuple[int, str], List[Any]] = {}
+        for name, asset in sorted(remote.items()):
+            digest = remote_sha256(asset)
+            if delete and name not in wanted and digest:
+                spare.setdefault((asset.size, digest), []).append(asset)
+        
+        plan: Dict[str, Any] = {'upload': [], 'rename': [], 'delete': [], 'unchanged': [], 'upload_bytes': 0}
+        renamed = set()
+        for entry in local:
+            existing = remote.get(entry['name'])
+            if (existing is not None and existing.size == entry['size']
+                    and remote_sha256(existing) == entry['sha256']):
+                plan['unchanged'].append(entry['name'])
+                continue
+            
+            candidates = spare.get((entry['size'], entry['sha256']))
+            if candidates:
+                source = candidates.pop(0)
+                renamed.add(source.name)
+                plan['rename'].append({
+                    'from': source.name, 'to': entry['name'], 'size': entry['size'], 'sha256': entry['sha256'],
+                })
+                continue
+            
+            plan['upload'].append({**entry, 'replace': existing is not None})
+            plan['upload_bytes'] += entry['size']
+        
+        if delete:
+            plan['delete'] = [
+                {'name': name, 'size': asset.size} for name, asset in sorted(remote.items())
+                if name not in wanted and name not in renamed
+            ]
+        return plan
+    
+    def apply_sync(self, release, plan: Dict[str, Any], max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Carry out a plan from plan_sync.
+        
+        Uploads and renames run concurrently; deletes run last, so every
+        wanted name is in place before anything is removed.
+        
+        Returns:
+            Dictionary containing:
+                - uploaded, renamed, deleted: Names of completed actions
+                - failed: {'name', 'error'} per failed action
+                - bytes_uploaded: Bytes sent
+                - seconds: Wall-clock time
+        """
+        started = time.perf_counter()
+        result: Dict[str, Any] = {'uploaded': [], 'renamed': [], 'deleted': [], 'failed': [], 'bytes_uploaded': 0}
+        lock = threading.Lock()
+        
+        def upload(entry: Dict[str, Any]) -> None:
+            self._replace_asset(release, Path(entry['path']), entry['name'], force=True, sha256=entry['sha256'])
+            with lock:
+                result['uploaded'].append(entry['name'])
+                result['bytes_uploaded'] += entry['size']
+        
+        def rename(entry: Dict[str, Any]) -> None:
+            asset = self.asset_index(release)[entry['from']]
+            print(f"  Renaming: {entry['from']} -> {entry['to']}")
+            self._swap_asset(release, asset, entry['from'], entry['to'], asset_label(entry['to'], entry['sha256']))
+            with lock:
+                result['renamed'].append(entry['to'])
+        
+        def delete(entry: Dict[str, Any]) -> None:
+            asset = self.asset_index(release).get(entry['name'])
+            if asset is not None:
+                self.scheduler.call(asset.delete_asset, write=True)
+                self._index_asset(release, entry['name'], None)
+            with lock:
+                result['deleted'].append(entry['name'])
+        
+        def run(tasks: List[Tuple[Callable[[Dict[str, Any]], None], Dict[str, Any], str]]) -> None:
+            if not tasks:
+                return
+            workers = min(len(tasks), max_workers or self.DEFAULT_UPLOAD_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(action, entry): name for action, entry, name in tasks}
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except (GitHubReleaseError,) + UPLOAD_ERRORS as e:
+                        message = describe_error(e) if isinstance(e, UPLOAD_ERRORS) else str(e)
+                        with lock:
+                            result['failed'].append({'name': futures[future], 'error': message})
+        
+        run([(rename, entry, entry['to']) for entry in plan['rename']]
+            + [(upload, entry, entry['name']) for entry in plan['upload']])
+        run([(delete, entry, entry['name']) for entry in plan['delete']])
+        
+        result['seconds'] = time.perf_counter() - started
+        return result
+
+
+class GitHubBackend(ArtifactBackend):
+    """GitHub Releases through GitHubReleaseUploader (PyGithub on a thread pool)."""
+    
+    name = "github"
+    
+    def __init__(self, uploader: GitHubReleaseUploader, max_workers: Optional[int] = None):
+        self.uploader = uploader
+        self.max_workers = max_workers
+    
+    def describe(self) -> str:
+        return f"{self.uploader.repository} ({self.uploader.release_tag})"
+    
+    def publish(self, files: Sequence[Tuple[Path, str]], force: bool = False) -> List[Dict[str, Any]]:
+        results = self.uploader.upload_files([(str(path), name) for path, name in files],
+                                             max_workers=self.max_workers, force=force)
+        return [dict(result, url=result['stable_url']) for result in results]
+    
+    def stats(self) -> Dict[str, Any]:
+        return self.uploader.request_stats()
+    
+    def close(self) -> None:
+        self.uploader.http_pool.close()
+
+
+def print_sync_plan(plan: Dict[str, Any]) -> None:
+    """Print a sync plan, one line per action."""
+    for entry in plan['upload']:
+        verb = "replace" if entry['replace'] else "upload"
+        print(f"  {'~' if entry['replace'] else '+'} {verb:<8}{entry['name']} ({entry['size'] / (1024*1024):.2f} MB)")
+    for entry in plan['rename']:
+        print(f"  > rename  {entry['from']} -> {entry['to']}")
+    for entry in plan['delete']:
+        print(f"  - delete  {entry['name']}")
+    print(f"  {len(plan['upload'])} to upload ({plan['upload_bytes'] / (1024*1024):.2f} MB), "
+          f"{len(plan['rename'])} to rename, {len(plan['delete'])} to delete, "
+          f"{len(plan['unchanged'])} unchanged")
+
+
+def credentials(token: Optional[str], repository: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Token and repository from arguments or GITHUB_TOKEN/GITHUB_REPOSITORY (errors printed)."""
+    token = token or os.environ.get("GITHUB_TOKEN")
+    if not token:
+        print("ERROR: GitHub token required. Set GITHUB_TOKEN env var or use --token", file=sys.stderr)
+        return None, None
+    
+    repository = repository or os.environ.get("GITHUB_REPOSITORY")
+    if not repository:
+        print("ERROR: Repository required. Set GITHUB_REPOSITORY env var or use --repository", file=sys.stderr)
+        return None, None
+    return token, repository
+
+
+def add_http_arguments(parser: argparse.ArgumentParser) -> None:
+    """Connection pool, timeout and request logging options."""
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        help=f"Connections kept open per host (default: {HTTPPool.DEFAULT_POOL_SIZE})"
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        metavar="SECONDS",
+        help=f"Seconds to establish a connection (default: {HTTPPool.DEFAULT_CONNECT_TIMEOUT:g})"
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        metavar="SECONDS",
+        help=f"Seconds without data from GitHub before a call fails and is retried "
+             f"(default: {HTTPPool.DEFAULT_READ_TIMEOUT:g})"
+    )
+    parser.add_argument(
+        "--no-keep-alive",
+        action="store_true",
+        help="Open a new connection for every call"
+    )
+    parser.add_argument(
+        "--log-requests",
+        action="store_true",
+        help="Print method, URL, status and latency of every HTTP call to stderr"
+    )
+
+
+def http_pool_from_args(args: argparse.Namespace) -> HTTPPool:
+    """HTTPPool configured by add_http_arguments() options."""
+    return HTTPPool(
+        pool_size=args.pool_size,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        keep_alive=not args.no_keep_alive,
+        retry=transport_retry(),
+        log_requests=args.log_requests
+    )
+
 
+def add_mirror_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options for mirror backends published to alongside GitHub Releases."""
+    parser.add_argument(
+        "--mirror-dir",
+        action="append",
+        default=[],
+        metavar="DIR",
+        help="Also publish into this directory (e.g. an internal mirror); repeatable"
+    )
+    parser.add_argument(
+        "--mirror-dir-url",
+        metavar="URL",
+        help="URL the --mirror-dir directories are served at (default: file:// URLs)"
+    )
+    parser.add_argument(
+        "--mirror-s3",
+        action="append",
+        default=[],
+        metavar="BUCKET[/PREFIX]",
+        help="Also publish to this S3-compatible bucket; repeatable. Credentials come from "
+             "AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY and AWS_SESSION_TOKEN"
+    )
+    parser.add_argument(
+        "--s3-endpoint",
+        help="S3 endpoint, e.g. a MinIO server (defaults to AWS_ENDPOINT_URL_S3 or AWS_ENDPOINT_URL "
+             "env var, else AWS S3)"
+    )
+    parser.add_argument(
+        "--s3-region",
+        help="S3 signing region (defaults to AWS_REGION or AWS_DEFAULT_REGION env var, else us-east-1)"
+    )
+    parser.add_argument(
+        "--s3-public-url",
+        metavar="URL",
+        help="URL objects are downloaded from, e.g. a CDN in front of the bucket (default: endpoint/bucket)"
+    )
+
+
+def mirror_backends_from_args(args: argparse.Namespace) -> List[ArtifactBackend]:
+    """
+    Mirror backends for --mirror-dir and --mirror-s3.
+    
+    Raises:
+        BackendError: If S3 credentials are missing or a bucket is invalid
+    """
+    backends: List[ArtifactBackend] = [LocalBackend(directory, base_url=args.mirror_dir_url) for directory in args.mirror_dir]
+    if args.mirror_s3:
+        access_key = os.environ.get("AWS_ACCESS_KEY_ID")
+        secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+        if not access_key or not secret_key:
+            raise BackendError("--mirror-s3 requires AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY")
+        for spec in args.mirror_s3:
+            bucket, _, prefix = spec.partition("/")
+            backends.append(S3Backend(
+                bucket,
+                access_key,
+                secret_key,
+                endpoint=args.s3_endpoint or os.environ.get("AWS_ENDPOINT_URL_S3") or os.environ.get("AWS_ENDPOINT_URL"),
+                prefix=prefix,
+                region=args.s3_region or os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION"),
+                session_token=os.environ.get("AWS_SESSION_TOKEN"),
+                public_url=args.s3_public_url,
+                http_pool=http_pool_from_args(args),
+                max_workers=args.jobs,
+                retries=args.retries
+            ))
+    return backends
+
+
+def mirror_urls(outcomes: Sequence[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Download URLs by mirror target, for mirrors that succeeded."""
+    return {
+        outcome['target']: [result['url'] for result in outcome['results']]
+        for outcome in outcomes if outcome['error'] is None
+    }
 
-def main():
+
+def publish_mirror_indexes(
+    mirrors: Sequence[Tuple[ArtifactBackend, Dict[str, Any]]],
+    files: Sequence[Tuple[str, Optional[str]]],
+    version: str,
+    index_name: str
+) -> None:
+    """
+    Publish a release index to every mirror that took the files.
+    
+    Each index names the mirror's own URLs and is added to its outcome's
+    results; a mirror that cannot take it is marked failed.
+    
+    Args:
+        mirrors: (backend, publish_all() outcome) pairs
+        files: (file path, asset name or None) pairs that were published
+        version: Release version (pubspec.yaml)
+        index_name: Name to publish the index under
+    """
+    with tempfile.TemporaryDirectory(prefix="release-index-") as scratch:
+        for backend, outcome in mirrors:
+            if outcome['error'] is not None:
+                continue
+            urls = {result['asset_name']: result['url'] for result in outcome['results']}
+            path = write_release_index(Path(scratch) / index_name, build_release_index(files, version, urls))
+            try:
+                outcome['results'] = outcome['results'] + backend.publish([(path, index_name)])
+            except Exception as e:
+                outcome['error'] = e
+                continue
+            print(f"✓ Release index {index_name} on mirror {outcome['target']}")
+
+
+def print_http_stats(stats: Dict[str, Any]) -> None:
+    """One-line connection and latency summary."""
+    if not stats.get('http_requests'):
+        return
+    print(f"HTTP: {stats['http_requests']} call(s) on {stats['connections']} connection(s), latency "
+          f"p50 {stats['latency_p50_ms']:.0f} ms, p95 {stats['latency_p95_ms']:.0f} ms, "
+          f"max {stats['latency_max_ms']:.0f} ms"
+          + (f", {stats['http_errors']} failed" if stats['http_errors'] else ""))
+
+
+def prune_main(argv: Sequence[str]) -> int:
+    """Entry point for the 'prune' subcommand"""
+    parser = argparse.ArgumentParser(
+        prog="upload_to_github_releases.py prune",
+        description="Delete old versioned assets from the 'latest' release",
+        epilog=f"Stable assets (<base-name>-latest.*) are never deleted, nor is the version they "
+               f"match or the newest version. Without rules, --keep-last "
+               f"{GitHubReleaseUploader.DEFAULT_KEEP_LAST} applies."
+    )
+    parser.add_argument(
+        "--base-name",
+        default="app-portfolio-release",
+        help="Base name of versioned assets (default: app-portfolio-release)"
+    )
+    parser.add_argument(
+        "--keep-last",
+        type=int,
+        metavar="N",
+        help="Keep the N newest versions"
+    )
+    parser.add_argument(
+        "--keep-newer-than",
+        metavar="DURATION",
+        help="Keep versions uploaded within DURATION (e.g. 30d, 12h, 2w)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List assets that would be deleted without deleting them"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help=f"Concurrent deletes (default: {GitHubReleaseUploader.DEFAULT_UPLOAD_WORKERS})"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the result as JSON"
+    )
+    parser.add_argument(
+        "--etag-cache",
+        metavar="PATH",
+        help="JSON file caching ETags of release metadata"
+    )
+    parser.add_argument(
+        "--api-url",
+        help="GitHub API root, e.g. a local fake_github_releases.py server "
+             "(defaults to GITHUB_API_URL env var or https://api.github.com)"
+    )
+    add_http_arguments(parser)
+    parser.add_argument(
+        "--token",
+        help="GitHub authentication token (defaults to GITHUB_TOKEN env var)"
+    )
+    parser.add_argument(
+        "--repository",
+        help="Repository in format 'owner/repo' (defaults to GITHUB_REPOSITORY env var)"
+    )
+    
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
+    try:
+        keep_newer_than = parse_duration(args.keep_newer_than) if args.keep_newer_than else None
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    if args.keep_last is not None and args.keep_last < 1:
+        print("ERROR: --keep-last must be at least 1", file=sys.stderr)
+        return 1
+    
+    token, repository = credentials(args.token, args.repository)
+    if not token:
+        return 1
+    
+    try:
+        uploader = GitHubReleaseUploader(
+            token=token,
+            repository=repository,
+            etag_cache=args.etag_cache,
+            base_url=args.api_url or os.environ.get("GITHUB_API_URL"),
+            http_pool=http_pool_from_args(args)
+        )
+        result = uploader.prune(
+            base_name=args.base_name,
+            keep_last=args.keep_last,
+            keep_newer_than=keep_newer_than,
+            dry_run=args.dry_run,
+            max_workers=args.jobs
+        )
+    except GitHubReleaseError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        action = "Would delete" if args.dry_run else "Deleted"
+        for name in result['deleted']:
+            print(f"  {action}: {name}")
+        for failure in result['failed']:
+            print(f"  ✗ Failed to delete {failure['name']}: {failure['error']}", file=sys.stderr)
+        print(f"✓ {action} {len(result['deleted'])} asset(s), kept {len(result['kept'])}, "
+              f"reclaimed {result['reclaimed_bytes'] / (1024*1024):.2f} MB")
+    
+    return 1 if result['failed'] else 0
+
+
+def sync_main(argv: Sequence[str]) -> int:
+    """Entry point for the 'sync' subcommand"""
+    parser = argparse.ArgumentParser(
+        prog="upload_to_github_releases.py sync",
+        description="Make a release's assets mirror a local directory",
+        epilog="Only files whose name, size or SHA-256 differ are uploaded; assets whose "
+               "bytes match a new file name are renamed instead of re-uploaded."
+    )
+    parser.add_argument(
+        "directory",
+        help="Directory whose files become the release assets (not recursive; hidden files skipped)"
+    )
+    parser.add_argument(
+        "--release",
+        default=GitHubReleaseUploader.RELEASE_TAG,
+        help=f"Release tag (default: {GitHubReleaseUploader.RELEASE_TAG}; created if missing)"
+    )
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="Delete assets that have no file in the directory"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show the plan without applying it"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help=f"Concurrent uploads, renames and deletes (default: {GitHubReleaseUploader.DEFAULT_UPLOAD_WORKERS})"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the plan and result as JSON"
+    )
+    parser.add_argument(
+        "--etag-cache",
+        metavar="PATH",
+        help="JSON file caching ETags of release metadata"
+    )
+    parser.add_argument(
+        "--api-url",
+        help="GitHub API root, e.g. a local fake_github_releases.py server "
+             "(defaults to GITHUB_API_URL env var or https://api.github.com)"
+    )
+    add_http_arguments(parser)
+    parser.add_argument(
+        "--token",
+        help="GitHub authentication token (defaults to GITHUB_TOKEN env var)"
+    )
+    parser.add_argument(
+        "--repository",
+        help="Repository in format 'owner/repo' (defaults to GITHUB_REPOSITORY env var)"
+    )
+    
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"ERROR: Directory not found: {directory}", file=sys.stderr)
+        return 1
+    
+    token, repository = credentials(args.token, args.repository)
+    if not token:
+        return 1
+    
+    try:
+        uploader = GitHubReleaseUploader(
+            token=token,
+            repository=repository,
+            etag_cache=args.etag_cache,
+            release_tag=args.release,
+            base_url=args.api_url or os.environ.get("GITHUB_API_URL"),
+            http_pool=http_pool_from_args(args)
+        )
+        release = uploader.get_or_create_release()
+        plan = uploader.plan_sync(release, directory, delete=args.delete)
+        if not args.json:
+            print("Plan:")
+            print_sync_plan(plan)
+        result = None if args.dry_run else uploader.apply_sync(release, plan, max_workers=args.jobs)
+    except (GitHubReleaseError, OSError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    except GithubException as e:
+        print(f"ERROR: {describe_error(e)}", file=sys.stderr)
+        return 1
+    
+    if args.json:
+        report = {
+            'plan': {
+                **plan,
+                'upload': [{**entry, 'path': str(entry['path'])} for entry in plan['upload']],
+            },
+            'result': result,
+        }
+        print(json.dumps(report, indent=2))
+    elif result is not None:
+        for failure in result['failed']:
+            print(f"  ✗ {failure['name']}: {failure['error']}", file=sys.stderr)
+        rate = result['bytes_uploaded'] / result['seconds'] if result['seconds'] > 0 else 0
+        print(f"✓ Synced: {len(result['uploaded'])} uploaded, {len(result['renamed'])} renamed, "
+              f"{len(result['deleted'])} deleted, {len(plan['unchanged'])} unchanged "
+              f"({result['bytes_uploaded'] / (1024*1024):.2f} MB in {result['seconds']:.1f} s, "
+              f"{format_rate(rate)})")
+        print_http_stats(uploader.request_stats())
+    
+    return 1 if result is not None and result['failed'] else 0
+
+
+SUBCOMMANDS = {
+    'prune': prune_main,
+    'sync': sync_main,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None):
     """Main entry point for the script"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+    
     parser = argparse.ArgumentParser(
         description="Upload artifacts to GitHub Releases with stable URLs",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -225,17 +1684,89 @@ Examples:
   
   # With GitHub Actions output
   python upload_to_github_releases.py build/app.apk --asset-name app-release.apk --github-output
+  
+  # Several assets in one run (one release lookup, concurrent uploads)
+  python upload_to_github_releases.py \\
+      dist/app-1.2.0+5.apk:app-portfolio-release-1.2.0+5.apk \\
+      dist/app-latest.apk:app-portfolio-release-latest.apk --github-output
+  
+  # Also publish latest.json for update checks (version from pubspec.yaml)
+  python upload_to_github_releases.py \\
+      dist/app-1.2.0+5.apk:app-portfolio-release-1.2.0+5.apk \\
+      dist/app-latest.apk:app-portfolio-release-latest.apk --release-index dist/latest.json
+  
+  # Publish to GitHub, an internal mirror directory and a MinIO bucket at once
+  AWS_ACCESS_KEY_ID=... AWS_SECRET_ACCESS_KEY=... python upload_to_github_releases.py \\
+      dist/app-latest.apk --mirror-dir /srv/downloads \\
+      --mirror-s3 releases/android --s3-endpoint http://minio.internal:9000
+  
+  # Delete versioned assets beyond the 5 newest versions (preview first)
+  python upload_to_github_releases.py prune --keep-last 5 --dry-run
+  
+  # Many assets at once from one event loop
+  python upload_to_github_releases.py dist/*.apk dist/app.aab --engine asyncio --jobs 8
+  
+  # Mirror dist/ onto the release, uploading only what changed
+  python upload_to_github_releases.py sync dist/ --release latest
         """
     )
     
     parser.add_argument(
-        "file_path",
-        help="Path to the file to upload"
+        "files",
+        nargs="+",
+        metavar="file_path[:asset-name]",
+        help="File to upload, optionally with its asset name; repeat to upload several"
     )
     parser.add_argument(
         "--asset-name",
-        help="Name for the asset in GitHub Releases (defaults to filename)"
+        help="Name for the asset in GitHub Releases (defaults to filename; single file only)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help=f"Concurrent uploads for several files (default: {GitHubReleaseUploader.DEFAULT_UPLOAD_WORKERS})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Upload even when the release already has an identical asset"
+    )
+    parser.add_argument(
+        "--release-index",
+        metavar="PATH",
+        help=f"Also write a release index (version, size, SHA-256, stable URL, delta patch) to PATH "
+             f"and upload it after the other assets, e.g. dist/{RELEASE_INDEX_NAME}"
+    )
+    parser.add_argument(
+        "--version",
+        help="Version recorded in the release index (defaults to pubspec.yaml)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("threads", "asyncio"),
+        default="threads",
+        help="threads: PyGithub calls on a thread pool; asyncio: one event loop driving the same "
+             "connection pool, for publishing many assets at once (default: threads)"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        help=f"Retries per upload on 5xx responses and connection errors "
+             f"(default: {GitHubReleaseUploader.UPLOAD_RETRIES})"
+    )
+    parser.add_argument(
+        "--etag-cache",
+        metavar="PATH",
+        help="JSON file caching ETags of release metadata; unchanged reads become "
+             "304 Not Modified replies that do not count against the rate limit"
+    )
+    parser.add_argument(
+        "--api-url",
+        help="GitHub API root, e.g. a local fake_github_releases.py server "
+             "(defaults to GITHUB_API_URL env var or https://api.github.com)"
     )
+    add_http_arguments(parser)
+    add_mirror_arguments(parser)
     parser.add_argument(
         "--token",
         help="GitHub authentication token (defaults to GITHUB_TOKEN env var)"
@@ -252,84 +1783,162 @@ Examples:
     parser.add_argument(
         "--url-only",
         action="store_true",
-        help="Output only the stable URL (for CI/CD pipelines)"
+        help="Output only the stable URL(s) (for CI/CD pipelines)"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
+    files = [parse_file_spec(spec) for spec in args.files]
+    if args.asset_name:
+        if len(files) != 1:
+            print("ERROR: --asset-name can only be used with a single file; use file:asset-name", file=sys.stderr)
+            return 1
+        files = [(files[0][0], args.asset_name)]
     
-    # Get token from args or environment
-    token = args.token or os.environ.get("GITHUB_TOKEN")
+    # Get token and repository from args or environment
+    token, repository = credentials(args.token, args.repository)
     if not token:
-        print("ERROR: GitHub token required. Set GITHUB_TOKEN env var or use --token", file=sys.stderr)
         return 1
     
-    # Get repository from args or environment
-    repository = args.repository or os.environ.get("GITHUB_REPOSITORY")
-    if not repository:
-        print("ERROR: Repository required. Set GITHUB_REPOSITORY env var or use --repository", file=sys.stderr)
+    if args.release_index:
+        index_path = Path(args.release_index)
+        if index_path.name in [asset_name or Path(file_path).name for file_path, asset_name in files]:
+            print(f"ERROR: {index_path.name} is both an asset and the release index", file=sys.stderr)
+            return 1
+        try:
+            version = args.version or APKPreparer().extract_version()
+        except APKPreparationError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+    
+    try:
+        mirrors = mirror_backends_from_args(args)
+    except BackendError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
         return 1
     
+    # Every backend created is closed on the way out, whatever happens
+    backends: List[ArtifactBackend] = list(mirrors)
     try:
-        # Initialize uploader
-        uploader = GitHubReleaseUploader(
-            token=token,
-            repository=repository
-        )
+        if args.engine == "asyncio":
+            from async_release_uploader import AsyncGitHubBackend
+            
+            github = AsyncGitHubBackend(
+                token,
+                repository,
+                max_workers=args.jobs,
+                retries=args.retries,
+                etag_cache=args.etag_cache,
+                base_url=args.api_url or os.environ.get("GITHUB_API_URL"),
+                http_pool=http_pool_from_args(args)
+            )
+        else:
+            github = GitHubBackend(
+                GitHubReleaseUploader(
+                    token=token,
+                    repository=repository,
+                    retries=args.retries,
+                    etag_cache=args.etag_cache,
+                    base_url=args.api_url or os.environ.get("GITHUB_API_URL"),
+                    http_pool=http_pool_from_args(args)
+                ),
+                max_workers=args.jobs
+            )
+        backends.insert(0, github)
         
-        # Upload the file
-        stable_url = uploader.upload_file(
-            file_path=args.file_path,
-            asset_name=args.asset_name
-        )
+        # GitHub and every mirror upload at once; each is reported as it finishes
+        outcomes = publish_all(backends, files, force=args.force)
+        if outcomes[0]['error'] is not None:
+            raise outcomes[0]['error']
+        stable_urls = [result['url'] for result in outcomes[0]['results']]
+        
+        # The index goes up last, so it never names an asset not yet
+        # uploaded; every target gets a copy naming its own download URLs
+        index_url = None
+        if args.release_index:
+            urls = {asset_name or Path(file_path).name: url for (file_path, asset_name), url in zip(files, stable_urls)}
+            index = build_release_index(files, version, urls)
+            index_url = github.publish([(write_release_index(index_path, index), index_path.name)])[0]['url']
+            print(f"✓ Release index {index_path.name}: version {index['version']}"
+                  f"{', delta from ' + index['delta']['from_version'] if 'delta' in index else ''}")
+            publish_mirror_indexes(list(zip(backends[1:], outcomes[1:])), files, version, index_path.name)
+        failed_mirrors = [outcome for outcome in outcomes[1:] if outcome['error'] is not None]
+        
+        api = github.stats()
+        print(f"API requests: {api['requests']} ({api['not_modified']} not modified, "
+              f"{api['rate_limited']} rate limited), {api['wait_seconds']:.1f} s waiting for rate limits")
+        print_http_stats(api)
         
         # Validate URL format
         print()
         print("Validating stable URL format...")
         
         expected_pattern = f"https://github.com/{repository}/releases/latest/download/"
-        if not stable_url.startswith(expected_pattern):
-            print(f"\n⚠ ERROR: URL validation failed!", file=sys.stderr)
-            print(f"Expected URL starting with: {expected_pattern}", file=sys.stderr)
-            print(f"Got: {stable_url}", file=sys.stderr)
-            return 1
+        for stable_url in stable_urls + ([index_url] if index_url else []):
+            if not stable_url.startswith(expected_pattern):
+                print(f"\n⚠ ERROR: URL validation failed!", file=sys.stderr)
+                print(f"Expected URL starting with: {expected_pattern}", file=sys.stderr)
+                print(f"Got: {stable_url}", file=sys.stderr)
+                return 1
         
         print("✓ URL format is valid")
         
+        # A mirror that failed fails the run, after everything else is reported
+        exit_code = 0
+        if failed_mirrors:
+            exit_code = 1
+            for outcome in failed_mirrors:
+                print(f"ERROR: Mirror {outcome['target']} failed: {outcome['error']}", file=sys.stderr)
+        
         # Output based on flags
         if args.url_only:
             print()
-            print(stable_url)
-            return 0
+            for stable_url in stable_urls:
+                print(stable_url)
+            return exit_code
         
         # Print results
         print()
         print("=" * 60)
         print("Upload Complete!")
         print("=" * 60)
-        print(f"Stable Download URL:")
-        print(f"  {stable_url}")
+        print(f"Stable Download URL{'s' if len(stable_urls) > 1 else ''}:")
+        for stable_url in stable_urls:
+            print(f"  {stable_url}")
+        if index_url:
+            print("Release Index URL:")
+            print(f"  {index_url}")
+        for outcome in outcomes[1:]:
+            if outcome['error'] is None:
+                print(f"Mirror {outcome['target']}:")
+                for result in outcome['results']:
+                    print(f"  {result['url']}")
         print()
         print("This URL will always point to the latest uploaded file.")
         print("=" * 60)
         print()
         
-        # Output for GitHub Actions
+        # Output for GitHub Actions; stable_url is the last file given
         if args.github_output:
-            github_output = os.environ.get("GITHUB_OUTPUT")
-            if github_output:
-                with open(github_output, "a") as f:
-                    f.write(f"stable_url={stable_url}\n")
-                print("✓ GitHub Actions output written")
-            else:
-                print("# Environment variable format:")
-                print(f"export STABLE_URL='{stable_url}'")
+            outputs: Dict[str, Any] = {'stable_url': stable_urls[-1]}
+            if len(stable_urls) > 1:
+                outputs['stable_urls'] = json.dumps(stable_urls)
+            if index_url:
+                outputs['index_url'] = index_url
+            if mirrors:
+                outputs['mirror_urls'] = json.dumps(mirror_urls(outcomes[1:]))
+            outputs['api_requests'] = api['requests']
+            outputs['api_wait_seconds'] = f"{api['wait_seconds']:.1f}"
+            write_github_output(outputs)
         
-        return 0
+        return exit_code
         
     except FileNotFoundError as e:
         print(f"ERROR: {e}", file=sys.stderr)
         return 1
-    except GitHubReleaseError as e:
+    except (GitHubReleaseError, BackendError) as e:
         print(f"ERROR: {e}", file=sys.stderr)
         return 1
     except Exception as e:
@@ -337,6 +1946,9 @@ Examples:
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        for backend in backends:
+            backend.close()
 
 
 if __name__ == "__main__":